@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+# asyncio transmit queue.
+#
+# IRsend.send() blocks the caller for the whole message, including the gap at
+# the end of it. A TransmitQueue sends from a worker thread & keeps the event
+# loop free:
+#
+#   queue = TransmitQueue(IRsend(pin))
+#   async with queue:
+#       frame = await queue.send(NEC, 0x20DF10EF, 32)
+#       await frame  # Resolves once the message is sent.
+#
+# The frame after the one on the wire is rendered (IRsend.waveform()) while
+# the current one is being sent, so there is always one frame ready to go.
+# Rendering is done by an IRsend of its own in the loop's default executor,
+# the one that sends is only used by the worker thread.
+#
+# The space a message ends with is its minimum gap to the next message. It
+# isn't sent by the worker thread, the queue waits it out on the event loop
+# before the next frame goes out. Messages that don't end with a space get
+# min_gap.
+#
+# A/C classes send their state with:
+#   await queue.send(ac._protocol, ac.get_raw(), ac._packet_len)
+
+import asyncio
+import concurrent.futures
+import threading
+
+from .IRremoteESP8266 import *
+from .IRbackend import RecordingBackend
+from .IRsend import IRsend, kDefaultMessageGap
+
+
+class TransmitFrame(object):
+
+    def __init__(self, decode_type, data, nbits, repeat, future):
+        self.decode_type = decode_type
+        self.data = data
+        self.nbits = nbits
+        self.repeat = repeat
+        # Resolves to this frame once it has been sent.
+        self.future = future
+        self.waveform = None
+        # loop.time() the frame started & finished (without the gap).
+        self.started = None
+        self.finished = None
+
+    @property
+    def airtime(self):
+        # Nr. of uSeconds the frame takes, gap included. None until rendered.
+        if self.waveform is None:
+            return None
+
+        return self.waveform.duration
+
+    def __await__(self):
+        return self.future.__await__()
+
+
+class TransmitQueue(object):
+
+    def __init__(self, irsend, maxsize=0, min_gap=kDefaultMessageGap, executor=None):
+        # Args:
+        #   irsend: The IRsend to send with. Set a waveform cache on it
+        #           (set_waveform_cache()) to not render repeats again.
+        #   maxsize: Max. nr. of frames waiting to be rendered. send() waits
+        #            when it is full. 0 means no limit.
+        #   min_gap: Nr. of uSeconds between messages that don't end with a
+        #            space. (kDefaultMessageGap)
+        #   executor: concurrent.futures executor to send with. Must run one
+        #             frame at a time. (Def: a thread of its own)
+        self._irsend = irsend
+        self._renderer = IRsend(
+            None,
+            use_modulation=irsend.modulation,
+            backend=RecordingBackend()
+        )
+        self._renderer.set_waveform_cache(irsend.get_waveform_cache())
+        # The renderer is used by the render thread & airtime().
+        self._render_lock = threading.Lock()
+        self._min_gap = min_gap
+        self._executor = executor
+        self._own_executor = False
+        self._maxsize = maxsize
+        self._pending = None
+        self._ready = None
+        self._tasks = []
+        # loop.time() the next frame may start.
+        self._next_start = 0.0
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *_):
+        await self.stop()
+
+    def start(self):
+        # Start the render & transmit tasks on the running loop.
+        if self._tasks:
+            return
+
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+            self._own_executor = True
+
+        self._pending = asyncio.Queue(self._maxsize)
+        # One rendered frame waits while another one is on the wire.
+        self._ready = asyncio.Queue(1)
+        self._tasks = [
+            asyncio.ensure_future(self._render()),
+            asyncio.ensure_future(self._transmit())
+        ]
+
+    async def stop(self, drain=True):
+        # Stop the queue.
+        #
+        # Args:
+        #   drain: Send the frames that are queued first. Otherwise every
+        #          frame that hasn't been sent yet is cancelled, the one on
+        #          the wire included. (Its output isn't cut short)
+        if not self._tasks:
+            return
+
+        if drain:
+            await self._pending.join()
+            await self._ready.join()
+
+        for task in self._tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        for q in (self._pending, self._ready):
+            while not q.empty():
+                frame = q.get_nowait()
+                if not frame.future.done():
+                    frame.future.cancel()
+
+        if self._own_executor:
+            # Waits for a frame still on the wire, off the event loop.
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                self._executor.shutdown,
+                True
+            )
+            self._executor = None
+            self._own_executor = False
+
+    def __len__(self):
+        # Nr. of frames that haven't been sent yet.
+        if self._pending is None:
+            return 0
+
+        return self._pending.qsize() + self._ready.qsize()
+
+    async def send(self, decode_type, data, nbits, repeat=kNoRepeat):
+        # Queue a message. (See IRsend.send())
+        #
+        # Returns:
+        #   A TransmitFrame, await it (or its future) to wait for the message
+        #   to be sent.
+        if not self._tasks:
+            self.start()
+
+        loop = asyncio.get_running_loop()
+        frame = TransmitFrame(decode_type, data, nbits, repeat, loop.create_future())
+        await self._pending.put(frame)
+        return frame
+
+    def airtime(self, decode_type, data, nbits, repeat=kNoRepeat):
+        # Get the nr. of uSeconds a message takes, gap included.
+        #
+        # Returns:
+        #   uSeconds, or None if the protocol can't be sent.
+        waveform = self._waveform(decode_type, data, nbits, repeat)
+        if waveform is None:
+            return None
+
+        return waveform.duration
+
+    def _waveform(self, decode_type, data, nbits, repeat):
+        with self._render_lock:
+            return self._renderer.waveform(decode_type, data, nbits, repeat)
+
+    async def _render(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            frame = await self._pending.get()
+            try:
+                if frame.future.done():  # Cancelled while waiting.
+                    continue
+
+                try:
+                    frame.waveform = await loop.run_in_executor(
+                        None,
+                        self._waveform,
+                        frame.decode_type,
+                        frame.data,
+                        frame.nbits,
+                        frame.repeat
+                    )
+                    if frame.waveform is None:
+                        raise ValueError(
+                            'protocol ' + str(frame.decode_type) + ' can not be sent'
+                        )
+                except Exception as err:  # NOQA
+                    # The frame can get cancelled while it is rendered.
+                    if not frame.future.done():
+                        frame.future.set_exception(err)
+                    continue
+
+                await self._ready.put(frame)
+            except asyncio.CancelledError:
+                # stop() without draining.
+                frame.future.cancel()
+                raise
+            finally:
+                self._pending.task_done()
+
+    async def _transmit(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            frame = await self._ready.get()
+            try:
+                if frame.future.done():
+                    continue
+
+                wait = self._next_start - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+                # A backend with a virtual clock gets the gap written to it.
+                realtime = self._irsend.get_backend().realtime
+
+                frame.started = loop.time()
+                try:
+                    await loop.run_in_executor(
+                        self._executor,
+                        self._irsend.send_waveform,
+                        frame.waveform,
+                        not realtime
+                    )
+                except Exception as err:  # NOQA
+                    if not frame.future.done():
+                        frame.future.set_exception(err)
+                    continue
+                finally:
+                    frame.finished = loop.time()
+
+                if realtime:
+                    gap = frame.waveform.gap or self._min_gap
+                    self._next_start = frame.finished + gap / 1e6
+
+                if not frame.future.done():
+                    frame.future.set_result(frame)
+            except asyncio.CancelledError:
+                frame.future.cancel()
+                raise
+            finally:
+                self._ready.task_done()
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+# IRsend output backends.
+#
+# IRsend.mark() & IRsend.space() hand the output to a backend.
+#
+#   LEDBackend:        Drives the LED through IRsend.led_on()/led_off() in real
+#                      time. (The default)
+#   RecordingBackend:  Appends (level, duration) pairs to a buffer under a
+#                      virtual clock. Nothing waits, a message is rendered at
+#                      memory speed.
+#
+#   backend = RecordingBackend()
+#   irsend = IRsend(None, backend=backend)
+#   irsend.sendNEC(0x20DF10EF)
+#   pairs = backend.finish()
+#
+# A backend also supplies the clock IRsend times messages with (mesg_time,
+# repeat windows), see IRsend.timer().
+
+from array import array
+
+from .IRtimer import micros, nanos, kDelay
+
+kLevelSpace = 0
+kLevelMark = 1
+
+# Nr. of (level, duration) pairs a RecordingBackend starts with.
+kRecordingSize = 512
+
+
+class OutputBackend(object):
+    # Base class of the backends.
+
+    frequency = 38000
+    duty = 50
+    # The output happens as it is written. A virtual clock backend doesn't
+    # see time pass between messages, so gaps have to be written to it.
+    realtime = True
+
+    def now(self):
+        # Get the time of the backend's clock in uSeconds.
+        raise NotImplementedError
+
+    def enable(self, frequency, duty):
+        # Set the modulation. Called by IRsend.enable_ir_out().
+        #
+        # Args:
+        #   frequency: Carrier frequency in Hz.
+        #   duty: Percentage duty cycle of the LED.
+        self.frequency = frequency
+        self.duty = duty
+
+    def mark(self, usec):
+        # Returns:
+        #   Nr. of pulses sent.
+        raise NotImplementedError
+
+    def space(self, usec):
+        raise NotImplementedError
+
+    def play(self, pairs):
+        # Output a rendered message. (IRwaveform.Waveform.pairs)
+        #
+        # Args:
+        #   pairs: level, duration, level, duration, ...
+        mark = self.mark
+        space = self.space
+
+        for index in range(0, len(pairs), 2):
+            if pairs[index] == kLevelMark:
+                mark(pairs[index + 1])
+            else:
+                space(pairs[index + 1])
+
+
+class BackendTimer(object):
+    # IRtimer on the clock of a backend.
+
+    def __init__(self, backend):
+        self._backend = backend
+        self.start = 0
+        self.reset()
+
+    def reset(self):
+        self.start = self._backend.now()
+
+    def elapsed(self):
+        return self._backend.now() - self.start
+
+
+class LEDBackend(OutputBackend):
+
+    def __init__(self, irsend, delay=None):
+        # Args:
+        #   irsend: The IRsend whose LED (led_on/led_off) is driven.
+        #   delay: The IRtimer.DelayEngine to wait with. (Def: IRtimer.kDelay)
+        self._irsend = irsend
+        self._delay = kDelay if delay is None else delay
+        # nanos() the last mark/space ends at.
+        self._deadline = None
+
+    def now(self):
+        return micros()
+
+    def _end(self, usec):
+        # Get the deadline of a mark/space that starts now.
+        #
+        # Back to back marks & spaces are timed from the deadline of the last
+        # one, so the time it takes to toggle the LED isn't added to every
+        # entry. Starting again after being idle is timed from now.
+        now = nanos()
+        start = self._deadline
+        if start is None or now - start > self._delay.spin_margin * 1000:
+            start = now
+
+        self._deadline = start + int(usec * 1000)
+        return start, self._deadline
+
+    def mark(self, usec):
+        # Modulate the IR LED for the given period (usec) and at the duty cycle set.
+        #
+        # Note:
+        #   The ESP8266 has no good way to do hardware PWM, so we have to do it all
+        #   in software. There is a horrible kludge/brilliant hack to use the second
+        #   serial TX line to do fairly accurate hardware PWM, but it is only
+        #   available on a single specific GPIO and only available on some modules.
+        #   e.g. It's not available on the ESP-01 module.
+        #   Hence, for greater compatibility & choice, we don't use that method.
+        # Ref:
+        #   https:#www.analysir.com/blog/2017/01/29/updated-esp8266-nodemcu-backdoor-upwm-hack-for-ir-signals/
+        irsend = self._irsend
+        until = self._delay.until
+        start, end = self._end(usec)
+
+        on_time = int(irsend.on_time_period * 1000)
+        period = on_time + int(irsend.off_time_period * 1000)
+
+        # Handle the simple case of no required frequency modulation.
+        # (or enable_ir_out() wasn't called)
+        if not irsend.modulation or irsend._dutycycle >= 100 or period <= 0:
+            irsend.led_on()
+            until(end)
+            irsend.led_off()
+            return 1
+
+        # Not simple, so do it assuming frequency modulation.
+        # Every pulse is timed from the start of the mark, so the time spent
+        # toggling the LED doesn't add up over the pulses.
+        counter = 0
+
+        while start < end:
+            irsend.led_on()
+            until(min(start + on_time, end))
+            irsend.led_off()
+            counter += 1
+
+            start += period
+            until(min(start, end))
+
+        return counter
+
+    def space(self, usec):
+        self._irsend.led_off()
+
+        if usec == 0:
+            return
+
+        _, end = self._end(usec)
+        self._delay.until(end)
+
+
+class RecordingBackend(OutputBackend):
+
+    realtime = False
+
+    def __init__(self, size=kRecordingSize):
+        # Args:
+        #   size: Nr. of (level, duration) pairs to allocate up front. The
+        #         buffer doubles when a message doesn't fit.
+        self._buffer = array('L', bytes(size * 2 * array('L').itemsize))
+        self._length = 0
+        self._clock = 0
+
+    def __len__(self):
+        # Nr. of recorded pairs.
+        return self._length // 2
+
+    def now(self):
+        return self._clock
+
+    def _add(self, level, usec):
+        usec = int(round(usec))
+        if usec <= 0:
+            return
+
+        self._clock += usec
+        buffer = self._buffer
+        length = self._length
+
+        # Back to back marks (or spaces) are a single longer one.
+        if length and buffer[length - 2] == level:
+            buffer[length - 1] += usec
+            return
+
+        if length == len(buffer):
+            buffer.extend(buffer)
+
+        buffer[length] = level
+        buffer[length + 1] = usec
+        self._length = length + 2
+
+    def mark(self, usec):
+        self._add(kLevelMark, usec)
+
+        if self.frequency <= 0 or self.duty >= 100:
+            return 1
+
+        # The nr. of carrier pulses a LED would have sent.
+        return max(int(usec * self.frequency // 1000000), 1)
+
+    def space(self, usec):
+        self._add(kLevelSpace, usec)
+
+    def play(self, pairs):
+        if len(pairs) < 2:
+            return
+
+        # The first pair may have to be merged with the recording so far,
+        # the rest alternates already.
+        self._add(pairs[0], pairs[1])
+
+        rest = array('L')
+        rest.frombytes(memoryview(pairs)[2:].cast('B'))
+        start = self._length
+        end = start + len(rest)
+
+        buffer = self._buffer
+        while end > len(buffer):
+            buffer.extend(buffer)
+
+        buffer[start:end] = rest
+        self._length = end
+        self._clock += sum(rest[1::2])
+
+    def reset(self):
+        # Drop the recording & restart the clock. The buffer is kept.
+        self._length = 0
+        self._clock = 0
+
+    def pairs(self):
+        # Get the recording so far.
+        #
+        # Returns:
+        #   An array('L') of level, duration, level, duration, ...
+        return self._buffer[:self._length]
+
+    def timings(self):
+        # Get the recording as alternating mark/space uSeconds, starting with
+        # the first mark. (The format of IRsend.send_raw())
+        start = 0
+        if self._length and self._buffer[0] == kLevelSpace:
+            start = 2
+
+        return self._buffer[start + 1:self._length:2]
+
+    def finish(self):
+        # Get the recording & start a new one.
+        #
+        # Returns:
+        #   See pairs().
+        pairs = self.pairs()
+        self.reset()
+        return pairs
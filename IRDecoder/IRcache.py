@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+# Decode cache.
+#
+# A receiver mostly sees the same few buttons over and over again. A
+# DecodeCache remembers the result of decoding a capture so the next capture
+# of the same button skips the decoders completely.
+#
+# The key of a capture is every entry snapped onto the time grid of the
+# protocol that decoded it. e.g. 560uSecs for the NEC family, so a 1690uSec
+# space becomes 3. An entry is only snapped if it is within half of the
+# tolerance of a grid point, captures with any entry that isn't close enough
+# don't use the cache at all. Two captures with the same key are within the
+# tolerance of each other, the only difference with a full decode is a capture
+# right at the edge of a decoder's tolerance window.
+#
+# Only results of real decoders are cached. decodeHash() (UNKNOWN) compares
+# the exact entries with each other, so those results are never stored. Each
+# entry keeps the name of the decode chain entry that decoded it, so a cache
+# hit still counts for that decoder. (IRrecv.setAdaptiveOrder)
+#
+# Usage:
+#   irrecv.setDecodeCache(DecodeCache(size=64))
+#
+# Changing the tolerance or the enabled protocols of the IRrecv clears it.
+
+import collections
+from array import array
+
+from .IRremoteESP8266 import *
+from .IRregistry import kRegistry
+
+
+# Default nr. of captures kept.
+kCacheSize = 128
+# Grid (in uSeconds) of a protocol that isn't in kCacheGrid.
+kCacheDefaultGrid = 50
+# Nr. of uSeconds marks are expected to be too long, and spaces too short.
+# (IRrecv.kMarkExcess)
+kCacheExcess = 50
+
+# uSeconds per unit of the timings of each protocol.
+kCacheGrid = {
+    NEC: 560,
+    NEC_LIKE: 560,
+    AIWA_RC_T501: 560,
+    SANYO_LC7461: 560,
+    CARRIER_AC: 560,
+    PIONEER: 534,
+    GICABLE: 550,
+    SAMSUNG: 560,
+    SAMSUNG36: 512,
+    LG: 550,
+    LG2: 500,
+    SONY: 600,
+    RC5: 889,
+    RC5X: 889,
+    RC6: 444,
+    JVC: 525,
+    PANASONIC: 432,
+    DENON: 432,
+    SHARP: 260,
+    COOLIX: 560,
+    MITSUBISHI: 300,
+    DAIKIN: 428,
+    WHYNTER: 750,
+}
+
+
+class DecodeCache(object):
+
+    def __init__(self, size=kCacheSize, tolerance=25, raw_tick=2):
+        # Args:
+        #   size: Max. nr. of captures to remember.
+        #   tolerance: Percentage tolerance used to decide if an entry is
+        #              close enough to a grid point. IRrecv.setDecodeCache()
+        #              sets this to the receiver's tolerance.
+        #   raw_tick: Nr. of uSeconds per capture tick. (kRawTick)
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._raw_tick = raw_tick
+        self._tolerance = tolerance
+        self._entries = collections.OrderedDict()
+        # rawlen -> the grids of the entries with that length.
+        self._grids = {}
+        # grid -> ticks -> grid units lookup tables.
+        self._tables = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def setTolerance(self, percent):
+        # The keys depend on the tolerance, so start over.
+        self._tolerance = percent
+        self._tables.clear()
+        self.invalidate()
+
+    def invalidate(self):
+        # Forget every cached capture. (The hit/miss counters are kept)
+        self._entries.clear()
+        self._grids.clear()
+
+    def resetStats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def _table(self, grid):
+        try:
+            return self._tables[grid]
+        except KeyError:
+            pass
+
+        # Every possible capture entry -> nr. of grid units, or -1 if it isn't
+        # close enough to a grid point.
+        margin = self._tolerance / 200.0
+        table = array('h', [-1]) * 65536
+
+        units = 1
+        while units * grid * (1.0 - margin) - kCacheExcess <= 65535 * self._raw_tick:
+            nominal = units * grid
+            spread = nominal * margin + kCacheExcess
+            low = max(-int(-(nominal - spread) // self._raw_tick), 0)
+            high = min(int((nominal + spread) // self._raw_tick), 65535)
+
+            for ticks in range(low, high + 1):
+                if table[ticks] == -1 and units < 0x8000:
+                    table[ticks] = units
+
+            units += 1
+
+        self._tables[grid] = table
+        return table
+
+    def _key(self, results, grid):
+        units = tuple(
+            map(self._table(grid).__getitem__, results.rawbuf[1:results.rawlen])
+        )
+        if -1 in units:
+            return None
+
+        return grid, units
+
+    def lookup(self, results):
+        # Fill in results from the cache.
+        #
+        # Returns:
+        #   The name of the decode chain entry that decoded the capture, or
+        #   None if it wasn't found.
+        for grid in self._grids.get(results.rawlen, ()):
+            key = self._key(results, grid)
+            if key is None:
+                continue
+
+            try:
+                value = self._entries[key]
+            except KeyError:
+                continue
+
+            self._entries.move_to_end(key)
+            (
+                results.decode_type,
+                results.value,
+                results.address,
+                results.command,
+                results.bits,
+                results.repeat,
+                state,
+                name
+            ) = value
+
+            if state is not None:
+                results.state[:len(state)] = state
+
+            self.hits += 1
+            return name
+
+        self.misses += 1
+        return None
+
+    def store(self, results, name):
+        # Remember a decoded capture.
+        #
+        # Args:
+        #   results: The decoded capture.
+        #   name: Name of the decode chain entry that decoded it.
+        if results.decode_type in (UNKNOWN, None) or self.size <= 0:
+            return
+
+        grid = kCacheGrid.get(results.decode_type, kCacheDefaultGrid)
+        key = self._key(results, grid)
+        if key is None:
+            return
+
+        state = None
+        if kRegistry.hasACState(results.decode_type):
+            state = bytes(results.state[:(results.bits + 7) // 8])
+
+        self._entries[key] = (
+            results.decode_type,
+            results.value,
+            results.address,
+            results.command,
+            results.bits,
+            results.repeat,
+            state,
+            name
+        )
+        self._entries.move_to_end(key)
+
+        grids = self._grids.setdefault(results.rawlen, [])
+        if grid not in grids:
+            grids.append(grid)
+
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
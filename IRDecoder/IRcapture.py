@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+# Binary capture log.
+#
+# An append only file of raw captures. All values are little endian.
+#
+#   Header:  magic 'IRCAP\0' (6 bytes), version (uint16), raw tick in uSeconds
+#            (uint16), reserved (uint16)
+#   Record:  timestamp in nano-Seconds (int64), receiver id (uint16),
+#            nr. of entries (uint16), the entries (uint16 each, in raw ticks,
+#            entry 0 is the gap before the message like rawbuf[0])
+#   Index:   (optional, written by CaptureWriter.close())
+#            the file offset of every record (uint64 each), followed by
+#            magic 'IRCAPIDX' (8 bytes), offset of the index (uint64) &
+#            nr. of records (uint64)
+#
+# CaptureReader maps the file into memory and gives out memoryview slices of
+# it, so captures go to the decoders without being copied into lists.
+#
+#   with CaptureReader('monday.ircap') as reader:
+#       for record, results in reader.decode(IRrecv(0)):
+#           ...
+
+import collections
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+
+
+kCaptureMagic = b'IRCAP\x00'
+kCaptureVersion = 1
+kCaptureIndexMagic = b'IRCAPIDX'
+
+_header = struct.Struct('<6sHHH')
+_record = struct.Struct('<qHH')
+_footer = struct.Struct('<8sQQ')
+
+# The entries can be handed out as they are stored.
+_native = sys.byteorder == 'little'
+
+
+CaptureRecord = collections.namedtuple(
+    'CaptureRecord',
+    ['timestamp', 'receiver', 'rawbuf']
+)
+
+
+class CaptureWriter(object):
+
+    def __init__(self, path, receiver=0, raw_tick=2, index=True):
+        # Open a capture log for appending. It gets created if needed.
+        #
+        # Args:
+        #   path: File name.
+        #   receiver: Default receiver id of the records.
+        #   raw_tick: Nr. of uSeconds per capture tick. (kRawTick)
+        #   index: Write an index block when closing.
+        self.receiver = receiver
+        self._index = index
+        self._offsets = array('Q')
+
+        self._file = open(path, 'a+b')
+        self._file.seek(0, os.SEEK_END)
+        size = self._file.tell()
+
+        if size == 0:
+            self.raw_tick = raw_tick
+            self._file.write(_header.pack(kCaptureMagic, kCaptureVersion, raw_tick, 0))
+        else:
+            self._file.seek(0)
+            magic, version, self.raw_tick, _ = _header.unpack(self._file.read(_header.size))
+            if magic != kCaptureMagic or version != kCaptureVersion:
+                raise ValueError(path + ' is not a capture log')
+
+            # Appending goes where the index is, it is rewritten on close. A
+            # record cut short (e.g. a crash while writing it) is dropped.
+            # When there is an index only the records after the last indexed
+            # one are walked.
+            offsets, end = _readIndex(self._file, size)
+            start = _header.size
+            if offsets:
+                start = offsets.pop()
+
+            tail, end = _scan(self._file, end, start)
+            offsets.extend(tail)
+            self._offsets = offsets
+
+            if end != size:
+                self._file.truncate(end)
+
+            self._file.seek(0, os.SEEK_END)
+
+    def write(self, rawbuf, rawlen=None, timestamp=None, receiver=None):
+        # Append a capture.
+        #
+        # Args:
+        #   rawbuf: The capture buffer. (ticks)
+        #   rawlen: Nr. of used entries in rawbuf. (Def: all of them)
+        #   timestamp: nano-Seconds since the epoch. (Def: now)
+        #   receiver: Receiver id. (Def: the writer's one)
+        if rawlen is None:
+            rawlen = len(rawbuf)
+
+        if rawlen > 0xFFFF:
+            raise ValueError('a record holds at most 65535 entries')
+
+        entries = array('H', rawbuf[:rawlen])
+        if not _native:
+            entries.byteswap()
+
+        if timestamp is None:
+            timestamp = time.time_ns()
+
+        if receiver is None:
+            receiver = self.receiver
+
+        self._offsets.append(self._file.tell())
+        self._file.write(_record.pack(timestamp, receiver, rawlen))
+        self._file.write(entries.tobytes())
+
+    def writeResults(self, results, timestamp=None, receiver=None):
+        # Append the capture of a decode_results.
+        self.write(results.rawbuf, results.rawlen, timestamp, receiver)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if self._file is None:
+            return
+
+        if self._index:
+            offsets = array('Q', self._offsets)
+            if not _native:
+                offsets.byteswap()
+
+            self._file.seek(0, os.SEEK_END)
+            start = self._file.tell()
+            self._file.write(offsets.tobytes())
+            self._file.write(_footer.pack(kCaptureIndexMagic, start, len(offsets)))
+
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+def _indexStart(f, size):
+    # Get where the records end. (The start of the index or the end of file)
+    if size < _header.size + _footer.size:
+        return size
+
+    f.seek(size - _footer.size)
+    magic, start, _ = _footer.unpack(f.read(_footer.size))
+    if magic != kCaptureIndexMagic:
+        return size
+
+    return start
+
+
+def _readIndex(f, size):
+    # Get the record offsets of the index.
+    #
+    # Returns:
+    #   The offsets (empty without an index) & where the records end.
+    end = _indexStart(f, size)
+    if end == size:
+        return array('Q'), size
+
+    f.seek(size - _footer.size)
+    _, _, count = _footer.unpack(f.read(_footer.size))
+    offsets = array('Q')
+    if end + count * 8 + _footer.size != size:
+        # Not written by close(), walk all of the records.
+        return offsets, end
+
+    f.seek(end)
+    offsets.frombytes(f.read(count * 8))
+    if not _native:
+        offsets.byteswap()
+
+    return offsets, end
+
+
+def _scan(f, end=None, offset=_header.size):
+    # Find the offsets of the records by walking the file. Only complete
+    # records are counted.
+    #
+    # Args:
+    #   end: Where the records end. (Def: the index or the end of the file)
+    #   offset: Where the first record to walk starts.
+    # Returns:
+    #   The offsets & where the last complete record ends.
+    f.seek(0, os.SEEK_END)
+    if end is None:
+        end = _indexStart(f, f.tell())
+
+    offsets = array('Q')
+    while offset + _record.size <= end:
+        f.seek(offset)
+        _, _, rawlen = _record.unpack(f.read(_record.size))
+        if offset + _record.size + rawlen * 2 > end:
+            break
+
+        offsets.append(offset)
+        offset += _record.size + rawlen * 2
+
+    return offsets, offset
+
+
+class CaptureReader(object):
+
+    def __init__(self, path):
+        # Open a capture log for reading.
+        #
+        # The rawbuf of every record is a memoryview into the file. They have
+        # to be released (or dropped) before the reader can be closed.
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        if size < _header.size:
+            raise ValueError(path + ' is not a capture log')
+
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+        magic, version, self.raw_tick, _ = _header.unpack_from(self._map, 0)
+        if magic != kCaptureMagic or version != kCaptureVersion:
+            self.close()
+            raise ValueError(path + ' is not a capture log')
+
+        magic = None
+        if size >= _header.size + _footer.size:
+            magic, start, count = _footer.unpack_from(self._map, size - _footer.size)
+
+        if magic == kCaptureIndexMagic:
+            offsets = self._view[start:start + count * 8]
+            if _native:
+                self._offsets = offsets.cast('Q')
+            else:
+                self._offsets = array('Q', offsets.tobytes())
+                self._offsets.byteswap()
+        else:
+            self._offsets, _ = _scan(self._file)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __getitem__(self, index):
+        offset = self._offsets[index]
+        timestamp, receiver, rawlen = _record.unpack_from(self._map, offset)
+        start = offset + _record.size
+        entries = self._view[start:start + rawlen * 2]
+
+        if _native:
+            rawbuf = entries.cast('H')
+        else:
+            rawbuf = array('H', entries.tobytes())
+            rawbuf.byteswap()
+
+        return CaptureRecord(timestamp, receiver, rawbuf)
+
+    def __iter__(self):
+        for index in range(len(self._offsets)):
+            yield self[index]
+
+    def records(self, start=None, end=None, receiver=None):
+        # Get the records in a time range (nano-Seconds, end not included)
+        # and/or of a single receiver.
+        for record in self:
+            if start is not None and record.timestamp < start:
+                continue
+            if end is not None and record.timestamp >= end:
+                continue
+            if receiver is not None and record.receiver != receiver:
+                continue
+
+            yield record
+
+    def decode(self, irrecv, **kwargs):
+        # Decode the records.
+        #
+        # Args:
+        #   irrecv: The IRrecv to decode with.
+        #   kwargs: Passed to records().
+        # Returns:
+        #   A generator of (CaptureRecord, decode_results) tuples.
+        for record in self.records(**kwargs):
+            yield record, irrecv.decodeRaw(record.rawbuf)
+
+    def close(self):
+        if self._map is None:
+            return
+
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        self._offsets = None
+        self._view.release()
+        try:
+            self._map.close()
+        except BufferError:
+            # Records are still in use, the map gets closed when they are gone.
+            pass
+
+        self._file.close()
+        self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+if __name__ == "__main__":
+    # Print a summary of a capture log.
+    # python -m IRDecoder.IRcapture <file>
+    from .IRrecv import IRrecv
+    from .IRutils import typeToString
+
+    counts = collections.Counter()
+    with CaptureReader(sys.argv[1]) as reader:
+        for record, results in reader.decode(IRrecv(0)):
+            counts[typeToString(results.decode_type)] += 1
+
+        # The views into the file have to be gone before it can be closed.
+        record = results = None
+
+    for name, count in counts.most_common():
+        print(name + ': ' + str(count))
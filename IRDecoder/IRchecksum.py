@@ -0,0 +1,436 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+# Checksums of A/C states.
+#
+# A protocol declares the sections of its state that are protected & the kind
+# of checksum each one has, once:
+#
+#   _checksum = kChecksums.register(HAIER_AC, ByteSum())
+#
+# Sections are like slices. start & end are byte offsets, at is the byte the
+# checksum is stored in. Negative values count from the end of the state, so
+# one declaration covers every length of a protocol.
+#
+# Kinds:
+#   ByteSum:        8-bit sum of the bytes.
+#   NibbleSum:      8-bit sum of the nibbles of the bytes.
+#   UpperNibbleSum: 4-bit sum of the nibbles, in the upper nibble of a byte.
+#   ReversedSum:    8-bit difference of the bit reversed bytes. (LSB first)
+#   XorSum:         XOR of the bytes.
+#   InvertedPairs:  Every 2nd byte is the inverse of the one before it.
+#   Crc8:           Table driven CRC-8. None of the protocols use one yet, it
+#                   is here for the ones that get ported with one.
+#
+# A protocol with a checksum of its own kind (e.g. Samsung A/C) subclasses
+# ChecksumSection next to the protocol & decorates it with
+# registerChecksumKind.
+#
+# validate_many() checks a lot of states (e.g. decode_results of stored
+# captures) at once. States of the same protocol & length are checked as a
+# NumPy matrix when NumPy is installed, a column at a time.
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .IRutils import reverseBits, sumBytes, sumNibbles, xorBytes
+
+# Kind name -> ChecksumSection subclass.
+kChecksumKinds = {}
+
+
+def registerChecksumKind(cls):
+    # Class decorator that makes a checksum kind known by its name.
+    kChecksumKinds[cls.kind] = cls
+    return cls
+
+
+class ChecksumSection(object):
+    kind = None
+
+    def __init__(self, start=0, end=-1, at=-1, init=0):
+        # Args:
+        #   start: First byte covered.
+        #   end: Byte after the last one covered. None is the end of the state.
+        #   at: Byte the checksum is stored in.
+        #   init: Starting value of the checksum.
+        self.start = start
+        self.end = end
+        self.at = at
+        self.init = init
+
+    def bounds(self, length):
+        # Get (start, end, at) for a state of length bytes.
+        start, end, _ = slice(self.start, self.end).indices(length)
+        at = self.at
+        if at is not None and at < 0:
+            at += length
+
+        return start, end, at
+
+    def calc(self, state, length=None):
+        # Calculate the checksum of a state.
+        #
+        # Args:
+        #   state: The bytes. (bytes, bytearray, array('B'), memoryview or a list)
+        #   length: Nr. of bytes of the state. (Def: all of them)
+        if length is None:
+            length = len(state)
+
+        start, end, _ = self.bounds(length)
+        return self._calc(state, start, end)
+
+    def _calc(self, state, start, end):
+        raise NotImplementedError
+
+    def valid(self, state, length=None):
+        if length is None:
+            length = len(state)
+
+        start, end, at = self.bounds(length)
+        if at < 0 or at >= length:
+            return False
+
+        return state[at] == self._calc(state, start, end)
+
+    def apply(self, state, length=None):
+        # Store the checksum in a state.
+        if length is None:
+            length = len(state)
+
+        start, end, at = self.bounds(length)
+        state[at] = self._calc(state, start, end)
+
+    def validMany(self, states):
+        # Check a matrix of states.
+        #
+        # Args:
+        #   states: A 2D numpy uint8 array, a state per row.
+        # Returns:
+        #   A numpy bool array.
+        start, end, at = self.bounds(states.shape[1])
+        if at < 0 or at >= states.shape[1]:
+            return np.zeros(len(states), dtype=bool)
+
+        return self._calcMany(states[:, start:end]) == states[:, at]
+
+    def _calcMany(self, data):
+        raise NotImplementedError
+
+
+@registerChecksumKind
+class ByteSum(ChecksumSection):
+    kind = 'sum'
+
+    def _calc(self, state, start, end):
+        return sumBytes(state[start:end], end - start, self.init)
+
+    def _calcMany(self, data):
+        return ((data.sum(axis=1, dtype=np.uint32) + self.init) & 0xFF).astype(np.uint8)
+
+
+@registerChecksumKind
+class NibbleSum(ChecksumSection):
+    kind = 'nibble'
+
+    def _calc(self, state, start, end):
+        return sumNibbles(state[start:end], end - start, self.init)
+
+    def _calcMany(self, data):
+        nibbles = (data >> 4).astype(np.uint32) + (data & 0xF)
+        return ((nibbles.sum(axis=1) + self.init) & 0xFF).astype(np.uint8)
+
+
+@registerChecksumKind
+class UpperNibbleSum(ChecksumSection):
+    # A 4-bit sum of the nibbles of the bytes & the lower nibble of the at
+    # byte, stored in the upper nibble of the at byte. (e.g. Daikin128)
+    kind = 'upper-nibble'
+
+    def calc(self, state, length=None):
+        if length is None:
+            length = len(state)
+
+        start, end, at = self.bounds(length)
+        return self._calcNibble(state, start, end, at)
+
+    def _calcNibble(self, state, start, end, at):
+        return sumNibbles(state[start:end], end - start, self.init + (state[at] & 0x0F)) & 0x0F
+
+    def valid(self, state, length=None):
+        if length is None:
+            length = len(state)
+
+        start, end, at = self.bounds(length)
+        if at < 0 or at >= length:
+            return False
+
+        return state[at] >> 4 == self._calcNibble(state, start, end, at)
+
+    def apply(self, state, length=None):
+        if length is None:
+            length = len(state)
+
+        start, end, at = self.bounds(length)
+        nibble = self._calcNibble(state, start, end, at)
+        state[at] = (state[at] & 0x0F) | (nibble << 4)
+
+    def validMany(self, states):
+        start, end, at = self.bounds(states.shape[1])
+        if at < 0 or at >= states.shape[1]:
+            return np.zeros(len(states), dtype=bool)
+
+        return self._calcNibbleMany(states, start, end, at) == states[:, at] >> 4
+
+    def _calcNibbleMany(self, states, start, end, at):
+        data = states[:, start:end]
+        nibbles = (data >> 4).astype(np.uint32) + (data & 0xF)
+        total = nibbles.sum(axis=1) + self.init + (states[:, at] & 0xF)
+        return (total & 0xF).astype(np.uint8)
+
+
+# Byte -> the byte with its bits reversed.
+_kReversed = bytes(reverseBits(value, 8) for value in range(256))
+
+
+@registerChecksumKind
+class ReversedSum(ChecksumSection):
+    # init minus the sum of the bytes, with the bits of the bytes & of the
+    # result reversed. A byte sum of a LSB first protocol. (e.g. Hitachi A/C)
+    kind = 'reversed'
+
+    def _calc(self, state, start, end):
+        total = self.init - sum(bytes(state[start:end]).translate(_kReversed))
+        return _kReversed[total & 0xFF]
+
+    def _calcMany(self, data):
+        table = np.frombuffer(_kReversed, dtype=np.uint8)
+        total = self.init - table[data].sum(axis=1, dtype=np.int64)
+        return table[total & 0xFF]
+
+
+@registerChecksumKind
+class XorSum(ChecksumSection):
+    kind = 'xor'
+
+    def _calc(self, state, start, end):
+        return xorBytes(state[start:end], end - start, self.init)
+
+    def _calcMany(self, data):
+        return np.bitwise_xor.reduce(data, axis=1, initial=self.init & 0xFF).astype(np.uint8)
+
+
+@registerChecksumKind
+class InvertedPairs(ChecksumSection):
+    # Every odd byte (from start) is the inverse of the byte before it.
+    # There is no checksum byte, at is ignored.
+    kind = 'inverted'
+
+    def __init__(self, start=0, end=None):
+        ChecksumSection.__init__(self, start, end, None)
+
+    def _calc(self, state, start, end):
+        return None
+
+    def valid(self, state, length=None):
+        if length is None:
+            length = len(state)
+
+        start, end, _ = self.bounds(length)
+        for index in range(start, end - 1, 2):
+            if state[index] ^ state[index + 1] != 0xFF:
+                return False
+
+        return True
+
+    def apply(self, state, length=None):
+        if length is None:
+            length = len(state)
+
+        start, end, _ = self.bounds(length)
+        for index in range(start, end - 1, 2):
+            state[index + 1] = state[index] ^ 0xFF
+
+    def validMany(self, states):
+        start, end, _ = self.bounds(states.shape[1])
+        # An even nr. of bytes.
+        end -= (end - start) % 2
+        data = states[:, start:end]
+        return ((data[:, 0::2] ^ data[:, 1::2]) == 0xFF).all(axis=1)
+
+
+@registerChecksumKind
+class Crc8(ChecksumSection):
+    kind = 'crc8'
+
+    def __init__(self, start=0, end=-1, at=-1, init=0, poly=0x07, xorout=0):
+        # Args:
+        #   poly: The CRC polynomial, MSB first.
+        #   xorout: Value the result is XORed with.
+        ChecksumSection.__init__(self, start, end, at, init)
+        self.poly = poly
+        self.xorout = xorout
+
+        table = []
+        for value in range(256):
+            for _ in range(8):
+                if value & 0x80:
+                    value = ((value << 1) ^ poly) & 0xFF
+                else:
+                    value = (value << 1) & 0xFF
+            table.append(value)
+
+        self.table = bytes(table)
+
+    def _calc(self, state, start, end):
+        table = self.table
+        crc = self.init
+        for index in range(start, end):
+            crc = table[crc ^ state[index]]
+
+        return crc ^ self.xorout
+
+    def _calcMany(self, data):
+        table = np.frombuffer(self.table, dtype=np.uint8)
+        crc = np.full(len(data), self.init, dtype=np.uint8)
+        # A byte (column) at a time, every state at once.
+        for column in range(data.shape[1]):
+            crc = table[crc ^ data[:, column]]
+
+        return crc ^ self.xorout
+
+
+class Checksum(object):
+
+    def __init__(self, *sections):
+        self.sections = sections
+
+    def calc(self, state, length=None):
+        # Calculate the checksum of the first section.
+        return self.sections[0].calc(state, length)
+
+    def valid(self, state, length=None):
+        for section in self.sections:
+            if not section.valid(state, length):
+                return False
+
+        return True
+
+    def apply(self, state, length=None):
+        # Store every checksum in a state. In order, so a section can cover
+        # the checksum of one before it.
+        for section in self.sections:
+            section.apply(state, length)
+
+    def validMany(self, states):
+        # Check states of the same length.
+        #
+        # Args:
+        #   states: A list of states or a 2D numpy uint8 array.
+        # Returns:
+        #   A list of bools.
+        if not len(states):
+            return []
+
+        if np is None:
+            return [self.valid(state) for state in states]
+
+        if isinstance(states, np.ndarray):
+            matrix = states
+        else:
+            # Joining the rows is a lot faster than np.asarray() of a list.
+            matrix = np.frombuffer(
+                b''.join(map(bytes, states)),
+                dtype=np.uint8
+            ).reshape(len(states), -1)
+
+        result = np.ones(len(matrix), dtype=bool)
+        for section in self.sections:
+            result &= section.validMany(matrix)
+
+        return result.tolist()
+
+
+class ChecksumRegistry(object):
+
+    def __init__(self):
+        # decode_type -> Checksum
+        self._checksums = {}
+
+    def register(self, decode_type, *sections):
+        # Declare the checksum sections of a protocol.
+        #
+        # Returns:
+        #   The Checksum.
+        checksum = Checksum(*sections)
+        self._checksums[decode_type] = checksum
+        return checksum
+
+    def get(self, decode_type):
+        return self._checksums.get(decode_type, None)
+
+    def protocols(self):
+        return list(self._checksums.keys())
+
+    def valid(self, decode_type, state, length=None):
+        # Returns:
+        #   None if the protocol has no checksum declared.
+        checksum = self._checksums.get(decode_type, None)
+        if checksum is None:
+            return None
+
+        return checksum.valid(state, length)
+
+    def validate_many(self, states, decode_type=None):
+        # Check a lot of states.
+        #
+        # Args:
+        #   states: decode_results instances (decode_type, state & bits are
+        #           used), or states of decode_type. (or a 2D numpy uint8
+        #           array of them)
+        #   decode_type: The protocol of the states when they aren't
+        #                decode_results.
+        # Returns:
+        #   A list with a bool for every state, None for the ones whose
+        #   protocol has no checksum declared.
+        if decode_type is not None and np is not None and isinstance(states, np.ndarray):
+            # Already a matrix of one length.
+            checksum = self._checksums.get(decode_type, None)
+            if checksum is None:
+                return [None] * len(states)
+
+            return checksum.validMany(states)
+
+        result = [None] * len(states)
+        groups = {}
+
+        for index, state in enumerate(states):
+            if decode_type is None:
+                protocol = state.decode_type
+                state = state.state[:state.bits // 8]
+            else:
+                protocol = decode_type
+
+            if protocol not in self._checksums:
+                continue
+
+            group = groups.setdefault((protocol, len(state)), ([], []))
+            group[0].append(index)
+            group[1].append(state)
+
+        for (protocol, _), (indexes, group) in groups.items():
+            checks = self._checksums[protocol].validMany(group)
+            for index, check in zip(indexes, checks):
+                result[index] = check
+
+        return result
+
+
+kChecksums = ChecksumRegistry()
+
+
+def validate_many(states, decode_type=None):
+    # See ChecksumRegistry.validate_many().
+    return kChecksums.validate_many(states, decode_type)
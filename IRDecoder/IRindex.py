@@ -0,0 +1,750 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+# Candidate index for IRrecv.decode()
+#
+# Rather than trying every decoder in turn for every capture, each decoder in
+# the chain declares the shape of the first mark/space pair it expects and the
+# minimum capture length it can possibly match. Captures are reduced to a key
+# of (rawlen bucket, quantized first mark, quantized first space) and the list
+# of decoders that can possibly fit that key is built once and then reused.
+#
+# The candidates for a key are always a filtered copy of kDecodeChain, so the
+# relative ordering rules documented below (e.g. Kelvinator before Gree) are
+# kept no matter which decoders end up being skipped.
+
+import warnings
+from bisect import bisect_right
+
+from .IRremoteESP8266 import *
+
+# Width (in capture ticks) of a single header quantization bucket.
+kIndexQuantum = 50
+# Extra percentage tolerance added on top of the decoder's own tolerance
+# when deciding if a header window overlaps a bucket. Being too wide only
+# costs a wasted decode attempt, being too narrow loses a valid match.
+kIndexToleranceSlack = 10
+# Errors that mean a decoder (or something it calls) isn't finished, rather
+# than the capture being bad. A decoder raising one is taken out of the chain.
+kUnfinishedErrors = (NameError, AttributeError, NotImplementedError)
+
+
+class DecodeCandidate(object):
+
+    def __init__(
+        self,
+        name,
+        method,
+        kwargs=None,
+        headers=None,
+        min_rawlen=0,
+        tolerance=None,
+        decode_type=None,
+        max_rawlen=None,
+        before=(),
+        after=()
+    ):
+        # A single entry in the decode chain.
+        #
+        # Args:
+        #   name: Human readable name of the decoder.
+        #   method: Name of the IRrecv method to call.
+        #   kwargs: Keyword arguments to pass to the method.
+        #   headers: A list of (mark, space) pairs in uSeconds that the first
+        #            entries of the capture can be. A value of None for either
+        #            the mark or the space matches anything.
+        #            None means this decoder can't be filtered on the header.
+        #   min_rawlen: Smallest rawlen the decoder could possibly accept.
+        #   tolerance: Percentage tolerance the decoder uses for the header.
+        #              None means the IRrecv class default.
+        #   decode_type: Override the decode_type after a successful decode.
+        #   max_rawlen: Largest rawlen of a complete message, or None if the
+        #               length isn't bounded. Used by IRstream to commit a
+        #               message without waiting for the timeout.
+        #   before: Names of the entries this one has to be tried before.
+        #   after: Names of the entries this one has to be tried after.
+        self.name = name
+        self.method = method
+        self.kwargs = kwargs or {}
+        self.headers = headers
+        self.min_rawlen = min_rawlen
+        self.tolerance = tolerance
+        self.decode_type = decode_type
+        self.max_rawlen = max_rawlen
+        self.before = tuple(before)
+        self.after = tuple(after)
+        # The exception that took the decoder out of the chain.
+        self.error = None
+
+    def decode(self, irrecv, results):
+        if self.error is not None:
+            return False
+
+        try:
+            matched = getattr(irrecv, self.method)(results, **self.kwargs)
+        except kUnfinishedErrors as err:
+            self.error = err
+            warnings.warn(
+                'decoder {0} is unavailable: {1!r}'.format(self.name, err),
+                RuntimeWarning,
+                stacklevel=2
+            )
+            return False
+
+        if matched:
+            if self.decode_type is not None:
+                results.decode_type = self.decode_type
+            return True
+
+        return False
+
+
+kDenonHeaders = [(3456, 1728), (260, None), (263, 789)]
+
+
+# The ordered decode chain.
+#
+# Header values are in uSeconds and mirror the kXxxHdrMark/kXxxHdrSpace (or
+# leader) constants of each protocol module. They are repeated here as plain
+# numbers so the index can be built without importing every protocol module.
+kDecodeChain = (
+    # Try decodeAiwaRCT501() before decodeSanyoLC7461() & decodeNEC()
+    # because the protocols are similar. This protocol is more specific than
+    # those ones, so should got before them.
+    DecodeCandidate(
+        'Aiwa RC T501', 'decodeAiwaRCT501',
+        headers=[(8960, 4480), (8960, 2240)],
+        min_rawlen=2 * kAiwaRcT501Bits,
+        max_rawlen=2 * kAiwaRcT501Bits + 4,
+        before=('Sanyo LC7461', 'NEC')
+    ),
+    # Try decodeSanyoLC7461() before decodeNEC() because the protocols are
+    # similar in timings & structure, but the Sanyo one is much longer than the
+    # NEC protocol (42 vs 32 bits) so this one should be tried first to try to
+    # reduce False detection as a NEC packet.
+    DecodeCandidate(
+        'Sanyo LC7461', 'decodeSanyoLC7461',
+        headers=[(9000, 4500)],
+        min_rawlen=2 * kSanyoLC7461Bits,
+        max_rawlen=2 * kSanyoLC7461Bits + 4,
+        before=('NEC',)
+    ),
+    # Try decodeCarrierAC() before decodeNEC() because the protocols are
+    # similar in timings & structure, but the Carrier one is much longer than the
+    # NEC protocol (3x32 bits vs 1x32 bits) so this one should be tried first to
+    # try to reduce False detection as a NEC packet.
+    DecodeCandidate(
+        'Carrier AC', 'decodeCarrierAC',
+        headers=[(8532, 4228)],
+        min_rawlen=2 * kCarrierAcBits,
+        max_rawlen=2 * kCarrierAcBits + 12,  # 3 messages
+        before=('NEC',)
+    ),
+    # Try decodePioneer() before decodeNEC() because the protocols are
+    # similar in timings & structure, but the Pioneer one is much longer than the
+    # NEC protocol (2x32 bits vs 1x32 bits) so this one should be tried first to
+    # try to reduce False detection as a NEC packet.
+    DecodeCandidate(
+        'Pioneer', 'decodePioneer',
+        headers=[(8544, 4272)],
+        min_rawlen=2 * kPioneerBits,
+        max_rawlen=2 * kPioneerBits + 8,  # 2 messages
+        before=('NEC',)
+    ),
+    DecodeCandidate(
+        'NEC', 'decodeNEC',
+        headers=[(8960, 4480), (8960, 2240)],
+        min_rawlen=4,  # kNecRptLength
+        max_rawlen=2 * kNECBits + 4
+    ),
+    DecodeCandidate(
+        'Sony', 'decodeSony',
+        headers=[(2400, None)],
+        min_rawlen=2 * kSonyMinBits,
+        max_rawlen=2 * kSony20Bits + 2  # No footer mark.
+    ),
+    DecodeCandidate(
+        'Mitsubishi', 'decodeMitsubishi',
+        headers=[(300, None)],  # No header, just a bit mark.
+        min_rawlen=2 * kMitsubishiBits,
+        max_rawlen=2 * kMitsubishiBits + 2
+    ),
+    DecodeCandidate(
+        'Mitsubishi AC', 'decodeMitsubishiAC',
+        headers=[(3400, 1750)],
+        min_rawlen=2 * kMitsubishiACBits,
+        max_rawlen=2 * kMitsubishiACBits + 4
+    ),
+    DecodeCandidate(
+        'Mitsubishi2', 'decodeMitsubishi2',
+        headers=[(8400, 4200)],
+        min_rawlen=2 * kMitsubishiBits
+    ),
+    DecodeCandidate(
+        'RC5', 'decodeRC5',
+        max_rawlen=2 * kRC5RawBits + 2
+    ),
+    DecodeCandidate(
+        'RC6', 'decodeRC6',
+        headers=[(2664, 888)],
+        max_rawlen=2 * kRC6_36Bits + 16
+    ),
+    DecodeCandidate(
+        'RC-MM', 'decodeRCMM',
+        headers=[(416, 277)],
+        max_rawlen=32 + 4  # 32 bit version, 2 bits per mark/space pair.
+    ),
+    # Fujitsu A/C needs to precede Panasonic and Denon as it has a short
+    # message which looks exactly the same as a Panasonic/Denon message.
+    DecodeCandidate(
+        'Fujitsu A/C', 'decodeFujitsuAC',
+        headers=[(3324, 1574)],
+        min_rawlen=2 * kFujitsuAcMinBits,
+        max_rawlen=2 * kFujitsuAcBits + 4,
+        before=('Panasonic', 'Denon (48-bit)', 'Denon', 'Denon (legacy)')
+    ),
+    # Denon needs to precede Panasonic as it is a special case of Panasonic.
+    # Denon messages are either Sharp (no header), Panasonic or the legacy
+    # Denon format.
+    DecodeCandidate(
+        'Denon (48-bit)', 'decodeDenon', dict(nbits=kDenon48Bits),
+        headers=kDenonHeaders,
+        max_rawlen=2 * kDenon48Bits + 4,
+        before=('Panasonic',)
+    ),
+    DecodeCandidate(
+        'Denon', 'decodeDenon', dict(nbits=kDenonBits),
+        headers=kDenonHeaders,
+        max_rawlen=2 * kDenonBits + 4,
+        before=('Panasonic',)
+    ),
+    DecodeCandidate(
+        'Denon (legacy)', 'decodeDenon', dict(nbits=kDenonLegacyBits),
+        headers=kDenonHeaders,
+        max_rawlen=2 * kDenonLegacyBits + 4,
+        before=('Panasonic',)
+    ),
+    DecodeCandidate(
+        'Panasonic', 'decodePanasonic',
+        headers=[(3456, 1728)],
+        min_rawlen=2 * kPanasonicBits,
+        max_rawlen=2 * kPanasonicBits + 4
+    ),
+    DecodeCandidate(
+        'LG (28-bit)', 'decodeLG', dict(nbits=kLgBits, strict=True),
+        headers=[(8500, 4250), (8500, 2250), (3200, 9850)],
+        min_rawlen=4,
+        max_rawlen=2 * kLgBits + 4
+    ),
+    # LG32 should be tried before Samsung
+    DecodeCandidate(
+        'LG (32-bit)', 'decodeLG', dict(nbits=kLg32Bits, strict=True),
+        headers=[(4500, 4450), (8950, 2250)],
+        min_rawlen=4,
+        max_rawlen=2 * kLg32Bits + 4,
+        before=('SAMSUNG',)
+    ),
+    # Note: Needs to happen before JVC decode, because it looks similar except
+    #       with a required NEC-like repeat code.
+    DecodeCandidate(
+        'GICable', 'decodeGICable',
+        headers=[(9000, 4400), (9000, 2200)],
+        min_rawlen=4,
+        max_rawlen=2 * kGicableBits + 8,  # Message + repeat.
+        before=('JVC',)
+    ),
+    DecodeCandidate(
+        'JVC', 'decodeJVC',
+        # Repeats have no header, so they start with a bit mark.
+        headers=[(8400, 4200), (525, None)],
+        min_rawlen=2 * kJvcBits,
+        max_rawlen=2 * kJvcBits + 4
+    ),
+    DecodeCandidate(
+        'SAMSUNG', 'decodeSAMSUNG',
+        headers=[(4480, 4480)],
+        min_rawlen=2 * kSamsungBits,
+        max_rawlen=2 * kSamsungBits + 4
+    ),
+    DecodeCandidate(
+        'Samsung36', 'decodeSamsung36',
+        headers=[(4480, 4480)],
+        min_rawlen=2 * kSamsung36Bits,
+        max_rawlen=2 * kSamsung36Bits + 6
+    ),
+    DecodeCandidate(
+        'Whynter', 'decodeWhynter',
+        headers=[(750, 750)],  # Leading bit mark + zero space.
+        min_rawlen=2 * kWhynterBits,
+        max_rawlen=2 * kWhynterBits + 6
+    ),
+    DecodeCandidate(
+        'DISH', 'decodeDISH',
+        headers=[(400, 6100)],
+        min_rawlen=2 * kDishBits,
+        max_rawlen=2 * kDishBits + 4
+    ),
+    DecodeCandidate(
+        'Sharp', 'decodeSharp',
+        headers=[(260, None)],  # No header, just a bit mark.
+        min_rawlen=2 * kSharpBits,
+        max_rawlen=2 * kSharpBits + 2
+    ),
+    DecodeCandidate(
+        'Coolix', 'decodeCOOLIX',
+        headers=[(4480, 4480)],
+        min_rawlen=2 * kCoolixBits,
+        max_rawlen=4 * kCoolixBits + 4  # Every byte is followed by its inverse.
+    ),
+    DecodeCandidate(
+        'Nikai', 'decodeNikai',
+        headers=[(4000, 4000)],
+        min_rawlen=2 * kNikaiBits,
+        max_rawlen=2 * kNikaiBits + 4
+    ),
+    # Kelvinator based-devices use a similar code to Gree ones, to avoid False
+    # matches this needs to happen before decodeGree().
+    DecodeCandidate(
+        'Kelvinator', 'decodeKelvinator',
+        headers=[(9010, 4505)],
+        min_rawlen=2 * kKelvinatorBits,
+        max_rawlen=2 * kKelvinatorBits + 24,
+        before=('Gree',)
+    ),
+    DecodeCandidate(
+        'Daikin', 'decodeDaikin',
+        headers=[(428, 428)],  # Starts with the zero header bits.
+        min_rawlen=2 * kDaikinBits,
+        tolerance=35,  # kDaikinTolerance
+        max_rawlen=2 * kDaikinBits + 24
+    ),
+    DecodeCandidate(
+        'Daikin2', 'decodeDaikin2',
+        headers=[(10024, 25180)],
+        min_rawlen=2 * kDaikin2Bits,
+        tolerance=30,  # kTolerance + kDaikin2Tolerance
+        max_rawlen=2 * kDaikin2Bits + 10
+    ),
+    DecodeCandidate(
+        'Daikin216', 'decodeDaikin216',
+        headers=[(3440, 1750)],
+        min_rawlen=2 * kDaikin216Bits,
+        max_rawlen=2 * kDaikin216Bits + 8
+    ),
+    DecodeCandidate(
+        'Toshiba AC', 'decodeToshibaAC',
+        headers=[(4400, 4300)],
+        min_rawlen=2 * kToshibaACBits,
+        max_rawlen=2 * kToshibaACBits + 4
+    ),
+    DecodeCandidate(
+        'Midea', 'decodeMidea',
+        headers=[(4480, 4480)],
+        min_rawlen=2 * kMideaBits,
+        tolerance=30,  # kMideaTolerance
+        max_rawlen=4 * kMideaBits + 8  # Message + inverted message.
+    ),
+    DecodeCandidate(
+        'Magiquest', 'decodeMagiQuest',
+        max_rawlen=2 * kMagiquestBits
+    ),
+    # NOTE: Disabled due to poor quality.
+    # The Sanyo S866500B decoder is very poor quality & depricated.
+    # *IF* you are going to enable it, do it near last to avoid False positive
+    # matches.
+    DecodeCandidate(
+        'Sanyo SA8650B', 'decodeSanyo',
+        headers=[(3500, 950)],
+        min_rawlen=2 * kSanyoSA8650BBits,
+        max_rawlen=2 * kSanyoSA8650BBits + 4
+    ),
+    # Some devices send NEC-like codes that don't follow the True NEC spec.
+    # This should detect those. e.g. Apple TV remote etc.
+    # This needs to be done after all other codes that use strict and some
+    # other protocols that are NEC-like as well, as turning off strict may
+    # cause this to match other valid protocols.
+    DecodeCandidate(
+        'NEC (non-strict)', 'decodeNEC', dict(nbits=kNECBits, strict=False),
+        headers=[(8960, 4480), (8960, 2240)],
+        min_rawlen=4,
+        decode_type=NEC_LIKE,
+        max_rawlen=2 * kNECBits + 4,
+        after=(
+            'Aiwa RC T501',
+            'Sanyo LC7461',
+            'Carrier AC',
+            'Pioneer',
+            'NEC',
+            'LG (32-bit)',
+            'GICable',
+            'Kelvinator'
+        )
+    ),
+    DecodeCandidate(
+        'Lasertag', 'decodeLasertag',
+        max_rawlen=2 * kLasertagBits + 1
+    ),
+    # Gree based-devices use a similar code to Kelvinator ones, to avoid False
+    # matches this needs to happen after decodeKelvinator().
+    DecodeCandidate(
+        'Gree', 'decodeGree',
+        headers=[(9000, 4500)],
+        min_rawlen=2 * kGreeBits,
+        max_rawlen=2 * kGreeBits + 12
+    ),
+    DecodeCandidate(
+        'Haier AC', 'decodeHaierAC',
+        headers=[(3000, 3000)],
+        min_rawlen=2 * kHaierACBits,
+        max_rawlen=2 * kHaierACBits + 6
+    ),
+    DecodeCandidate(
+        'Haier AC YR-W02', 'decodeHaierACYRW02',
+        headers=[(3000, 3000)],
+        min_rawlen=2 * kHaierACYRW02Bits,
+        max_rawlen=2 * kHaierACYRW02Bits + 6
+    ),
+    # HitachiAc424 should be checked before HitachiAC & HitachiAC2
+    DecodeCandidate(
+        'Hitachi AC 424', 'decodeHitachiAc424', dict(nbits=kHitachiAc424Bits),
+        headers=[(29784, 49290)],
+        min_rawlen=2 * kHitachiAc424Bits,
+        max_rawlen=2 * kHitachiAc424Bits + 6,
+        before=('Hitachi AC2', 'Hitachi AC')
+    ),
+    # HitachiAC2 should be checked before HitachiAC
+    DecodeCandidate(
+        'Hitachi AC2', 'decodeHitachiAC', dict(nbits=kHitachiAc2Bits),
+        headers=[(3300, 1700)],
+        min_rawlen=2 * kHitachiAc2Bits,
+        tolerance=30,  # kTolerance + 5
+        max_rawlen=2 * kHitachiAc2Bits + 4,
+        before=('Hitachi AC',)
+    ),
+    DecodeCandidate(
+        'Hitachi AC', 'decodeHitachiAC', dict(nbits=kHitachiAcBits),
+        headers=[(3300, 1700)],
+        min_rawlen=2 * kHitachiAcBits,
+        tolerance=30,  # kTolerance + 5
+        max_rawlen=2 * kHitachiAcBits + 4
+    ),
+    DecodeCandidate(
+        'Hitachi AC1', 'decodeHitachiAC', dict(nbits=kHitachiAc1Bits),
+        headers=[(3400, 3400)],
+        min_rawlen=2 * kHitachiAc1Bits,
+        tolerance=30,  # kTolerance + 5
+        max_rawlen=2 * kHitachiAc1Bits + 4
+    ),
+    DecodeCandidate(
+        'Whirlpool AC', 'decodeWhirlpoolAC',
+        headers=[(8950, 4484)],
+        min_rawlen=2 * kWhirlpoolAcBits,
+        max_rawlen=2 * kWhirlpoolAcBits + 12
+    ),
+    # Check the extended size first, as it should fail fast due to longer length.
+    DecodeCandidate(
+        'Samsung AC (extended)', 'decodeSamsungAC',
+        dict(nbits=kSamsungAcExtendedBits, strict=False),
+        headers=[(690, 17844)],
+        min_rawlen=2 * kSamsungAcExtendedBits,
+        max_rawlen=2 * kSamsungAcExtendedBits + 14,
+        before=('Samsung AC',)
+    ),
+    # Now check for the more common length.
+    DecodeCandidate(
+        'Samsung AC', 'decodeSamsungAC', dict(nbits=kSamsungAcBits),
+        headers=[(690, 17844)],
+        min_rawlen=2 * kSamsungAcBits,
+        max_rawlen=2 * kSamsungAcBits + 10
+    ),
+    DecodeCandidate(
+        'Electra AC', 'decodeElectraAC',
+        headers=[(9166, 4470)],
+        min_rawlen=2 * kElectraAcBits,
+        max_rawlen=2 * kElectraAcBits + 4
+    ),
+    DecodeCandidate(
+        'Panasonic AC', 'decodePanasonicAC',
+        headers=[(3456, 1728)],
+        min_rawlen=2 * kPanasonicAcBits,
+        tolerance=40,  # kPanasonicAcTolerance
+        max_rawlen=2 * kPanasonicAcBits + 8
+    ),
+    DecodeCandidate(
+        'Panasonic AC short', 'decodePanasonicAC',
+        dict(nbits=kPanasonicAcShortBits),
+        headers=[(3456, 1728)],
+        min_rawlen=2 * kPanasonicAcShortBits,
+        tolerance=40,  # kPanasonicAcTolerance
+        max_rawlen=2 * kPanasonicAcShortBits + 8
+    ),
+    DecodeCandidate(
+        'Lutron', 'decodeLutron',
+        max_rawlen=kLutronBits + 1  # Every entry is at least 1 bit.
+    ),
+    # MWM messages don't have a header, but they always start with a mark of
+    # 1 to 9 ticks of 417uSecs (+/- 150uSecs). They don't have a fixed length.
+    DecodeCandidate(
+        'MWM', 'decodeMWM',
+        headers=[(2085, None)],
+        tolerance=87
+    ),
+    DecodeCandidate(
+        'Vestel AC', 'decodeVestelAc',
+        headers=[(3110, 9066)],
+        min_rawlen=2 * kVestelAcBits,
+        tolerance=30,  # kVestelAcTolerance
+        max_rawlen=2 * kVestelAcBits + 4
+    ),
+    # Mitsubish112 and Tcl112 share the same decoder.
+    DecodeCandidate(
+        'Mitsubishi112/TCL112AC', 'decodeMitsubishi112',
+        headers=[(3450, 1696), (3000, 1650)],
+        min_rawlen=2 * kMitsubishi112Bits,
+        tolerance=31,  # kTolerance + kTcl112AcHdrMarkTolerance
+        max_rawlen=2 * kMitsubishi112Bits + 4
+    ),
+    DecodeCandidate(
+        'Teco', 'decodeTeco',
+        headers=[(9000, 4440)],
+        min_rawlen=2 * kTecoBits,
+        max_rawlen=2 * kTecoBits + 4
+    ),
+    DecodeCandidate(
+        'LEGOPF', 'decodeLegoPf',
+        headers=[(158, 1026)],
+        min_rawlen=2 * kLegoPfBits,
+        max_rawlen=2 * kLegoPfBits + 4
+    ),
+    DecodeCandidate(
+        'MITSUBISHIHEAVY (152 bit)', 'decodeMitsubishiHeavy',
+        dict(nbits=kMitsubishiHeavy152Bits),
+        headers=[(3140, 1630)],
+        min_rawlen=2 * kMitsubishiHeavy152Bits,
+        max_rawlen=2 * kMitsubishiHeavy152Bits + 4
+    ),
+    DecodeCandidate(
+        'MITSUBISHIHEAVY (88 bit)', 'decodeMitsubishiHeavy',
+        dict(nbits=kMitsubishiHeavy88Bits),
+        headers=[(3140, 1630)],
+        min_rawlen=2 * kMitsubishiHeavy88Bits,
+        max_rawlen=2 * kMitsubishiHeavy88Bits + 4
+    ),
+    DecodeCandidate(
+        'Argo', 'decodeArgo',
+        headers=[(6400, 3300)],
+        min_rawlen=2 * kArgoBits,
+        max_rawlen=2 * kArgoBits + 4
+    ),
+    DecodeCandidate(
+        'SHARP_AC', 'decodeSharpAc',
+        headers=[(3800, 1900)],
+        min_rawlen=2 * kSharpAcBits,
+        max_rawlen=2 * kSharpAcBits + 4
+    ),
+    DecodeCandidate(
+        'GOODWEATHER', 'decodeGoodweather',
+        headers=[(6820, 6820)],
+        min_rawlen=2 * kGoodweatherBits,
+        tolerance=37,  # kTolerance + kGoodweatherExtraTolerance
+        max_rawlen=4 * kGoodweatherBits + 8  # Every byte is followed by its inverse.
+    ),
+    DecodeCandidate(
+        'Inax', 'decodeInax',
+        headers=[(9000, 4500)],
+        min_rawlen=2 * kInaxBits,
+        max_rawlen=2 * kInaxBits + 4
+    ),
+    DecodeCandidate(
+        'Trotec', 'decodeTrotec',
+        headers=[(5952, 7364)],
+        min_rawlen=2 * kTrotecBits,
+        max_rawlen=2 * kTrotecBits + 4
+    ),
+    DecodeCandidate(
+        'Daikin160', 'decodeDaikin160',
+        headers=[(5000, 2145)],
+        min_rawlen=2 * kDaikin160Bits,
+        max_rawlen=2 * kDaikin160Bits + 8
+    ),
+    DecodeCandidate(
+        'Neoclima', 'decodeNeoclima',
+        headers=[(6112, 7391)],
+        min_rawlen=2 * kNeoclimaBits,
+        max_rawlen=2 * kNeoclimaBits + 4
+    ),
+    DecodeCandidate(
+        'Daikin176', 'decodeDaikin176',
+        headers=[(5070, 2140)],
+        min_rawlen=2 * kDaikin176Bits,
+        max_rawlen=2 * kDaikin176Bits + 8
+    ),
+    DecodeCandidate(
+        'Daikin128', 'decodeDaikin128',
+        headers=[(9800, 9800)],
+        min_rawlen=2 * kDaikin128Bits,
+        max_rawlen=2 * kDaikin128Bits + 8
+    ),
+    DecodeCandidate(
+        'Amcor', 'decodeAmcor',
+        headers=[(8200, 4200)],
+        min_rawlen=2 * kAmcorBits,
+        tolerance=40,  # kAmcorTolerance
+        max_rawlen=2 * kAmcorBits + 8
+    ),
+    DecodeCandidate(
+        'Daikin152', 'decodeDaikin152',
+        headers=[(433, 433)],  # Starts with the zero leader bits.
+        min_rawlen=2 * kDaikin152Bits,
+        max_rawlen=2 * kDaikin152Bits + 16
+    ),
+    DecodeCandidate(
+        'Mitsubishi136', 'decodeMitsubishi136',
+        headers=[(3324, 1474)],
+        min_rawlen=2 * kMitsubishi136Bits,
+        max_rawlen=2 * kMitsubishi136Bits + 4
+    ),
+)
+
+
+class DecodeIndex(object):
+
+    def __init__(self, irrecv, chain=kDecodeChain, raw_tick=2, excess=50):
+        # Build a candidate index over a decode chain.
+        #
+        # Args:
+        #   irrecv: The IRrecv instance the index is for. Its tolerance is used
+        #           to size the header windows.
+        #   chain: Ordered sequence of DecodeCandidate entries.
+        #   raw_tick: Capture tick to uSec factor. (kRawTick)
+        #   excess: Nr. of uSeconds marks are expected to be too long, and
+        #           spaces too short. (kMarkExcess)
+        self._irrecv = irrecv
+        self._chain = tuple(chain)
+        self._raw_tick = raw_tick
+        self._excess = excess
+        # Distinct min_rawlen values. The position of a rawlen in this list is
+        # its rawlen bucket.
+        self._thresholds = sorted(set(c.min_rawlen for c in self._chain))
+        self._windows = None
+        self._buckets = {}
+
+    @property
+    def chain(self):
+        return self._chain
+
+    def reset(self):
+        # Throw away every cached key. Needed when the tolerance changes.
+        self._windows = None
+        self._buckets.clear()
+
+    def _window(self, usecs, tolerance, is_mark):
+        # Calculate the (low, high) window in capture ticks for a header entry.
+        if usecs is None:
+            return None
+
+        if is_mark:
+            usecs += self._excess
+        else:
+            usecs -= self._excess
+
+        tolerance += kIndexToleranceSlack
+        low = self._irrecv.ticksLow(usecs, tolerance) // self._raw_tick
+        high = self._irrecv.ticksHigh(usecs, tolerance) // self._raw_tick + 1
+        return int(low), int(high)
+
+    def _build_windows(self):
+        windows = []
+        base_tolerance = self._irrecv.getTolerance()
+
+        for candidate in self._chain:
+            if candidate.headers is None:
+                windows.append(None)
+                continue
+
+            tolerance = base_tolerance
+            if candidate.tolerance is not None:
+                tolerance = max(tolerance, candidate.tolerance)
+
+            windows.append([
+                (
+                    self._window(mark, tolerance, True),
+                    self._window(space, tolerance, False)
+                )
+                for mark, space in candidate.headers
+            ])
+
+        self._windows = windows
+
+    @staticmethod
+    def _overlaps(window, bucket):
+        if window is None or bucket is None:
+            return True
+
+        low = bucket * kIndexQuantum
+        high = low + kIndexQuantum - 1
+        return window[0] <= high and window[1] >= low
+
+    def key(self, results):
+        # Reduce a capture to its index key.
+        rawlen = results.rawlen
+        rawlen_bucket = bisect_right(self._thresholds, rawlen)
+
+        if rawlen > 1:
+            mark_bucket = results.rawbuf[1] // kIndexQuantum
+        else:
+            mark_bucket = None
+
+        if rawlen > 2:
+            space_bucket = results.rawbuf[2] // kIndexQuantum
+        else:
+            space_bucket = None
+
+        return rawlen_bucket, mark_bucket, space_bucket
+
+    def candidates(self, results):
+        # Get the decoders that could possibly match a capture, in chain order.
+        return self._lookup(self.key(results))
+
+    def frameCandidates(self, results):
+        # Get the decoders whose header fits a capture, no matter how long the
+        # capture is (or will become), in chain order.
+        _, mark_bucket, space_bucket = self.key(results)
+        return self._lookup((None, mark_bucket, space_bucket))
+
+    def _lookup(self, key):
+        try:
+            return self._buckets[key]
+        except KeyError:
+            pass
+
+        if self._windows is None:
+            self._build_windows()
+
+        rawlen_bucket, mark_bucket, space_bucket = key
+        if rawlen_bucket is None:
+            max_min_rawlen = self._thresholds[-1]
+        else:
+            # Every min_rawlen at or below this capture's length.
+            max_min_rawlen = self._thresholds[rawlen_bucket - 1] if rawlen_bucket else -1
+
+        found = []
+        for candidate, windows in zip(self._chain, self._windows):
+            if candidate.min_rawlen > max_min_rawlen:
+                continue
+
+            if windows is not None:
+                for mark_window, space_window in windows:
+                    if (
+                        self._overlaps(mark_window, mark_bucket) and
+                        self._overlaps(space_window, space_bucket)
+                    ):
+                        break
+                else:
+                    continue
+
+            found.append(candidate)
+
+        found = tuple(found)
+        self._buckets[key] = found
+        return found
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+# LIRC mode2 reader.
+#
+# Reads the pulse/space text Linux receivers produce, from a file, a pipe or
+# a socket, and splits it into captures IRrecv can decode:
+#
+#   mode2:   "pulse 9024", "space 4512", "timeout 126000"
+#   ir-ctl:  "+9024 -4512 +576 ..." & "# timeout 126000"
+#
+# Other lines ("Using driver ...", "code: ...") are skipped.
+#
+#   proc = subprocess.Popen(['mode2', '-d', '/dev/lirc0'], stdout=PIPE)
+#   for results in LircReader(proc.stdout).decode(IRrecv(0)):
+#       ...
+#
+# The text is read in blocks & picked apart with a single regular expression
+# per block, there is no str made per line. A message ends at a timeout
+# record or at a space of at least the timeout, the same as IRrecv. Durations
+# are stored as kRawTick ticks, entry 0 of a capture is the gap before it.
+
+import re
+from array import array
+
+from .IRremoteESP8266 import *
+from .IRrecv import *
+from .IRstream import kMaxRawEntry
+
+# Nr. of bytes read at a time.
+kLircReadSize = 65536
+
+_kRecord = re.compile(rb'(pulse|space|timeout|[+-])[ \t]*(\d+)')
+
+# First byte of a record type to its level.
+_kPulse = 1
+_kSpace = 0
+_kTimeout = 2
+_kLevels = {
+    ord('p'): _kPulse,
+    ord('+'): _kPulse,
+    ord('s'): _kSpace,
+    ord('-'): _kSpace,
+    ord('t'): _kTimeout
+}
+
+
+def _blockReader(source):
+    # Get a function that reads a block of bytes from source, b'' at the end.
+    if hasattr(source, 'recv'):  # A socket.
+        return source.recv
+
+    # read1() returns what is there instead of waiting for a full block, so a
+    # pipe is handed out as the receiver produces it.
+    if hasattr(source, 'read1'):
+        return source.read1
+
+    if hasattr(source, 'buffer'):  # A text mode file.
+        return _blockReader(source.buffer)
+
+    return source.read
+
+
+class LircReader(object):
+
+    def __init__(self, source, timeout=None, raw_tick=kRawTick, read_size=kLircReadSize):
+        # Args:
+        #   source: A file name, a file like object (read1() or read()) or a
+        #           socket (recv()).
+        #   timeout: Nr. of milli-Seconds of space that ends a message.
+        #            (Def: kTimeoutMs)
+        #   raw_tick: Nr. of uSeconds per capture tick. (kRawTick)
+        #   read_size: Nr. of bytes to read at a time.
+        if timeout is None:
+            timeout = kTimeoutMs
+
+        self._own_file = isinstance(source, str)
+        if self._own_file:
+            source = open(source, 'rb')
+
+        self._source = source
+        self._read = _blockReader(source)
+        self._timeout = MS_TO_USEC(timeout) // raw_tick
+        self._raw_tick = raw_tick
+        self._read_size = read_size
+        # Nr. of records & captures seen so far.
+        self.records = 0
+        self.frames = 0
+
+    def __iter__(self):
+        return self.captures()
+
+    def _blocks(self):
+        # Blocks of whole records. A block is cut at its last line end (or
+        # before its last ir-ctl record), the rest goes in front of the next
+        # one.
+        read = self._read
+        size = self._read_size
+        rest = b''
+
+        while True:
+            block = read(size)
+            if not block:
+                break
+
+            cut = block.rfind(b'\n')
+            if cut < 0:
+                cut = max(block.rfind(b' +'), block.rfind(b' -'))
+            if cut < 0:
+                rest += block
+                continue
+
+            yield rest + block[:cut]
+            rest = block[cut:]
+
+        if rest:
+            yield rest
+
+    def captures(self):
+        # Read the source until it ends.
+        #
+        # Returns:
+        #   A generator of capture buffers. (array('H'), see IRrecv.decodeRaw())
+        raw_tick = self._raw_tick
+        timeout = self._timeout
+        levels = _kLevels
+        findall = _kRecord.findall
+
+        rawbuf = array('H', [0])
+        # Level of the last entry of rawbuf. The gap is a space.
+        last = _kSpace
+
+        for block in self._blocks():
+            records = findall(block)
+            self.records += len(records)
+
+            for kind, value in records:
+                level = levels[kind[0]]
+                ticks = int(value) // raw_tick
+
+                if level == _kPulse:
+                    if last == _kPulse:  # Back to back pulses are one.
+                        rawbuf[-1] = min(rawbuf[-1] + ticks, kMaxRawEntry)
+                    else:
+                        rawbuf.append(min(ticks, kMaxRawEntry))
+                        last = _kPulse
+                    continue
+
+                if len(rawbuf) == 1:  # Still the gap before a message.
+                    rawbuf[0] = min(rawbuf[0] + ticks, kMaxRawEntry)
+                    continue
+
+                if last == _kSpace:
+                    ticks += rawbuf.pop()
+
+                if level == _kTimeout or ticks >= timeout:
+                    self.frames += 1
+                    yield rawbuf
+                    rawbuf = array('H', [min(ticks, kMaxRawEntry)])
+                else:
+                    rawbuf.append(min(ticks, kMaxRawEntry))
+                last = _kSpace
+
+        if len(rawbuf) > 1:
+            if last == _kSpace:
+                rawbuf.pop()
+
+            self.frames += 1
+            yield rawbuf
+
+    def decode(self, irrecv):
+        # Decode the captures as they are read.
+        #
+        # Args:
+        #   irrecv: The IRrecv to decode with.
+        # Returns:
+        #   A generator of decode_results. decode_type is UNKNOWN for a
+        #   capture nothing matched.
+        for rawbuf in self.captures():
+            yield irrecv.decodeRaw(rawbuf)
+
+    def close(self):
+        if self._own_file:
+            self._source.close()
+            self._own_file = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+# Carrier modulated sample renderer.
+#
+# IRsend (& IRbackend.RecordingBackend) produce the envelope of a message,
+# marks & spaces. Outputs like an audio jack emitter or a DMA driven GPIO
+# buffer need the modulated carrier itself, sampled at a fixed rate. A
+# CarrierRenderer turns the envelope into those samples with NumPy, a chunk at
+# a time, without a Python loop per carrier cycle.
+#
+#   backend = RecordingBackend()
+#   IRsend(None, backend=backend).sendHitachiAc424(state)
+#   renderer = CarrierRenderer.fromOutput(backend, sample_rate=192000)
+#   for chunk in renderer.chunks(backend.timings()):
+#       stream.write(chunk.tobytes())
+#
+# Every mark starts with the carrier on, like IRsend.mark() does.
+#
+# Requires NumPy.
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .IRbackend import kLevelSpace
+
+# Default nr. of samples per second.
+kSampleRate = 1000000
+# Default nr. of samples per chunk.
+kChunkSize = 65536
+
+
+def pairTimings(pairs):
+    # Get alternating mark/space uSeconds, starting with a mark, from
+    # (level, duration) pairs. (IRwaveform.Waveform.pairs)
+    pairs = np.asarray(pairs)
+    if len(pairs) and pairs[0] == kLevelSpace:
+        pairs = pairs[2:]
+
+    return pairs[1::2]
+
+
+class CarrierRenderer(object):
+
+    def __init__(
+        self,
+        sample_rate=kSampleRate,
+        frequency=38000,
+        duty=50,
+        high=1,
+        low=0,
+        dtype='uint8'
+    ):
+        # Args:
+        #   sample_rate: Nr. of samples per second.
+        #   frequency: Carrier frequency in Hz. (< 1000 means kHz)
+        #   duty: Percentage of a carrier cycle the output is high.
+        #   high: Sample value of the carrier being on.
+        #   low: Sample value of the carrier being off & of spaces.
+        #   dtype: NumPy dtype of the samples.
+        if np is None:
+            raise ImportError('CarrierRenderer requires numpy')
+
+        if frequency < 1000:  # Were we given kHz?
+            frequency *= 1000
+
+        self.sample_rate = sample_rate
+        self.frequency = frequency
+        self.duty = min(max(duty, 0), 100)
+        self.high = high
+        self.low = low
+        self.dtype = np.dtype(dtype)
+
+    @classmethod
+    def fromOutput(cls, output, sample_rate=kSampleRate, **kwargs):
+        # Make a renderer with the frequency & duty cycle that
+        # IRsend.enable_ir_out() set on a backend (or a Waveform).
+        return cls(sample_rate, output.frequency, output.duty, **kwargs)
+
+    def _edges(self, timings):
+        # Sample index of the end of every mark & space.
+        durations = np.asarray(timings, dtype=np.float64)
+        return np.rint(np.cumsum(durations) * (self.sample_rate / 1e6)).astype(np.int64)
+
+    def nsamples(self, timings):
+        # Get the nr. of samples of a message.
+        edges = self._edges(timings)
+        if not len(edges):
+            return 0
+
+        return int(edges[-1])
+
+    def chunks(self, timings, chunk_size=kChunkSize):
+        # Render a message a chunk at a time.
+        #
+        # Args:
+        #   timings: Alternating mark/space uSeconds, starting with a mark.
+        #            (RecordingBackend.timings(), pairTimings())
+        #   chunk_size: Nr. of samples per chunk. The last one can be shorter.
+        # Returns:
+        #   A generator of NumPy arrays.
+        edges = self._edges(timings)
+        if not len(edges):
+            return
+
+        starts = np.concatenate(([0], edges[:-1]))
+        total = int(edges[-1])
+        # Carrier cycles per sample.
+        step = self.frequency / float(self.sample_rate)
+        on = self.duty / 100.0
+
+        high = np.asarray(self.high, dtype=self.dtype)
+        low = np.asarray(self.low, dtype=self.dtype)
+
+        for first in range(0, total, chunk_size):
+            index = np.arange(first, min(first + chunk_size, total), dtype=np.int64)
+
+            # The mark/space each sample is in, even ones are marks.
+            entry = np.searchsorted(edges, index, side='right')
+            is_mark = (entry & 1) == 0
+
+            # Position within the carrier cycle, from the start of the mark.
+            phase = ((index - starts[entry]) * step) % 1.0
+
+            yield np.where(is_mark & (phase < on), high, low)
+
+    def render(self, timings):
+        # Render a whole message.
+        #
+        # Returns:
+        #   A NumPy array.
+        parts = list(self.chunks(timings))
+        if not parts:
+            return np.zeros(0, dtype=self.dtype)
+
+        return np.concatenate(parts)
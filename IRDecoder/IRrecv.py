@@ -5,8 +5,19 @@
 # Copyright 2015 Sebastien Warin
 # Copyright 2017 David Conran
 
+import collections
+import concurrent.futures
+import os
+from array import array
+
 from .IRremoteESP8266 import *
 from .IRutils import *
+from .IRindex import DecodeIndex
+from .IRcache import DecodeCache
+from .IRregistry import kRegistry, adaptiveOrder
+from .IRrepeat import RepeatClassifier
+from .IRtiming import TimingTable, byteTable, tickWindow
+from .IRtrace import kTraceAttempt, kTraceDecoded, kTraceFail, kTraceMatch
 
 ONCE = 0
 
@@ -63,6 +74,17 @@ kStateSizeMax = kHitachiAc2StateLength
 # Types
 # information for the interrupt handler
 class irparams_t(object):
+    __slots__ = (
+        'recvpin',
+        'rcvstate',
+        'timer',
+        'bufsize',
+        'rawbuf',
+        'rawlen',
+        'overflow',
+        'timeout'
+    )
+
     def __init__(self):
         self.recvpin = None   # pin for IR data from detector
         self.rcvstate = None  # state machine
@@ -76,9 +98,16 @@ class irparams_t(object):
         self.timeout = None   # Nr. of milliSeconds before we give up.
 
 
+def rawBuffer(bufsize):
+    # Allocate a zeroed capture buffer. One unsigned 16 bit entry per
+    # mark/space, the same as the uint16_t rawbuf[] of the C++ library.
+    return array('H', bytes(bufsize * 2))
+
+
 # results from a data match
 class match_result_t(object):
-  
+    __slots__ = ('success', 'data', 'used')
+
     def __init__(self):
         self.success = False   # Was the match successful?
         self.data = None  # The data found.
@@ -89,7 +118,19 @@ class match_result_t(object):
 
 # Results returned from the decoder
 class decode_results(object):
-  
+    __slots__ = (
+        'decode_type',
+        'value',
+        'address',
+        'command',
+        'state',
+        'bits',
+        'rawbuf',
+        'rawlen',
+        'overflow',
+        'repeat'
+    )
+
     def __init__(self):
         self.decode_type = None  # NEC, SONY, RC5, UNKNOWN
         # value, address, & command are all mutually exclusive with state.
@@ -98,7 +139,9 @@ class decode_results(object):
         self.value = None    # Decoded value
         self.address = None  # Decoded device address.
         self.command = None  # Decoded command.
-        self.state = [0x0] * kStateSizeMax  # Multi-byte results.
+        # Multi-byte results. A decoder can fill a part of it in place through
+        # memoryview(results.state)[pos:pos + nbytes]
+        self.state = bytearray(kStateSizeMax)
         self.bits = None              # Number of bits in decoded value
         self.rawbuf = None  # Raw intervals in .5 us ticks
         self.rawlen = None            # Number of records in rawbuf.
@@ -106,10 +149,66 @@ class decode_results(object):
         self.repeat = False  # Is the result a repeat code?
 
 
+# Batch decoding (IRrecv.decode_many) helpers.
+# Each worker process builds its own IRrecv once, so the candidate index and
+# the timing tables are only ever compiled once per worker. It gets the
+# settings of the IRrecv decode_many() was called on. The repeat fast path is
+# off in the workers, repeat frames depend on the message before them so they
+# are recognized in order by the calling process.
+_batch_irrecv = None
+
+
+def _batchInit(tolerance, unknown_threshold, protocols, order, cache_size):
+    global _batch_irrecv
+
+    _batch_irrecv = IRrecv(0)
+    _batch_irrecv.setTolerance(tolerance)
+    _batch_irrecv.setUnknownThreshold(unknown_threshold)
+    _batch_irrecv.setRepeatFastPath(False)
+    _batch_irrecv.setProtocols(protocols)
+    _batch_irrecv._useChain(order)
+
+    if cache_size is not None:
+        _batch_irrecv.setDecodeCache(DecodeCache(size=cache_size))
+
+    byteTable(True)
+    byteTable(False)
+
+
+def _batchChunks(rawbufs, chunksize):
+    # Pack the captures as compact unsigned 16 bit arrays.
+    chunk = []
+    for rawbuf in rawbufs:
+        chunk.append(array('H', rawbuf).tobytes())
+
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def _batchDecode(chunk):
+    # Returns:
+    #   A list of (name of the decode chain entry that decoded it or None,
+    #   decode_results) tuples.
+    hits = _batch_irrecv._hits
+    output = []
+    for packed in chunk:
+        rawbuf = array('H')
+        rawbuf.frombytes(packed)
+        hits.clear()
+        results = _batch_irrecv.decodeRaw(rawbuf)
+        output.append((next(iter(hits), None), results))
+
+    return output
+
+
 # main class for receiving IR
 class IRrecv(object):
 
-    def __init__(self, recvpin, bufsize=kRawBuf, timeout=kTimeoutMs, save_buffer=False):  # Constructor 
+    def __init__(self, recvpin, bufsize=kRawBuf, timeout=kTimeoutMs, save_buffer=False, swap_buffers=False):  # Constructor 
         # Class constructor
         # Args:
         #   recvpin: GPIO pin the IR receiver module's data pin is connected to.
@@ -117,6 +216,11 @@ class IRrecv(object):
         #   timeout: Nr. of milli-Seconds of no signal before we stop capturing data.
         #            (Default: kTimeoutMs)
         #   save_buffer: Use a second (save) buffer to decode from. (Default: False)
+        #   swap_buffers: When using a save buffer, swap the capture & save
+        #                 buffers instead of copying the capture into the save
+        #                 buffer. The results of the previous decode() then get
+        #                 overwritten by the capture after the next one.
+        #                 (Default: False)
         #   timer_num: Which ESP32 timer number to use? ESP32 only, otherwise unused.
         #              (Range: 0-3. Default: kDefaultESP32Timer)
         # Returns:
@@ -128,26 +232,182 @@ class IRrecv(object):
         # Ensure we are going to be able to store all possible values in the
         # capture buffer.
         self.irparams.timeout = min(timeout, kMaxTimeoutMs)
-        self.irparams.rawbuf = [0x0] * bufsize
+        self.irparams.rawbuf = rawBuffer(bufsize)
 
         # If we have been asked to use a save buffer (for decoding), then create one.
         if save_buffer:
             self.irparams_save = irparams_t()
-            self.irparams_save.rawbuf = [0x0] * bufsize
+            self.irparams_save.bufsize = bufsize
+            self.irparams_save.rawbuf = rawBuffer(bufsize)
             # Check we allocated the memory successfully.
         else:
             self.irparams_save = None
 
+        self._swap_buffers = swap_buffers
+
         self._unknown_threshold = kUnknownThreshold
         self._tolerance = kTolerance
+        self._decode_index = DecodeIndex(
+            self,
+            chain=kRegistry.chain(),
+            raw_tick=kRawTick,
+            excess=kMarkExcess
+        )
+        # Compiled tick windows & timing tables. See IRtiming.
+        self._windows = {}
+        self._timings = {}
+        # Trace sink (See IRtrace) & the decoder currently being tried.
+        self._trace = None
+        self._trace_protocol = None
+        # Decode cache. See IRcache.
+        self._cache = None
+        self._protocols = None
+        # Repeat frame fast path. See IRrepeat.
+        self._repeats = RepeatClassifier(repeat_value=kRepeat)
+        # Nr. of messages each decode chain entry decoded & the adaptive
+        # ordering settings. (interval, decay)
+        self._hits = collections.Counter()
+        self._adaptive = None
+        self._adaptive_count = 0
 
     def setTolerance(self, percent=kTolerance):
         # Set the base tolerance percentage for matching incoming IR messages.
         self._tolerance = min(percent, 100)
+        # The candidate header windows depend on the tolerance.
+        self._decode_index.reset()
+
+        if self._cache is not None:
+            self._cache.setTolerance(self._tolerance)
     
     def getTolerance(self):
         # Get the base tolerance percentage for matching incoming IR messages.
         return self._tolerance
+
+    def setTrace(self, sink=None):
+        # Set the IRtrace.TraceSink decode events are sent to.
+        # None turns tracing off.
+        self._trace = sink
+        self._trace_protocol = None
+
+    def getTrace(self):
+        return self._trace
+
+    def setProtocols(self, protocols=None):
+        # Only try the decoders of some protocols.
+        #
+        # Args:
+        #   protocols: An iterable of decode_type_t values. None enables every
+        #              protocol.
+        if protocols is not None:
+            protocols = tuple(protocols)
+
+        self._protocols = protocols
+        chain = kRegistry.chain(protocols)
+
+        if self._repeats is not None:
+            self._repeats.setProtocols(protocols)
+
+        if self._adaptive is not None:
+            chain = adaptiveOrder(chain, self._hits)
+
+        self._decode_index = DecodeIndex(
+            self,
+            chain=chain,
+            raw_tick=kRawTick,
+            excess=kMarkExcess
+        )
+
+        if self._cache is not None:
+            self._cache.invalidate()
+
+    def setDecodeCache(self, cache=None):
+        # Set the IRcache.DecodeCache to check before running the decoders.
+        # None turns caching off. The cache isn't used while tracing.
+        if cache is not None:
+            cache.setTolerance(self._tolerance)
+
+        self._cache = cache
+
+    def getDecodeCache(self):
+        return self._cache
+
+    def setAdaptiveOrder(self, interval=256, decay=0.5):
+        # Reorder the decode chain by how often each decoder matches.
+        # Decoders only move where the before/after constraints of the chain
+        # (e.g. Kelvinator before Gree) allow it.
+        #
+        # Args:
+        #   interval: Reorder after this many decoded messages. None or 0
+        #             turns adaptive ordering off & restores the default order.
+        #   decay: Multiply the hit counters by this after every reorder so
+        #          recent hits count more. 1.0 never forgets.
+        if interval:
+            self._adaptive = (interval, decay)
+            self._adaptive_count = 0
+            self.reorderChain()
+        else:
+            self._adaptive = None
+            self.setProtocols(self._protocols)
+
+    def reorderChain(self):
+        # Put the decoders with the most hits first.
+        chain = self._decode_index.chain
+        ordered = adaptiveOrder(chain, self._hits)
+
+        if ordered != chain:
+            self._decode_index = DecodeIndex(
+                self,
+                chain=ordered,
+                raw_tick=kRawTick,
+                excess=kMarkExcess
+            )
+
+    def _useChain(self, order):
+        # Put the decode chain in the order of a list of entry names.
+        # (e.g. the names of the chain of another IRrecv)
+        positions = dict((name, pos) for pos, name in enumerate(order))
+        chain = self._decode_index.chain
+        ordered = tuple(sorted(
+            chain,
+            key=lambda candidate: positions.get(candidate.name, len(positions))
+        ))
+
+        if ordered != chain:
+            self._decode_index = DecodeIndex(
+                self,
+                chain=ordered,
+                raw_tick=kRawTick,
+                excess=kMarkExcess
+            )
+
+    def _adaptiveUpdate(self):
+        self._adaptive_count = 0
+        self.reorderChain()
+
+        decay = self._adaptive[1]
+        for name in self._hits:
+            self._hits[name] *= decay
+
+    def getDecodeStats(self):
+        # Get the hit counters. A dict of decode chain entry name -> hits,
+        # that can be saved (e.g. as JSON) & given to loadDecodeStats().
+        return dict(self._hits)
+
+    def loadDecodeStats(self, stats):
+        # Replace the hit counters, e.g. with ones saved at the last run.
+        self._hits = collections.Counter(stats)
+        if self._adaptive is not None:
+            self.reorderChain()
+
+    def setRepeatFastPath(self, enable=True):
+        # Recognize repeat frames (e.g. NEC's) before running the decoders.
+        # On by default.
+        if enable:
+            if self._repeats is None:
+                self._repeats = RepeatClassifier(repeat_value=kRepeat)
+                self._repeats.setProtocols(self._protocols)
+        else:
+            self._repeats = None
     
     def decode(self, results, save=None):
         # Decodes the received IR message.
@@ -181,11 +441,20 @@ class IRrecv(object):
         if save is None:
             save = self.irparams_save
 
-        if not save.rawbuf:
+        if save is None or not save.rawbuf:
             # We haven't been asked to copy it so use the existing memory.
             results.rawbuf = self.irparams.rawbuf
             results.rawlen = self.irparams.rawlen
             results.overflow = self.irparams.overflow
+        elif self._swap_buffers:
+            # Hand the capture buffer to the save state & capture into the
+            # old save buffer. Nothing gets copied.
+            self.swapIrParams(self.irparams, save)
+
+            # Point the results at the saved copy.
+            results.rawbuf = save.rawbuf
+            results.rawlen = save.rawlen
+            results.overflow = save.overflow
         else:
             self.copyIrParams(self.irparams, save)  # Duplicate the interrupt's memory.
 
@@ -194,343 +463,219 @@ class IRrecv(object):
             results.rawlen = save.rawlen
             results.overflow = save.overflow
 
-        # Reset any previously partially processed results.
-        results.decode_type = UNKNOWN
-        results.bits = 0
-        results.value = 0
-        results.address = 0
-        results.command = 0
-        results.repeat = False
-
-        print("Attempting Aiwa RC T501 decode")
-        # Try decodeAiwaRCT501() before decodeSanyoLC7461() & decodeNEC()
-        # because the protocols are similar. This protocol is more specific than
-        # those ones, so should got before them.
-        if self.decodeAiwaRCT501(results):
-            return True
-
-        print("Attempting Sanyo LC7461 decode")
-        # Try decodeSanyoLC7461() before decodeNEC() because the protocols are
-        # similar in timings & structure, but the Sanyo one is much longer than the
-        # NEC protocol (42 vs 32 bits) so this one should be tried first to try to
-        # reduce False detection as a NEC packet.
-        if self.decodeSanyoLC7461(results):
-            return True
-
-        print("Attempting Carrier AC decode")
-        # Try decodeCarrierAC() before decodeNEC() because the protocols are
-        # similar in timings & structure, but the Carrier one is much longer than the
-        # NEC protocol (3x32 bits vs 1x32 bits) so this one should be tried first to
-        # try to reduce False detection as a NEC packet.
-        if self.decodeCarrierAC(results):
-            return True
-
-        print("Attempting Pioneer decode")
-        # Try decodePioneer() before decodeNEC() because the protocols are
-        # similar in timings & structure, but the Pioneer one is much longer than the
-        # NEC protocol (2x32 bits vs 1x32 bits) so this one should be tried first to
-        # try to reduce False detection as a NEC packet.
-        if self.decodePioneer(results):
-            return True
+        return self._decode(results)
 
-        print("Attempting NEC decode")
-        if self.decodeNEC(results):
-            return True
-
-        print("Attempting Sony decode")
-        if self.decodeSony(results):
-            return True
-
-        print("Attempting Mitsubishi decode")
-        if self.decodeMitsubishi(results):
-            return True
-
-        print("Attempting Mitsubishi AC decode")
-        if self.decodeMitsubishiAC(results):
-            return True
-        print("Attempting Mitsubishi2 decode")
-
-        if self.decodeMitsubishi2(results):
-            return True
-
-        print("Attempting RC5 decode")
-        if self.decodeRC5(results):
-            return True
-
-        print("Attempting RC6 decode")
-        if self.decodeRC6(results):
-            return True
-
-        print("Attempting RC-MM decode")
-        if self.decodeRCMM(results):
-            return True
-
-        # Fujitsu A/C needs to precede Panasonic and Denon as it has a short
-        # message which looks exactly the same as a Panasonic/Denon message.
-        print("Attempting Fujitsu A/C decode")
-        if self.decodeFujitsuAC(results):
-            return True
-
-        # Denon needs to precede Panasonic as it is a special case of Panasonic.
-        print("Attempting Denon decode")
-        if (
-            self.decodeDenon(results, kDenon48Bits) or
-            self.decodeDenon(results, kDenonBits) or
-            self.decodeDenon(results, kDenonLegacyBits)
-        ):
-            return True
-
-        print("Attempting Panasonic decode")
-        if self.decodePanasonic(results):
-            return True
-
-        print("Attempting LG (28-bit) decode")
-        if self.decodeLG(results, kLgBits, True):
-            return True
-
-        print("Attempting LG (32-bit) decode")
-        # LG32 should be tried before Samsung
-        if self.decodeLG(results, kLg32Bits, True):
-            return True
-
-        # Note: Needs to happen before JVC decode, because it looks similar except
-        #       with a required NEC-like repeat code.
-        print("Attempting GICable decode")
-        if self.decodeGICable(results):
-            return True
-
-        print("Attempting JVC decode")
-        if self.decodeJVC(results):
-            return True
-
-        print("Attempting SAMSUNG decode")
-        if self.decodeSAMSUNG(results):
-            return True
-
-        print("Attempting Samsung36 decode")
-        if self.decodeSamsung36(results):
-            return True
-
-        print("Attempting Whynter decode")
-        if self.decodeWhynter(results):
-            return True
-
-        print("Attempting DISH decode")
-        if self.decodeDISH(results):
-            return True
-
-        print("Attempting Sharp decode")
-        if self.decodeSharp(results):
-            return True
-
-        print("Attempting Coolix decode")
-        if self.decodeCOOLIX(results):
-            return True
-
-        print("Attempting Nikai decode")
-        if self.decodeNikai(results):
-            return True
-
-        # Kelvinator based-devices use a similar code to Gree ones, to avoid False
-        # matches this needs to happen before decodeGree().
-        print("Attempting Kelvinator decode")
-        if self.decodeKelvinator(results):
-            return True
-
-        print("Attempting Daikin decode")
-        if self.decodeDaikin(results):
-            return True
-
-        print("Attempting Daikin2 decode")
-        if self.decodeDaikin2(results):
-            return True
-
-        print("Attempting Daikin216 decode")
-        if self.decodeDaikin216(results):
-            return True
-
-        print("Attempting Toshiba AC decode")
-        if self.decodeToshibaAC(results):
-            return True
-
-        print("Attempting Midea decode")
-        if self.decodeMidea(results):
-            return True
-
-        print("Attempting Magiquest decode")
-        if self.decodeMagiQuest(results):
-            return True
-
-        # NOTE: Disabled due to poor quality.
-        # The Sanyo S866500B decoder is very poor quality & depricated.
-        # *IF* you are going to enable it, do it near last to avoid False positive
-        # matches.
-        print("Attempting Sanyo SA8650B decode")
-        if self.decodeSanyo(results):
-            return True
-
-        # Some devices send NEC-like codes that don't follow the True NEC spec.
-        # This should detect those. e.g. Apple TV remote etc.
-        # This needs to be done after all other codes that use strict and some
-        # other protocols that are NEC-like as well, as turning off strict may
-        # cause this to match other valid protocols.
-        print("Attempting NEC (non-strict) decode")
-        if self.decodeNEC(results, kNECBits, False):
-            results.decode_type = NEC_LIKE
-            return True
-
-        print("Attempting Lasertag decode")
-        if self.decodeLasertag(results):
-            return True
-
-        # Gree based-devices use a similar code to Kelvinator ones, to avoid False
-        # matches this needs to happen after decodeKelvinator().
-        print("Attempting Gree decode")
-        if self.decodeGree(results):
-            return True
-
-        print("Attempting Haier AC decode")
-        if self.decodeHaierAC(results):
-            return True
-
-        print("Attempting Haier AC YR-W02 decode")
-        if self.decodeHaierACYRW02(results):
-            return True
-
-        # HitachiAc424 should be checked before HitachiAC & HitachiAC2
-        print("Attempting Hitachi AC 424 decode")
-        if self.decodeHitachiAc424(results, kHitachiAc424Bits):
-            return True
-
-        # HitachiAC2 should be checked before HitachiAC
-        print("Attempting Hitachi AC2 decode")
-        if self.decodeHitachiAC(results, kHitachiAc2Bits):
-            return True
-
-        print("Attempting Hitachi AC decode")
-        if self.decodeHitachiAC(results, kHitachiAcBits):
-            return True
-
-        print("Attempting Hitachi AC1 decode")
-        if self.decodeHitachiAC(results, kHitachiAc1Bits):
-            return True
-
-        print("Attempting Whirlpool AC decode")
-        if self.decodeWhirlpoolAC(results):
-            return True
-
-        print("Attempting Samsung AC (extended) decode")
-        # Check the extended size first, as it should fail fast due to longer length.
-        if self.decodeSamsungAC(results, kSamsungAcExtendedBits, False):
-            return True
-
-        # Now check for the more common length.
-        print("Attempting Samsung AC decode")
-        if self.decodeSamsungAC(results, kSamsungAcBits):
-            return True
-
-        print("Attempting Electra AC decode")
-        if self.decodeElectraAC(results):
-            return True
-
-        print("Attempting Panasonic AC decode")
-        if self.decodePanasonicAC(results):
-            return True
-
-        print("Attempting Panasonic AC short decode")
-        if self.decodePanasonicAC(results, kPanasonicAcShortBits):
-            return True
-
-        print("Attempting Lutron decode")
-        if self.decodeLutron(results):
-            return True
-
-        print("Attempting MWM decode")
-        if self.decodeMWM(results):
-            return True
-
-        print("Attempting Vestel AC decode")
-        if self.decodeVestelAc(results):
+    def _decode(self, results):
+        # Run the decoders over a capture that is already in results.
+        #
+        # Args:
+        #   results:  A decode_results with rawbuf & rawlen set.
+        # Returns:
+        #   A boolean indicating if the message was decoded or not.
+        if self._decodeMessage(results):
             return True
 
-        # Mitsubish112 and Tcl112 share the same decoder.
-        print("Attempting Mitsubishi112/TCL112AC decode")
-        if self.decodeMitsubishi112(results):
-            return True
+        # A repeat frame after this isn't one of the message before it.
+        if self._repeats is not None:
+            self._repeats.reset()
 
-        print("Attempting Teco decode")
-        if self.decodeTeco(results):
+        # Typically new protocols are added to IRindex.kDecodeChain.
+        # decodeHash returns a hash on any input.
+        # Thus, it needs to be last in the list.
+        # If you add any decodes, add them before this.
+        if self.decodeHash(results):
             return True
 
-        print("Attempting LEGOPF decode")
-        if self.decodeLegoPf(results):
-            return True
+        # Throw away and start over
+        return False
 
-        print("Attempting MITSUBISHIHEAVY (152 bit) decode")
-        if self.decodeMitsubishiHeavy(results, kMitsubishiHeavy152Bits):
-            return True
+    def _decodeMessage(self, results, accept=None):
+        # Recognize a capture with the repeat fast path, the decode cache &
+        # the decode chain. (Everything but decodeHash())
+        #
+        # Args:
+        #   results:  A decode_results with rawbuf & rawlen set.
+        #   accept:  A function that is given the name of the decode chain
+        #            entry that matched, None for a repeat frame. When it
+        #            returns False the match is dropped without being counted,
+        #            cached or remembered as the last message. (IRstream)
+        # Returns:
+        #   True if the message was decoded (& accepted).
+
+        # Repeat frames get the protocol & address of the last message.
+        repeats = self._repeats
+        if repeats is not None and repeats.classify(self, results):
+            return accept is None or accept(None)
+
+        cache = self._cache
+        if cache is not None and self._trace is None:
+            name = cache.lookup(results)
+            if name is not None:
+                if accept is not None and not accept(name):
+                    return False
+
+                self._countHit(name)
+                if repeats is not None:
+                    repeats.update(results)
+                return True
+        else:
+            cache = None
 
-        print("Attempting MITSUBISHIHEAVY (88 bit) decode")
-        if self.decodeMitsubishiHeavy(results, kMitsubishiHeavy88Bits):
-            return True
+        # Only try the decoders that could possibly match this capture.
+        # See IRindex.kDecodeChain for the order & the reasons for it.
+        candidates = self._decode_index.candidates(results)
+        candidate = self.decodeCandidates(results, candidates)
+        if candidate is None:
+            return False
 
-        print("Attempting Argo decode")
-        if self.decodeArgo(results):
-            return True
+        if accept is not None and not accept(candidate.name):
+            return False
 
-        print("Attempting SHARP_AC decode")
-        if self.decodeSharpAc(results):
-            return True
+        self._countHit(candidate.name)
+        if cache is not None:
+            cache.store(results, candidate.name)
+        if repeats is not None:
+            repeats.update(results)
+        return True
 
-        print("Attempting GOODWEATHER decode")
-        if self.decodeGoodweather(results):
-            return True
+    def decodeCandidates(self, results, candidates):
+        # Try a sequence of decoders (IRindex.DecodeCandidate) in order.
+        # The hit counters aren't updated, see _decodeMessage().
+        #
+        # Args:
+        #   results:  A decode_results with rawbuf & rawlen set.
+        #   candidates:  The decoders to try.
+        # Returns:
+        #   The DecodeCandidate that decoded the message, or None.
 
-        print("Attempting Inax decode")
-        if self.decodeInax(results):
-            return True
+        # Reset any previously partially processed results.
+        results.decode_type = UNKNOWN
+        results.bits = 0
+        results.value = 0
+        results.address = 0
+        results.command = 0
+        results.repeat = False
 
-        print("Attempting Trotec decode")
-        if self.decodeTrotec(results):
-            return True
+        for candidate in candidates:
+            if self._trace is not None:
+                self._trace_protocol = candidate.name
+                self._trace.emit(kTraceAttempt, candidate.name, offset=results.rawlen)
 
-        print("Attempting Daikin160 decode")
-        if self.decodeDaikin160(results):
-            return True
+            if candidate.decode(self, results):
+                if self._trace is not None:
+                    self._trace.emit(kTraceDecoded, candidate.name, offset=results.rawlen)
 
-        print("Attempting Neoclima decode")
-        if self.decodeNeoclima(results):
-            return True
+                return candidate
 
-        print("Attempting Daikin176 decode")
-        if self.decodeDaikin176(results):
-            return True
+        return None
 
-        print("Attempting Daikin128 decode")
-        if self.decodeDaikin128(results):
-            return True
+    def _countHit(self, name):
+        # Count a message decoded by a decode chain entry, either by running
+        # it or from the decode cache.
+        self._hits[name] += 1
+        if self._adaptive is not None:
+            self._adaptive_count += 1
+            if self._adaptive_count >= self._adaptive[0]:
+                self._adaptiveUpdate()
 
-        print("Attempting Amcor decode")
-        if self.decodeAmcor(results):
-            return True
+    def decodeRaw(self, rawbuf, rawlen=None):
+        # Decode a capture that didn't come from this receiver's irparams.
+        #
+        # Args:
+        #   rawbuf:  Capture buffer in kRawTick ticks. Entry 0 is the gap before
+        #            the message, like irparams.rawbuf.
+        #   rawlen:  Nr. of used entries in rawbuf. (Def: len(rawbuf))
+        # Returns:
+        #   A decode_results instance. decode_type is UNKNOWN if nothing matched.
+        results = decode_results()
+        results.rawbuf = rawbuf
+        results.rawlen = len(rawbuf) if rawlen is None else rawlen
+        results.overflow = False
 
-        print("Attempting Daikin152 decode")
-        if self.decodeDaikin152(results):
-            return True
+        if not self._decode(results):
+            results.decode_type = UNKNOWN
 
-        print("Attempting Mitsubishi136 decode")
-        if self.decodeMitsubishi136(results):
-            return True
+        return results
 
-        # Typically new protocols are added above this line.
-        # decodeHash returns a hash on any input.
-        # Thus, it needs to be last in the list.
-        # If you add any decodes, add them before this.
-        if self.decodeHash(results):
-            return True
+    def decode_many(self, rawbufs, workers=None, chunksize=256):
+        # Decode a lot of captures, spreading them over a pool of processes.
+        # Results are yielded in the same order as the captures, & are the
+        # same as decodeRaw() of every capture in turn.
+        #
+        # The workers use the tolerance, unknown threshold, enabled protocols
+        # & decode chain order of this IRrecv at the time of the call, and a
+        # decode cache of the same size if it has one. Repeat frames are
+        # recognized here, in order, as the results come back. The hit
+        # counters of this IRrecv count the worker decodes.
+        #
+        # Args:
+        #   rawbufs:  An iterable of capture buffers. See decodeRaw().
+        #             Entries have to fit in an unsigned 16 bit integer.
+        #   workers:  Nr. of worker processes. (Def: os.cpu_count())
+        #             1 decodes in this process.
+        #   chunksize:  Nr. of captures sent to a worker at a time.
+        # Returns:
+        #   A generator of decode_results instances.
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        if workers <= 1:
+            for rawbuf in rawbufs:
+                yield self.decodeRaw(rawbuf)
+            return
+
+        cache_size = None if self._cache is None else self._cache.size
+        initargs = (
+            self._tolerance,
+            self._unknown_threshold,
+            self._protocols,
+            tuple(candidate.name for candidate in self._decode_index.chain),
+            cache_size
+        )
 
-        # Throw away and start over
-        return False
+        # Only keep a couple of chunks per worker in flight so an endless
+        # iterable doesn't get read into memory all at once.
+        max_pending = workers * 2
+        pending = collections.deque()
+
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_batchInit,
+            initargs=initargs
+        ) as executor:
+            for chunk in _batchChunks(rawbufs, chunksize):
+                pending.append(executor.submit(_batchDecode, chunk))
+
+                while len(pending) >= max_pending:
+                    for results in self._batchResults(pending.popleft().result()):
+                        yield results
+
+            while pending:
+                for results in self._batchResults(pending.popleft().result()):
+                    yield results
+
+    def _batchResults(self, output):
+        # Finish the worker results of a chunk the way _decode() would have.
+        repeats = self._repeats
+
+        for name, results in output:
+            if repeats is not None:
+                # The worker decoded the capture without knowing the message
+                # before it, so start from clean results.
+                repeat = decode_results()
+                repeat.rawbuf = results.rawbuf
+                repeat.rawlen = results.rawlen
+                repeat.overflow = results.overflow
+                if repeats.classify(self, repeat):
+                    yield repeat
+                    continue
+
+                repeats.update(results)
+
+            if name is not None:
+                self._countHit(name)
+
+            yield results
 
     def getBufSize(self):
         # Obtain the maximum number of entries possible in the capture buffer.
@@ -541,6 +686,51 @@ class IRrecv(object):
         # Set the minimum length we will consider for reporting UNKNOWN message types.
         self._unknown_threshold = length
     
+    def _window(self, usecs, tolerance=kUseDefTol, delta=0):
+        # Get the (cached) integer window of capture ticks for a period.
+        key = (usecs, self._validTolerance(tolerance), delta)
+        try:
+            return self._windows[key]
+        except KeyError:
+            window = tickWindow(usecs, key[1], delta, kRawTick)
+            self._windows[key] = window
+            return window
+
+    def compileTiming(
+        self,
+        onemark,
+        onespace,
+        zeromark,
+        zerospace,
+        tolerance=kUseDefTol,
+        excess=kMarkExcess
+    ):
+        # Get the (cached) compiled timing table for a set of bit timings.
+        #
+        # Args:
+        #   onemark:   Nr. of uSeconds in an expected mark signal for a '1' bit.
+        #   onespace:  Nr. of uSeconds in an expected space signal for a '1' bit.
+        #   zeromark:  Nr. of uSeconds in an expected mark signal for a '0' bit.
+        #   zerospace: Nr. of uSeconds in an expected space signal for a '0' bit.
+        #   tolerance: Percentage error margin to allow. (Def: kUseDefTol)
+        #   excess:  Nr. of useconds. (Def: kMarkExcess)
+        # Returns:
+        #   A TimingTable instance.
+        key = (
+            onemark,
+            onespace,
+            zeromark,
+            zerospace,
+            self._validTolerance(tolerance),
+            excess
+        )
+        try:
+            return self._timings[key]
+        except KeyError:
+            table = TimingTable(*key, raw_tick=kRawTick)
+            self._timings[key] = table
+            return table
+
     def match(self, measured, desired, tolerance=kUseDefTol, delta=0):
         # Check if we match a pulse(measured) with the desired within
         # +/-tolerance percent and/or +/- a fixed delta range.
@@ -553,14 +743,20 @@ class IRrecv(object):
         #
         # Returns:
         #   Boolean: True if it matches, False if it doesn't.
-        measured *= kRawTick  # Convert to uSecs.
-        print("Matching: ")
-        print(self.ticksLow(desired, tolerance, delta))
-        print(" <= ")
-        print(measured)
-        print(" <= ")
-        print(self.ticksHigh(desired, tolerance, delta))
-    
+        low, high = self._window(desired, tolerance, delta)
+        matched = low <= measured <= high
+
+        if self._trace is not None:
+            self._trace.emit(
+                kTraceMatch,
+                self._trace_protocol,
+                measured=measured,
+                window=(low, high),
+                matched=matched
+            )
+
+        return matched
+
     def matchMark(self, measured, desired, tolerance=kUseDefTol, excess=kMarkExcess):
         # Check if we match a mark signal(measured) with the desired within
         # +/-tolerance percent, after an expected is excess is added.
@@ -573,15 +769,8 @@ class IRrecv(object):
         #
         # Returns:
         #   Boolean: True if it matches, False if it doesn't.
-        print("Matching MARK ")
-        print(measured * kRawTick)
-        print(" vs ")
-        print(desired)
-        print(" + ")
-        print(excess)
-        print(". ")
         return self.match(measured, desired + excess, tolerance)
-    
+
     def matchSpace(self, measured, desired, tolerance=kUseDefTol, excess=kMarkExcess):
         # Check if we match a space signal(measured) with the desired within
         # +/-tolerance percent, after an expected is excess is removed.
@@ -594,13 +783,6 @@ class IRrecv(object):
         #
         # Returns:
         #   Boolean: True if it matches, False if it doesn't.
-        print("Matching SPACE ")
-        print(measured * kRawTick)
-        print(" vs ")
-        print(desired)
-        print(" - ")
-        print(excess)
-        print(". ")
         return self.match(measured, desired - excess, tolerance)
 
     # These are called by decode
@@ -611,7 +793,6 @@ class IRrecv(object):
     @staticmethod
     def copyIrParams(src, dst):
         # Make a copy of the interrupt state & buffer data.
-        # Needed because irparams is marked as volatile, thus memcpy() isn't allowed.
         # Only call this when you know the interrupt handlers won't modify anything.
         # i.e. In kStopState.
         #
@@ -619,17 +800,27 @@ class IRrecv(object):
         #   src: Pointer to an irparams_t structure to copy from.
         #   dst: Pointer to an irparams_t structure to copy to.
 
-        # Save the pointer to the destination's rawbuf so we don't lose it as
-        # the for-loop/copy after this will overwrite it with src's rawbuf pointer.
-        # This isn't immediately obvious due to typecasting/different variable names.
-        dst_rawbuf_ptr = dst.rawbuf[:]
+        # Keep the destination's rawbuf and copy the entries into it in one go.
+        dst_rawbuf = dst.rawbuf
+        for name in irparams_t.__slots__:
+            setattr(dst, name, getattr(src, name))
+
+        dst.rawbuf = dst_rawbuf
+        dst.rawbuf[:] = src.rawbuf
 
-        # Restore the buffer pointer
-        dst.rawbuf = dst_rawbuf_ptr
+    @staticmethod
+    def swapIrParams(src, dst):
+        # Move the interrupt state & buffer to dst and give src the buffer of
+        # dst to capture into. Both buffers have to be the same size.
+        #
+        # Args:
+        #   src: Pointer to an irparams_t structure to move from.
+        #   dst: Pointer to an irparams_t structure to move to.
+        src_rawbuf = dst.rawbuf
+        for name in irparams_t.__slots__:
+            setattr(dst, name, getattr(src, name))
 
-        # Copy the rawbuf
-        for i in range(dst.bufsize):
-            dst.rawbuf[i] = src.rawbuf[i]
+        src.rawbuf = src_rawbuf
 
     @staticmethod
     def compare(oldval, newval):
@@ -697,27 +888,30 @@ class IRrecv(object):
         #
         # Returns:
         #   Boolean: True if it matches, False if it doesn't.
-        measured *= kRawTick  # Convert to uSecs.
-        print("Matching ATLEAST ")
-        print(measured)
-        print(" vs ")
-        print(desired)
-        print(". Matching: ")
-        print(measured)
-        print(" >= ")
-        print(self.ticksLow(min(desired, MS_TO_USEC(self.irparams.timeout)), tolerance, delta))
-        print(" [min(")
-        print(self.ticksLow(desired, tolerance, delta))
-        print(", ")
-        print(self.ticksLow(MS_TO_USEC(self.irparams.timeout), tolerance, delta))
-        print(")]")
 
         # We really should never get a value of 0, except as the last value
         # in the buffer. If that is the case, then assume infinity and return True.
         if measured == 0:
             return True
 
-        return measured >= ticksLow(min(desired, MS_TO_USEC(self.irparams.timeout)), tolerance, delta)
+        desired = min(desired, MS_TO_USEC(self.irparams.timeout))
+        low = self._window(desired, tolerance, delta)[0]
+        matched = measured >= low
+
+        if self._trace is not None:
+            self._trace.emit(
+                kTraceMatch,
+                self._trace_protocol,
+                stage='atleast',
+                measured=measured,
+                window=(low, None),
+                matched=matched
+            )
+
+        return matched
+
+    def _traceFail(self, stage, offset):
+        self._trace.emit(kTraceFail, self._trace_protocol, stage, offset=offset)
     
     def _matchGeneric(
         self,
@@ -738,7 +932,8 @@ class IRrecv(object):
         atleast=False,
         tolerance=kUseDefTol,
         excess=kMarkExcess,
-        MSBfirst=True
+        MSBfirst=True,
+        start=0
     ):
 
         # Match & decode a generic/typical IR message.
@@ -748,9 +943,9 @@ class IRrecv(object):
         # that requirement.
         #
         # Args:
-        #   data_ptr: A pointer to where we are at in the capture buffer.
-        #   result_bits_ptr: A pointer to where to start storing the bits we decoded.
-        #   result_bytes_ptr: A pointer to where to start storing the bytes we decoded.
+        #   data_ptr: The capture buffer.
+        #   result_bits_ptr: A match_result_t to store the bits we decoded in.
+        #   result_bytes_ptr: A mutable sequence to start storing the bytes we decoded in.
         #   use_bits: A flag indicating if we are to decode bits or bytes.
         #   remaining: The size of the capture buffer are remaining.
         #   nbits:        Nr. of data bits we expect.
@@ -766,6 +961,7 @@ class IRrecv(object):
         #   tolerance: Percentage error margin to allow. (Def: kUseDefTol)
         #   excess:  Nr. of useconds. (Def: kMarkExcess)
         #   MSBfirst: Bit order to save the data in. (Def: True)
+        #   start: Index in data_ptr where we are at. (Def: 0)
         # Returns:
         #  A uint16_t: If successful, how many buffer entries were used. Otherwise 0.
 
@@ -786,69 +982,80 @@ class IRrecv(object):
 
         # Check if there is enough capture buffer to possibly have the message.
         if remaining < min_remaining:
+            if self._trace is not None:
+                self._traceFail('length', start + remaining)
             return 0  # Nope, so abort.
         offset = 0
 
         # Header
-        offset += 1
-        if hdrmark and not self.matchMark(data_ptr[offset], hdrmark, tolerance, excess):
-            return 0
+        if hdrmark:
+            if not self.matchMark(data_ptr[start + offset], hdrmark, tolerance, excess):
+                if self._trace is not None:
+                    self._traceFail('header mark', start + offset)
+                return 0
+            offset += 1
 
-        offset += 1
-        if hdrspace and not self.matchSpace(data_ptr[offset], hdrspace, tolerance, excess):
-            return 0
+        if hdrspace:
+            if not self.matchSpace(data_ptr[start + offset], hdrspace, tolerance, excess):
+                if self._trace is not None:
+                    self._traceFail('header space', start + offset)
+                return 0
+            offset += 1
 
         # Data
+        table = self.compileTiming(
+            onemark,
+            onespace,
+            zeromark,
+            zerospace,
+            tolerance,
+            excess
+        )
         if use_bits:  # Bits.
-            result = self.matchData(
-                data_ptr[offset],
+            success, data, used = table.matchData(
+                data_ptr,
+                start + offset,
                 nbits,
-                onemark,
-                onespace,
-                zeromark,
-                zerospace,
-                tolerance,
-                excess,
                 MSBfirst
             )
-
-            if not result.success:
+            if not success:
+                if self._trace is not None:
+                    self._traceFail('data', start + offset + used)
                 return 0
 
-            result_bits_ptr += result.data[:]
-
-            offset += result.used
+            result_bits_ptr.success = True
+            result_bits_ptr.data = data
+            result_bits_ptr.used = used
+            offset += used
 
         else:  # bytes
-            data_used = self.matchBytes(
-                data_ptr[offset],
-                result_bytes_ptr,
-                remaining - offset,
-                nbits / 8,
-                onemark,
-                onespace,
-                zeromark,
-                zerospace,
-                tolerance,
-                excess,
-                MSBfirst
-            )
-
-            if not data_used:
+            data = table.matchBytes(data_ptr, start + offset, nbits // 8, MSBfirst)
+            if data is None:
+                if self._trace is not None:
+                    self._traceFail('data', start + offset)
                 return 0
 
-            offset += data_used
+            result_bytes_ptr[:len(data)] = bytes(data)
+            offset += nbits * 2
 
         # Footer
-        offset += 1
-        if footermark and not self.matchMark(data_ptr[offset], footermark, tolerance, excess):
-            return 0
+        if footermark:
+            if not self.matchMark(data_ptr[start + offset], footermark, tolerance, excess):
+                if self._trace is not None:
+                    self._traceFail('footer mark', start + offset)
+                return 0
+            offset += 1
 
         # If we have something still to match & haven't reached the end of the buffer
-        if footerspace and offset < remaining and atleast:
-            if not self.matchAtLeast(data_ptr[offset], footerspace, tolerance, excess):
-                return 0
-            elif not self.matchSpace(data_ptr[offset], footerspace, tolerance, excess):
+        if footerspace and offset < remaining:
+            if atleast:
+                matched = self.matchAtLeast(data_ptr[start + offset], footerspace, tolerance, excess)
+            else:
+                matched = self.matchSpace(data_ptr[start + offset], footerspace, tolerance, excess)
+
+            if not matched:
+                if self._trace is not None:
+                    self._traceFail('footer space', start + offset)
                 return 0
 
             offset += 1
@@ -865,14 +1072,15 @@ class IRrecv(object):
         zerospace,
         tolerance=kUseDefTol,
         excess=kMarkExcess,
-        MSBfirst=True
+        MSBfirst=True,
+        start=0
     ):
         # Match & decode the typical data section of an IR message.
         # The data value is stored in the least significant bits reguardless of the
         # bit ordering requested.
         #
         # Args:
-        #   data_ptr: A pointer to where we are at in the capture buffer.
+        #   data_ptr: The capture buffer.
         #   nbits:     Nr. of data bits we expect.
         #   onemark:   Nr. of uSeconds in an expected mark signal for a '1' bit.
         #   onespace:  Nr. of uSeconds in an expected space signal for a '1' bit.
@@ -881,39 +1089,26 @@ class IRrecv(object):
         #   tolerance: Percentage error margin to allow. (Def: kUseDefTol)
         #   excess:  Nr. of useconds. (Def: kMarkExcess)
         #   MSBfirst: Bit order to save the data in. (Def: True)
+        #   start: Index in data_ptr where we are at. (Def: 0)
         # Returns:
         #  A match_result_t structure containing the success (or not), the data value,
         #  and how many buffer entries were used.
+        table = self.compileTiming(
+            onemark,
+            onespace,
+            zeromark,
+            zerospace,
+            tolerance,
+            excess
+        )
 
         result = match_result_t()
-        result.success = False  # Fail by default.
-        result.data = 0
-        result.used = 0
-        while result.used < nbits * 2:
-            # Is the bit a '1'?
-            if (
-                self.matchMark(data_ptr[0], onemark, tolerance, excess) and
-                self.matchSpace(data_ptr[1], onespace, tolerance, excess)
-            ):
-                result.data = (result.data << 1) | 1
-
-            elif (
-                self.matchMark(data_ptr[0], zeromark, tolerance, excess) and
-                self.matchSpace(data_ptr[1], zerospace, tolerance, excess)
-            ):
-                result.data <<= 1  # The bit is a '0'.
-            else:
-                if not MSBfirst:
-                    result.data = self.reverseBits(result.data, result.used / 2)
-                    return result  # It's neither, so fail.
-
-            result.used += 2
-            data_ptr += 2
-
-        result.success = True
-        if not MSBfirst:
-            result.data = self.reverseBits(result.data, nbits)
-
+        result.success, result.data, result.used = table.matchData(
+            data_ptr,
+            start,
+            nbits,
+            MSBfirst
+        )
         return result
     
     def matchBytes(
@@ -928,15 +1123,16 @@ class IRrecv(object):
         zerospace,
         tolerance=kUseDefTol,
         excess=kMarkExcess,
-        MSBfirst=True
+        MSBfirst=True,
+        start=0
     ):
         # Match & decode the typical data section of an IR message.
         # The bytes are stored at result_ptr. The first byte in the result equates to
         # the first byte encountered, and so on.
         #
         # Args:
-        #   data_ptr: A pointer to where we are at in the capture buffer.
-        #   result_ptr: A pointer to where to start storing the bytes we decoded.
+        #   data_ptr: The capture buffer.
+        #   result_ptr: A mutable sequence to start storing the bytes we decoded in.
         #   remaining: The size of the capture buffer are remaining.
         #   nbytes:    Nr. of data bytes we expect.
         #   onemark:   Nr. of uSeconds in an expected mark signal for a '1' bit.
@@ -946,32 +1142,28 @@ class IRrecv(object):
         #   tolerance: Percentage error margin to allow. (Def: kUseDefTol)
         #   excess:  Nr. of useconds. (Def: kMarkExcess)
         #   MSBfirst: Bit order to save the data in. (Def: True)
+        #   start: Index in data_ptr where we are at. (Def: 0)
         # Returns:
         #  A uint16_t: If successful, how many buffer entries were used. Otherwise 0.
 
         # Check if there is enough capture buffer to possibly have the desired bytes.
         if remaining < nbytes * 8 * 2:
             return 0  # Nope, so abort.
-        offset = 0
-        for byte_pos in range(nbytes):
-            result = self.matchData(
-                data_ptr[offset],
-                8,
-                onemark,
-                onespace,
-                zeromark,
-                zerospace,
-                tolerance,
-                excess,
-                MSBfirst
-            )
-            if result.success is False:
-                return 0  # Fail
 
-            result_ptr[byte_pos] = result.data
-            offset += result.used
+        table = self.compileTiming(
+            onemark,
+            onespace,
+            zeromark,
+            zerospace,
+            tolerance,
+            excess
+        )
+        data = table.matchBytes(data_ptr, start, nbytes, MSBfirst)
+        if data is None:
+            return 0  # Fail
 
-        return offset
+        result_ptr[:nbytes] = bytes(data)
+        return nbytes * 8 * 2
     
     def matchGeneric(
         self,
@@ -990,14 +1182,17 @@ class IRrecv(object):
         atleast=False,
         tolerance=kUseDefTol,
         excess=kMarkExcess,
-        MSBfirst=True
+        MSBfirst=True,
+        start=0
     ):
-        if result_ptr <= 255:
+        # A match_result_t result_ptr gets the decoded value (bits), anything
+        # else is treated as a byte array (e.g. results.state).
+        if isinstance(result_ptr, match_result_t):
             return self._matchGeneric(
                 data_ptr,
-                NULL,
                 result_ptr,
-                False,
+                None,
+                True,
                 remaining,
                 nbits,
                 hdrmark,
@@ -1011,14 +1206,15 @@ class IRrecv(object):
                 atleast,
                 tolerance,
                 excess,
-                MSBfirst
+                MSBfirst,
+                start
             )
         else:
             return self._matchGeneric(
                 data_ptr,
+                None,
                 result_ptr,
-                NULL,
-                True,
+                False,
                 remaining,
                 nbits,
                 hdrmark,
@@ -1032,7 +1228,8 @@ class IRrecv(object):
                 atleast,
                 tolerance,
                 excess,
-                MSBfirst
+                MSBfirst,
+                start
             )
 
     def decodeHash(self, results):
@@ -1061,313 +1258,9 @@ class IRrecv(object):
         results.decode_type = UNKNOWN
         return True
       
-    def decodeNEC(self, results, nbits=kNECBits, strict=True):
-        from . import ir_NEC
-        return ir_NEC.decodeNEC(results, nbits, strict)
-
-    def decodeArgo(self, results, nbits=kArgoBits, strict=True):
-        from . import ir_Argo
-        return ir_Argo.decodeArgo(results, nbits, strict)
-
-    def decodeSony(self, results, nbits=kSonyMinBits, strict=False):
-        from . import ir_Sony
-        return ir_Sony.decodeSony(results, nbits, strict)
-
-    def decodeSanyo(self, results, nbits=kSanyoSA8650BBits, strict=False):
-        from . import ir_Sanyo
-        return ir_Sanyo.decodeSanyo(results, nbits, strict)
-
-    def decodeSanyoLC7461(self, results, nbits=kSanyoLC7461Bits, strict=True):
-        from . import ir_Sanyo
-        return ir_Sanyo.decodeSanyoLC7461(results, nbits, strict)
-
-    def decodeMitsubishi(self, results, nbits=kMitsubishiBits, strict=True):
-        from . import ir_Mitsubishi
-        return ir_Mitsubishi.decodeMitsubishi(results, nbits, strict)
-
-    def decodeMitsubishi2(self, results, nbits=kMitsubishiBits, strict=True):
-        from . import ir_Mitsubishi
-        return ir_Mitsubishi.decodeMitsubishi2(results, nbits, strict)
-
-    def decodeMitsubishiAC(self, results, nbits=kMitsubishiACBits, strict=False):
-        from . import ir_Mitsubishi
-
-        return ir_Mitsubishi.decodeMitsubishiAC(results, nbits, strict)
-
-    def decodeMitsubishi136(self, results, nbits=kMitsubishi136Bits, strict=True):
-        from . import ir_Mitsubishi
-
-        return ir_Mitsubishi.decodeMitsubishi136(results, nbits, strict)
-
-    def decodeMitsubishi112(self, results, nbits=kMitsubishi112Bits, strict=True):
-        from . import ir_Mitsubishi
-
-        return ir_Mitsubishi.decodeMitsubishi112(results, nbits, strict)
-
-    def decodeMitsubishiHeavy(self, results, nbits, strict=True):
-        from . import ir_MitsubishiHeavy
-
-        return ir_MitsubishiHeavy.decodeMitsubishiHeavy(results, nbits, strict)
-
     def getRClevel(self, results, offset, used, bitTime, tolerance=kUseDefTol, excess=kMarkExcess, delta=0, maxwidth=3):
         pass
 
-    def decodeRC5(self, results, nbits=kRC5XBits, strict=True):
-        from . import ir_RC5_RC6
-
-        return ir_RC5_RC6.decodeRC5(results, nbits, strict)
-
-    def decodeRC6(self, results, nbits=kRC6Mode0Bits,strict=False):
-        from . import ir_RC5_RC6
-
-        return ir_RC5_RC6.decodeRC6(results, nbits, strict)
-
-    def decodeRCMM(self, results, nbits=kRCMMBits, strict=False):
-        from . import ir_RCMM
-
-        return ir_RCMM.decodeRCMM(results, nbits, strict)
-
-    def decodePanasonic(self, results, nbits=kPanasonicBits, strict=False, manufacturer=kPanasonicManufacturer):
-        from . import ir_Panasonic
-
-        return ir_Panasonic.decodePanasonic(results, nbits, strict, manufacturer)
-
-    def decodeLG(self, results, nbits=kLgBits,strict=False):
-        from . import ir_LG
-
-        return ir_LG.decodeLG(results, nbits, strict)
-
-    def decodeInax(self, results, nbits=kInaxBits, strict=True):
-        from . import ir_Inax
-
-        return ir_Inax.decodeInax(results, nbits, strict)
-
-    def decodeJVC(self, results, nbits=kJvcBits, strict=True):
-        from . import ir_JVC
-
-        return ir_JVC.decodeJVC(results, nbits, strict)
-
-    def decodeSAMSUNG(self, results, nbits=kSamsungBits,strict=True):
-        from . import ir_Samsung
-
-        return ir_Samsung.decodeSAMSUNG(results, nbits, strict)
-
-    def decodeSamsung36(self, results, nbits=kSamsung36Bits,strict=True):
-        from . import ir_Samsung
-
-        return ir_Samsung.decodeSamsung36(results, nbits, strict)
-
-    def decodeSamsungAC(self, results, nbits=kSamsungAcBits,strict=True):
-        from . import ir_Samsung
-
-        return ir_Samsung.decodeSamsungAC(results, nbits, strict)
-
-    def decodeWhynter(self, results, nbits=kWhynterBits, strict=True):
-        from . import ir_Whynter
-
-        return ir_Whynter.decodeWhynter(results, nbits, strict)
-
-    def decodeCOOLIX(self, results, nbits=kCoolixBits, strict=True):
-        from . import ir_Coolix
-
-        return ir_Coolix.decodeCOOLIX(results, nbits, strict)
-
-    def decodeDenon(self, results, nbits=kDenonBits, strict=True):
-        from . import ir_Denon
-
-        return ir_Denon.decodeDenon(results, nbits, strict)
-
-    def decodeDISH(self, results, nbits=kDishBits, strict=True):
-        from . import ir_Dish
-
-        return ir_Dish.decodeDISH(results, nbits, strict)
-
-    def decodeSharp(self, results, nbits=kSharpBits, strict=True, expansion=True):
-        from . import ir_Sharp
-
-        return ir_Sharp.decodeSharp(results, nbits, strict, expansion)
-
-    def decodeSharpAc(self, results, nbits=kSharpAcBits, strict=True):
-        from . import ir_Sharp
-
-        return ir_Sharp.decodeSharpAc(results, nbits, strict)
-
-    def decodeAiwaRCT501(self, results, nbits=kAiwaRcT501Bits, strict=True):
-        from . import ir_Aiwa
-
-        return ir_Aiwa.decodeAiwaRCT501(results, nbits, strict)
-
-    def decodeNikai(self, results, nbits=kNikaiBits, strict=True):
-        from . import ir_Nikai
-
-        return ir_Nikai.decodeNikai(results, nbits, strict)
-
-    def decodeMagiQuest(self, results, nbits=kMagiquestBits, strict=True):
-        from . import ir_MagiQuest
-
-        return ir_MagiQuest.decodeMagiQuest(results, nbits, strict)
-
-    def decodeKelvinator(self, results, nbits=kKelvinatorBits, strict=True):
-        from . import ir_Kelvinator
-
-        return ir_Kelvinator.decodeKelvinator(results, nbits, strict)
-
-    def decodeDaikin(self, results, nbits=kDaikinBits, strict=True):
-        from . import ir_Daikin
-
-        return ir_Daikin.decodeDaikin(results, nbits, strict)
-
-    def decodeDaikin128(self, results, nbits=kDaikin128Bits, strict=True):
-        from . import ir_Daikin
-
-        return ir_Daikin.decodeDaikin128(results, nbits, strict)
-
-    def decodeDaikin152(self, results, nbits=kDaikin152Bits, strict=True):
-        from . import ir_Daikin
-
-        return ir_Daikin.decodeDaikin152(results, nbits, strict)
-
-    def decodeDaikin160(self, results, nbits=kDaikin160Bits, strict=True):
-        from . import ir_Daikin
-
-        return ir_Daikin.decodeDaikin160(results, nbits, strict)
-
-    def decodeDaikin176(self, results, nbits=kDaikin176Bits, strict=True):
-        from . import ir_Daikin
-
-        return ir_Daikin.decodeDaikin176(results, nbits, strict)
-
-    def decodeDaikin2(self, results, nbits=kDaikin2Bits, strict=True):
-        from . import ir_Daikin
-
-        return ir_Daikin.decodeDaikin2(results, nbits, strict)
-
-    def decodeDaikin216(self, results, nbits=kDaikin216Bits, strict=True):
-        from . import ir_Daikin
-
-        return ir_Daikin.decodeDaikin216(results, nbits, strict)
-
-    def decodeToshibaAC(self, results, nbytes=kToshibaACBits, strict=True):
-        from . import ir_Toshiba
-
-        return ir_Toshiba.decodeToshibaAC(results, nbytes, strict)
-
-    def decodeTrotec(self, results, nbits=kTrotecBits, strict=True):
-        from . import ir_Trotec
-
-        return ir_Trotec.decodeTrotec(results, nbits, strict)
-
-    def decodeMidea(self, results, nbits=kMideaBits, strict=True):
-        from . import ir_Midea
-
-        return ir_Midea.decodeMidea(results, nbits, strict)
-
-    def decodeFujitsuAC(self, results, nbits=kFujitsuAcBits, strict=False):
-        from . import ir_Fujitsu
-
-        return ir_Fujitsu.decodeFujitsuAC(results, nbits, strict)
-
-    def decodeLasertag(self, results, nbits=kLasertagBits, strict=True):
-        from . import ir_Lasertag
-
-        return ir_Lasertag.decodeLasertag(results, nbits, strict)
-
-    def decodeCarrierAC(self, results, nbits=kCarrierAcBits, strict=True):
-        from . import ir_Carrier
-
-        return ir_Carrier.decodeCarrierAC(results, nbits, strict)
-
-    def decodeGoodweather(self, results,nbits=kGoodweatherBits, strict=True):
-        from . import ir_Goodweather
-
-        return ir_Goodweather.decodeGoodweather(results, nbits, strict)
-
-    def decodeGree(self, results, nbits=kGreeBits, strict=True):
-        from . import ir_Gree
-
-        return ir_Gree.decodeGree(results, nbits, strict)
-
-    def decodeHaierAC(self, results, nbits=kHaierACBits, strict=True):
-        from . import ir_Haier
-
-        return ir_Haier.decodeHaierAC(results, nbits, strict)
-
-    def decodeHaierACYRW02(self, results, nbits=kHaierACYRW02Bits, strict=True):
-        from . import ir_Haier
-
-        return ir_Haier.decodeHaierACYRW02(results, nbits, strict)
-
-    def decodeHitachiAC(self, results, nbits=kHitachiAcBits, strict=True):
-        from . import ir_Hitachi
-
-        return ir_Hitachi.decodeHitachiAC(results, nbits, strict)
-
-    def decodeHitachiAC1(self, results, nbits=kHitachiAc1Bits, strict=True):
-        from . import ir_Hitachi
-
-        return ir_Hitachi.decodeHitachiAC1(results, nbits, strict)
-
-    def decodeHitachiAc424(self, results, nbits=kHitachiAc424Bits, strict=True):
-        from . import ir_Hitachi
-
-        return ir_Hitachi.decodeHitachiAc424(results, nbits, strict)
-
-    def decodeGICable(self, results, nbits=kGicableBits, strict=True):
-        from . import ir_GICable
-
-        return ir_GICable.decodeGICable(results, nbits, strict)
-
-    def decodeWhirlpoolAC(self, results, nbits=kWhirlpoolAcBits, strict=True):
-        from . import ir_Whirlpool
-
-        return ir_Whirlpool.decodeWhirlpoolAC(results, nbits, strict)
-
-    def decodeLutron(self, results, nbits=kLutronBits, strict=True):
-        from . import ir_Lutron
-
-        return ir_Lutron.decodeLutron(results, nbits, strict)
-
-    def decodeElectraAC(self, results, nbits=kElectraAcBits, strict=True):
-        from . import ir_Electra
-
-        return ir_Electra.decodeElectraAC(results, nbits, strict)
-
-    def decodePanasonicAC(self, results, nbits=kPanasonicAcBits, strict=True):
-        from . import ir_Panasonic
-
-        return ir_Panasonic.decodePanasonicAC(results, nbits, strict)
-
-    def decodePioneer(self, results, nbits=kPioneerBits, strict=True):
-        from . import ir_Pioneer
-
-        return ir_Pioneer.decodePioneer(results, nbits, strict)
-
-    def decodeMWM(self, results, nbits=24, strict=True):
-        from . import ir_MWM
-
-        return ir_MWM.decodeMWM(results, nbits, strict)
-
-    def decodeVestelAc(self, results, nbits=kVestelAcBits, strict=True):
-        from . import ir_Vestel
-
-        return ir_Vestel.decodeVestelAc(results, nbits, strict)
-
-    def decodeTeco(self, results, nbits=kTecoBits, strict=False):
-        from . import ir_Teco
-
-        return ir_Teco.decodeTeco(results, nbits, strict)
-
-    def decodeLegoPf(self, results, nbits=kLegoPfBits, strict=True):
-        from . import ir_Lego
-
-        return ir_Lego.decodeLegoPf(results, nbits, strict)
-
-    def decodeNeoclima(self, results, nbits=kNeoclimaBits, strict=True):
-        from . import ir_Neoclima
-
-        return ir_Neoclima.decodeNeoclima(results, nbits, strict)
-
-    def decodeAmcor(self, results, nbits=kAmcorBits,strict=True):
-        from . import ir_Amcor
 
-        return ir_Amcor.decodeAmcor(results, nbits, strict)
+# The protocol decoders. (decodeNEC(), decodeSony() ...)
+kRegistry.install(IRrecv)
@@ -0,0 +1,629 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+# Protocol registry.
+#
+# Everything IRrecv & IRsend need to know about a protocol lives here:
+#   * The module it is implemented in. Modules are only imported the first
+#     time the protocol is actually used, and the decode/send callables found
+#     in them are cached so later calls go straight to the function.
+#   * The default nr. of bits, minimum nr. of repeats and if it uses a state
+#     (IRsend.default_bits(), IRsend.min_repeats() & IRutils.hasACState())
+#   * Where its decoders go in the decode chain. See DecodeCandidate.before &
+#     DecodeCandidate.after in IRindex.
+#
+# Third party protocols register through the "irdecoder.protocols" entry point
+# group. An entry point is either a ProtocolEntry or a function that gets
+# called with the registry. e.g. in setup.py:
+#
+#   entry_points={
+#       'irdecoder.protocols': ['foo = irdecoder_foo:register'],
+#   }
+#
+#   def register(registry):
+#       registry.registerDecoder(
+#           DecoderEntry('decodeFoo', 'irdecoder_foo', (('nbits', 32), ('strict', True)))
+#       )
+#       registry.register(
+#           ProtocolEntry(
+#               1000, 'irdecoder_foo', 'decodeFoo', 'sendFoo', 32,
+#               candidates=[
+#                   DecodeCandidate(
+#                       'Foo', 'decodeFoo',
+#                       headers=[(4000, 4000)],
+#                       min_rawlen=64,
+#                       before=('NEC',)
+#                   )
+#               ]
+#           )
+#       )
+#
+# The decoder is then available as IRrecv.decodeFoo() and IRsend.send(1000, ...)
+# sends using the module's sendFoo(). Protocols have to be registered before
+# the IRrecv instance that should use them is created.
+#
+# A module that can't be imported (or doesn't have the function) makes its
+# protocols unavailable instead of failing the decode. A warning is issued the
+# first time, after that its decoders don't match anything & its senders fall
+# back to the IRsend method of the same name.
+
+import heapq
+import importlib
+import inspect
+import warnings
+
+from .IRremoteESP8266 import *
+from .IRindex import kDecodeChain
+
+try:
+    from importlib.metadata import entry_points
+except ImportError:
+    entry_points = None
+
+
+kEntryPointGroup = 'irdecoder.protocols'
+
+
+class DecoderEntry(object):
+
+    def __init__(self, name, module, params=(('nbits', 0), ('strict', True))):
+        # A decode function.
+        #
+        # Args:
+        #   name: Name of the function in the module. It also becomes the name
+        #         of the IRrecv method.
+        #   module: Module the function is in. Names starting with a '.' are
+        #           relative to this package.
+        #   params: (name, default) pairs of the arguments the function takes
+        #           after `results`, in order.
+        self.name = name
+        self.module = module
+        self.params = tuple(params)
+
+
+class ProtocolEntry(object):
+
+    def __init__(
+        self,
+        decode_type,
+        module=None,
+        decoder=None,
+        sender=None,
+        default_bits=0,
+        min_repeats=kNoRepeat,
+        ac_state=False,
+        candidates=()
+    ):
+        # A single protocol (decode_type_t value).
+        #
+        # Args:
+        #   decode_type: The decode_type_t value of the protocol.
+        #   module: Module the protocol is implemented in.
+        #   decoder: Name of the decode function/IRrecv method. (A DecoderEntry)
+        #   sender: Name of the send function/IRsend method.
+        #   default_bits: Default nr. of bits of a message.
+        #   min_repeats: Minimum nr. of repeats a message has to be sent with.
+        #   ac_state: The protocol uses a state (list of bytes).
+        #   candidates: DecodeCandidate entries to add to the decode chain.
+        self.decode_type = decode_type
+        self.module = module
+        self.decoder = decoder
+        self.sender = sender
+        self.default_bits = default_bits
+        self.min_repeats = min_repeats
+        self.ac_state = ac_state
+        self.candidates = tuple(candidates)
+
+
+def _decoderMethod(registry, entry):
+    # Build the IRrecv method for a DecoderEntry.
+    names = [name for name, _ in entry.params]
+    defaults = [default for _, default in entry.params]
+
+    def method(self, results, *args, **kwargs):
+        values = list(args) + defaults[len(args):]
+        for key, value in kwargs.items():
+            values[names.index(key)] = value
+
+        func, takes_self = registry.resolve(entry.module, entry.name)
+        if func is None:  # The module can't be loaded.
+            return False
+
+        if takes_self:
+            return func(self, results, *values)
+
+        return func(results, *values)
+
+    method.__name__ = entry.name
+    return method
+
+
+class ProtocolRegistry(object):
+
+    def __init__(self):
+        self._protocols = {}
+        self._decoders = {}
+        self._methods = {}
+        self._candidates = []
+        self._modules = {}
+        # Module name -> the exception importing it raised.
+        self._unavailable = {}
+        self._resolved = {}
+        self._classes = []
+        self._chain = None
+        self._entry_points_loaded = False
+
+    def register(self, entry):
+        # Add (or replace) a protocol.
+        self._protocols[entry.decode_type] = entry
+        if entry.candidates:
+            self._candidates.extend(entry.candidates)
+            self._chain = None
+
+    def registerDecoder(self, entry):
+        # Add a decode function & make it an IRrecv method.
+        self._decoders[entry.name] = entry
+        self._methods[entry.name] = _decoderMethod(self, entry)
+
+        for cls in self._classes:
+            setattr(cls, entry.name, self._methods[entry.name])
+
+    def install(self, cls):
+        # Add every registered decoder as a method of an IRrecv class.
+        if cls not in self._classes:
+            self._classes.append(cls)
+
+        for name, method in self._methods.items():
+            setattr(cls, name, method)
+
+    def get(self, decode_type):
+        return self._protocols.get(decode_type, None)
+
+    def protocols(self):
+        return sorted(self._protocols.keys())
+
+    def decoder(self, name):
+        return self._decoders.get(name, None)
+
+    def defaultBits(self, decode_type):
+        entry = self.get(decode_type)
+        if entry is None:
+            return 0
+
+        return entry.default_bits
+
+    def minRepeats(self, decode_type):
+        entry = self.get(decode_type)
+        if entry is None:
+            return kNoRepeat
+
+        return entry.min_repeats
+
+    def hasACState(self, decode_type):
+        entry = self.get(decode_type)
+        return entry is not None and entry.ac_state
+
+    def module(self, name):
+        # Import a protocol module the first time it is needed.
+        #
+        # Returns:
+        #   The module or None if it can't be imported.
+        try:
+            return self._modules[name]
+        except KeyError:
+            pass
+
+        if name in self._unavailable:
+            return None
+
+        try:
+            if name.startswith('.'):
+                module = importlib.import_module(name, __package__)
+            else:
+                module = importlib.import_module(name)
+        except Exception as err:  # NOQA  A broken module, whatever the error.
+            self._unavailable[name] = err
+            warnings.warn(
+                'protocol module {0} is unavailable: {1!r}'.format(name, err),
+                RuntimeWarning,
+                stacklevel=2
+            )
+            return None
+
+        self._modules[name] = module
+
+        # Some of the modules attach their functions to IRrecv when imported.
+        # Those don't have the default arguments, so put the methods back.
+        for cls in self._classes:
+            for method_name, method in self._methods.items():
+                if cls.__dict__.get(method_name) is not method:
+                    setattr(cls, method_name, method)
+
+        return module
+
+    def available(self, module):
+        # Check if a protocol module can be imported. (Imports it)
+        return self.module(module) is not None
+
+    def unavailable(self):
+        # Get the modules that couldn't be imported.
+        #
+        # Returns:
+        #   A dict of module name -> exception.
+        return dict(self._unavailable)
+
+    def resolve(self, module, name):
+        # Find a function in a protocol module.
+        #
+        # Returns:
+        #   A (function, takes_self) tuple. takes_self is True for functions
+        #   that are written as methods. (first argument is "self")
+        #   function is None when the module can't be imported or doesn't
+        #   have it.
+        key = (module, name)
+        try:
+            return self._resolved[key]
+        except KeyError:
+            pass
+
+        func = getattr(self.module(module), name, None)
+        if func is None:
+            resolved = (None, False)
+        else:
+            try:
+                args = inspect.getfullargspec(func).args
+            except TypeError:
+                args = []
+
+            resolved = (func, args[:1] == ['self'])
+
+        self._resolved[key] = resolved
+        return resolved
+
+    def sender(self, irsend, decode_type):
+        # Get the send function of a protocol bound to an IRsend instance.
+        #
+        # Returns:
+        #   A callable or None if the protocol can't be sent.
+        entry = self.get(decode_type)
+        if entry is None or entry.sender is None:
+            return None
+
+        if entry.module is not None:
+            func, takes_self = self.resolve(entry.module, entry.sender)
+            if func is not None:
+                if takes_self:
+                    return func.__get__(irsend)
+
+                return func
+
+        return getattr(irsend, entry.sender, None)
+
+    def chain(self, protocols=None):
+        # Get the decode chain.
+        #
+        # Args:
+        #   protocols: Only include the decoders of these decode_type_t
+        #              values. (Def: every registered protocol)
+        self.loadEntryPoints()
+
+        if self._chain is None:
+            self._chain = self._buildChain()
+
+        if protocols is None:
+            return self._chain
+
+        protocols = set(protocols)
+        return tuple(
+            candidate for candidate in self._chain
+            if protocols.intersection(self.candidateProtocols(candidate))
+        )
+
+    def candidateProtocols(self, candidate):
+        # Get the decode_type_t values a decode chain entry can produce.
+        if candidate.decode_type is not None:
+            return (candidate.decode_type,)
+
+        return tuple(
+            entry.decode_type for entry in self._protocols.values()
+            if entry.decoder == candidate.method
+        )
+
+    def _buildChain(self):
+        chain = list(kDecodeChain)
+        names = set(candidate.name for candidate in chain)
+
+        for candidate in self._candidates:
+            if candidate.name in names:
+                raise ValueError(
+                    'duplicate decode chain entry: ' + repr(candidate.name)
+                )
+            names.add(candidate.name)
+
+            # As late as possible. i.e. right before the first entry it has to
+            # precede, or at the end.
+            positions = [
+                pos for pos, other in enumerate(chain)
+                if other.name in candidate.before
+            ]
+            if positions:
+                chain.insert(min(positions), candidate)
+            else:
+                chain.append(candidate)
+
+        chain = tuple(chain)
+        checkOrder(chain)
+        return chain
+
+    def loadEntryPoints(self, group=kEntryPointGroup):
+        # Register the protocols of every installed plugin. Only done once.
+        if self._entry_points_loaded:
+            return
+
+        self._entry_points_loaded = True
+
+        if entry_points is None:
+            return
+
+        eps = entry_points()
+        if hasattr(eps, 'select'):
+            eps = eps.select(group=group)
+        else:
+            eps = eps.get(group, [])
+
+        for ep in eps:
+            plugin = ep.load()
+
+            if isinstance(plugin, ProtocolEntry):
+                self.register(plugin)
+            else:
+                plugin(self)
+
+
+def checkOrder(chain):
+    # Make sure a decode chain keeps every before/after constraint.
+    # Constraints naming entries that aren't in the chain are ignored.
+    #
+    # Raises:
+    #   ValueError if a constraint is broken.
+    positions = dict((candidate.name, pos) for pos, candidate in enumerate(chain))
+
+    for pos, candidate in enumerate(chain):
+        for name in candidate.before:
+            if positions.get(name, pos + 1) < pos:
+                raise ValueError(
+                    repr(candidate.name) + ' has to be before ' + repr(name)
+                )
+
+        for name in candidate.after:
+            if positions.get(name, pos - 1) > pos:
+                raise ValueError(
+                    repr(candidate.name) + ' has to be after ' + repr(name)
+                )
+
+
+def adaptiveOrder(chain, hits):
+    # Reorder a decode chain so the entries with the most hits are tried
+    # first, without breaking any before/after constraint. Entries with the
+    # same nr. of hits keep their order.
+    #
+    # Args:
+    #   chain: The decode chain.
+    #   hits: A mapping of entry name -> nr. of hits.
+    # Returns:
+    #   The reordered chain as a tuple.
+    positions = dict((candidate.name, pos) for pos, candidate in enumerate(chain))
+    following = [[] for _ in chain]
+    waiting = [0] * len(chain)
+
+    for pos, candidate in enumerate(chain):
+        for name in candidate.before:
+            if name in positions:
+                following[pos].append(positions[name])
+                waiting[positions[name]] += 1
+
+        for name in candidate.after:
+            if name in positions:
+                following[positions[name]].append(pos)
+                waiting[pos] += 1
+
+    # An entry that has to come before a busy one is as urgent as that one,
+    # otherwise the busy entry can't move up.
+    urgency = [None] * len(chain)
+
+    def urgent(pos, path=()):
+        if urgency[pos] is None:
+            if pos in path:
+                raise ValueError('the before/after constraints of the chain form a loop')
+
+            urgency[pos] = max(
+                [hits.get(chain[pos].name, 0)] +
+                [urgent(other, path + (pos,)) for other in following[pos]]
+            )
+        return urgency[pos]
+
+    def priority(pos):
+        return -urgent(pos), pos
+
+    ready = [priority(pos) for pos in range(len(chain)) if not waiting[pos]]
+    heapq.heapify(ready)
+
+    ordered = []
+    while ready:
+        _, pos = heapq.heappop(ready)
+        ordered.append(chain[pos])
+
+        for other in following[pos]:
+            waiting[other] -= 1
+            if not waiting[other]:
+                heapq.heappush(ready, priority(other))
+
+    if len(ordered) != len(chain):
+        raise ValueError('the before/after constraints of the chain form a loop')
+
+    return tuple(ordered)
+
+
+kRegistry = ProtocolRegistry()
+
+
+for _name, _module, _params in (
+    ('decodeNEC', '.ir_NEC', (('nbits', kNECBits), ('strict', True))),
+    ('decodeArgo', '.ir_Argo', (('nbits', kArgoBits), ('strict', True))),
+    ('decodeSony', '.ir_Sony', (('nbits', kSonyMinBits), ('strict', False))),
+    ('decodeSanyo', '.ir_Sanyo', (('nbits', kSanyoSA8650BBits), ('strict', False))),
+    ('decodeSanyoLC7461', '.ir_Sanyo', (('nbits', kSanyoLC7461Bits), ('strict', True))),
+    ('decodeMitsubishi', '.ir_Mitsubishi', (('nbits', kMitsubishiBits), ('strict', True))),
+    ('decodeMitsubishi2', '.ir_Mitsubishi', (('nbits', kMitsubishiBits), ('strict', True))),
+    ('decodeMitsubishiAC', '.ir_Mitsubishi', (('nbits', kMitsubishiACBits), ('strict', False))),
+    ('decodeMitsubishi136', '.ir_Mitsubishi', (('nbits', kMitsubishi136Bits), ('strict', True))),
+    ('decodeMitsubishi112', '.ir_Mitsubishi', (('nbits', kMitsubishi112Bits), ('strict', True))),
+    ('decodeMitsubishiHeavy', '.ir_MitsubishiHeavy', (('nbits', kMitsubishiHeavy152Bits), ('strict', True))),
+    ('decodeRC5', '.ir_RC5_RC6', (('nbits', kRC5XBits), ('strict', True))),
+    ('decodeRC6', '.ir_RC5_RC6', (('nbits', kRC6Mode0Bits), ('strict', False))),
+    ('decodeRCMM', '.ir_RCMM', (('nbits', kRCMMBits), ('strict', False))),
+    (
+        'decodePanasonic', '.ir_Panasonic',
+        (('nbits', kPanasonicBits), ('strict', False), ('manufacturer', kPanasonicManufacturer))
+    ),
+    ('decodeLG', '.ir_LG', (('nbits', kLgBits), ('strict', False))),
+    ('decodeInax', '.ir_Inax', (('nbits', kInaxBits), ('strict', True))),
+    ('decodeJVC', '.ir_JVC', (('nbits', kJvcBits), ('strict', True))),
+    ('decodeSAMSUNG', '.ir_Samsung', (('nbits', kSamsungBits), ('strict', True))),
+    ('decodeSamsung36', '.ir_Samsung', (('nbits', kSamsung36Bits), ('strict', True))),
+    ('decodeSamsungAC', '.ir_Samsung', (('nbits', kSamsungAcBits), ('strict', True))),
+    ('decodeWhynter', '.ir_Whynter', (('nbits', kWhynterBits), ('strict', True))),
+    ('decodeCOOLIX', '.ir_Coolix', (('nbits', kCoolixBits), ('strict', True))),
+    ('decodeDenon', '.ir_Denon', (('nbits', kDenonBits), ('strict', True))),
+    ('decodeDISH', '.ir_Dish', (('nbits', kDishBits), ('strict', True))),
+    (
+        'decodeSharp', '.ir_Sharp',
+        (('nbits', kSharpBits), ('strict', True), ('expansion', True))
+    ),
+    ('decodeSharpAc', '.ir_Sharp', (('nbits', kSharpAcBits), ('strict', True))),
+    ('decodeAiwaRCT501', '.ir_Aiwa', (('nbits', kAiwaRcT501Bits), ('strict', True))),
+    ('decodeNikai', '.ir_Nikai', (('nbits', kNikaiBits), ('strict', True))),
+    ('decodeMagiQuest', '.ir_Magiquest', (('nbits', kMagiquestBits), ('strict', True))),
+    ('decodeKelvinator', '.ir_Kelvinator', (('nbits', kKelvinatorBits), ('strict', True))),
+    ('decodeDaikin', '.ir_Daikin', (('nbits', kDaikinBits), ('strict', True))),
+    ('decodeDaikin128', '.ir_Daikin', (('nbits', kDaikin128Bits), ('strict', True))),
+    ('decodeDaikin152', '.ir_Daikin', (('nbits', kDaikin152Bits), ('strict', True))),
+    ('decodeDaikin160', '.ir_Daikin', (('nbits', kDaikin160Bits), ('strict', True))),
+    ('decodeDaikin176', '.ir_Daikin', (('nbits', kDaikin176Bits), ('strict', True))),
+    ('decodeDaikin2', '.ir_Daikin', (('nbits', kDaikin2Bits), ('strict', True))),
+    ('decodeDaikin216', '.ir_Daikin', (('nbits', kDaikin216Bits), ('strict', True))),
+    ('decodeToshibaAC', '.ir_Toshiba', (('nbytes', kToshibaACBits), ('strict', True))),
+    ('decodeTrotec', '.ir_Trotec', (('nbits', kTrotecBits), ('strict', True))),
+    ('decodeMidea', '.ir_Midea', (('nbits', kMideaBits), ('strict', True))),
+    ('decodeFujitsuAC', '.ir_Fujitsu', (('nbits', kFujitsuAcBits), ('strict', False))),
+    ('decodeLasertag', '.ir_Lasertag', (('nbits', kLasertagBits), ('strict', True))),
+    ('decodeCarrierAC', '.ir_Carrier', (('nbits', kCarrierAcBits), ('strict', True))),
+    ('decodeGoodweather', '.ir_Goodweather', (('nbits', kGoodweatherBits), ('strict', True))),
+    ('decodeGree', '.ir_Gree', (('nbits', kGreeBits), ('strict', True))),
+    ('decodeHaierAC', '.ir_Haier', (('nbits', kHaierACBits), ('strict', True))),
+    ('decodeHaierACYRW02', '.ir_Haier', (('nbits', kHaierACYRW02Bits), ('strict', True))),
+    ('decodeHitachiAC', '.ir_Hitachi', (('nbits', kHitachiAcBits), ('strict', True))),
+    ('decodeHitachiAc424', '.ir_Hitachi', (('nbits', kHitachiAc424Bits), ('strict', True))),
+    ('decodeGICable', '.ir_GICable', (('nbits', kGicableBits), ('strict', True))),
+    ('decodeWhirlpoolAC', '.ir_Whirlpool', (('nbits', kWhirlpoolAcBits), ('strict', True))),
+    ('decodeLutron', '.ir_Lutron', (('nbits', kLutronBits), ('strict', True))),
+    ('decodeElectraAC', '.ir_Electra', (('nbits', kElectraAcBits), ('strict', True))),
+    ('decodePanasonicAC', '.ir_Panasonic', (('nbits', kPanasonicAcBits), ('strict', True))),
+    ('decodePioneer', '.ir_Pioneer', (('nbits', kPioneerBits), ('strict', True))),
+    ('decodeMWM', '.ir_MWM', (('nbits', 24), ('strict', True))),
+    ('decodeVestelAc', '.ir_Vestel', (('nbits', kVestelAcBits), ('strict', True))),
+    ('decodeTeco', '.ir_Teco', (('nbits', kTecoBits), ('strict', False))),
+    ('decodeLegoPf', '.ir_Lego', (('nbits', kLegoPfBits), ('strict', True))),
+    ('decodeNeoclima', '.ir_Neoclima', (('nbits', kNeoclimaBits), ('strict', True))),
+    ('decodeAmcor', '.ir_Amcor', (('nbits', kAmcorBits), ('strict', True))),
+):
+    kRegistry.registerDecoder(DecoderEntry(_name, _module, _params))
+
+
+# decode_type, module, decoder, sender, default bits, min repeats, uses a state
+for _entry in (
+    (AIWA_RC_T501, '.ir_Aiwa', 'decodeAiwaRCT501', 'sendAiwaRCT501', 15, kSingleRepeat, False),
+    (AMCOR, '.ir_Amcor', 'decodeAmcor', 'sendAmcor', 64, kSingleRepeat, True),
+    (ARGO, '.ir_Argo', 'decodeArgo', 'sendArgo', kArgoBits, kNoRepeat, True),
+    (CARRIER_AC, '.ir_Carrier', 'decodeCarrierAC', 'sendCarrierAC', 32, kNoRepeat, False),
+    (COOLIX, '.ir_Coolix', 'decodeCOOLIX', 'sendCOOLIX', 24, kSingleRepeat, False),
+    (DAIKIN, '.ir_Daikin', 'decodeDaikin', 'sendDaikin', kDaikinBits, kNoRepeat, True),
+    (DAIKIN128, '.ir_Daikin', 'decodeDaikin128', 'sendDaikin128', kDaikin128Bits, kNoRepeat, True),
+    (DAIKIN152, '.ir_Daikin', 'decodeDaikin152', 'sendDaikin152', kDaikin152Bits, kNoRepeat, True),
+    (DAIKIN160, '.ir_Daikin', 'decodeDaikin160', 'sendDaikin160', kDaikin160Bits, kNoRepeat, True),
+    (DAIKIN176, '.ir_Daikin', 'decodeDaikin176', 'sendDaikin176', kDaikin176Bits, kNoRepeat, True),
+    (DAIKIN2, '.ir_Daikin', 'decodeDaikin2', 'sendDaikin2', kDaikin2Bits, kNoRepeat, True),
+    (DAIKIN216, '.ir_Daikin', 'decodeDaikin216', 'sendDaikin216', kDaikin216Bits, kNoRepeat, True),
+    (DENON, '.ir_Denon', 'decodeDenon', 'sendDenon', 15, kNoRepeat, False),
+    (DISH, '.ir_Dish', 'decodeDISH', 'sendDISH', 16, kDishMinRepeat, False),
+    (ELECTRA_AC, '.ir_Electra', 'decodeElectraAC', 'sendElectraAC', kElectraAcBits, kNoRepeat, True),
+    (FUJITSU_AC, '.ir_Fujitsu', 'decodeFujitsuAC', 'sendFujitsuAC', 0, kNoRepeat, True),
+    (GICABLE, '.ir_GICable', 'decodeGICable', 'sendGICable', 16, kSingleRepeat, False),
+    (GLOBALCACHE, '.ir_GlobalCache', None, 'sendGC', 0, kNoRepeat, False),
+    (GOODWEATHER, '.ir_Goodweather', 'decodeGoodweather', 'sendGoodweather', 48, kNoRepeat, False),
+    (GREE, '.ir_Gree', 'decodeGree', 'sendGree', kGreeBits, kNoRepeat, True),
+    (HAIER_AC, '.ir_Haier', 'decodeHaierAC', 'sendHaierAC', kHaierACBits, kNoRepeat, True),
+    (HAIER_AC_YRW02, '.ir_Haier', 'decodeHaierACYRW02', 'sendHaierACYRW02', kHaierACYRW02Bits, kNoRepeat, True),
+    (HITACHI_AC, '.ir_Hitachi', 'decodeHitachiAC', 'sendHitachiAC', kHitachiAcBits, kNoRepeat, True),
+    (HITACHI_AC1, '.ir_Hitachi', 'decodeHitachiAC', 'sendHitachiAC1', kHitachiAc1Bits, kNoRepeat, True),
+    (HITACHI_AC2, '.ir_Hitachi', 'decodeHitachiAC', 'sendHitachiAC2', kHitachiAc2Bits, kNoRepeat, True),
+    (HITACHI_AC424, '.ir_Hitachi', 'decodeHitachiAc424', 'sendHitachiAc424', kHitachiAc424Bits, kNoRepeat, True),
+    (INAX, '.ir_Inax', 'decodeInax', 'sendInax', 24, kSingleRepeat, False),
+    (JVC, '.ir_JVC', 'decodeJVC', 'sendJVC', 16, kNoRepeat, False),
+    (KELVINATOR, '.ir_Kelvinator', 'decodeKelvinator', 'sendKelvinator', kKelvinatorBits, kNoRepeat, True),
+    (LASERTAG, '.ir_Lasertag', 'decodeLasertag', 'sendLasertag', 13, kNoRepeat, False),
+    (LEGOPF, '.ir_Lego', 'decodeLegoPf', 'sendLegoPf', 16, kNoRepeat, False),
+    (LG, '.ir_LG', 'decodeLG', 'sendLG', 28, kNoRepeat, False),
+    (LG2, '.ir_LG', 'decodeLG', 'sendLG2', 28, kNoRepeat, False),
+    (LUTRON, '.ir_Lutron', 'decodeLutron', 'sendLutron', 35, kNoRepeat, False),
+    (MAGIQUEST, '.ir_Magiquest', 'decodeMagiQuest', 'sendMagiQuest', 56, kNoRepeat, False),
+    (MIDEA, '.ir_Midea', 'decodeMidea', 'sendMidea', 48, kNoRepeat, False),
+    (MITSUBISHI, '.ir_Mitsubishi', 'decodeMitsubishi', 'sendMitsubishi', 16, kSingleRepeat, False),
+    (MITSUBISHI2, '.ir_Mitsubishi', 'decodeMitsubishi2', 'sendMitsubishi2', 16, kSingleRepeat, False),
+    (MITSUBISHI_AC, '.ir_Mitsubishi', 'decodeMitsubishiAC', 'sendMitsubishiAC', kMitsubishiACBits, kSingleRepeat, True),
+    (MITSUBISHI136, '.ir_Mitsubishi', 'decodeMitsubishi136', 'sendMitsubishi136', kMitsubishi136Bits, kNoRepeat, True),
+    (MITSUBISHI112, '.ir_Mitsubishi', 'decodeMitsubishi112', 'sendMitsubishi112', kMitsubishi112Bits, kNoRepeat, True),
+    (
+        MITSUBISHI_HEAVY_88, '.ir_MitsubishiHeavy', 'decodeMitsubishiHeavy', 'sendMitsubishiHeavy88',
+        kMitsubishiHeavy88Bits, kNoRepeat, True
+    ),
+    (
+        MITSUBISHI_HEAVY_152, '.ir_MitsubishiHeavy', 'decodeMitsubishiHeavy', 'sendMitsubishiHeavy152',
+        kMitsubishiHeavy152Bits, kNoRepeat, True
+    ),
+    (MWM, '.ir_MWM', 'decodeMWM', 'sendMWM', 0, kNoRepeat, True),
+    (NEC, '.ir_NEC', 'decodeNEC', 'sendNEC', 32, kNoRepeat, False),
+    (NEC_LIKE, '.ir_NEC', 'decodeNEC', 'sendNEC', 32, kNoRepeat, False),
+    (NEOCLIMA, '.ir_Neoclima', 'decodeNeoclima', 'sendNeoclima', kNeoclimaBits, kNoRepeat, True),
+    (NIKAI, '.ir_Nikai', 'decodeNikai', 'sendNikai', 24, kNoRepeat, False),
+    (PANASONIC, '.ir_Panasonic', 'decodePanasonic', 'sendPanasonic64', 48, kNoRepeat, False),
+    (PANASONIC_AC, '.ir_Panasonic', 'decodePanasonicAC', 'sendPanasonicAC', kPanasonicAcBits, kNoRepeat, True),
+    (PIONEER, '.ir_Pioneer', 'decodePioneer', 'sendPioneer', 64, kNoRepeat, False),
+    (PRONTO, '.ir_Pronto', None, 'sendPronto', 0, kNoRepeat, False),
+    (RC5, '.ir_RC5_RC6', 'decodeRC5', 'sendRC5', 12, kNoRepeat, False),
+    (RC5X, '.ir_RC5_RC6', 'decodeRC5', 'sendRC5', 13, kNoRepeat, False),
+    (RC6, '.ir_RC5_RC6', 'decodeRC6', 'sendRC6', 20, kNoRepeat, False),
+    (RCMM, '.ir_RCMM', 'decodeRCMM', 'sendRCMM', 24, kNoRepeat, False),
+    (SAMSUNG, '.ir_Samsung', 'decodeSAMSUNG', 'sendSAMSUNG', 32, kNoRepeat, False),
+    (SAMSUNG36, '.ir_Samsung', 'decodeSamsung36', 'sendSamsung36', 36, kNoRepeat, False),
+    (SAMSUNG_AC, '.ir_Samsung', 'decodeSamsungAC', 'sendSamsungAC', kSamsungAcBits, kNoRepeat, True),
+    (SANYO, '.ir_Sanyo', 'decodeSanyo', None, 0, kNoRepeat, False),
+    (SANYO_LC7461, '.ir_Sanyo', 'decodeSanyoLC7461', 'sendSanyoLC7461', kSanyoLC7461Bits, kNoRepeat, False),
+    (SHARP, '.ir_Sharp', 'decodeSharp', 'sendSharpRaw', 15, kNoRepeat, False),
+    (SHARP_AC, '.ir_Sharp', 'decodeSharpAc', 'sendSharpAc', kSharpAcBits, kNoRepeat, True),
+    (SHERWOOD, '.ir_Sherwood', None, 'sendSherwood', 32, kSingleRepeat, False),
+    (SONY, '.ir_Sony', 'decodeSony', 'sendSony', 20, kSonyMinRepeat, False),
+    (TCL112AC, '.ir_Tcl', 'decodeMitsubishi112', 'sendTcl112Ac', kTcl112AcBits, kNoRepeat, True),
+    (TECO, '.ir_Teco', 'decodeTeco', 'sendTeco', 35, kNoRepeat, False),
+    (TOSHIBA_AC, '.ir_Toshiba', 'decodeToshibaAC', 'sendToshibaAC', kToshibaACBits, kSingleRepeat, True),
+    (TROTEC, '.ir_Trotec', 'decodeTrotec', 'sendTrotec', kTrotecBits, kNoRepeat, True),
+    (VESTEL_AC, '.ir_Vestel', 'decodeVestelAc', 'sendVestelAc', 56, kNoRepeat, False),
+    (WHIRLPOOL_AC, '.ir_Whirlpool', 'decodeWhirlpoolAC', 'sendWhirlpoolAC', kWhirlpoolAcBits, kNoRepeat, True),
+    (WHYNTER, '.ir_Whynter', 'decodeWhynter', 'sendWhynter', 32, kNoRepeat, False),
+):
+    kRegistry.register(ProtocolEntry(*_entry))
+
+del _entry
+del _name
+del _module
+del _params
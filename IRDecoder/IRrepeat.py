@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+# Repeat frame fast path.
+#
+# Holding a button down on a lot of remotes doesn't resend the message, a short
+# repeat frame is sent instead. e.g. NEC sends a header mark, a short space &
+# a single bit mark (kNecRptLength entries). RepeatClassifier recognizes these
+# frames by their length & timings before the decode chain runs and answers
+# with the protocol, address & command of the last full message the receiver
+# decoded.
+#
+# A JVC repeat is the whole message without the header, so its data bits have
+# to be the same as the last JVC message's. Anything else is left to the
+# decoders.
+#
+# The last message is forgotten when a capture doesn't decode, e.g. another
+# remote or noise came in between.
+#
+# Sony has no repeat frame, it sends the whole message again. Those are
+# handled by the normal decoders (or IRcache).
+#
+# Timings are in uSeconds and mirror the constants of each protocol module.
+
+from .IRremoteESP8266 import *
+
+
+# Nr. of uSeconds of the repeat frame timings.
+kNecRptHdrMark = 8960    # ir_NEC.kNecHdrMark
+kNecRptSpace = 2240      # ir_NEC.kNecRptSpace
+kNecRptBitMark = 560     # ir_NEC.kNecBitMark
+kLgRptHdrMark = 8500     # ir_LG.kLgHdrMark
+kLgRptSpace = 2250       # ir_LG.kLgRptSpace
+kLgRptBitMark = 550      # ir_LG.kLgBitMark
+kJvcRptBitMark = 525     # ir_JVC.kJvcBitMark
+kJvcRptOneSpace = 1725   # ir_JVC.kJvcOneSpace
+kJvcRptZeroSpace = 525   # ir_JVC.kJvcZeroSpace
+
+
+class RepeatFrame(object):
+
+    def __init__(
+        self,
+        protocols,
+        rawlen,
+        hdrmark,
+        hdrspace,
+        footermark,
+        default=None,
+        data=None
+    ):
+        # The repeat frame of a family of protocols.
+        #
+        # Args:
+        #   protocols: decode_type_t values that use this repeat frame.
+        #   rawlen: rawlen of the repeat frame.
+        #   hdrmark: Nr. of uSeconds of the first mark.
+        #   hdrspace: Nr. of uSeconds of the first space. None to not check it.
+        #   footermark: Nr. of uSeconds of the last mark.
+        #   default: decode_type of the frame when the last message wasn't one
+        #            of the protocols. None means it is only a repeat when it
+        #            follows one of them.
+        #   data: (nbits, bitmark, onespace, zerospace) of the data bits (MSB
+        #         first) that have to be the value of the last message. None
+        #         when the frame has no data.
+        self.protocols = frozenset(protocols)
+        self.rawlen = rawlen
+        self.hdrmark = hdrmark
+        self.hdrspace = hdrspace
+        self.footermark = footermark
+        self.default = default
+        self.data = data
+
+    def restrict(self, protocols):
+        # A copy of the frame that only answers for some protocols.
+        #
+        # Args:
+        #   protocols: The enabled decode_type_t values.
+        #
+        # Returns:
+        #   The RepeatFrame or None if none of its protocols are enabled.
+        enabled = self.protocols.intersection(protocols)
+        if not enabled:
+            return None
+
+        default = self.default
+        if default not in enabled:
+            default = None
+
+        return RepeatFrame(
+            enabled,
+            self.rawlen,
+            self.hdrmark,
+            self.hdrspace,
+            self.footermark,
+            default=default,
+            data=self.data
+        )
+
+    def match(self, irrecv, rawbuf, value=None):
+        # Args:
+        #   value: The value of the last message. Only used by data frames.
+        if not irrecv.matchMark(rawbuf[1], self.hdrmark):
+            return False
+
+        if self.hdrspace is not None and not irrecv.matchSpace(rawbuf[2], self.hdrspace):
+            return False
+
+        if self.data is not None and not self._matchData(irrecv, rawbuf, value):
+            return False
+
+        return irrecv.matchMark(rawbuf[self.rawlen - 1], self.footermark)
+
+    def _matchData(self, irrecv, rawbuf, value):
+        if value is None:
+            return False
+
+        nbits, bitmark, onespace, zerospace = self.data
+        offset = 1 if self.hdrspace is None else 3
+        data = 0
+
+        for _ in range(nbits):
+            if not irrecv.matchMark(rawbuf[offset], bitmark):
+                return False
+
+            if irrecv.matchSpace(rawbuf[offset + 1], onespace):
+                data = (data << 1) | 1
+            elif irrecv.matchSpace(rawbuf[offset + 1], zerospace):
+                data <<= 1
+            else:
+                return False
+
+            offset += 2
+
+        return data == value
+
+
+kRepeatFrames = (
+    # LG is checked before NEC because its header is within the NEC
+    # tolerance, but only when the last message was a LG one.
+    RepeatFrame(
+        (LG, LG2),
+        4,
+        kLgRptHdrMark,
+        kLgRptSpace,
+        kLgRptBitMark
+    ),
+    RepeatFrame(
+        (NEC, NEC_LIKE, GICABLE, AIWA_RC_T501, SANYO_LC7461),
+        4,  # kNecRptLength
+        kNecRptHdrMark,
+        kNecRptSpace,
+        kNecRptBitMark,
+        default=NEC
+    ),
+    # A JVC repeat is the message without the header.
+    RepeatFrame(
+        (JVC,),
+        2 * kJvcBits + 2,
+        kJvcRptBitMark,
+        None,
+        kJvcRptBitMark,
+        data=(kJvcBits, kJvcRptBitMark, kJvcRptOneSpace, kJvcRptZeroSpace)
+    ),
+)
+
+
+class RepeatClassifier(object):
+
+    def __init__(self, frames=kRepeatFrames, repeat_value=0xFFFFFFFFFFFFFFFF):
+        # Args:
+        #   frames: The RepeatFrame entries to look for.
+        #   repeat_value: The value to give a repeat. (IRrecv.kRepeat, UINT64_MAX)
+        self._all_frames = tuple(frames)
+        self._frames = {}
+        self._repeat_value = repeat_value
+        # decode_type, address, command, value of the last full message.
+        self._last = None
+        self.setProtocols(None)
+
+    def setProtocols(self, protocols=None):
+        # Only recognize the repeat frames of some protocols.
+        #
+        # Args:
+        #   protocols: An iterable of decode_type_t values. None enables every
+        #              protocol.
+        frames = self._all_frames
+        if protocols is not None:
+            protocols = frozenset(protocols)
+            frames = [frame.restrict(protocols) for frame in frames]
+
+        self._frames = {}
+        for frame in frames:
+            if frame is not None:
+                self._frames.setdefault(frame.rawlen, []).append(frame)
+
+    def rawlens(self):
+        # The lengths of the repeat frames that are looked for.
+        return frozenset(self._frames)
+
+    def reset(self):
+        # Forget the last message.
+        self._last = None
+
+    def update(self, results):
+        # Remember a decoded (full) message. Anything that didn't decode
+        # (UNKNOWN) is forgotten as well, a repeat frame after it isn't a
+        # repeat of the message before it.
+        if results.repeat:
+            return
+
+        if results.decode_type in (UNKNOWN, None):
+            self._last = None
+            return
+
+        self._last = (
+            results.decode_type,
+            results.address,
+            results.command,
+            results.value
+        )
+
+    def classify(self, irrecv, results):
+        # Check if a capture is a repeat frame & fill in results if it is.
+        #
+        # Returns:
+        #   True if it is a repeat frame.
+        frames = self._frames.get(results.rawlen, None)
+        if frames is None:
+            return False
+
+        last = self._last
+        for frame in frames:
+            if last is not None and last[0] in frame.protocols:
+                decode_type, address, command, value = last
+            elif frame.default is not None:
+                decode_type, address, command, value = frame.default, 0, 0, None
+            else:
+                continue
+
+            if not frame.match(irrecv, results.rawbuf, value):
+                continue
+
+            results.decode_type = decode_type
+            results.value = self._repeat_value
+            results.address = address
+            results.command = command
+            results.bits = 0
+            results.repeat = True
+            return True
+
+        return False
@@ -12,6 +12,9 @@
 
 from .IRremoteESP8266 import *
 from .IRtimer import *
+from .IRregistry import kRegistry
+from .IRbackend import LEDBackend, RecordingBackend, BackendTimer
+from .IRwaveform import Waveform, waveformKey
 
 # Constants
 # Offset (in microseconds) to use in Period time calculations to account for
@@ -131,7 +134,7 @@ class lg_ac_remote_model_t(object):
 
 
 class IRsend(object):
-    def __init__(self, ir_pin, inverted=False, use_modulation=True):
+    def __init__(self, ir_pin, inverted=False, use_modulation=True, backend=None):
         # IRsend ----------------------------------------------------------------------
         # Create an IRsend object.
         #
@@ -145,6 +148,8 @@ class IRsend(object):
         #   use_modulation: Do we do frequency modulation during transmission?
         #                   i.e. If not, assume a 100% duty cycle. Ignore attempts
         #                        to change the duty cycle etc.
+        #   backend:    Where the marks & spaces go. (IRbackend)
+        #               Default is a LEDBackend that drives ir_pin.
         # Returns:
         #   An IRsend object.
         
@@ -164,7 +169,34 @@ class IRsend(object):
             self._dutycycle = kDutyDefault
         else:
             self._dutycycle = kDutyMax
-    
+
+        if backend is None:
+            backend = LEDBackend(self)
+
+        self._backend = backend
+        self._waveforms = None
+
+    def set_backend(self, backend):
+        # Set the IRbackend.OutputBackend the output goes to.
+        self._backend = backend
+
+    def get_backend(self):
+        return self._backend
+
+    def set_waveform_cache(self, cache=None):
+        # Set the IRwaveform.WaveformCache send() keeps rendered messages in.
+        # None turns caching off. A cache can be shared between instances.
+        self._waveforms = cache
+
+    def get_waveform_cache(self):
+        return self._waveforms
+
+    def timer(self):
+        # Get an IRtimer that runs on the clock of the backend.
+        # Use this to time messages instead of IRtimer, a RecordingBackend
+        # has a virtual clock.
+        return BackendTimer(self._backend)
+
     def begin(self):
         # Enable the pin for output.
         # pinMode(self.ir_pin, OUTPUT)
@@ -197,6 +229,7 @@ class IRsend(object):
         self.on_time_period = (period * self._dutycycle) / kDutyMax
         # Nr. of uSeconds the LED will be off per pulse.
         self.off_time_period = period - self.on_time_period
+        self._backend.enable(freq, self._dutycycle)
     
     @staticmethod
     def _delay_microseconds(usec):
@@ -207,11 +240,10 @@ class IRsend(object):
         #
         # NOTE: Use this only if you know what you are doing as it may cause the WDT
         #       to reset the ESP8266.
-
-        while usec > kMaxAccurateUsecDelay:
-            delay_microseconds(kMaxAccurateUsecDelay)
-            delay_microseconds(usec)
-            usec -= kMaxAccurateUsecDelay
+        #
+        # The delay engine (IRtimer.kDelay) sleeps for most of a long delay,
+        # so it doesn't have to be split up like on the ESP8266.
+        delay_microseconds(usec)
     
     def mark(self, usec):
         # Modulate the IR LED for the given period (usec) and at the duty cycle set.
@@ -222,48 +254,9 @@ class IRsend(object):
         #   Nr. of pulses actually sent.
         #
         # Note:
-        #   The ESP8266 has no good way to do hardware PWM, so we have to do it all
-        #   in software. There is a horrible kludge/brilliant hack to use the second
-        #   serial TX line to do fairly accurate hardware PWM, but it is only
-        #   available on a single specific GPIO and only available on some modules.
-        #   e.g. It's not available on the ESP-01 module.
-        #   Hence, for greater compatibility & choice, we don't use that method.
-        # Ref:
-        #   https:#www.analysir.com/blog/2017/01/29/updated-esp8266-nodemcu-backdoor-upwm-hack-for-ir-signals/
-
-        # Handle the simple case of no required frequency modulation.
-        if not self.modulation or self._dutycycle >= 100:
-            self.led_on()
-            self._delay_microseconds(usec)
-            self.led_off()
-            return 1
-
-        # Not simple, so do it assuming frequency modulation.
-        counter = 0
-        usec_timer = IRtimer()
-        # Cache the time taken so far. This saves us calling time, and we can be
-        # assured that we can't have odd math problems. i.e. unsigned under/overflow.
-        elapsed = usec_timer.elapsed()
-
-        while elapsed < usec:  # Loop until we've met/exceeded our required time.
-            self.led_on()
-
-            # Calculate how long we should pulse on for.
-            # e.g. Are we to close to the end of our requested mark time (usec)?
-            self._delay_microseconds(min(self.on_time_period, usec - elapsed))
-            self.led_off()
-            counter += 1
-
-            if elapsed + self.on_time_period >= usec:
-                return counter  # LED is now off & we've passed our allotted time.
-            # Wait for the lesser of the rest of the duty cycle, or the time remaining.
-            self._delay_microseconds(
-                min(usec - elapsed - self.on_time_period, self.off_time_period)
-            )
-            elapsed = usec_timer.elapsed()  # Update & recache the actual elapsed time.
-
-        return counter
-    
+        #   The output is done by the backend. See IRbackend.LEDBackend.mark()
+        return self._backend.mark(usec)
+
     def space(self, usec):
         # Turn the pin (LED) off for a given time.
         # Sends an IR space for the specified number of microseconds.
@@ -271,13 +264,8 @@ class IRsend(object):
         #
         # Args:
         #   time: Time in microseconds (us).
-        self.led_off()
-
-        if usec == 0:
-            return
+        self._backend.space(usec)
 
-        self._delay_microseconds(usec)
-    
     def calibrate(self, hz=38000):
         # Calculate & set any offsets to account for execution times.
         #
@@ -299,7 +287,7 @@ class IRsend(object):
         self.period_offset = 0  # Turn off any existing offset while we calibrate.
         self.enable_ir_out(hz)
 
-        usec_timer = IRtimer()  # Start a timer *just* before we do the call.
+        usec_timer = self.timer()  # Start a timer *just* before we do the call.
         pulses = self.mark(UINT16_MAX)  # Generate a PWM of 65,535 us. (Max.)
         time_taken = usec_timer.elapsed()  # Record the time it took.
 
@@ -379,7 +367,7 @@ class IRsend(object):
 
         if msb_first:  # Send the MSB first.
             # Send 0's until we get down to a bit size we can actually manage.
-            while nbits > len(data) * 8:
+            while nbits > 64:
                 self.mark(zero_mark)
                 self.space(zero_space)
                 nbits -= 1
@@ -408,71 +396,6 @@ class IRsend(object):
 
                 data >>= 1
     
-    def send_generic(
-        self,
-        header_mark, 
-        header_space, 
-        one_mark, 
-        one_space, 
-        zero_mark, 
-        zero_space, 
-        footer_mark, 
-        gap, 
-        data, 
-        nbits, 
-        frequency, 
-        msb_first, 
-        repeat, 
-        duty_cycle
-    ):
-        # Generic method for sending simple protocol messages.
-        # Will send leading or trailing 0's if the nbits is larger than the number
-        # of bits in data.
-        #
-        # Args:
-        #   headermark:  Nr. of usecs for the led to be pulsed for the header mark.
-        #                A value of 0 means no header mark.
-        #   headerspace: Nr. of usecs for the led to be off after the header mark.
-        #                A value of 0 means no header space.
-        #   onemark:     Nr. of usecs for the led to be pulsed for a '1' bit.
-        #   onespace:    Nr. of usecs for the led to be fully off for a '1' bit.
-        #   zeromark:    Nr. of usecs for the led to be pulsed for a '0' bit.
-        #   zerospace:   Nr. of usecs for the led to be fully off for a '0' bit.
-        #   footermark:  Nr. of usecs for the led to be pulsed for the footer mark.
-        #                A value of 0 means no footer mark.
-        #   gap:         Nr. of usecs for the led to be off after the footer mark.
-        #                This is effectively the gap between messages.
-        #                A value of 0 means no gap space.
-        #   data:        The data to be transmitted.
-        #   nbits:       Nr. of bits of data to be sent.
-        #   frequency:   The frequency we want to modulate at.
-        #                Assumes < 1000 means kHz otherwise it is in Hz.
-        #                Most common value is 38000 or 38, for 38kHz.
-        #   MSBfirst:    Flag for bit transmission order. Defaults to MSB->LSB order.
-        #   repeat:      Nr. of extra times the message will be sent.
-        #                e.g. 0 = 1 message sent, 1 = 1 initial + 1 repeat = 2 messages
-        #   dutycycle:   Percentage duty cycle of the LED.
-        #                e.g. 25 = 25% = 1/4 on, 3/4 off.
-        #                If you are not sure, try 50 percent.
-
-        self.send_generic(
-            header_mark,
-            header_space,
-            one_mark,
-            one_space,
-            zero_mark,
-            zero_space,
-            footer_mark,
-            gap,
-            0,
-            data,
-            nbits,
-            frequency,
-            msb_first,
-            repeat,
-            duty_cycle
-        )
-
     def send_generic(
         self,
         header_mark,
@@ -483,18 +406,17 @@ class IRsend(object):
         zero_space,
         footer_mark,
         gap,
-        mesg_time,
-        data,
-        nbits,
-        frequency,
-        msb_first,
-        repeat,
-        duty_cycle
+        *args
     ):
         # Generic method for sending simple protocol messages.
         # Will send leading or trailing 0's if the nbits is larger than the number
         # of bits in data.
         #
+        # The 3 IRsend::sendGeneric() overloads of the C++ code in one:
+        #   send_generic(..., gap, data, nbits, frequency, MSBfirst, repeat, dutycycle)
+        #   send_generic(..., gap, mesgtime, data, nbits, frequency, MSBfirst, repeat, dutycycle)
+        #   send_generic(..., gap, dataptr, nbytes, frequency, MSBfirst, repeat, dutycycle)
+        #
         # Args:
         #   headermark:  Nr. of usecs for the led to be pulsed for the header mark.
         #                A value of 0 means no header mark.
@@ -510,8 +432,10 @@ class IRsend(object):
         #                This is effectively the absolute minimum gap between messages.
         #   mesgtime:    Min. nr. of usecs a single message needs to be.
         #                This is effectively the min. total length of a single message.
-        #   data:        The data to be transmitted.
-        #   nbits:       Nr. of bits of data to be sent.
+        #                (Optional, default 0)
+        #   data:        The data to be transmitted. An int, or for dataptr a
+        #                sequence of bytes.
+        #   nbits:       Nr. of bits of data to be sent. (nbytes for dataptr)
         #   frequency:   The frequency we want to modulate at.
         #                Assumes < 1000 means kHz otherwise it is in Hz.
         #                Most common value is 38000 or 38, for 38kHz.
@@ -521,13 +445,20 @@ class IRsend(object):
         #   dutycycle:   Percentage duty cycle of the LED.
         #                e.g. 25 = 25% = 1/4 on, 3/4 off.
         #                If you are not sure, try 50 percent.
+        if len(args) == 7:
+            mesg_time = args[0]
+            args = args[1:]
+        else:
+            mesg_time = 0
+
+        data, nbits, frequency, msb_first, repeat, duty_cycle = args
 
         # Setup
         self.enable_ir_out(frequency, duty_cycle)
-        usecs = IRtimer()
+        usecs = self.timer()
 
-        # We always send a message, even for repeat=0, hence '<= repeat'.
-        for _ in range(repeat):
+        # We always send a message, even for repeat=0, hence 'repeat + 1'.
+        for _ in range(repeat + 1):
             usecs.reset()
 
             # Header
@@ -537,7 +468,19 @@ class IRsend(object):
                 self.space(header_space)
 
             # Data
-            self.send_data(one_mark, one_space, zero_mark, zero_space, data, nbits, msb_first)
+            if isinstance(data, int):
+                self.send_data(one_mark, one_space, zero_mark, zero_space, data, nbits, msb_first)
+            else:
+                for ii in range(nbits):
+                    self.send_data(
+                        one_mark,
+                        one_space,
+                        zero_mark,
+                        zero_space,
+                        data[ii],
+                        8,
+                        msb_first
+                    )
 
             # Footer
             if footer_mark:
@@ -549,80 +492,6 @@ class IRsend(object):
                 self.space(gap)
             else:
                 self.space(max(gap, mesg_time - elapsed))
-    
-    def send_generic(
-        self,
-        header_mark,
-        header_space,
-        one_mark,
-        one_space,
-        zero_mark,
-        zero_space,
-        footer_mark,
-        gap,
-        dataptr,
-        nbytes,
-        frequency,
-        msb_first,
-        repeat, 
-        duty_cycle
-    ):
-        # Generic method for sending simple protocol messages.
-        #
-        # Args:
-        #   headermark:  Nr. of usecs for the led to be pulsed for the header mark.
-        #                A value of 0 means no header mark.
-        #   headerspace: Nr. of usecs for the led to be off after the header mark.
-        #                A value of 0 means no header space.
-        #   onemark:     Nr. of usecs for the led to be pulsed for a '1' bit.
-        #   onespace:    Nr. of usecs for the led to be fully off for a '1' bit.
-        #   zeromark:    Nr. of usecs for the led to be pulsed for a '0' bit.
-        #   zerospace:   Nr. of usecs for the led to be fully off for a '0' bit.
-        #   footermark:  Nr. of usecs for the led to be pulsed for the footer mark.
-        #                A value of 0 means no footer mark.
-        #   gap:         Nr. of usecs for the led to be off after the footer mark.
-        #                This is effectively the gap between messages.
-        #                A value of 0 means no gap space.
-        #   dataptr:     Pointer to the data to be transmitted.
-        #   nbytes:      Nr. of bytes of data to be sent.
-        #   frequency:   The frequency we want to modulate at.
-        #                Assumes < 1000 means kHz otherwise it is in Hz.
-        #                Most common value is 38000 or 38, for 38kHz.
-        #   MSBfirst:    Flag for bit transmission order. Defaults to MSB->LSB order.
-        #   repeat:      Nr. of extra times the message will be sent.
-        #                e.g. 0 = 1 message sent, 1 = 1 initial + 1 repeat = 2 messages
-        #   dutycycle:   Percentage duty cycle of the LED.
-        #                e.g. 25 = 25% = 1/4 on, 3/4 off.
-        #                If you are not sure, try 50 percent.
-
-        # Setup
-        self.enable_ir_out(frequency, duty_cycle)
-
-        # We always send a message, even for repeat=0, hence '<= repeat'.
-        for _ in range(repeat):
-            # Header
-            if header_mark:
-                self.mark(header_mark)
-            if header_space:
-                self.space(header_space)
-
-            # Data
-            for ii in range(nbytes):
-                self.send_data(
-                    one_mark,
-                    one_space,
-                    zero_mark,
-                    zero_space,
-                    (dataptr + ii),
-                    8,
-                    msb_first
-                )
-
-            # Footer
-            if footer_mark:
-                self.mark(footer_mark)
-
-            self.space(gap)
 
     @staticmethod
     def min_repeats(protocol):
@@ -631,28 +500,7 @@ class IRsend(object):
         #   protocol:  Protocol number/type of the message you want to send.
         # Returns:
         #   int16_t:  The number of repeats required.
-
-        # Single repeats
-        if protocol in (
-            AIWA_RC_T501,
-            AMCOR,
-            COOLIX,
-            GICABLE,
-            INAX,
-            MITSUBISHI,
-            MITSUBISHI2,
-            MITSUBISHI_AC,
-            SHERWOOD,
-            TOSHIBA_AC
-        ):
-            return kSingleRepeat
-        # Special
-        if protocol == DISH:
-            return kDishMinRepeat
-        if protocol == SONY:
-            return kSonyMinRepeat
-
-        return kNoRepeat
+        return kRegistry.minRepeats(protocol)
 
     @staticmethod
     def default_bits(protocol):
@@ -661,270 +509,108 @@ class IRsend(object):
         #   protocol:  Protocol number/type you want the default nr. of bits for.
         # Returns:
         #   int16_t:  The number of bits.
-        if protocol == RC5:
-            return 12
-        if protocol in (LASERTAG, RC5X):
-            return 13
-        if protocol in (AIWA_RC_T501, DENON, SHARP):
-            return 15
-        if protocol in (DISH, GICABLE, JVC, LEGOPF, MITSUBISHI, MITSUBISHI2):
-            return 16
-        if protocol in (RC6, SONY):
-            return 20
-        if protocol in (COOLIX, INAX, NIKAI, RCMM):
-            return 24
-        if protocol in (LG, LG2):
-            return 28
-        if protocol in (CARRIER_AC, NEC, NEC_LIKE, SAMSUNG, SHERWOOD, WHYNTER):
-            return 32
-        if protocol in (LUTRON, TECO):
-            return 35
-        if protocol == SAMSUNG36:
-            return 36
-        if protocol == SANYO_LC7461:
-            return kSanyoLC7461Bits  # 42
-        if protocol in (GOODWEATHER, MIDEA, PANASONIC):
-            return 48
-        if protocol in (MAGIQUEST, VESTEL_AC):
-            return 56
-        if protocol in (AMCOR, PIONEER):
-            return 64
-        if protocol == ARGO:
-            return kArgoBits
-        if protocol == DAIKIN:
-            return kDaikinBits
-        if protocol == DAIKIN128:
-            return kDaikin128Bits
-        if protocol == DAIKIN152:
-            return kDaikin152Bits
-        if protocol == DAIKIN160:
-            return kDaikin160Bits
-        if protocol == DAIKIN176:
-            return kDaikin176Bits
-        if protocol == DAIKIN2:
-            return kDaikin2Bits
-        if protocol == DAIKIN216:
-            return kDaikin216Bits
-        if protocol == ELECTRA_AC:
-            return kElectraAcBits
-        if protocol == GREE:
-            return kGreeBits
-        if protocol == HAIER_AC:
-            return kHaierACBits
-        if protocol == HAIER_AC_YRW02:
-            return kHaierACYRW02Bits
-        if protocol == HITACHI_AC:
-            return kHitachiAcBits
-        if protocol == HITACHI_AC1:
-            return kHitachiAc1Bits
-        if protocol == HITACHI_AC2:
-            return kHitachiAc2Bits
-        if protocol == HITACHI_AC424:
-            return kHitachiAc424Bits
-        if protocol == KELVINATOR:
-            return kKelvinatorBits
-        if protocol == MITSUBISHI_AC:
-            return kMitsubishiACBits
-        if protocol == MITSUBISHI136:
-            return kMitsubishi136Bits
-        if protocol == MITSUBISHI112:
-            return kMitsubishi112Bits
-        if protocol == MITSUBISHI_HEAVY_152:
-            return kMitsubishiHeavy152Bits
-        if protocol == MITSUBISHI_HEAVY_88:
-            return kMitsubishiHeavy88Bits
-        if protocol == NEOCLIMA:
-            return kNeoclimaBits
-        if protocol == PANASONIC_AC:
-            return kNeoclimaBits
-        if protocol == SAMSUNG_AC:
-            return kSamsungAcBits
-        if protocol == SHARP_AC:
-            return kSharpAcBits
-        if protocol == TCL112AC:
-            return kTcl112AcBits
-        if protocol == TOSHIBA_AC:
-            return kToshibaACBits
-        if protocol == TROTEC:
-            return kTrotecBits
-        if protocol == WHIRLPOOL_AC:
-            return kWhirlpoolAcBits
-
-        # No default amount of bits.
-        if protocol in (FUJITSU_AC, MWM):
-            return 0
-
-        return 0
+        return kRegistry.defaultBits(protocol)
 
     def send(self, _type, data, nbits, repeat=kNoRepeat):
-        # Send a simple (up to 64 bits) IR message of a given type.
+        # Send an IR message of a given type.
         # An unknown/unsupported type will do nothing.
         # Args:
         #   type:  # Protocol number/type of the message you want to send.
-        #   data:  The data you want to send (up to 64 bits).
-        #   nbits: How many bits long the message is to be.
-        #   repeat: How many repeats to do?
+        #   data:  The data you want to send (up to 64 bits), or for protocols
+        #          that use a state, the list of bytes that make up the state.
+        #   nbits: How many bits long the message is to be, or how many bytes
+        #          are in the state.
+        #   repeat: How many repeats to do? At least the protocol's minimum
+        #           nr. of repeats are done, states included.
         # Returns:
         #   bool: True if it is a type we can attempt to send, False if not.
-        min_repeat = max(self.min_repeats(_type), repeat)
-
-        if _type == AIWA_RC_T501:
-            self.sendAiwaRCT501(data, nbits, min_repeat)
-        elif _type == CARRIER_AC:
-            self.sendCarrierAC(data, nbits, min_repeat)
-        elif _type == COOLIX:
-            self.sendCOOLIX(data, nbits, min_repeat)
-        elif _type == DENON:
-            self.sendDenon(data, nbits, min_repeat)
-        elif _type == DISH:
-            self.sendDISH(data, nbits, min_repeat)
-        elif _type == GICABLE:
-            self.sendGICable(data, nbits, min_repeat)
-        elif _type == GOODWEATHER:
-            self.sendGoodweather(data, nbits, min_repeat)
-        elif _type == GREE:
-            self.sendGree(data, nbits=nbits, repeat=min_repeat)
-        elif _type == INAX:
-            self.sendInax(data, nbits, min_repeat)
-        elif _type == JVC:
-            self.sendJVC(data, nbits, min_repeat)
-        elif _type == LASERTAG:
-            self.sendLasertag(data, nbits, min_repeat)
-        elif _type == LEGOPF:
-            self.sendLegoPf(data, nbits, min_repeat)
-        elif _type == LG:
-            self.sendLG(data, nbits, min_repeat)
-        elif _type == LG2:
-            self.sendLG2(data, nbits, min_repeat)
-        elif _type == LUTRON:
-            self.sendLutron(data, nbits, min_repeat)
-        elif _type == MAGIQUEST:
-            self.sendMagiQuest(data, nbits, min_repeat)
-        elif _type == MIDEA:
-            self.sendMidea(data, nbits, min_repeat)
-        elif _type == MITSUBISHI:
-            self.sendMitsubishi(data, nbits, min_repeat)
-        elif _type == MITSUBISHI2:
-            self.sendMitsubishi2(data, nbits, min_repeat)
-        elif _type == NIKAI:
-            self.sendNikai(data, nbits, min_repeat)
-        elif _type == NEC:
-            self.sendNEC(data, nbits, min_repeat)
-        elif _type == NEC_LIKE:
-            self.sendNEC(data, nbits, min_repeat)
-        elif _type == PANASONIC:
-            self.sendPanasonic64(data, nbits, min_repeat)
-        elif _type == PIONEER:
-            self.sendPioneer(data, nbits, min_repeat)
-        elif _type == RC5:
-            self.sendRC5(data, nbits, min_repeat)
-        elif _type == RC5X:
-            self.sendRC5(data, nbits, min_repeat)
-        elif _type == RC6:
-            self.sendRC6(data, nbits, min_repeat)
-        elif _type == RCMM:
-            self.sendRCMM(data, nbits, min_repeat)
-        elif _type == SAMSUNG:
-            self.sendSAMSUNG(data, nbits, min_repeat)
-        elif _type == SAMSUNG36:
-            self.sendSamsung36(data, nbits, min_repeat)
-        elif _type == SANYO_LC7461:
-            self.sendSanyoLC7461(data, nbits, min_repeat)
-        elif _type == SHARP:
-            self.sendSharpRaw(data, nbits, min_repeat)
-        elif _type == SHERWOOD:
-            self.sendSherwood(data, nbits, min_repeat)
-        elif _type == SONY:
-            self.sendSony(data, nbits, min_repeat)
-        elif _type == TECO:
-            self.sendTeco(data, nbits, min_repeat)
-        elif _type == VESTEL_AC:
-            self.sendVestelAc(data, nbits, min_repeat)
-        elif _type == WHYNTER:
-            self.sendWhynter(data, nbits, min_repeat)
-        else:
+        if self._waveforms is None:
+            call = self._sender_call(_type, data, nbits, repeat)
+            if call is None:
+                return False
+
+            sender, args, _ = call
+            sender(*args)
+            return True
+
+        waveform = self.waveform(_type, data, nbits, repeat)
+        if waveform is None:
             return False
 
+        self.send_waveform(waveform)
         return True
 
-    def send(self, _type, state, nbytes):
-        # Send a complex (>= 64 bits) IR message of a given type.
-        # An unknown/unsupported type will do nothing.
+    def _sender_call(self, _type, data, nbits, repeat):
+        # Get the (sender, args, repeat) send() calls for a message or None if
+        # the protocol can't be sent.
+        sender = kRegistry.sender(self, _type)
+        if sender is None:
+            return None
+
+        repeat = max(self.min_repeats(_type), repeat)
+        return sender, (data, nbits, repeat), repeat
+
+    def waveform(self, _type, data, nbits, repeat=kNoRepeat):
+        # Get the rendered message send() would send. The waveform cache is
+        # used when one is set.
+        #
         # Args:
-        #   type: # Protocol number type of the message you want to send.
-        #   state:  A pointer to the array of bytes that make up the state[].
-        #   nbytes: How many bytes are in the state.
+        #   See send().
         # Returns:
-        #   bool: True if it is a type we can attempt to send, False if not.
-        if _type == AMCOR:
-            self.sendAmcor(state, nbytes)
-        elif _type == ARGO:
-            self.sendArgo(state, nbytes)
-        elif _type == DAIKIN:
-            self.sendDaikin(state, nbytes)
-        elif _type == DAIKIN128:
-            self.sendDaikin128(state, nbytes)
-        elif _type == DAIKIN152:
-            self.sendDaikin152(state, nbytes)
-        elif _type == DAIKIN160:
-            self.sendDaikin160(state, nbytes)
-        elif _type == DAIKIN176:
-            self.sendDaikin176(state, nbytes)
-        elif _type == DAIKIN2:
-            self.sendDaikin2(state, nbytes)
-        elif _type == DAIKIN216:
-            self.sendDaikin216(state, nbytes)
-        elif _type == ELECTRA_AC:
-            self.sendElectraAC(state, nbytes)
-        elif _type == FUJITSU_AC:
-            self.sendFujitsuAC(state, nbytes)
-        elif _type == GREE:
-            self.sendGree(state, nbytes=nbytes)
-        elif _type == HAIER_AC:
-            self.sendHaierAC(state, nbytes)
-        elif _type == HAIER_AC_YRW02:
-            self.sendHaierACYRW02(state, nbytes)
-        elif _type == HITACHI_AC:
-            self.sendHitachiAC(state, nbytes)
-        elif _type == HITACHI_AC1:
-            self.sendHitachiAC1(state, nbytes)
-        elif _type == HITACHI_AC2:
-            self.sendHitachiAC2(state, nbytes)
-        elif _type == HITACHI_AC424:
-            self.sendHitachiAc424(state, nbytes)
-        elif _type == KELVINATOR:
-            self.sendKelvinator(state, nbytes)
-        elif _type == MITSUBISHI_AC:
-            self.sendMitsubishiAC(state, nbytes)
-        elif _type == MITSUBISHI136:
-            self.sendMitsubishi136(state, nbytes)
-        elif _type == MITSUBISHI112:
-            self.sendMitsubishi112(state, nbytes)
-        elif _type == MITSUBISHI_HEAVY_88:
-            self.sendMitsubishiHeavy88(state, nbytes)
-        elif _type == MITSUBISHI_HEAVY_152:
-            self.sendMitsubishiHeavy152(state, nbytes)
-        elif _type == MWM:
-            self.sendMWM(state, nbytes)
-        elif _type == NEOCLIMA:
-            self.sendNeoclima(state, nbytes)
-        elif _type == PANASONIC_AC:
-            self.sendPanasonicAC(state, nbytes)
-        elif _type == SAMSUNG_AC:
-            self.sendSamsungAC(state, nbytes)
-        elif _type == SHARP_AC:
-            self.sendSharpAc(state, nbytes)
-        elif _type == TCL112AC:
-            self.sendTcl112Ac(state, nbytes)
-        elif _type == TOSHIBA_AC:
-            self.sendToshibaAC(state, nbytes)
-        elif _type == TROTEC:
-            self.sendTrotec(state, nbytes)
-        elif _type == WHIRLPOOL_AC:
-            self.sendWhirlpoolAC(state, nbytes)
-        else:
-            return False
-        return True
+        #   An IRwaveform.Waveform or None if the protocol can't be sent.
+        call = self._sender_call(_type, data, nbits, repeat)
+        if call is None:
+            return None
+
+        sender, args, repeat = call
+        cache = self._waveforms
+        key = None
+        if cache is not None:
+            key = waveformKey(_type, data, nbits, repeat, self.modulation)
+
+        if key is None:
+            return self.render_waveform(sender, *args)
+
+        waveform = cache.get(key)
+        if waveform is None:
+            waveform = self.render_waveform(sender, *args)
+            cache.put(key, waveform)
+
+        return waveform
+
+    def render_waveform(self, sender, *args):
+        # Render a message without sending it.
+        #
+        # Args:
+        #   sender: The send function/method. e.g. self.sendNEC
+        #   args: The arguments for sender.
+        # Returns:
+        #   An IRwaveform.Waveform.
+        backend = self._backend
+        recording = RecordingBackend()
+        self._backend = recording
+
+        try:
+            sender(*args)
+        finally:
+            self._backend = backend
+
+        return Waveform(recording.frequency, recording.duty, recording.pairs())
+
+    def send_waveform(self, waveform, gap=True):
+        # Send a rendered message. (See render_waveform())
+        #
+        # Args:
+        #   waveform: An IRwaveform.Waveform.
+        #   gap: Also wait out the space the message ends with.
+        self.enable_ir_out(waveform.frequency, waveform.duty)
+
+        pairs = waveform.pairs
+        if not gap:
+            pairs = pairs[:len(pairs) - 2 * (waveform.gap > 0)]
+
+        self._backend.play(pairs)
+        self.led_off()
 
     def sendNEC(self, data, nbits=kNECBits, repeat=kNoRepeat):
         pass
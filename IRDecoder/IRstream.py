@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+# Streaming decoder.
+#
+# IRrecv only decodes a message once the receiver has seen no signal for
+# kTimeoutMs (or longer for some A/C units). IRrecvStream is fed the
+# mark/space durations as they come in and commits a message as soon as the
+# last mark of a complete message has arrived.
+#
+# A message is committed early when it is a repeat frame (IRrepeat), or when:
+#   * The capture is exactly as long as a complete message of one of the
+#     protocols whose header fits it (IRindex.DecodeCandidate.max_rawlen).
+#   * A decoder matches it.
+#   * Every decoder that comes before that one in the decode chain and whose
+#     header also fits has already seen all the entries it could need.
+# Anything else is decoded when the gap reaches the timeout, same as IRrecv.
+# e.g. A NEC message has to wait for the gap, as the longer Aiwa, Sanyo LC7461
+# & Pioneer messages start the same way and have precedence over it.
+#
+# Early commits go through the repeat fast path, the decode cache & the
+# decoders the same way IRrecv.decode() does, so a committed message decodes
+# the same as its capture would have.
+
+from array import array
+
+from .IRremoteESP8266 import *
+from .IRrecv import *
+
+
+# Largest value a capture buffer entry can hold.
+kMaxRawEntry = 0xFFFF
+
+
+class IRrecvStream(object):
+
+    def __init__(self, irrecv=None, timeout=None):
+        # Args:
+        #   irrecv: The IRrecv instance to decode with. (Def: a new IRrecv)
+        #   timeout: Nr. of milli-Seconds of no signal before a message ends.
+        #            (Def: the IRrecv timeout)
+        if irrecv is None:
+            irrecv = IRrecv(0)
+
+        if timeout is None:
+            timeout = irrecv.irparams.timeout
+
+        self._irrecv = irrecv
+        self._timeout = MS_TO_USEC(timeout) // kRawTick
+        self._rawbuf = array('H', [0])
+        # The space following an early committed message is the gap before
+        # the next one.
+        self._await_gap = False
+        self._frame = None
+        self._commit_lengths = None
+
+    def feed(self, durations):
+        # Add received durations to the stream.
+        #
+        # Args:
+        #   durations: An iterable of uSeconds. Marks & spaces alternate and a
+        #              stream always starts with a mark.
+        # Returns:
+        #   A generator of decode_results, one for every message completed by
+        #   these durations. A message that isn't complete yet is kept until
+        #   the next call.
+        for usecs in durations:
+            ticks = min(int(usecs) // kRawTick, kMaxRawEntry)
+
+            if self._await_gap:
+                self._await_gap = False
+                self._rawbuf[0] = ticks
+                continue
+
+            rawlen = len(self._rawbuf)
+
+            # Marks are at odd indexes, spaces at even ones.
+            if not rawlen % 2 and ticks >= self._timeout:
+                results = self._finish()
+                self._rawbuf[0] = ticks
+
+                if results is not None:
+                    yield results
+                continue
+
+            self._rawbuf.append(ticks)
+            rawlen += 1
+
+            if not rawlen % 2 and rawlen > 2:
+                results = self._commit(rawlen)
+                if results is not None:
+                    self._await_gap = True
+                    yield results
+
+    def idle(self, usecs):
+        # Tell the stream how long the signal has been a space since the last
+        # fed mark. The space itself is only fed once it ends, this lets a
+        # message end as soon as the timeout is reached.
+        #
+        # Args:
+        #   usecs: Nr. of uSeconds the current space has lasted.
+        # Returns:
+        #   A generator of decode_results (0 or 1 of them).
+        rawlen = len(self._rawbuf)
+        if self._await_gap or rawlen % 2 or rawlen < 2:
+            return
+
+        ticks = min(int(usecs) // kRawTick, kMaxRawEntry)
+        if ticks >= self._timeout:
+            results = self._finish()
+            # The rest of this space is the gap before the next message.
+            self._await_gap = True
+
+            if results is not None:
+                yield results
+
+    def flush(self):
+        # Decode whatever is left as if the timeout had been reached.
+        #
+        # Returns:
+        #   A generator of decode_results (0 or 1 of them).
+        results = self._finish()
+        self._await_gap = False
+
+        if results is not None:
+            yield results
+
+    def _reset(self):
+        rawbuf = self._rawbuf
+        self._rawbuf = array('H', [0])
+        self._frame = None
+        self._commit_lengths = None
+        return rawbuf
+
+    def _finish(self):
+        if len(self._rawbuf) < 2:
+            return None
+
+        results = decode_results()
+        results.rawbuf = self._reset()
+        results.rawlen = len(results.rawbuf)
+
+        if self._irrecv._decode(results):
+            return results
+
+        return None
+
+    def _commit(self, rawlen):
+        results = decode_results()
+        results.rawbuf = self._rawbuf
+        results.rawlen = rawlen
+        irrecv = self._irrecv
+
+        if self._frame is None:
+            # The header is known now, so work out which decoders could still
+            # match and the lengths at which one of them could be complete.
+            self._frame = irrecv._decode_index.frameCandidates(results)
+            self._commit_lengths = set(
+                candidate.max_rawlen for candidate in self._frame
+                if candidate.max_rawlen is not None
+            )
+            if irrecv._repeats is not None:
+                self._commit_lengths.update(irrecv._repeats.rawlens())
+
+        if rawlen not in self._commit_lengths:
+            return None
+
+        def accept(name):
+            # A decoder that has precedence could still match once more data
+            # arrives, so wait. Repeat frames go before every decoder.
+            if name is None:
+                return True
+
+            for other in self._frame:
+                if other.name == name:
+                    return True
+
+                if other.max_rawlen is None or other.max_rawlen > rawlen:
+                    return False
+
+            return False
+
+        # The same repeat fast path, decode cache & decoders as decode().
+        if not irrecv._decodeMessage(results, accept):
+            return None
+
+        results.rawbuf = self._reset()[:rawlen]
+        return results
@@ -2,107 +2,197 @@
 # Copyright 2017 David Conran
 # Copyright 2020 Kevin Schlosser
 
-import ctypes
-import sys
-
-
-# OS-specific low-level timing functions:
-if sys.platform.startswith('win'):  # for Windows:
-    def micros():
-        """return a timestamp in microseconds (us)"""
-        tics = ctypes.c_int64()
-        freq = ctypes.c_int64()
-
-        # get ticks on the internal ~2MHz QPC clock
-        ctypes.windll.Kernel32.QueryPerformanceCounter(ctypes.byref(tics))
-        # get the actual freq. of the internal ~2MHz QPC clock
-        ctypes.windll.Kernel32.QueryPerformanceFrequency(ctypes.byref(freq))
-
-        t_us = tics.value * 1e6 / freq.value
-        return t_us
-
-    def millis():
-        """return a timestamp in milliseconds (ms)"""
-        tics = ctypes.c_int64()
-        freq = ctypes.c_int64()
-
-        # get ticks on the internal ~2MHz QPC clock
-        ctypes.windll.Kernel32.QueryPerformanceCounter(ctypes.byref(tics))
-        # get the actual freq. of the internal ~2MHz QPC clock
-        ctypes.windll.Kernel32.QueryPerformanceFrequency(ctypes.byref(freq))
-
-        t_ms = tics.value * 1e3 / freq.value
-        return t_ms
-
-else:  # for Linux:
-    import os
-
-    # Constants:
-    # see <linux/time.h> here:
-    # https://github.com/torvalds/linux/blob/master/include/uapi/linux/time.h
-    CLOCK_MONOTONIC_RAW = 4
-    # prepare ctype timespec structure of {long, long}
-
-    class timespec(ctypes.Structure):
-        _fields_ = [
-            ('tv_sec', ctypes.c_long),
-            ('tv_nsec', ctypes.c_long)
-        ]
-
-    # Configure Python access to the clock_gettime C library, via ctypes:
-    # Documentation:
-    # -ctypes.CDLL: https://docs.python.org/3.2/library/ctypes.html
-    # -librt.so.1 with clock_gettime:
-    # https://docs.oracle.com/cd/E36784_01/html/E36873/librt-3lib.html
-    # -Linux clock_gettime(): http://linux.die.net/man/3/clock_gettime
-    librt = ctypes.CDLL('librt.so.1', use_errno=True)
-    clock_gettime = librt.clock_gettime
-
-    # specify input arguments and types to the C clock_gettime() function
-    # (int clock_ID, timespec* t)
-    clock_gettime.argtypes = [ctypes.c_int, ctypes.POINTER(timespec)]
-
-    def monotonic_time():
-        """return a timestamp in seconds (sec)"""
-        t = timespec()
-
-        # (Note that clock_gettime() returns 0 for success, or -1 for failure, in
-        # which case errno is set appropriately)
-        # -see here: http://linux.die.net/man/3/clock_gettime
-        if clock_gettime(CLOCK_MONOTONIC_RAW , ctypes.pointer(t)) != 0:
-            # if clock_gettime() returns an error
-            errno_ = ctypes.get_errno()
-
-            raise OSError(errno_, os.strerror(errno_))
-
-        return t.tv_sec + t.tv_nsec * 1e-9  # sec
-
-    def micros():
-        """return a timestamp in microseconds (us)"""
-        return monotonic_time() * 1e6  # us
-
-    def millis():
-        """eturn a timestamp in milliseconds (ms)"""
-        return monotonic_time() * 1e3  # ms
+import os
+import time
+
+
+# Clocks:
+# Integer nano-Second clocks of the stdlib. The cheapest one to call that
+# ticks at least every kClockMaxResolution nano-Seconds is picked when this
+# module is imported. Set the IRTIMER_CLOCK environment variable to the name
+# of a clock to pick it yourself.
+kClockMaxResolution = 1000
+
+
+def _clocks():
+    clocks = []
+
+    if hasattr(time, 'clock_gettime_ns') and hasattr(time, 'CLOCK_MONOTONIC_RAW'):
+        # Not slewed by NTP. (Linux)
+        raw = time.CLOCK_MONOTONIC_RAW
+
+        def monotonic_raw_ns():
+            return time.clock_gettime_ns(raw)
+
+        clocks.append(('monotonic_raw_ns', monotonic_raw_ns))
+
+    clocks.append(('perf_counter_ns', time.perf_counter_ns))
+    clocks.append(('monotonic_ns', time.monotonic_ns))
+    return clocks
+
+
+def measureClock(clock, calls=2000):
+    """return the (call overhead, resolution) of a clock in nano-Seconds"""
+    perf_counter_ns = time.perf_counter_ns
+
+    start = perf_counter_ns()
+    for _ in range(calls):
+        clock()
+    overhead = (perf_counter_ns() - start) / float(calls)
+
+    # The smallest step the clock was seen to make.
+    resolution = None
+    last = clock()
+    for _ in range(calls):
+        now = clock()
+        if now != last:
+            step = now - last
+            if resolution is None or step < resolution:
+                resolution = step
+            last = now
+
+    if resolution is None:
+        resolution = float('inf')
+
+    return overhead, resolution
+
+
+def benchmarkClocks(calls=100000):
+    """return {name: (call overhead, resolution)} of every clock in nano-Seconds"""
+    return dict(
+        (name, measureClock(clock, calls))
+        for name, clock in _clocks()
+    )
+
+
+def _selectClock():
+    clocks = _clocks()
+    wanted = os.environ.get('IRTIMER_CLOCK', None)
+
+    for name, clock in clocks:
+        if name == wanted:
+            return name, clock
+
+    best = None
+    for name, clock in clocks:
+        overhead, resolution = measureClock(clock)
+        if resolution > kClockMaxResolution:
+            continue
+
+        if best is None or overhead < best[0]:
+            best = (overhead, name, clock)
+
+    if best is None:
+        return clocks[-1]
+
+    return best[1], best[2]
+
+
+# The name & function of the selected clock.
+clock_name, nanos = _selectClock()
+
+
+def micros():
+    """return a timestamp in microseconds (us)"""
+    return nanos() // 1000
+
+
+def millis():
+    """return a timestamp in milliseconds (ms)"""
+    return nanos() // 1000000
+
+
+def monotonic_time():
+    """return a timestamp in seconds (sec)"""
+    return nanos() / 1e9
 
 
 # Other timing functions:
+# Nr. of uSeconds before a deadline the delay engine stops sleeping and spins.
+# Sleeping is only as precise as the OS scheduler, the margin absorbs its
+# wake up latency.
+kSpinMargin = 300
+
+
+class DelayEngine(object):
+    """sleep for the bulk of a delay, spin for the last spin_margin uSeconds"""
+
+    def __init__(self, spin_margin=kSpinMargin):
+        self.spin_margin = spin_margin
+        self.count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._max = 0
+
+    def setSpinMargin(self, usec):
+        """set the nr. of uSeconds to spin at the end of a delay"""
+        self.spin_margin = usec
+
+    def until(self, deadline_ns):
+        """delay until nanos() reaches deadline_ns"""
+        clock = nanos
+
+        # time.sleep() is clock_nanosleep()/a waitable timer on the platforms
+        # that have them.
+        remaining = deadline_ns - clock() - self.spin_margin * 1000
+        if remaining > 0:
+            time.sleep(remaining / 1e9)
+
+        now = clock()
+        while now < deadline_ns:
+            now = clock()
+
+        # Welford's running mean & variance of how late the delay ended.
+        late = now - deadline_ns
+        self.count += 1
+        delta = late - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (late - self._mean)
+        if late > self._max:
+            self._max = late
+
+        return now
+
+    def wait(self, usec):
+        """delay for usec microseconds (us)"""
+        if usec <= 0:
+            return
+
+        self.until(nanos() + int(usec * 1000))
+
+    def jitter(self):
+        """return how late the delays ended, in microseconds (us)"""
+        if self.count > 1:
+            stddev = (self._m2 / (self.count - 1)) ** 0.5
+        else:
+            stddev = 0.0
+
+        return dict(
+            count=self.count,
+            mean=self._mean / 1000.0,
+            max=self._max / 1000.0,
+            stddev=stddev / 1000.0
+        )
+
+    def resetStats(self):
+        self.count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._max = 0
+
+
+# The delay engine delay() & delay_microseconds() use.
+kDelay = DelayEngine()
+
+
 def delay(delay_ms):
     """delay for delay_ms milliseconds (ms)"""
-    t_start = millis()
-    while millis() - t_start < delay_ms:
-        pass  # do nothing
-
-    return
+    kDelay.wait(delay_ms * 1000)
 
 
 def delay_microseconds(delay_us):
     """delay for delay_us microseconds (us)"""
-    t_start = micros()
-    while micros() - t_start < delay_us:
-        pass  # do nothing
-
-    return
+    kDelay.wait(delay_us)
 
 
 # Classes
@@ -140,6 +230,17 @@ class TimerMs(object):
 # -see here: http://effbot.org/pyfaq/tutor-what-is-if-name-main-for.htm
 if __name__ == "__main__":
 
+    # call overhead & resolution of the clocks
+    print("selected clock: " + clock_name)
+    for name, (overhead, resolution) in sorted(benchmarkClocks().items()):
+        print(
+            "{0:<20} overhead {1:8.1f} ns  resolution {2} ns".format(
+                name,
+                overhead,
+                resolution
+            )
+        )
+
     # print loop execution time 100 times, using micros()
     tStart = micros()  # us
     for x in range(0, 100):
@@ -163,9 +264,8 @@ if __name__ == "__main__":
         delay(1000)
         print(i)
 
-    # print a counter once per second, for 5 seconds, using delayMicroseconds
+    # print a counter once per second, for 5 seconds, using delay_microseconds
     print("\nstart")
     for i in range(1,6):
-        delayMicroseconds(1000000)
+        delay_microseconds(1000000)
         print(i)
-
@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+# Precompiled timing tables for matching mark/space data sections.
+#
+# IRrecv.matchMark()/matchSpace() work out the tolerance window in floating
+# point uSeconds every time they are called, and matchData() calls both of them
+# twice per bit. A TimingTable does all of that once for a given set of
+# bit timings, tolerance & excess and stores integer windows in capture ticks.
+#
+# Every mark & space in the capture gets classified with a single list lookup.
+# The classification of a bit is a 2 bit code:
+#   bit 0 set: The mark & space both fit the '1' bit timings.
+#   bit 1 set: The mark & space both fit the '0' bit timings.
+# 8 of these codes (16 buffer entries) make a 16 bit key which is looked up in
+# a 65536 entry table to get a whole byte in one step.
+#
+# If NumPy is installed, long data sections are classified in a single
+# vectorized pass instead. See kNumpyMinBits.
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+kCodeOne = 0x1
+kCodeZero = 0x2
+
+# Shortest data section (in bits) that is handed to NumPy. Below this the cost
+# of building the arrays is more than the time saved.
+kNumpyMinBits = 64
+
+_byte_tables = {}
+
+
+def _nibbleValues(MSBfirst):
+    # Value of 4 bit codes (an 8 bit key) or -1 if any of the codes is invalid.
+    values = []
+    for key in range(256):
+        value = 0
+        for pos in range(4):
+            code = (key >> (6 - pos * 2)) & 0x3
+            if not code:
+                value = -1
+                break
+
+            bit = 1 if code & kCodeOne else 0
+
+            if MSBfirst:
+                value = (value << 1) | bit
+            else:
+                value |= bit << pos
+
+        values.append(value)
+
+    return values
+
+
+def byteTable(MSBfirst=True):
+    # Get the (shared) 16 bit key -> byte lookup table for a bit order.
+    #
+    # Args:
+    #   MSBfirst: Bit order the data is sent in.
+    # Returns:
+    #   An array of 65536 signed shorts. -1 means the key isn't a valid byte.
+    try:
+        return _byte_tables[MSBfirst]
+    except KeyError:
+        pass
+
+    nibbles = _nibbleValues(MSBfirst)
+    table = array('h', [-1]) * 65536
+
+    for high in range(256):
+        high_value = nibbles[high]
+        if high_value < 0:
+            continue
+
+        base = high << 8
+        for low in range(256):
+            low_value = nibbles[low]
+            if low_value < 0:
+                continue
+
+            if MSBfirst:
+                table[base | low] = (high_value << 4) | low_value
+            else:
+                table[base | low] = high_value | (low_value << 4)
+
+    _byte_tables[MSBfirst] = table
+    return table
+
+
+def tickWindow(usecs, tolerance, delta=0, raw_tick=2):
+    # Calculate the inclusive window of capture ticks that match a period.
+    # Gives the same answer as IRrecv.match() without any floating point math
+    # at match time.
+    #
+    # Args:
+    #   usecs:  Nr. of uSeconds expected.
+    #   tolerance:  Percent as an integer. e.g. 10 is 10%
+    #   delta:  A non-scaling (+/-) error margin (in useconds).
+    #   raw_tick:  Nr. of uSeconds per capture tick.
+    # Returns:
+    #   A (low, high) tuple of capture ticks.
+    low = int(max(usecs * (1.0 - tolerance / 100.0) - delta, 0))
+    high = int(usecs * (1.0 + tolerance / 100.0) + 1 + delta)
+    return -(-low // raw_tick), high // raw_tick
+
+
+class TimingTable(object):
+
+    def __init__(
+        self,
+        onemark,
+        onespace,
+        zeromark,
+        zerospace,
+        tolerance,
+        excess,
+        raw_tick=2
+    ):
+        # Compile the bit timings of a protocol.
+        #
+        # Args:
+        #   onemark:   Nr. of uSeconds in an expected mark signal for a '1' bit.
+        #   onespace:  Nr. of uSeconds in an expected space signal for a '1' bit.
+        #   zeromark:  Nr. of uSeconds in an expected mark signal for a '0' bit.
+        #   zerospace: Nr. of uSeconds in an expected space signal for a '0' bit.
+        #   tolerance: Percentage error margin to allow. (Already validated)
+        #   excess:  Nr. of useconds.
+        #   raw_tick:  Nr. of uSeconds per capture tick.
+        self.one_mark = tickWindow(onemark + excess, tolerance, 0, raw_tick)
+        self.one_space = tickWindow(onespace - excess, tolerance, 0, raw_tick)
+        self.zero_mark = tickWindow(zeromark + excess, tolerance, 0, raw_tick)
+        self.zero_space = tickWindow(zerospace - excess, tolerance, 0, raw_tick)
+
+        self.limit = max(
+            self.one_mark[1],
+            self.one_space[1],
+            self.zero_mark[1],
+            self.zero_space[1]
+        ) + 1
+
+        self.mark_codes = self._classify(self.one_mark, self.zero_mark)
+        self.space_codes = self._classify(self.one_space, self.zero_space)
+        self._np_codes = None
+
+    def _classify(self, one, zero):
+        codes = bytearray(self.limit)
+        for ticks in range(one[0], one[1] + 1):
+            codes[ticks] |= kCodeOne
+
+        for ticks in range(zero[0], zero[1] + 1):
+            codes[ticks] |= kCodeZero
+
+        return codes
+
+    def codes(self, buf, start, nbits):
+        # Classify nbits worth of mark/space pairs starting at buf[start].
+        mark_codes = self.mark_codes
+        space_codes = self.space_codes
+        limit = self.limit
+        end = start + nbits * 2
+
+        return [
+            (mark_codes[mark] if mark < limit else 0) &
+            (space_codes[space] if space < limit else 0)
+            for mark, space in zip(buf[start:end:2], buf[start + 1:end:2])
+        ]
+
+    def npCodes(self, buf, start, nbits):
+        # NumPy version of codes(). Returns a uint8 array.
+        if self._np_codes is None:
+            # One extra (0) entry so everything >= limit can be clipped onto it.
+            self._np_codes = (
+                np.frombuffer(bytes(self.mark_codes) + b'\x00', dtype=np.uint8),
+                np.frombuffer(bytes(self.space_codes) + b'\x00', dtype=np.uint8)
+            )
+
+        mark_codes, space_codes = self._np_codes
+        end = start + nbits * 2
+        pulses = np.asarray(buf[start:end], dtype=np.int64)
+        np.minimum(pulses, self.limit, out=pulses)
+        return mark_codes[pulses[0::2]] & space_codes[pulses[1::2]]
+
+    def npMatchBits(self, buf, start, nbits, MSBfirst=True):
+        # Decode a data section in a single vectorized pass.
+        #
+        # Args:
+        #   buf: The capture buffer.
+        #   start: Index in buf of the first mark of the data.
+        #   nbits: Nr. of data bits we expect.
+        #   MSBfirst: Bit order of the data.
+        # Returns:
+        #   A (packed, mismatch) tuple. packed is the bytes of the data padded
+        #   with 0 bits at the end, or None if it didn't match.
+        #   mismatch is the index of the first bit that didn't match, or -1.
+        if len(buf) - start < nbits * 2:
+            return None, 0
+
+        codes = self.npCodes(buf, start, nbits)
+
+        invalid = codes == 0
+        if invalid.any():
+            return None, int(invalid.argmax())
+
+        bits = codes & kCodeOne
+        packed = np.packbits(bits, bitorder='big' if MSBfirst else 'little')
+        return packed.tobytes(), -1
+
+    def matchData(self, buf, start, nbits, MSBfirst=True):
+        # Decode a data section.
+        #
+        # Args:
+        #   buf: The capture buffer.
+        #   start: Index in buf of the first mark of the data.
+        #   nbits: Nr. of data bits we expect.
+        #   MSBfirst: Bit order to save the data in.
+        # Returns:
+        #   A (success, data, used) tuple. Same as the match_result_t fields.
+        if np is not None and nbits >= kNumpyMinBits:
+            packed, mismatch = self.npMatchBits(buf, start, nbits, MSBfirst)
+            if packed is None:
+                return False, 0, mismatch * 2
+
+            if MSBfirst:
+                data = int.from_bytes(packed, 'big') >> (len(packed) * 8 - nbits)
+            else:
+                data = int.from_bytes(packed, 'little')
+
+            return True, data, nbits * 2
+
+        codes = self.codes(buf, start, nbits)
+        if len(codes) < nbits:
+            return False, 0, 0
+
+        table = byteTable(MSBfirst)
+        data = 0
+        nbytes = nbits // 8
+
+        for byte_pos in range(nbytes):
+            key = 0
+            for code in codes[byte_pos * 8:byte_pos * 8 + 8]:
+                key = (key << 2) | code
+
+            value = table[key]
+            if value < 0:
+                return self._fail(codes, byte_pos * 8)
+
+            if MSBfirst:
+                data = (data << 8) | value
+            else:
+                data |= value << (byte_pos * 8)
+
+        # Any bits that don't make up a whole byte.
+        for pos in range(nbytes * 8, nbits):
+            code = codes[pos]
+            if not code:
+                return self._fail(codes, pos)
+
+            bit = 1 if code & kCodeOne else 0
+            if MSBfirst:
+                data = (data << 1) | bit
+            else:
+                data |= bit << pos
+
+        return True, data, nbits * 2
+
+    def matchBytes(self, buf, start, nbytes, MSBfirst=True):
+        # Decode a data section into a list of bytes.
+        #
+        # Returns:
+        #   A list of the bytes, or None if it doesn't match.
+        if np is not None and nbytes * 8 >= kNumpyMinBits:
+            packed, _ = self.npMatchBits(buf, start, nbytes * 8, MSBfirst)
+            if packed is None:
+                return None
+
+            return list(packed)
+
+        codes = self.codes(buf, start, nbytes * 8)
+        if len(codes) < nbytes * 8:
+            return None
+
+        table = byteTable(MSBfirst)
+        output = []
+
+        for byte_pos in range(nbytes):
+            key = 0
+            for code in codes[byte_pos * 8:byte_pos * 8 + 8]:
+                key = (key << 2) | code
+
+            value = table[key]
+            if value < 0:
+                return None
+
+            output.append(value)
+
+        return output
+
+    @staticmethod
+    def _fail(codes, pos):
+        # Find the exact bit that didn't match so "used" is the same as the
+        # bit by bit decode would have reported.
+        while codes[pos]:
+            pos += 1
+
+        return False, 0, pos * 2
+
+
+if __name__ == "__main__":
+    # Compare the pure Python and NumPy paths.
+    # python -m IRDecoder.IRtiming
+    import random
+    import timeit
+
+    def frame(nbits, bitmark, onespace, zerospace, raw_tick=2):
+        buf = []
+        for _ in range(nbits):
+            buf.append(bitmark // raw_tick)
+            if random.randint(0, 1):
+                buf.append(onespace // raw_tick)
+            else:
+                buf.append(zerospace // raw_tick)
+        return buf
+
+    frames = (
+        # name, nbits, bit mark, one space, zero space, tolerance, excess
+        ('Daikin (280 bits)', 280, 428, 1280, 428, 35, 50),
+        ('Hitachi424 (424 bits)', 424, 463, 1208, 372, 25, 50),
+    )
+
+    numpy = np
+    for name, nbits, bitmark, onespace, zerospace, tolerance, excess in frames:
+        table = TimingTable(bitmark, onespace, bitmark, zerospace, tolerance, excess)
+        buf = frame(nbits, bitmark, onespace, zerospace)
+        byteTable(False)
+
+        np = None
+        python_us = min(timeit.repeat(
+            lambda: table.matchBytes(buf, 0, nbits // 8, False),
+            number=200,
+            repeat=5
+        )) / 200 * 1e6
+        print(name + ": python " + str(round(python_us, 1)) + "us")
+
+        np = numpy
+        if np is None:
+            print(name + ": numpy not installed")
+            continue
+
+        numpy_us = min(timeit.repeat(
+            lambda: table.matchBytes(buf, 0, nbits // 8, False),
+            number=200,
+            repeat=5
+        )) / 200 * 1e6
+        print(name + ": numpy " + str(round(numpy_us, 1)) + "us")
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+# Decode tracing.
+#
+# IRrecv doesn't print anything while decoding. To see what the decoders are
+# doing set a trace sink with IRrecv.setTrace(). When no sink is set the only
+# cost is a single "is None" check at each trace point.
+#
+# Events:
+#   kTraceAttempt: A decoder is about to be tried.
+#   kTraceDecoded: A decoder matched the message.
+#   kTraceMatch:   A single mark/space comparison. measured is in ticks,
+#                  window is the inclusive (low, high) range in ticks.
+#   kTraceFail:    A stage of matchGeneric didn't match. offset is where in
+#                  the capture buffer it failed.
+
+import collections
+import time
+
+
+kTraceAttempt = 'attempt'
+kTraceDecoded = 'decoded'
+kTraceMatch = 'match'
+kTraceFail = 'fail'
+
+
+TraceEvent = collections.namedtuple(
+    'TraceEvent',
+    ['event', 'protocol', 'stage', 'measured', 'window', 'offset', 'matched']
+)
+
+
+class TraceSink(object):
+    # Base of the sinks. It drops every event, subclasses override write().
+    # A sink can be used as a context manager, it is closed at the end.
+
+    def __init__(self, events=None):
+        # Args:
+        #   events: Only record these event types. (Def: All of them)
+        self.events = None if events is None else frozenset(events)
+
+    def emit(
+        self,
+        event,
+        protocol=None,
+        stage=None,
+        measured=None,
+        window=None,
+        offset=None,
+        matched=None
+    ):
+        if self.events is not None and event not in self.events:
+            return
+
+        self.write(
+            TraceEvent(event, protocol, stage, measured, window, offset, matched)
+        )
+
+    def write(self, trace_event):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+class RingSink(TraceSink):
+
+    def __init__(self, size=1024, events=None):
+        # Keep the last `size` events in memory.
+        TraceSink.__init__(self, events)
+        self.buffer = collections.deque(maxlen=size)
+
+    def write(self, trace_event):
+        self.buffer.append(trace_event)
+
+    def clear(self):
+        self.buffer.clear()
+
+    def __iter__(self):
+        return iter(list(self.buffer))
+
+    def __len__(self):
+        return len(self.buffer)
+
+
+class CallbackSink(TraceSink):
+
+    def __init__(self, callback, events=None):
+        # callback is called with every TraceEvent.
+        TraceSink.__init__(self, events)
+        self.callback = callback
+
+    def write(self, trace_event):
+        self.callback(trace_event)
+
+
+class FileSink(TraceSink):
+
+    def __init__(self, path, events=None):
+        # Append the events as tab separated lines to a file.
+        #
+        # Args:
+        #   path: A file path or a text mode file object. A path is opened
+        #         here & closed by close(), a file object is left open.
+        TraceSink.__init__(self, events)
+        self._own_file = isinstance(path, str)
+        if self._own_file:
+            path = open(path, 'a')
+
+        self.file = path
+
+    def write(self, trace_event):
+        self.file.write(
+            '\t'.join(
+                [repr(time.time())] +
+                ['' if value is None else str(value) for value in trace_event]
+            ) + '\n'
+        )
+
+    def close(self):
+        if self._own_file:
+            self.file.close()
+            self._own_file = False
@@ -2,10 +2,14 @@
 
 # Copyright 2017 David Conran
 
+import functools
+import operator
+
 from .IRrecv import *
 from .IRsend import *
 from .IRtext import *
 from .IRremoteESP8266 import *
+from .IRregistry import kRegistry
 
 kNibbleSize = 4
 kLowNibble = 0
@@ -13,6 +17,29 @@ kHighNibble = 4
 kModeBitsSize = 3
 
 
+# Bit manipulation kernel:
+# 256 entry tables indexed by a byte. bytes.translate() applies one to a
+# whole buffer (or every byte of an integer) in a single C call.
+_kReverseTable = bytes(int('{0:08b}'.format(ii)[::-1], 2) for ii in range(256))
+_kPopcountTable = bytes(bin(ii).count('1') for ii in range(256))
+_kNibbleSumTable = bytes((ii >> 4) + (ii & 0xF) for ii in range(256))
+
+if hasattr(int, 'bit_count'):  # Python 3.10+
+    _popcount = int.bit_count
+else:
+    def _popcount(value):
+        return bin(value).count('1')
+
+
+def _asBytes(start, length):
+    # The first length entries of a byte sequence as something with
+    # translate(). (bytes, bytearray, array('B'), memoryview or a list)
+    if isinstance(start, (bytes, bytearray)):
+        return start[:length]
+
+    return bytes(start[:length])
+
+
 def reverseBits(inpt, nbits):
     # Reverse the order of the requested least significant nr. of bits.
     # Args:
@@ -22,18 +49,20 @@ def reverseBits(inpt, nbits):
     #   The reversed bit pattern.
     if nbits <= 1:
         return inpt  # Reversing <= 1 bits makes no change at all.
-    
-    # Cap the nr. of bits to rotate to the max nr. of bits in the input.
-    nbits = min(nbits, len(inpt) * 8)
-    output = 0
-    
-    for _ in range(nbits):
-        output <<= 1
-        output |= (inpt & 1)
-        inpt >>= 1
-    
+
+    output = inpt & ((1 << nbits) - 1)
+    if nbits <= 8:
+        output = _kReverseTable[output] >> (8 - nbits)
+    else:
+        # A word at a time: reverse the bits of every byte & the byte order.
+        nbytes = (nbits + 7) >> 3
+        output = int.from_bytes(
+            output.to_bytes(nbytes, 'little').translate(_kReverseTable),
+            'big'
+        ) >> ((nbytes << 3) - nbits)
+
     # Merge any remaining unreversed bits back to the top of the reversed bits.
-    return (inpt << nbits) | output
+    return ((inpt >> nbits) << nbits) | output
 
 
 def uint64ToString(inpt, base=10):
@@ -172,41 +201,7 @@ def typeToString(protocol, isRepeat=False):
 
 def hasACState(protocol):
     # Does the given protocol use a complex state as part of the decode?
-    return protocol in (
-        AMCOR,
-        ARGO,
-        DAIKIN,
-        DAIKIN128,
-        DAIKIN152,
-        DAIKIN160,
-        DAIKIN176,
-        DAIKIN2,
-        DAIKIN216,
-        ELECTRA_AC,
-        FUJITSU_AC,
-        GREE,
-        HAIER_AC,
-        HAIER_AC_YRW02,
-        HITACHI_AC,
-        HITACHI_AC1,
-        HITACHI_AC2,
-        HITACHI_AC424,
-        KELVINATOR,
-        MITSUBISHI136,
-        MITSUBISHI112,
-        MITSUBISHI_AC,
-        MITSUBISHI_HEAVY_88,
-        MITSUBISHI_HEAVY_152,
-        MWM,
-        NEOCLIMA,
-        PANASONIC_AC,
-        SAMSUNG_AC,
-        SHARP_AC,
-        TCL112AC,
-        TOSHIBA_AC,
-        TROTEC,
-        WHIRLPOOL_AC
-    )
+    return kRegistry.hasACState(protocol)
 
 
 def getCorrectedRawLength(results):
@@ -371,63 +366,90 @@ def resultToRawArray(decode):
     return result
 
 
+# Sum all the bytes of an array and return the least significant 8-bits of
+# the result.
+# Args:
+#   start: The bytes. (bytes, bytearray, array('B'), memoryview or a list)
+#          Pass a slice (memoryview(state)[offset:]) to start further in.
+#   length: Nr. of bytes to sum.
+#   init: Starting value of the sum.
+# Returns:
+#   The 8-bit sum.
 def sumBytes(start, length, init=0):
-    checksum = init
-    for ii in range(length - len(start)):
-        checksum += start[i]
+    return (init + sum(start[:length])) & 0xFF
 
-    return checksum
 
-
-def xorBytes(start, _, init):
-    checksum = init
-    for ptr in start:
-        checksum ^= ptr
-
-    return checksum
+# Calculate a rolling XOR of all the bytes of an array.
+# Args:
+#   start: The bytes. See sumBytes().
+#   length: Nr. of bytes to XOR.
+#   init: Starting value of the XOR.
+# Returns:
+#   The 8-bit XOR of the bytes.
+def xorBytes(start, length, init=0):
+    return functools.reduce(operator.xor, start[:length], init) & 0xFF
 
 
 # Count the number of bits of a certain type.
 # Args:
-#   start: Ptr to the start of data to count bits in.
-#   length: How many bytes to count.
+#   start: The bytes (see sumBytes()), or an integer.
+#   length: How many bytes to count, or how many bits of an integer.
 #   ones: Count the binary 1 bits. False for counting the 0 bits.
 #   init: Start the counting from this value.
 # Returns:
 #   Nr. of bits found.
-def countBits(start, length, ones, init):
-    count = init
-    for offset in range(length):
-        currentbyte = start[offset]
-        while currentbyte:
-            currentbyte >>= 1
-            if currentbyte & 1:
-                count += 1
+def countBits(start, length, ones=True, init=0):
+    if isinstance(start, int):
+        count = init + _popcount(start & ((1 << length) - 1))
+        bits = length
+    else:
+        count = init + sum(_asBytes(start, length).translate(_kPopcountTable))
+        bits = length * 8
 
     if ones or length == 0:
         return count
     else:
-        return (length * 8) - count
+        return bits - count
 
 
+# Invert/Flip the bits in an Integer.
+# Args:
+#   data: The integer that will be inverted.
+#   nbits: Nr. of bits to invert. (max 64)
+# Returns:
+#   The integer with the least significant nbits inverted.
 def invertBits(data, nbits):
     # No change if we are asked to invert no bits.
     if nbits == 0:
         return data
 
-    p = 1
-    newnum = 0
-    while data > 0 and nbits:
-        bit = data & 1
+    return ~data & ((1 << min(nbits, 64)) - 1)
+
+
+# Sum all the nibbles together in a series of bytes.
+# Args:
+#   start: The bytes. See sumBytes().
+#   length: Nr of bytes to sum the nibbles of.
+#   init: Starting value of the sum.
+# Returns:
+#   A sum of all the nibbles inc the init. (8-bit)
+def sumNibbles(start, length, init=0):
+    return (init + sum(_asBytes(start, length).translate(_kNibbleSumTable))) & 0xFF
+
+
+def bcdToUint8(bcd):
+    if bcd > 0x99:
+        return 255  # Too big.
 
-        if bit == 0:
-            newnum += p
+    return (bcd >> 4) * 10 + (bcd & 0xF)
 
-        data >>= 1
-        p *= 2
-        nbits -= 1
 
-    return newnum
+def uint8ToBcd(integer):
+    if integer > 99:
+        return 255  # Too big.
+
+    tens, units = divmod(integer, 10)
+    return (tens << 4) + units
 
 
 def celsiusToFahrenheit(deg):
@@ -681,34 +703,10 @@ class irutils(object):
 
         return result
 
-    # Sum all the nibbles together in a series of bytes.
-    # Args:
-    #   start: PTR to the start of the bytes.
-    #   length: Nr of bytes to sum the nibbles of.
-    #   init: Starting value of the sum.
-    # Returns:
-    #   A sum of all the nibbles inc the init.
-    @staticmethod
-    def sumNibbles(start, _, init=0):
-        sm = init
-
-        for ptr in start:
-            sm += (ptr >> 4) + (ptr & 0xF)
-        return sm
-
-    @staticmethod
-    def bcdToUint8(bcd):
-        if bcd > 0x99:
-            return 255  # Too big.
-
-        return (bcd >> 4) * 10 + (bcd & 0xF)
-
-    @staticmethod
-    def uint8ToBcd(integer):
-        if integer > 99:
-            return 255  # Too big.
-
-        return ((integer / 10) << 4) + (integer % 10)
+    # See the module level functions.
+    sumNibbles = staticmethod(sumNibbles)
+    bcdToUint8 = staticmethod(bcdToUint8)
+    uint8ToBcd = staticmethod(uint8ToBcd)
 
     # Return the value of `position`th bit of `data`.
     # Args:
@@ -759,33 +757,159 @@ class irutils(object):
         return dst
 
 
-class SetParam(object):
+# State fields:
+# A SetParam subclass describes a field of an A/C state. num_bits bits from
+# bit bit_num of byte byte_num, or the single bit bit_num when num_bits is
+# None. A field can go past the end of its byte, the next byte holds the
+# higher bits. (least significant byte first)
+#
+# The get/set of every field are compiled when its class is made, with the
+# masks & shifts worked out up front.
+def compileField(byte_num, bit_num, num_bits):
+    # Make the accessors of a field.
+    #
+    # Returns:
+    #   A (get(state), set(state, value)) tuple.
+    if num_bits is None:
+        mask = 1 << bit_num
+        clear = ~mask & 0xFF
+
+        def get(state):
+            return (state[byte_num] >> bit_num) & 1
+
+        def set(state, on):
+            if on:
+                state[byte_num] |= mask
+            else:
+                state[byte_num] &= clear
+
+        return get, set
+
+    mask = (1 << num_bits) - 1
+
+    if bit_num + num_bits <= 8:
+        clear = ~(mask << bit_num) & 0xFF
+
+        def get(state):
+            return (state[byte_num] >> bit_num) & mask
+
+        def set(state, value):
+            state[byte_num] = (state[byte_num] & clear) | ((value & mask) << bit_num)
+
+        return get, set
+
+    # Multi byte field.
+    indexes = tuple(range(byte_num, byte_num + (bit_num + num_bits + 7) // 8))
+    clear = ~(mask << bit_num) & ((1 << (len(indexes) * 8)) - 1)
+
+    if len(indexes) == 2:
+        low, high = indexes
+
+        def get(state):
+            return ((state[low] | (state[high] << 8)) >> bit_num) & mask
+
+        def set(state, value):
+            word = ((state[low] | (state[high] << 8)) & clear) | ((value & mask) << bit_num)
+            state[low] = word & 0xFF
+            state[high] = word >> 8
+
+        return get, set
+
+    shifts = tuple((index, (index - byte_num) * 8) for index in indexes)
+
+    def get(state):
+        word = 0
+        for index, shift in shifts:
+            word |= state[index] << shift
+
+        return (word >> bit_num) & mask
+
+    def set(state, value):
+        word = 0
+        for index, shift in shifts:
+            word |= state[index] << shift
+
+        word = (word & clear) | ((value & mask) << bit_num)
+        for index, shift in shifts:
+            state[index] = (word >> shift) & 0xFF
+
+    return get, set
+
+
+kFieldAttributes = ('byte_num', 'bit_num', 'num_bits')
+
+
+class SetParamType(type):
+    # Compiles the field of a SetParam subclass when the class is made, and
+    # again when byte_num, bit_num or num_bits of it (or of a class it
+    # inherits them from) change.
+
+    def __init__(cls, name, bases, namespace):
+        type.__init__(cls, name, bases, namespace)
+        cls._compileField()
+
+    def __setattr__(cls, name, value):
+        type.__setattr__(cls, name, value)
+
+        if name in kFieldAttributes:
+            pending = [cls]
+            while pending:
+                klass = pending.pop()
+                klass._compileField()
+                pending.extend(klass.__subclasses__())
+
+    def _compileField(cls):
+        if cls.byte_num is None or cls.bit_num is None:
+            get = set = None
+        else:
+            get, set = compileField(cls.byte_num, cls.bit_num, cls.num_bits)
+
+        # Used by subclasses that do more than get/set the field.
+        type.__setattr__(cls, '_field_get', staticmethod(get) if get else None)
+        type.__setattr__(cls, '_field_set', staticmethod(set) if set else None)
+
+        # get/set are the field accessors unless the class (or a class before
+        # SetParam in its MRO) has its own.
+        for attr, accessor in (('get', get), ('set', set)):
+            for klass in cls.__mro__:
+                if attr in klass.__dict__:
+                    break
+            else:
+                continue
+
+            # A classmethod/staticmethod wraps the function, a plain method
+            # or a property is the subclass' own.
+            current = klass.__dict__[attr]
+            if not getattr(getattr(current, '__func__', current), '_field', False):
+                continue
+
+            if accessor is not None:
+                type.__setattr__(cls, attr, staticmethod(_fieldAccessor(accessor)))
+            elif klass is cls and isinstance(current, staticmethod):
+                # The field went away, back to the inherited accessor.
+                type.__delattr__(cls, attr)
+
+
+def _fieldAccessor(func):
+    # Marks the accessors the field compiler may replace.
+    func._field = True
+    return func
+
+
+class SetParam(object, metaclass=SetParamType):
     byte_num = None
     bit_num = None
     num_bits = None
 
     @classmethod
+    @_fieldAccessor
     def set(cls, remote_state, bit_state):
-        if cls.num_bits is None:
-            remote_state[cls.byte_num] = irutils.setBit(
-                remote_state[cls.byte_num],
-                cls.bit_num,
-                bit_state
-            )
-        else:
-            remote_state[cls.byte_num] = irutils.setBits(
-                remote_state[cls.byte_num],
-                cls.bit_num,
-                cls.num_bits,
-                bit_state
-            )
+        raise TypeError(cls.__name__ + ' has no byte_num/bit_num')
 
     @classmethod
+    @_fieldAccessor
     def get(cls, remote_state):
-        if cls.num_bits is None:
-            return GETBIT8(remote_state[cls.byte_num], cls.bit_num)
-        else:
-            return GETBITS8(remote_state[cls.byte_num], cls.bit_num, cls.num_bits)
+        raise TypeError(cls.__name__ + ' has no byte_num/bit_num')
 
 
 class AntiFreezeBase(SetParam):
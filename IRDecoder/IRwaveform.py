@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+# Rendered waveform cache.
+#
+# Sending the same message again renders the same marks & spaces again, bit by
+# bit. A WaveformCache keeps the rendered output (see IRbackend) of the last
+# messages sent with IRsend.send(), a repeat transmit replays it through the
+# output backend in one go.
+#
+# The key is (protocol, data or state bytes, nbits, repeat, modulation). The
+# carrier frequency & duty cycle are set by the sender itself, so they are
+# stored with the waveform.
+#
+# One cache can be shared by any number of IRsend instances:
+#   cache = WaveformCache(size=256)
+#   irsend1.set_waveform_cache(cache)
+#   irsend2.set_waveform_cache(cache)
+
+import collections
+import threading
+
+# Default nr. of waveforms kept.
+kWaveformCacheSize = 256
+
+
+class Waveform(object):
+    __slots__ = ('frequency', 'duty', 'pairs', 'duration', 'gap')
+
+    def __init__(self, frequency, duty, pairs):
+        # A rendered message.
+        #
+        # Args:
+        #   frequency: Carrier frequency in Hz.
+        #   duty: Percentage duty cycle.
+        #   pairs: array('L') of level, duration, ... (RecordingBackend.pairs())
+        self.frequency = frequency
+        self.duty = duty
+        # Read only view, the waveform is shared.
+        self.pairs = memoryview(pairs.tobytes()).cast(pairs.typecode)
+        # Nr. of uSeconds the message takes.
+        self.duration = sum(self.pairs[1::2])
+        # Nr. of uSeconds of the space the message ends with. (The gap before
+        # the next message)
+        if len(self.pairs) >= 2 and self.pairs[-2] == 0:  # IRbackend.kLevelSpace
+            self.gap = self.pairs[-1]
+        else:
+            self.gap = 0
+
+    def __len__(self):
+        # Nr. of (level, duration) pairs.
+        return len(self.pairs) // 2
+
+
+def waveformKey(decode_type, data, nbits, repeat, modulation=True):
+    # Get the cache key of a message.
+    #
+    # Returns:
+    #   A hashable key, or None if data can't be used in a key.
+    if not isinstance(data, int):
+        try:
+            data = bytes(data)
+        except (TypeError, ValueError):
+            return None
+
+    return decode_type, data, nbits, repeat, modulation
+
+
+class WaveformCache(object):
+
+    def __init__(self, size=kWaveformCacheSize):
+        # Args:
+        #   size: Max. nr. of waveforms to remember.
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        # Returns:
+        #   The Waveform or None.
+        with self._lock:
+            try:
+                waveform = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return waveform
+
+    def put(self, key, waveform):
+        if self.size <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = waveform
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        # Forget every waveform. (The hit/miss counters are kept)
+        with self._lock:
+            self._entries.clear()
+
+    def resetStats(self):
+        self.hits = 0
+        self.misses = 0
@@ -16,6 +16,7 @@ from .IRrecv import *
 from .IRutils import *
 from .IRsend import *
 from .protocol_base import ACProtocolBase
+from .IRchecksum import kChecksums, NibbleSum
 from .IRremoteESP8266 import *
 
 
@@ -121,6 +122,10 @@ class IRAmcorAc(ACProtocolBase):
     _packet_len = kAmcorStateLength
 
     _protocol = decode_type_t.AMCOR
+    _checksum = kChecksums.register(
+        decode_type_t.AMCOR,
+        NibbleSum(end=kAmcorChecksumByte, at=kAmcorChecksumByte)
+    )
 
     def state_reset(self):
         ACProtocolBase.state_reset(self)
@@ -132,10 +137,6 @@ class IRAmcorAc(ACProtocolBase):
     def send(self, repeat=kAmcorDefaultRepeat):
         self._irsend.sendAmcor(self.get_raw(), kAmcorStateLength, repeat)
 
-    @classmethod
-    def calc_checksum(cls, state, length=kAmcorStateLength):
-        return irutils.sumNibbles(state, length - 1)
-
     @property
     def mode(self):
         return ACProtocolBase.mode.fget(self)
@@ -156,9 +157,6 @@ class IRAmcorAc(ACProtocolBase):
 
             ACProtocolBase.mode.fset(self, mode)
 
-    def checksum(self, length=kAmcorStateLength):
-        self.remote_state[kAmcorChecksumByte] = self.calc_checksum(self.remote_state, length)
-
 
 # Send a Amcor HVAC formatted message.
 #
@@ -62,42 +62,22 @@ setBits = irutils.setBits
 
 
 class Param(SetParam):
-    _get = SetParam.get
-    _set = SetParam.set
+    # A setting of the state. When the state holds a command (Power,
+    # Swing...) the state the command replaced is put back first.
 
     @classmethod
     def get(cls, remote_state):
-        if remote_state in (
-            SwingHorz.cmd,
-            SwingVert.cmd,
-            Swing.cmd,
-            Sleep.cmd,
-            Turbo.cmd,
-            Light.cmd,
-            Clean.cmd,
-            Power.cmd
-        ):
-            for ii in range(3):
-                remote_state[ii] = Command.saved_state[ii]
-
-        return cls._get(remote_state)
+        if tuple(remote_state) in kCoolixCommands:
+            remote_state[:3] = Command.saved_state
+
+        return cls._field_get(remote_state)
 
     @classmethod
     def set(cls, remote_state, bit_state):
-        if remote_state in (
-            SwingHorz.cmd,
-            SwingVert.cmd,
-            Swing.cmd,
-            Sleep.cmd,
-            Turbo.cmd,
-            Light.cmd,
-            Clean.cmd,
-            Power.cmd
-        ):
-            for ii in range(3):
-                remote_state[ii] = Command.saved_state[ii]
-
-        cls._set(remote_state, bit_state)
+        if tuple(remote_state) in kCoolixCommands:
+            remote_state[:3] = Command.saved_state
+
+        cls._field_set(remote_state, bit_state)
 
 
 # Constants
@@ -212,21 +192,10 @@ class Command(SetParam):
 
         cls._state = value
 
-        if remote_state not in (
-            SwingHorz.cmd,
-            SwingVert.cmd,
-            Swing.cmd,
-            Sleep.cmd,
-            Turbo.cmd,
-            Light.cmd,
-            Clean.cmd,
-            Power.cmd
-        ):
-
+        if tuple(remote_state) not in kCoolixCommands:
             Command.saved_state = remote_state[:]
 
-        for ii in range(3):
-            remote_state[ii] = cls.cmd[ii]
+        remote_state[:3] = cls.cmd
 
 
 class SwingHorz(SwingHorzBase, Command):
@@ -239,7 +208,7 @@ class SwingVert(SwingVertBase, Command):
     cmd = [0xB2, 0x0F, 0xE0]
 
 
-class Swing(SetParam, Command):
+class Swing(Command):
     _state = False
     cmd = [0xB2, 0x6B, 0xE0]
 
@@ -264,13 +233,19 @@ class Light(LightBase, Command):
     cmd = [0xB5, 0xF5, 0xA5]
 
 
-class Clean(CleanBase):
+class Clean(CleanBase, Command):
     _state = False
     cmd = [0xB5, 0xF5, 0xAA]
 
 
 kCoolixCmdFan = [0xB2, 0xBF, 0xE4]
 
+# The states that are a command instead of settings.
+kCoolixCommands = frozenset(
+    tuple(command.cmd)
+    for command in (SwingHorz, SwingVert, Swing, Sleep, Turbo, Light, Clean, Power)
+)
+
 
 # IRCoolixAC class
 # Supports:
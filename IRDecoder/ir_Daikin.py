@@ -26,6 +26,7 @@ from .IRsend import *
 from .IRtext import *
 from .IRutils import *
 from .protocol_base import *
+from .IRchecksum import kChecksums, ByteSum, NibbleSum, UpperNibbleSum
 
 
 # Constants
@@ -1053,7 +1054,7 @@ class Daikin(ProtocolBase):
 
         # Header #1 - Doesn't count as data.
         data_result = self.matchData(
-            results.rawbuf[offset],
+            results.rawbuf,
             kDaikinHeaderLength,
             kDaikinBitMark,
             kDaikinOneSpace,
@@ -1061,7 +1062,8 @@ class Daikin(ProtocolBase):
             kDaikinZeroSpace,
             kDaikinTolerance,
             kDaikinMarkExcess,
-            False
+            False,
+            start=offset
         )
         offset += data_result.used
         if data_result.success is False:
@@ -1071,7 +1073,6 @@ class Daikin(ProtocolBase):
             return False  # The header bits should be zero.
 
         # Footer
-        offset += 1
         if not self.matchMark(
                 results.rawbuf[offset],
                 kDaikinBitMark,
@@ -1087,21 +1088,24 @@ class Daikin(ProtocolBase):
                 kDaikinMarkExcess
         ):
             return False
+        offset += 1
 
         # Sections
-        ksectionSize[kDaikinSections] = [
+        ksectionSize = [
             kDaikinSection1Length,
             kDaikinSection2Length,
             kDaikinSection3Length
         ]
 
+        # Write each section straight into results.state.
+        state = memoryview(results.state)
         pos = 0
         for section in range(kDaikinSections):
 
             # Section Header + Section Data (7 bytes) + Section Footer
             used = self.matchGeneric(
-                results.rawbuf[offset:],
-                results.state + pos,
+                results.rawbuf,
+                state[pos:pos + ksectionSize[section]],
                 results.rawlen - offset,
                 ksectionSize[section] * 8,
                 kDaikinHdrMark,
@@ -1115,13 +1119,13 @@ class Daikin(ProtocolBase):
                 section >= kDaikinSections - 1,
                 kDaikinTolerance,
                 kDaikinMarkExcess,
-                False
+                False,
+                start=offset
             )
             if used == 0:
                 return False
 
             offset += used
-
             pos += ksectionSize[section]
 
         # Compliance
@@ -1143,6 +1147,15 @@ class Daikin(ProtocolBase):
         return True
 
 
+# An 8-bit sum of the bytes in the last byte of each section.
+kDaikinChecksum = kChecksums.register(
+    DAIKIN,
+    ByteSum(end=kDaikinByteChecksum1, at=kDaikinByteChecksum1),
+    ByteSum(kDaikinSection1Length, kDaikinByteChecksum2, at=kDaikinByteChecksum2),
+    ByteSum(kDaikinSection1Length + kDaikinSection2Length)
+)
+
+
 class IRDaikinESP(ProtocolBase):
 
     def send_ac(self, repeat):
@@ -1155,48 +1168,16 @@ class IRDaikinESP(ProtocolBase):
     # Returns:
     #   A boolean.
     @staticmethod
-    def validChecksum(state, length):
-        # Data #1
-        if (
-            length < kDaikinSection1Length or
-            state[kDaikinByteChecksum1] != sumBytes(state, kDaikinSection1Length - 1)
-        ):
-            return False
-        # Data #2
-        if (
-            length < kDaikinSection1Length + kDaikinSection2Length or
-            state[kDaikinByteChecksum2] != sumBytes(
-                state + kDaikinSection1Length,
-                kDaikinSection2Length - 1
-            )
-        ):
-            return False
-        # Data #3
-        if (
-            length < kDaikinSection1Length + kDaikinSection2Length + 2 or
-            state[length - 1] != sumBytes(
-                state + kDaikinSection1Length + kDaikinSection2Length,
-                length - (kDaikinSection1Length + kDaikinSection2Length) - 1
-            )
-        ):
+    def validChecksum(state, length=kDaikinStateLength):
+        # The 3rd section needs at least 1 byte of data.
+        if length < kDaikinSection1Length + kDaikinSection2Length + 2:
             return False
 
-        return True
+        return kDaikinChecksum.valid(state, length)
 
     # Calculate and set the checksum values for the internal state.
     def checksum(self):
-        self.remote_state[kDaikinByteChecksum1] = sumBytes(
-            self.remote_state,
-            kDaikinSection1Length - 1
-        )
-        self.remote_state[kDaikinByteChecksum2] = sumBytes(
-            self.remote_state[:kDaikinSection1Length],
-            kDaikinSection2Length - 1
-        )
-        self.remote_state[kDaikinByteChecksum3] = sumBytes(
-            self.remote_state[kDaikinSection1Length:kDaikinSection2Length],
-            kDaikinSection3Length - 1
-        )
+        kDaikinChecksum.apply(self.remote_state, kDaikinStateLength)
 
     def stateReset(self):
         self.remote_state = [0x0] * kDaikinStateLength
@@ -1570,6 +1551,14 @@ class IRDaikinESP(ProtocolBase):
 #   https:#docs.google.com/spreadsheets/d/1f8EGfIbBUo2B-CzUFdrgKQprWakoYNKM80IKZN4KXQE/edit?usp=sharing
 #   https:#www.daikin.co.nz/sites/default/files/daikin-split-system-US7-FTXZ25-50NV1B.pdf
 
+# An 8-bit sum of the bytes in the last byte of each section.
+kDaikin2Checksum = kChecksums.register(
+    DAIKIN2,
+    ByteSum(end=kDaikin2Section1Length - 1, at=kDaikin2Section1Length - 1),
+    ByteSum(kDaikin2Section1Length)
+)
+
+
 class IRDaikin2(ProtocolBase):
 
     # Send a Daikin2 A/C message.
@@ -1649,34 +1638,16 @@ class IRDaikin2(ProtocolBase):
     # Returns:
     #   A boolean.
     @staticmethod
-    def validChecksum(state, length):
-        # Validate the checksum of section #1.
-        if (
-            length <= kDaikin2Section1Length - 1 or
-            state[kDaikin2Section1Length - 1] != sumBytes(state, kDaikin2Section1Length - 1)
-        ):
-            return False
-        # Validate the checksum of section #2 (a.k.a. the rest)
-        if (
-            length <= kDaikin2Section1Length + 1 or
-            state[length - 1] != sumBytes(
-                state + kDaikin2Section1Length,
-                length - kDaikin2Section1Length - 1
-            )
-        ):
+    def validChecksum(state, length=kDaikin2StateLength):
+        # Section #2 (a.k.a. the rest) needs at least 1 byte of data.
+        if length <= kDaikin2Section1Length + 1:
             return False
-        return True
+
+        return kDaikin2Checksum.valid(state, length)
 
     # Calculate and set the checksum values for the internal state.
     def checksum(self):
-        self.remote_state[kDaikin2Section1Length - 1] = sumBytes(
-            self.remote_state,
-            kDaikin2Section1Length - 1
-        )
-        self.remote_state[kDaikin2StateLength -1 ] = sumBytes(
-            self.remote_state + kDaikin2Section1Length,
-            kDaikin2Section2Length - 1
-        )
+        kDaikin2Checksum.apply(self.remote_state, kDaikin2StateLength)
 
     def stateReset(self):
 
@@ -2216,13 +2187,15 @@ class IRDaikin2(ProtocolBase):
             return False
 
         # Sections
+        # Write each section straight into results.state.
+        state = memoryview(results.state)
         pos = 0
         for section in range(kDaikin2Sections):
 
             # Section Header + Section Data + Section Footer
             used = self.matchGeneric(
-                results.rawbuf[:offset],
-                results.state + pos,
+                results.rawbuf,
+                state[pos:pos + ksectionSize[section]],
                 results.rawlen - offset,
                 ksectionSize[section] * 8,
                 kDaikin2HdrMark,
@@ -2236,7 +2209,8 @@ class IRDaikin2(ProtocolBase):
                 section >= kDaikin2Sections - 1,
                 _tolerance + kDaikin2Tolerance,
                 kDaikinMarkExcess,
-                False
+                False,
+                start=offset
             )
             if used == 0:
                 return False
@@ -2262,6 +2236,14 @@ class IRDaikin2(ProtocolBase):
         return True
 
 
+# An 8-bit sum of the bytes in the last byte of each section.
+kDaikin216Checksum = kChecksums.register(
+    DAIKIN216,
+    ByteSum(end=kDaikin216Section1Length - 1, at=kDaikin216Section1Length - 1),
+    ByteSum(kDaikin216Section1Length)
+)
+
+
 class IRDaikin216(ProtocolBase):
 
     # Class for handling Daikin 216 bit / 27 byte A/C messages.
@@ -2342,39 +2324,16 @@ class IRDaikin216(ProtocolBase):
     # Returns:
     #   A boolean.
     @staticmethod
-    def validChecksum(state, length):
-        # Validate the checksum of section #1.
-        if (
-            length <= kDaikin216Section1Length - 1 or
-            state[kDaikin216Section1Length - 1] != sumBytes(
-                state,
-                kDaikin216Section1Length - 1
-            )
-        ):
-            return False
-        # Validate the checksum of section #2 (a.k.a. the rest)
-        if (
-            length <= kDaikin216Section1Length + 1 or
-            state[length - 1] != sumBytes(
-                state + kDaikin216Section1Length,
-                length - kDaikin216Section1Length - 1
-            )
-        ):
+    def validChecksum(state, length=kDaikin216StateLength):
+        # Section #2 (a.k.a. the rest) needs at least 1 byte of data.
+        if length <= kDaikin216Section1Length + 1:
             return False
 
-        return True
+        return kDaikin216Checksum.valid(state, length)
 
     # Calculate and set the checksum values for the internal state.
     def checksum(self):
-        self.remote_state[kDaikin216Section1Length - 1] = sumBytes(
-            self.remote_state,
-            kDaikin216Section1Length - 1
-        )
-
-        self.remote_state[kDaikin216StateLength - 1] = sumBytes(
-            self.remote_state + kDaikin216Section1Length,
-            kDaikin216Section2Length - 1
-        )
+        kDaikin216Checksum.apply(self.remote_state, kDaikin216StateLength)
 
     def stateReset(self):
         self.remote_state = [0x11, 0xDA, 0x27, 0xF0, 0x0, 0x0, 0x0, 0x0, 0x11, 0xDA, 0x27]
@@ -2573,12 +2532,14 @@ class IRDaikin216(ProtocolBase):
         offset = kStartOffset
         ksectionSize = [kDaikin216Section1Length, kDaikin216Section2Length]
         # Sections
+        # Write each section straight into results.state.
+        state = memoryview(results.state)
         pos = 0
         for section in range(kDaikin216Sections):
             # Section Header + Section Data + Section Footer
             used = self.matchGeneric(
-                results.rawbuf[:offset],
-                results.state + pos,
+                results.rawbuf,
+                state[pos:pos + ksectionSize[section]],
                 results.rawlen - offset,
                 ksectionSize[section] * 8,
                 kDaikin216HdrMark,
@@ -2592,7 +2553,8 @@ class IRDaikin216(ProtocolBase):
                 section >= kDaikin216Sections - 1,
                 kDaikinTolerance,
                 kDaikinMarkExcess,
-                False
+                False,
+                start=offset
             )
             if used == 0:
                 return False
@@ -2617,6 +2579,14 @@ class IRDaikin216(ProtocolBase):
         return True
 
 
+# An 8-bit sum of the bytes in the last byte of each section.
+kDaikin160Checksum = kChecksums.register(
+    DAIKIN160,
+    ByteSum(end=kDaikin160Section1Length - 1, at=kDaikin160Section1Length - 1),
+    ByteSum(kDaikin160Section1Length)
+)
+
+
 class IRDaikin160(ProtocolBase):
     # Class for handling Daikin 160 bit / 20 byte A/C messages.
     #
@@ -2692,32 +2662,16 @@ class IRDaikin160(ProtocolBase):
     # Returns:
     #   A boolean.
     @staticmethod
-    def validChecksum(state, length):
-        # Validate the checksum of section #1.
-        if (
-            length <= kDaikin160Section1Length - 1 or
-            state[kDaikin160Section1Length - 1] != sumBytes(state, kDaikin160Section1Length - 1)
-        ):
-            return False
-        # Validate the checksum of section #2 (a.k.a. the rest)
-        if (
-            length <= kDaikin160Section1Length + 1 or
-            state[length - 1] != sumBytes(state + kDaikin160Section1Length, length - kDaikin160Section1Length - 1)
-        ):
+    def validChecksum(state, length=kDaikin160StateLength):
+        # Section #2 (a.k.a. the rest) needs at least 1 byte of data.
+        if length <= kDaikin160Section1Length + 1:
             return False
-        return True
+
+        return kDaikin160Checksum.valid(state, length)
 
     # Calculate and set the checksum values for the internal state.
     def checksum(self):
-        self.remote_state[kDaikin160Section1Length - 1] = sumBytes(
-            self.remote_state,
-            kDaikin160Section1Length - 1
-        )
-
-        self.remote_state[kDaikin160StateLength - 1] = sumBytes(
-            self.remote_state + kDaikin160Section1Length,
-            kDaikin160Section2Length - 1
-        )
+        kDaikin160Checksum.apply(self.remote_state, kDaikin160StateLength)
 
     def stateReset(self):
         self.remote_state = [
@@ -2945,13 +2899,15 @@ class IRDaikin160(ProtocolBase):
         ksectionSize = [kDaikin160Section1Length, kDaikin160Section2Length]
 
         # Sections
+        # Write each section straight into results.state.
+        state = memoryview(results.state)
         pos = 0
         for section in range(kDaikin160Sections):
 
             # Section Header + Section Data (7 bytes) + Section Footer
             used = self.matchGeneric(
-                results.rawbuf[:offset],
-                results.state + pos,
+                results.rawbuf,
+                state[pos:pos + ksectionSize[section]],
                 results.rawlen - offset,
                 ksectionSize[section] * 8,
                 kDaikin160HdrMark,
@@ -2965,13 +2921,13 @@ class IRDaikin160(ProtocolBase):
                 section >= kDaikin160Sections - 1,
                 kDaikinTolerance,
                 kDaikinMarkExcess,
-                False
+                False,
+                start=offset
             )
             if used == 0:
                 return False
 
             offset += used
-
             pos += ksectionSize[section]
 
         # Compliance
@@ -2987,6 +2943,14 @@ class IRDaikin160(ProtocolBase):
         return True
 
 
+# An 8-bit sum of the bytes in the last byte of each section.
+kDaikin176Checksum = kChecksums.register(
+    DAIKIN176,
+    ByteSum(end=kDaikin176Section1Length - 1, at=kDaikin176Section1Length - 1),
+    ByteSum(kDaikin176Section1Length)
+)
+
+
 class Daikin176(ProtocolBase):
     # Class for handling Daikin 176 bit / 22 byte A/C messages.
     #
@@ -3057,26 +3021,16 @@ class Daikin176(ProtocolBase):
     # Returns:
     #   A boolean.
     @staticmethod
-    def validChecksum(state, length):
-        # Validate the checksum of section #1.
-        if (
-            length <= kDaikin176Section1Length - 1 or
-            state[kDaikin176Section1Length - 1] != sumBytes(state, kDaikin176Section1Length - 1)
-        ):
-            return False
-        # Validate the checksum of section #2 (a.k.a. the rest)
-        if (
-            length <= kDaikin176Section1Length + 1 or
-            state[length - 1] != sumBytes(state + kDaikin176Section1Length, length - kDaikin176Section1Length - 1)
-        ):
+    def validChecksum(state, length=kDaikin176StateLength):
+        # Section #2 (a.k.a. the rest) needs at least 1 byte of data.
+        if length <= kDaikin176Section1Length + 1:
             return False
 
-        return True
+        return kDaikin176Checksum.valid(state, length)
 
     # Calculate and set the checksum values for the internal state.
     def checksum(self):
-        self.remote_state[kDaikin176Section1Length - 1] = sumBytes(self.remote_state, kDaikin176Section1Length - 1)
-        self.remote_state[kDaikin176StateLength - 1] = sumBytes(self.remote_state + kDaikin176Section1Length, kDaikin176Section2Length - 1)
+        kDaikin176Checksum.apply(self.remote_state, kDaikin176StateLength)
 
     def stateReset(self):
 
@@ -3302,12 +3256,14 @@ class Daikin176(ProtocolBase):
         ksectionSize = [kDaikin176Section1Length, kDaikin176Section2Length]
 
         # Sections
+        # Write each section straight into results.state.
+        state = memoryview(results.state)
         pos = 0
         for section in range(kDaikin176Sections):
             # Section Header + Section Data (7 bytes) + Section Footer
             used = self.matchGeneric(
-                results.rawbuf[:offset],
-                results.state + pos,
+                results.rawbuf,
+                state[pos:pos + ksectionSize[section]],
                 results.rawlen - offset,
                 ksectionSize[section] * 8,
                 kDaikin176HdrMark,
@@ -3321,7 +3277,8 @@ class Daikin176(ProtocolBase):
                 section >= kDaikin176Sections - 1,
                 kDaikinTolerance,
                 kDaikinMarkExcess,
-                False
+                False,
+                start=offset
             )
             if used == 0:
                 return False
@@ -3342,6 +3299,15 @@ class Daikin176(ProtocolBase):
         return True
 
 
+# Section #1 has a 4-bit nibble sum in the upper nibble of its last byte,
+# section #2 an 8-bit one in its last byte.
+kDaikin128Checksum = kChecksums.register(
+    DAIKIN128,
+    UpperNibbleSum(end=kDaikin128SectionLength - 1, at=kDaikin128SectionLength - 1),
+    NibbleSum(kDaikin128SectionLength)
+)
+
+
 class Daikin128(ProtocolBase):
     # Class for handling Daikin 128 bit / 16 byte A/C messages.
     #
@@ -3417,37 +3383,24 @@ class Daikin128(ProtocolBase):
 
     @staticmethod
     def calcFirstChecksum(state):
-        return sumNibbles(
-            state,
-            kDaikin128SectionLength - 1,
-            state[kDaikin128SectionLength - 1] & 0x0F
-        ) & 0x0F
+        return kDaikin128Checksum.sections[0].calc(state, kDaikin128StateLength)
 
     @staticmethod
     def calcSecondChecksum(state):
-        return sumNibbles(state + kDaikin128SectionLength, kDaikin128SectionLength - 1)
+        return kDaikin128Checksum.sections[1].calc(state, kDaikin128StateLength)
 
     # Verify the checksum is valid for a given state.
     # Args:
     #   state:  The array to verify the checksum of.
     # Returns:
     #   A boolean.
-    @classmethod
-    def validChecksum(cls, state):
-        # Validate the checksum of section #1.
-        if state[kDaikin128SectionLength - 1] >> 4 != cls.calcFirstChecksum(state):
-            return False
-        # Validate the checksum of section #2
-        if state[kDaikin128StateLength - 1] != cls.calcSecondChecksum(state):
-            return False
-
-        return True
+    @staticmethod
+    def validChecksum(state):
+        return kDaikin128Checksum.valid(state, kDaikin128StateLength)
 
     # Calculate and set the checksum values for the internal state.
     def checksum(self):
-        self.remote_state[kDaikin128SectionLength - 1] &= 0x0F  # Clear upper half.
-        self.remote_state[kDaikin128SectionLength - 1] |= (self.calcFirstChecksum(self.remote_state) << 4)
-        self.remote_state[kDaikin128StateLength - 1] = self.calcSecondChecksum(self.remote_state)
+        kDaikin128Checksum.apply(self.remote_state, kDaikin128StateLength)
 
     def stateReset(self):
         self.remote_state = [0x16, 0x0, 0x0, 0x0, 0x0, 0x0, 0x0, 0x04, 0xA1]
@@ -3628,7 +3581,7 @@ class Daikin128(ProtocolBase):
             mins = 0  # Bounds check.
 
         # Hours.
-        self.remote_state[kDaikin128ByteClockHours] = uint8ToBcd(mins / 60)
+        self.remote_state[kDaikin128ByteClockHours] = uint8ToBcd(mins // 60)
         # Minutes.
         self.remote_state[kDaikin128ByteClockMins] = uint8ToBcd(mins % 60)
 
@@ -3659,7 +3612,7 @@ class Daikin128(ProtocolBase):
       setBit(ptr, kDaikin128HalfHourOffset, (mins % 60) >= 30)
       # Set the nr of whole hours.
       setBits(ptr, kDaikin128HoursOffset, kDaikin128HoursSize,
-              uint8ToBcd(mins / 60))
+              uint8ToBcd(mins // 60))
     }
 
     # Timer is stored in nr of half hours internally.
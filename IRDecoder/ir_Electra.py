@@ -21,6 +21,7 @@ from .IRutils import *
 from .IRsend import *
 from .IRremoteESP8266 import *
 from .protocol_base import ACProtocolBase
+from .IRchecksum import kChecksums, ByteSum
 
 # Constants
 kElectraAcHdrMark = 9166
@@ -95,6 +96,7 @@ class Power(PowerBase):
 
 class IRElectraAc(ACProtocolBase):
     _packet_len = kElectraAcStateLength
+    _checksum = kChecksums.register(decode_type_t.ELECTRA_AC, ByteSum())
     _reset = [0x00] * kElectraAcStateLength
     _reset[0] = 0xC3
     _reset[11] = 0x08
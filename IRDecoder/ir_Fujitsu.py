@@ -346,7 +346,7 @@ class IRFujitsuAC(ACProtocolBase):
             sm_complement = 0x9B
         elif length == kFujitsuAcStateLength:  # ARRAH2E, ARRY4, & ARREB1E
             sm = sumBytes(
-                state + kFujitsuAcStateLengthShort,
+                state[kFujitsuAcStateLengthShort:],
                 length - 1 - kFujitsuAcStateLengthShort
             )
 
@@ -576,7 +576,7 @@ class IRFujitsuAC(ACProtocolBase):
                     )
                 
                 checksum = sumBytes(
-                    self.remote_state + self._state_length_short, 
+                    self.remote_state[self._state_length_short:],
                     self._state_length - self._state_length_short - 1
                 )
             
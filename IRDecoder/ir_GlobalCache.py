@@ -5,8 +5,27 @@
 
 # Global Cache IR format sender originally added by Hisham Khalifa
 #   (http:#www.hishamkhalifa.com)
+#
+# Besides sendGC() this module converts between GC "sendir" strings, Pronto
+# codes & raw timings/capture ticks, for importing & serving GC code sets:
+#
+#   code = compileGlobalCache('sendir,1:1,1,38000,1,1,9,70,9,30,9,...')
+#   irsend.sendGC(code)
+#   frequency, timings = gc_to_raw(code)
+#   pronto = gc_to_pronto(code)
+#
+# Compiled codes are cached. They hold the uSeconds of the message & the
+# slice a repeat starts from, so sending one again (or repeating it) doesn't
+# convert the units again.
 
+import functools
+import re
+from array import array
+
+from .IRrecv import kRawTick
 from .IRsend import *
+from .IRbackend import kLevelMark, kLevelSpace, RecordingBackend
+from .ir_Pronto import compilePronto, raw_to_pronto
 
 # Constants
 kGlobalCacheMaxRepeat = 50
@@ -16,12 +35,349 @@ kGlobalCacheRptIndex = kGlobalCacheFreqIndex + 1
 kGlobalCacheRptStartIndex = kGlobalCacheRptIndex + 1
 kGlobalCacheStartIndex = kGlobalCacheRptStartIndex + 1
 
+# Nr. of compiled codes kept by compileGlobalCache().
+kGlobalCacheCacheSize = 1024
+# Nr. of distinct on/off pairs the compressed sendir format can refer to.
+# (A to O)
+kGlobalCacheMaxCompressed = 15
+# Largest capture tick. (uint16)
+kGlobalCacheMaxTick = 0xFFFF
+
+_kTokens = re.compile(r'\d+|[A-O]')
+_kValid = re.compile(r'^[\d,\sA-O]*$')
+
+
+class GlobalCacheCode(object):
+    __slots__ = ('frequency', 'emits', 'timings', 'pairs', 'repeat_pairs')
+
+    def __init__(self, frequency, emits, timings, repeat_start):
+        # A compiled GC code.
+        #
+        # Args:
+        #   frequency: Carrier frequency in Hz.
+        #   emits: Nr. of times the message is sent. (count)
+        #   timings: uSeconds of the message, mark first.
+        #   repeat_start: Index into timings a repeat starts from.
+        self.frequency = frequency
+        self.emits = emits
+        self.timings = array('L', timings)
+        pairs = array('L', [kLevelMark, 0, kLevelSpace, 0]) * (len(timings) // 2)
+        if len(timings) % 2:
+            pairs.extend((kLevelMark, 0))
+        pairs[1::2] = self.timings
+        # (level, duration) pairs for IRbackend.OutputBackend.play()
+        self.pairs = memoryview(pairs).toreadonly()
+        self.repeat_pairs = self.pairs[repeat_start * 2:]
+
+    def message(self, emits=None):
+        # Get the uSeconds of the whole message, repeats included.
+        #
+        # Args:
+        #   emits: Nr. of times to send it. (Def: the count of the code)
+        # Returns:
+        #   An array('L'), mark first.
+        if emits is None:
+            emits = self.emits
+
+        # A repeat can start on a space, the recording merges it with the
+        # space before it.
+        backend = RecordingBackend(len(self.pairs))
+        for index in range(min(emits, kGlobalCacheMaxRepeat)):
+            backend.play(self.repeat_pairs if index else self.pairs)
+
+        return backend.timings()
+
+
+def parseGlobalCache(code):
+    # Turn a GC code into its words. (frequency, count, repeat offset, data...)
+    #
+    # Args:
+    #   code: A "sendir,<module>:<connector>,<id>,<frequency>,..." string, the
+    #         same without the "sendir,<module>:<connector>,<id>," prefix or a
+    #         sequence of ints. Compressed strings (A to O) are expanded.
+    # Returns:
+    #   An array('L').
+    if not isinstance(code, str):
+        return array('L', code)
+
+    text = code.strip()
+    if text.lower().startswith('sendir'):
+        parts = text.split(',', 3)
+        if len(parts) < 4:
+            raise ValueError('invalid GC code: ' + repr(code[:40]))
+        text = parts[3]
+
+    if not _kValid.match(text):
+        raise ValueError('invalid GC code: ' + repr(code[:40]))
+
+    words = array('L')
+    pairs = []
+
+    for token in _kTokens.findall(text):
+        if token.isdigit():
+            words.append(int(token))
+        else:
+            # A compressed pair. Only valid on a pair boundary of the data.
+            index = ord(token) - ord('A')
+            offset = len(words) - kGlobalCacheStartIndex
+            if offset < 0 or offset % 2 or index >= len(pairs):
+                raise ValueError('invalid GC compression in: ' + repr(code[:40]))
+            words.extend(pairs[index])
+
+        # Every distinct pair gets the next letter as it completes.
+        offset = len(words) - kGlobalCacheStartIndex
+        if offset > 0 and not offset % 2:
+            pair = (words[-2], words[-1])
+            if pair not in pairs and len(pairs) < kGlobalCacheMaxCompressed:
+                pairs.append(pair)
+
+    return words
+
+
+def _period(hz):
+    # IRsend.calc_usec_period(hz, False), in whole uSeconds.
+    return max(1, (1000000 + hz // 2) // hz)
+
+
+def _compile(words):
+    if len(words) <= kGlobalCacheStartIndex:
+        raise ValueError('GC code is too short')
+
+    hz = words[kGlobalCacheFreqIndex]  # GC frequency is in Hz.
+    if hz == 0:
+        raise ValueError('GC code has no frequency')
+
+    data = words[kGlobalCacheStartIndex:]
+    # The repeat offset counts from 1.
+    repeat_start = max(words[kGlobalCacheRptStartIndex], 1) - 1
+    if repeat_start >= len(data):
+        raise ValueError('GC repeat offset is past the end of the code')
+
+    # Convert periodic units to microseconds.
+    # Minimum is kGlobalCacheMinUsec for actual GC units.
+    periodic_time = _period(hz)
+    timings = [max(word * periodic_time, kGlobalCacheMinUsec) for word in data]
+    return GlobalCacheCode(hz, words[kGlobalCacheRptIndex], timings, repeat_start)
+
+
+@functools.lru_cache(maxsize=kGlobalCacheCacheSize)
+def _compileCached(code):
+    return _compile(parseGlobalCache(code))
+
+
+def compileGlobalCache(code):
+    # Compile a GC code. Compiled codes are cached.
+    #
+    # Args:
+    #   code: See parseGlobalCache(), or a GlobalCacheCode.
+    # Returns:
+    #   A GlobalCacheCode.
+    # Raises:
+    #   ValueError if the code is invalid.
+    if isinstance(code, GlobalCacheCode):
+        return code
+
+    if not isinstance(code, str):
+        code = tuple(code)
+
+    return _compileCached(code)
+
+
+def formatGlobalCache(words, module='1:1', ident=1, compress=False):
+    # Make a "sendir" string of GC words.
+    #
+    # Args:
+    #   words: frequency, count, repeat offset, data...
+    #   module: The "<module>:<connector>" of the emitter.
+    #   ident: The ID of the request.
+    #   compress: Replace repeated on/off pairs with letters. (A to O)
+    # Returns:
+    #   A string.
+    head = [str(word) for word in words[:kGlobalCacheStartIndex]]
+    data = words[kGlobalCacheStartIndex:]
+
+    if not compress:
+        return ','.join(['sendir', module, str(ident)] + head + [str(word) for word in data])
+
+    text = ','.join(['sendir', module, str(ident)] + head)
+    pairs = []
+
+    for index in range(0, len(data), 2):
+        pair = tuple(data[index:index + 2])
+        if pair in pairs:
+            # Letters go straight after whatever is before them.
+            text += chr(ord('A') + pairs.index(pair))
+            continue
+
+        if len(pair) == 2 and len(pairs) < kGlobalCacheMaxCompressed:
+            pairs.append(pair)
+
+        text += ',' + ','.join(str(word) for word in pair)
+
+    return text
+
+
+def raw_to_gc(
+    timings,
+    frequency=38000,
+    emits=1,
+    repeat_start=1,
+    gap=kDefaultMessageGap,
+    **kwargs
+):
+    # Encode raw timings as a GC "sendir" string.
+    #
+    # Args:
+    #   timings: uSeconds of the message, mark first.
+    #   frequency: Carrier frequency in Hz. (< 1000 means kHz)
+    #   emits: Nr. of times the message is sent. (count)
+    #   repeat_start: Entry of the message a repeat starts from. (from 1)
+    #   gap: uSeconds of the space added when the message ends with a mark.
+    #   kwargs: See formatGlobalCache().
+    # Returns:
+    #   A string.
+    if frequency < 1000:  # Were we given kHz?
+        frequency *= 1000
+
+    frequency = int(frequency)
+    timings = list(timings)
+    if len(timings) % 2:
+        timings.append(gap)
+
+    periodic_time = _period(frequency)
+    words = [frequency, emits, repeat_start] + [
+        max(int(round(usec / float(periodic_time))), 1) for usec in timings
+    ]
+    return formatGlobalCache(words, **kwargs)
+
+
+def gc_to_raw(code, emits=None):
+    # Convert a GC code to raw timings. (IRsend.send_raw())
+    #
+    # Args:
+    #   code: See compileGlobalCache().
+    #   emits: Nr. of times to send it. (Def: the count of the code)
+    # Returns:
+    #   A (frequency in Hz, array('L') of uSeconds) tuple.
+    compiled = compileGlobalCache(code)
+    return compiled.frequency, compiled.message(emits)
+
+
+def rawbuf_to_gc(rawbuf, rawlen=None, frequency=38000, **kwargs):
+    # Encode a capture (IRrecv rawbuf, kRawTick ticks, entry 0 is the gap) as
+    # a GC "sendir" string.
+    #
+    # Args:
+    #   kwargs: See raw_to_gc().
+    if rawlen is None:
+        rawlen = len(rawbuf)
+
+    timings = [tick * kRawTick for tick in rawbuf[1:rawlen]]
+    return raw_to_gc(timings, frequency, **kwargs)
+
+
+def gc_to_rawbuf(code, emits=None):
+    # Convert a GC code to capture ticks. Entry 0 (the gap) is 0.
+    #
+    # Returns:
+    #   An array('H').
+    _, timings = gc_to_raw(code, emits)
+    ticks = array('H', [0])
+    ticks.extend(min(usec // kRawTick, kGlobalCacheMaxTick) for usec in timings)
+    return ticks
+
+
+def gc_to_pronto(code):
+    # Convert a GC code to a Pronto hex string.
+    #
+    # The whole message is the 1st Pronto sequence, the part from the repeat
+    # offset on the 2nd. Send it with repeat=count - 1 to send it as often as
+    # the GC code does.
+    compiled = compileGlobalCache(code)
+    timings = compiled.timings
+    repeat_start = len(timings) - len(compiled.repeat_pairs) // 2
+
+    if repeat_start % 2:
+        raise ValueError('a Pronto sequence can not start with a space')
+
+    return raw_to_pronto(timings, compiled.frequency, timings[repeat_start:])
+
+
+def pronto_to_gc(code, repeat=kNoRepeat, **kwargs):
+    # Convert a Pronto code to a GC "sendir" string that sends the same as
+    # IRsend.sendPronto(code, repeat=repeat).
+    #
+    # Args:
+    #   kwargs: See formatGlobalCache().
+    compiled = compilePronto(code)
+    once = compiled.once
+    again = compiled.repeat
+
+    if not once:
+        return raw_to_gc(again, compiled.frequency, repeat + 1, 1, **kwargs)
+
+    if not again or not repeat:
+        return raw_to_gc(once, compiled.frequency, 1, 1, **kwargs)
+
+    return raw_to_gc(
+        once + again,
+        compiled.frequency,
+        repeat,
+        len(once) + 1,
+        **kwargs
+    )
+
+
+_kLibraryCode = re.compile(r'(?:^|[\s:=,])((?:sendir|\d+\s*,\s*\d+\s*,\s*\d+\s*,).*)$', re.I)
+
+
+def convert_library(lines, emits=None, strict=False, to=None):
+    # Convert a library of GC codes, a line at a time.
+    #
+    # Each line is an optional name followed by the code. e.g.
+    #   KEY_POWER,sendir,1:1,1,38000,1,1,343,171,21,...
+    # Empty lines & lines starting with '#' are skipped.
+    #
+    # Args:
+    #   lines: An iterable of lines. e.g. an open file.
+    #   emits: See gc_to_raw().
+    #   strict: Raise a ValueError for an invalid line instead of skipping it.
+    #   to: A function to convert the GlobalCacheCode of every line with.
+    #       e.g. gc_to_pronto.
+    # Returns:
+    #   A generator of (name, frequency, timings) tuples, or (name, result of
+    #   to) tuples. name is '' for a line without a name.
+    for line_no, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+
+        match = _kLibraryCode.search(line)
+        try:
+            if match is None:
+                raise ValueError('no GC code found')
+
+            name = line[:match.start(1)].strip(' \t:=,')
+            compiled = compileGlobalCache(match.group(1))
+            if to is None:
+                result = gc_to_raw(compiled, emits)
+            else:
+                result = (to(compiled),)
+        except ValueError as err:
+            if strict:
+                raise ValueError('line ' + str(line_no) + ': ' + str(err))
+            continue
+
+        yield (name,) + tuple(result)
+
 
 # Send a shortened GlobalCache (GC) IRdb/control tower formatted message.
 #
 # Args:
-#   buf: An array of containing the shortened GlobalCache data.
-#   len: Nr. of entries in the buf[] array.
+#   buf: The GC code. A "sendir" string, an array of the shortened GlobalCache
+#        data or a GlobalCacheCode.
+#   length: Nr. of entries in the buf[] array. (Def: all of them)
+#   repeat: Nr. of times to send it on top of the count of the code.
 #
 # Status: STABLE / Known working.
 #
@@ -32,33 +388,28 @@ kGlobalCacheStartIndex = kGlobalCacheRptStartIndex + 1
 #   then the rest of entries are the actual IR message as units of periodic
 #   time.
 #   e.g. sendir,1:1,1,38000,1,1,9,70,9,30,9,... .38000,1,1,9,70,9,30,9,...
+#
+#   Compiled codes are cached, the units are converted the first time a code
+#   is sent only.
 # Ref:
 #   https:#irdb.globalcache.com/Home/Database
-def sendGC(self, buf, length):
-    hz = buf[kGlobalCacheFreqIndex]  # GC frequency is in Hz.
-    self.enable_ir_out(hz)
-    periodic_time = self.calc_usec_period(hz, False)
-    emits = min(buf[kGlobalCacheRptIndex], kGlobalCacheMaxRepeat)
-    # Repeat
-    repeat = 0
-    while repeat < emits:
-        # First time through, start at the beginning (kGlobalCacheStartIndex),
-        # otherwise for repeats, we start a specified offset from that.
-        offset = kGlobalCacheStartIndex
-        if repeat:
-            offset += buf[kGlobalCacheRptStartIndex] - 1
-        # Data
-        while offset < length:
-            # Convert periodic units to microseconds.
-            # Minimum is kGlobalCacheMinUsec for actual GC units.
-            microseconds = max(buf[offset] * periodic_time, kGlobalCacheMinUsec)
-            # These codes start at an odd index (not even as with sendRaw).
-            if offset & 1:  # Odd bit.
-                self.mark(microseconds)
-            else:  # Even bit.
-                self.space(microseconds)
-            offset += 1
-        repeat += 1
+def sendGC(self, buf, length=None, repeat=kNoRepeat):
+    if length and not isinstance(buf, (str, GlobalCacheCode)):
+        buf = buf[:length]
+
+    try:
+        code = compileGlobalCache(buf)
+    except ValueError:
+        return
+
+    self.enable_ir_out(code.frequency)
+    backend = self.get_backend()
+    emits = min(code.emits + repeat, kGlobalCacheMaxRepeat)
+
+    # First time through, send it all, repeats start from the repeat offset.
+    for index in range(emits):
+        backend.play(code.repeat_pairs if index else code.pairs)
+
     # It's possible that we've ended on a mark(), thus ensure the LED is off.
     self.led_off()
 
@@ -14,6 +14,7 @@ from .IRrecv import *
 from .IRsend import *
 from .IRtext import *
 from .IRutils import *
+from .IRchecksum import kChecksums, ByteSum
 
 # Ref:
 #   https:#github.com/crankyoldgit/IRremoteESP8266/issues/404
@@ -208,6 +209,10 @@ kHaierAcYrw02ButtonSleep = 0xB
 # define HAIER_AC_YRW02_BUTTON_SLEEP kHaierAcYrw02ButtonSleep
 
 
+# An 8-bit sum of the bytes before it, in the last byte.
+kHaierAcChecksum = kChecksums.register(HAIER_AC, ByteSum())
+
+
 class IRHaierAC(object):
     # Class for emulating a Haier HSU07-HEA03 remote
 
@@ -377,7 +382,7 @@ class IRHaierAC(object):
         if length < 2:
             return False  # 1 byte of data can't have a checksum.
 
-        return state[length - 1] == sumBytes(state, length - 1)
+        return kHaierAcChecksum.valid(state, length)
 
     def toString(self):
         # Convert the internal state into a human readable string.
@@ -596,7 +601,7 @@ class IRHaierAC(object):
         self.setCommand(kHaierAcCmdOn)
 
     def checksum(self):
-        self.remote_state[8] = sumBytes(self.remote_state, kHaierACStateLength - 1)
+        kHaierAcChecksum.apply(self.remote_state, kHaierACStateLength)
 
     @staticmethod
     def getTime(ptr):
@@ -614,6 +619,9 @@ class IRHaierAC(object):
         setBits(ptr + 1, kHaierAcTimeOffset, kHaierAcMinsSize, mins % 60)  # Minutes
 
 
+kHaierAcYrw02Checksum = kChecksums.register(HAIER_AC_YRW02, ByteSum())
+
+
 class IRHaierACYRW02(object):
     def __init__(self, pin, inverted=False, use_modulation=True):
         self.remote_state = [0x0] * kHaierACYRW02StateLength
@@ -774,7 +782,7 @@ class IRHaierACYRW02(object):
         if length < 2:
             return False  # 1 byte of data can't have a checksum.
 
-        return state[length - 1] == sumBytes(state, length - 1)
+        return kHaierAcYrw02Checksum.valid(state, length)
 
     @staticmethod
     def convertMode(mode):
@@ -995,7 +1003,7 @@ class IRHaierACYRW02(object):
         self.setPower(True)
 
     def checksum(self):
-        self.remote_state[kHaierACYRW02StateLength - 1] = sumBytes(self.remote_state, kHaierACYRW02StateLength - 1)
+        kHaierAcYrw02Checksum.apply(self.remote_state, kHaierACYRW02StateLength)
 
 
 # Supported devices:
@@ -1132,7 +1140,7 @@ def decodeHaierAC(results, nbits, strict):
     if strict:
         if results.state[0] != kHaierAcPrefix:
             return False
-        if not IRHaierAC.validChecksum(results.state, nbits / 8):
+        if not IRHaierAC.validChecksum(results.state, nbits // 8):
             return False
 
     # Success
@@ -1164,7 +1172,7 @@ def decodeHaierACYRW02(results, nbits, strict):
     if strict and results.state[0] != kHaierAcYrw02Prefix:
         return False
 
-    if not IRHaierACYRW02.validChecksum(results.state, nbits / 8):
+    if not IRHaierACYRW02.validChecksum(results.state, nbits // 8):
         return False
 
     # Success
@@ -5,6 +5,7 @@ from .IRrecv import *
 from .IRsend import *
 from .IRtext import *
 from .IRutils import *
+from .IRchecksum import kChecksums, InvertedPairs, ReversedSum
 
 # Hitachi A/C
 #
@@ -109,6 +110,10 @@ setBit = irutils.setBit
 setBits = irutils.setBits
 
 
+# 62 minus the sum of the bytes before it, LSB first, in the last byte.
+kHitachiAcChecksum = kChecksums.register(HITACHI_AC, ReversedSum(init=62))
+
+
 # Classes
 class IRHitachiAc(object):
 
@@ -235,15 +240,11 @@ class IRHitachiAc(object):
         if length < 2:
             return True  # Assume True for lengths that are too short.
 
-        return state[length - 1] == calcChecksum(state, length)
+        return kHitachiAcChecksum.valid(state, length)
 
     @staticmethod
     def calcChecksum(state, length=kHitachiAcStateLength):
-        sm = 62
-        for i in range(length - 1):
-            sm -= reverseBits(state[i], 8)
-
-        return reverseBits(sm, 8)
+        return kHitachiAcChecksum.calc(state, length)
 
     @staticmethod
     def convertMode(mode):
@@ -354,7 +355,11 @@ class IRHitachiAc(object):
         return result
 
     def checksum(self, length=kHitachiAcStateLength):
-        self.remote_state[length - 1] = calcChecksum(self.remote_state, length)
+        kHitachiAcChecksum.apply(self.remote_state, length)
+
+
+# From byte 3 on, every 2nd byte is the inverse of the one before it.
+kHitachiAc424Checksum = kChecksums.register(HITACHI_AC424, InvertedPairs(3))
 
 
 class IRHitachiAc424(object):
@@ -391,8 +396,7 @@ class IRHitachiAc424(object):
         self.setFan(kHitachiAc424FanAuto)
 
     def setInvertedStates(self):
-        for i in range(3, kHitachiAc424StateLength - 1, 2):
-            self.remote_state[i + 1] = ~self.remote_state[i]
+        kHitachiAc424Checksum.apply(self.remote_state, kHitachiAc424StateLength)
 
     def send(self, repeat=kHitachiAcDefaultRepeat):
         self._irsend.sendHitachiAc424(self.getRaw(), kHitachiAc424StateLength, repeat)
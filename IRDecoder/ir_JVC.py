@@ -50,7 +50,7 @@ def sendJVC(self, data, nbits, repeat):
     # Set 38kHz IR carrier frequency & a 1/3 (33%) duty cycle.
     self.enable_ir_out(38, 33)
 
-    usecs = IRtimer()
+    usecs = self.timer()
     # Header
     # Only sent for the first message.
     self.mark(kJvcHdrMark)
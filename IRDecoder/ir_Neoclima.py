@@ -10,6 +10,7 @@ from .IRutils import *
 from .IRsend import *
 from .IRtext import *
 from .protocol_base import ACProtocolBase
+from .IRchecksum import kChecksums, ByteSum
 
 # Supports:
 #   Brand: Neoclima,  Model: NS-09AHTI A/C
@@ -24,19 +25,7 @@ class SetBit(SetParam):
 
     @classmethod
     def set(cls, remote_state, bit_state):
-        if cls.num_bits is None:
-            remote_state[cls.byte_num] = irutils.setBit(
-                remote_state[cls.byte_num],
-                cls.bit_num,
-                bit_state
-            )
-        else:
-            remote_state[cls.byte_num] = irutils.setBits(
-                remote_state[cls.byte_num],
-                cls.bit_num,
-                cls.num_bits,
-                bit_state
-            )
+        cls._field_set(remote_state, bit_state)
 
         if hasattr(cls, 'button'):
             Button.set(remote_state, getattr(cls, 'button'))
@@ -233,6 +222,7 @@ class IRNeoclimaAc(ACProtocolBase):
     ]
     _reset += [0x00] * (_packet_len - len(_reset))
     _protocol = decode_type_t.NEOCLIMA
+    _checksum = kChecksums.register(decode_type_t.NEOCLIMA, ByteSum())
 
     def send(self, repeat=kNeoclimaMinRepeat):
         self._irsend.sendNeoclima(self.get_raw(), self._packet_len, repeat)
@@ -365,13 +365,13 @@ class Panasonic(ProtocolBase):
         if strict and nbits != kPanasonicBits:
             return False  # Request is out of spec.
     
-        data = 0
+        data_result = match_result_t()
         offset = kStartOffset
     
         # Match Header + Data + Footer
         if not self.matchGeneric(
-            results.rawbuf[:offset],
-            data,
+            results.rawbuf,
+            data_result,
             results.rawlen - offset,
             nbits,
             kPanasonicHdrMark,
@@ -382,10 +382,13 @@ class Panasonic(ProtocolBase):
             kPanasonicZeroSpace,
             kPanasonicBitMark,
             kPanasonicEndGap,
-            True
+            True,
+            start=offset
         ):
             return False
 
+        data = data_result.data
+
         # Compliance
         address = data >> 32
         command = data
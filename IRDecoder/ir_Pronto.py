@@ -1,32 +1,285 @@
+# -*- coding: utf-8 -*-
 # Copyright 2017 David Conran
+# Copyright 2020 Kevin Schlosser
 
 # Pronto code message generation
 
-#include <algorithm>
-#include "IRsend.h"
+import functools
+import sys
+from array import array
+
+from .IRremoteESP8266 import *
+from .IRbackend import kLevelMark, kLevelSpace
+from .IRsend import IRsend, kDefaultMessageGap
 
 # Constants
-float kProntoFreqFactor = 0.241246
+kProntoFreqFactor = 0.241246
 kProntoTypeOffset = 0
 kProntoFreqOffset = 1
 kProntoSeq1LenOffset = 2
 kProntoSeq2LenOffset = 3
 kProntoDataOffset = 4
 
-#if SEND_PRONTO
+# Nr. of compiled codes kept by compilePronto().
+kProntoCacheSize = 1024
+
+
+class ProntoCode(object):
+    __slots__ = ('frequency', 'once', 'repeat', 'once_pairs', 'repeat_pairs')
+
+    def __init__(self, frequency, once, repeat):
+        # A compiled Pronto code.
+        #
+        # Args:
+        #   frequency: Carrier frequency in Hz.
+        #   once: uSeconds of the 1st (normal) sequence, mark first.
+        #   repeat: uSeconds of the 2nd (repeat) sequence, mark first.
+        self.frequency = frequency
+        self.once = array('L', once)
+        self.repeat = array('L', repeat)
+        # The same as (level, duration) pairs for IRbackend.OutputBackend.play()
+        self.once_pairs = _pairs(self.once)
+        self.repeat_pairs = _pairs(self.repeat)
+
+    def timings(self, repeat=kNoRepeat):
+        # Get the uSeconds of the whole message.
+        #
+        # Args:
+        #   repeat: Nr. of times to send the repeat sequence.
+        #           If there is no 1st sequence, it is sent one more time.
+        # Returns:
+        #   An array('L'), mark first.
+        if not self.once:
+            repeat += 1
+
+        return self.once + self.repeat * repeat
+
+
+def _pairs(timings):
+    pairs = array('L', [kLevelMark, 0, kLevelSpace, 0]) * (len(timings) // 2)
+    pairs[1::2] = timings
+    return pairs
+
+
+def parseProntoWords(code):
+    # Turn a Pronto code into a list of words.
+    #
+    # Args:
+    #   code: A hex string. e.g. "0000 0067 0000 0015 0060 ..." Words can be
+    #         separated by whitespace and/or commas. Or a sequence of ints.
+    # Returns:
+    #   An array('H').
+    if not isinstance(code, str):
+        return array('H', code)
+
+    # The usual format, 4 digit words, goes through bytes.fromhex().
+    text = code.replace(',', ' ')
+    tokens = text.split()
+    if all(len(token) == 4 for token in tokens):
+        try:
+            words = array('H', bytes.fromhex(''.join(tokens)))
+        except ValueError:
+            raise ValueError('invalid Pronto code: ' + repr(code[:40]))
+
+        if sys.byteorder == 'little':
+            words.byteswap()  # Pronto words are written big endian.
+
+        return words
+
+    try:
+        return array('H', [int(token, 16) for token in tokens])
+    except (ValueError, OverflowError):
+        raise ValueError('invalid Pronto code: ' + repr(code[:40]))
+
+
+def _compile(words):
+    length = len(words)
+    # Check we have enough data to work out what to send.
+    if length < kProntoMinLength:
+        raise ValueError('Pronto code is too short')
+
+    # We only know how to deal with 'raw' pronto codes types. Reject all others.
+    if words[kProntoTypeOffset] != 0:
+        raise ValueError('only raw (0000) Pronto codes are supported')
+
+    if words[kProntoFreqOffset] == 0:
+        raise ValueError('Pronto code has no frequency')
+
+    # Pronto frequency is in Hz.
+    hz = int(1000000 / (words[kProntoFreqOffset] * kProntoFreqFactor))
+
+    # Grab the length of the two sequences.
+    seq_1_len = words[kProntoSeq1LenOffset] * 2
+    seq_2_len = words[kProntoSeq2LenOffset] * 2
+    # Calculate where each sequence starts in the buffer.
+    seq_1_start = kProntoDataOffset
+    seq_2_start = kProntoDataOffset + seq_1_len
+
+    # Check we have enough data for the complete sequences.
+    if seq_2_start + seq_2_len > length:
+        raise ValueError('Pronto code is shorter than its sequences')
+
+    # IRsend.calc_usec_period(hz, False), in whole uSeconds.
+    periodic_time = max(1, (1000000 + hz // 2) // hz)
+
+    once = [word * periodic_time for word in words[seq_1_start:seq_2_start]]
+    repeat = [word * periodic_time for word in words[seq_2_start:seq_2_start + seq_2_len]]
+    return ProntoCode(hz, once, repeat)
+
+
+@functools.lru_cache(maxsize=kProntoCacheSize)
+def _compileCached(code):
+    return _compile(parseProntoWords(code))
+
+
+def compilePronto(code):
+    # Compile a Pronto code. Compiled codes are cached.
+    #
+    # Args:
+    #   code: A hex string, a sequence of words or a ProntoCode.
+    # Returns:
+    #   A ProntoCode.
+    # Raises:
+    #   ValueError if the code is invalid or not a raw Pronto code.
+    if isinstance(code, ProntoCode):
+        return code
+
+    if not isinstance(code, str):
+        code = tuple(code)
+
+    return _compileCached(code)
+
+
+def pronto_to_raw(code, repeat=kNoRepeat):
+    # Convert a Pronto code to raw timings. (IRsend.send_raw())
+    #
+    # Returns:
+    #   A (frequency in Hz, array('L') of uSeconds) tuple.
+    compiled = compilePronto(code)
+    return compiled.frequency, compiled.timings(repeat)
+
+
+def raw_to_pronto(timings, frequency=38000, repeat=None, gap=kDefaultMessageGap):
+    # Encode raw timings as a Pronto hex string. e.g. for exporting captures.
+    #
+    # Args:
+    #   timings: uSeconds of the 1st sequence, mark first.
+    #   frequency: Carrier frequency in Hz. (< 1000 means kHz)
+    #   repeat: uSeconds of the 2nd (repeat) sequence, mark first.
+    #   gap: uSeconds of the space added when a sequence ends with a mark.
+    # Returns:
+    #   A Pronto hex string.
+    if frequency < 1000:  # Were we given kHz?
+        frequency *= 1000
+
+    freq_word = min(max(int(round(1000000 / (frequency * kProntoFreqFactor))), 1), 0xFFFF)
+    # The same whole uSecond period sendPronto() multiplies the words with.
+    hz = int(1000000 / (freq_word * kProntoFreqFactor))
+    period = max(1, (1000000 + hz // 2) // hz)
+
+    def units(sequence):
+        sequence = list(sequence)
+        if len(sequence) % 2:
+            sequence.append(gap)
+
+        return [
+            min(max(int(round(usec / period)), 1), 0xFFFF)
+            for usec in sequence
+        ]
+
+    once = units(timings)
+    again = units(repeat or ())
+    words = [0x0000, freq_word, len(once) // 2, len(again) // 2] + once + again
+    return ' '.join('%04X' % word for word in words)
+
+
+def convert_library(lines, repeat=kNoRepeat, strict=False):
+    # Convert a library of Pronto codes, a line at a time.
+    #
+    # Each line is an optional name followed by the code. e.g.
+    #   KEY_POWER 0000 006C 0022 0002 0155 00AA ...
+    # Empty lines & lines starting with '#' are skipped.
+    #
+    # Args:
+    #   lines: An iterable of lines. e.g. an open file.
+    #   repeat: See pronto_to_raw().
+    #   strict: Raise a ValueError for an invalid line instead of skipping it.
+    # Returns:
+    #   A generator of (name, frequency, timings) tuples. name is '' for a
+    #   line without a name.
+    for line_no, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+
+        tokens = line.replace(',', ' ').split()
+        # The name is everything before the code.
+        start = _codeStart(tokens)
+
+        name = ' '.join(tokens[:start]).rstrip(':=')
+        try:
+            frequency, timings = pronto_to_raw(' '.join(tokens[start:]), repeat)
+        except ValueError as err:
+            if strict:
+                raise ValueError('line ' + str(line_no) + ': ' + str(err))
+            continue
+
+        yield name, frequency, timings
+
+
+def _codeStart(tokens):
+    # Find where the code starts in the tokens of a line. A name can look like
+    # a word (e.g. FACE, BEEF or 0001), so the code is taken from the end of
+    # the line: the 0000 word whose sequence lengths add up to the rest of
+    # the line. If there is none, the first 0000 word so the code gets
+    # reported as invalid.
+    start = len(tokens)
+    while start and _isWord(tokens[start - 1]):
+        start -= 1
+
+    first = None
+    for index in range(start, len(tokens)):
+        if int(tokens[index], 16) != 0:
+            continue
+
+        if first is None:
+            first = index
+
+        if index + kProntoDataOffset > len(tokens):
+            break
+
+        seq_1_len = int(tokens[index + kProntoSeq1LenOffset], 16)
+        seq_2_len = int(tokens[index + kProntoSeq2LenOffset], 16)
+        if index + kProntoDataOffset + (seq_1_len + seq_2_len) * 2 == len(tokens):
+            return index
+
+    return start if first is None else first
+
+
+def _isWord(token):
+    if len(token) != 4:
+        return False
+
+    try:
+        int(token, 16)
+    except ValueError:
+        return False
+
+    return True
+
+
 # Send a Pronto Code formatted message.
 #
 # Args:
-#   data: An array of containing the pronto codes.
-#   len: Nr. of entries in the data[] array.
+#   data: A Pronto hex string, a list of words or a ProntoCode.
+#   length: Nr. of entries of data to use. (Def: all of them)
 #   repeat: Nr. of times to repeat the message.
 #
 # Status: ALPHA / Not tested in the real world.
 #
 # Note:
-#   Pronto codes are typically represented in hexadecimal.
-#   You will need to convert the code to an array of integers, and calculate
-#   it's length.
+#   Compiled codes are cached, sending the same code again doesn't parse it
+#   again.
 #   e.g.
 #      A Sony 20 bit DVD remote command.
 #      "0000 0067 0000 0015 0060 0018 0018 0018 0030 0018 0030 0018 0030 0018
@@ -34,71 +287,38 @@ kProntoDataOffset = 4
 #       0030 0018 0030 0018 0018 0018 0018 0018 0030 0018 0018 0018 0018 0018
 #       0030 0018 0018 03f6"
 #
-#   converts to:
-#
-#       prontoCode[46] = {
-#           0x0000, 0x0067, 0x0000, 0x0015,
-#           0x0060, 0x0018, 0x0018, 0x0018, 0x0030, 0x0018, 0x0030, 0x0018,
-#           0x0030, 0x0018, 0x0018, 0x0018, 0x0030, 0x0018, 0x0018, 0x0018,
-#           0x0018, 0x0018, 0x0030, 0x0018, 0x0018, 0x0018, 0x0030, 0x0018,
-#           0x0030, 0x0018, 0x0030, 0x0018, 0x0018, 0x0018, 0x0018, 0x0018,
-#           0x0030, 0x0018, 0x0018, 0x0018, 0x0018, 0x0018, 0x0030, 0x0018,
-#           0x0018, 0x03f6}
 #       # Send the Pronto(Sony) code. Repeat twice as Sony's require that.
-#       sendPronto(prontoCode, 46, kSonyMinRepeat)
+#       irsend.sendPronto(prontoCode, repeat=kSonyMinRepeat)
 #
 # Ref:
 #   http:#www.etcwiki.org/wiki/Pronto_Infrared_Format
 #   http:#www.remotecentral.com/features/irdisp2.htm
-void IRsend.sendPronto(data[], len, repeat) {
-  # Check we have enough data to work out what to send.
-  if (len < kProntoMinLength) return
-
-  # We only know how to deal with 'raw' pronto codes types. Reject all others.
-  if (data[kProntoTypeOffset] != 0) return
-
-  # Pronto frequency is in Hz.
-  hz =
-      (uint16_t)(1000000U / (data[kProntoFreqOffset] * kProntoFreqFactor))
-  enableIROut(hz)
-
-  # Grab the length of the two sequences.
-  seq_1_len = data[kProntoSeq1LenOffset] * 2
-  seq_2_len = data[kProntoSeq2LenOffset] * 2
-  # Calculate where each sequence starts in the buffer.
-  seq_1_start = kProntoDataOffset
-  seq_2_start = kProntoDataOffset + seq_1_len
-
-  periodic_time = calcUSecPeriod(hz, False)
-
-  # Normal (1st sequence) case.
-  # Is there a first (normal) sequence to send?
-  if (seq_1_len > 0) {
-    # Check we have enough data to send the complete first sequence.
-    if (seq_1_len + seq_1_start > len) return
-    # Send the contents of the 1st sequence.
-    for (i = seq_1_start i < seq_1_start + seq_1_len i += 2) {
-      mark(data[i] * periodic_time)
-      space(data[i + 1] * periodic_time)
-    }
-  } else {
-    # There was no first sequence to send, it is implied that we have to send
-    # the 2nd/repeat sequence an additional time. i.e. At least once.
-    repeat++
-  }
-
-  # Repeat (2nd sequence) case.
-  # Is there a second (repeat) sequence to be sent?
-  if (seq_2_len > 0) {
-    # Check we have enough data to send the complete second sequence.
-    if (seq_2_len + seq_2_start > len) return
-
-    # Send the contents of the 2nd sequence.
-    for (r = 0 r < repeat r++)
-      for (i = seq_2_start i < seq_2_start + seq_2_len i += 2) {
-        mark(data[i] * periodic_time)
-        space(data[i + 1] * periodic_time)
-      }
-  }
-}
-#endif
+def sendPronto(self, data, length=None, repeat=kNoRepeat):
+    if length and not isinstance(data, (str, ProntoCode)):
+        data = data[:length]
+
+    try:
+        code = compilePronto(data)
+    except ValueError:
+        return
+
+    self.enable_ir_out(code.frequency)
+    backend = self.get_backend()
+
+    # Normal (1st sequence) case.
+    if code.once:
+        backend.play(code.once_pairs)
+    else:
+        # There was no first sequence to send, it is implied that we have to send
+        # the 2nd/repeat sequence an additional time. i.e. At least once.
+        repeat += 1
+
+    # Repeat (2nd sequence) case.
+    if code.repeat:
+        for _ in range(repeat):
+            backend.play(code.repeat_pairs)
+
+    self.led_off()
+
+
+IRsend.sendPronto = sendPronto
@@ -13,11 +13,17 @@
 #
 # Copyright 2018 David Conran
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from .IRremoteESP8266 import *
 from .IRrecv import *
 from .IRsend import *
 from .IRtext import *
 from .IRutils import *
+from .IRchecksum import kChecksums, UpperNibbleSum, registerChecksumKind
 
 # Supports:
 #   Brand: Samsung,  Model: UA55H6300 TV
@@ -99,6 +105,48 @@ kSamsungAcOneSpace = 1432
 kSamsungAcZeroSpace = 436
 
 
+# Nr. of set bits of every byte value.
+_kBitCounts = bytes(bin(value).count('1') for value in range(256))
+
+
+@registerChecksumKind
+class SamsungAcSum(UpperNibbleSum):
+    # 28 minus most of the set bits of a 7 byte section, in the upper nibble of
+    # the 2nd byte of the section.
+    # Shamelessly inspired by:
+    #   https:#github.com/adafruit/Raw-IR-decoder-for-Arduino/pull/3/files
+    kind = 'samsung-ac'
+
+    def _calcNibble(self, state, start, end, at):
+        counts = _kBitCounts
+        total = (
+            counts[state[start]] -
+            counts[state[start + 1] & 0x0F] +
+            counts[state[start + 2] >> 1] +
+            sum(counts[value] for value in state[start + 3:start + 6])
+        )
+        return (28 - total) & 0x0F
+
+    def _calcNibbleMany(self, states, start, end, at):
+        counts = np.frombuffer(_kBitCounts, dtype=np.uint8).astype(np.int32)
+        total = (
+            counts[states[:, start]] -
+            counts[states[:, start + 1] & 0x0F] +
+            counts[states[:, start + 2] >> 1] +
+            counts[states[:, start + 3:start + 6]].sum(axis=1)
+        )
+        return ((28 - total) & 0x0F).astype(np.uint8)
+
+
+# The first & the last section have a checksum. (The middle section of an
+# extended state doesn't)
+kSamsungAcChecksum = kChecksums.register(
+    SAMSUNG_AC,
+    SamsungAcSum(0, kSamsungACSectionLength, 1),
+    SamsungAcSum(-kSamsungACSectionLength, None, 1 - kSamsungACSectionLength)
+)
+
+
 # Classes
 class IRSamsungAc(object):
     def __init__(self, pin, inverted=False, use_modulation=True):
@@ -381,35 +429,16 @@ class IRSamsungAc(object):
         if length < kSamsungAcStateLength:
             return True  # No checksum to compare with. Assume okay.
 
-        offset = 0
-        if length >= kSamsungAcExtendedStateLength:
-            offset = 7
-
-        return (
-            (
-                GETBITS8(state[length - 6], kHighNibble, kNibbleSize) ==
-                IRSamsungAc.calcChecksum(state, length)
-            ) and
-            (
-                GETBITS8(state[length - (13 + offset)], kHighNibble, kNibbleSize) ==
-                IRSamsungAc.calcChecksum(state, length - (7 + offset))
-            )
-        )
+        return kSamsungAcChecksum.valid(state, length)
     
     @staticmethod
     def calcChecksum(state, length=kSamsungAcStateLength):
-        sm = 0
+        # Checksum of the section that ends at length.
         # Safety check so we don't go outside the array.
-        if length < 7:
+        if length < kSamsungACSectionLength:
             return 255
-        # Shamelessly inspired by:
-        #   https:#github.com/adafruit/Raw-IR-decoder-for-Arduino/pull/3/files
-        # Count most of the '1' bits after the checksum location.
-        sm += countBits(state[length - 7], 8)
-        sm -= countBits(GETBITS8(state[length - 6], kLowNibble, kNibbleSize), 8)
-        sm += countBits(GETBITS8(state[length - 5], 1, 7), 8)
-        sm += countBits(state + length - 4, 3)
-        return GETBITS8(28 - sm, kLowNibble, kNibbleSize)
+
+        return kSamsungAcChecksum.sections[-1].calc(state, length)
     
     @staticmethod
     def convertMode(mode):
@@ -541,18 +570,8 @@ class IRSamsungAc(object):
         # Update the checksum for the internal state.
         if length < 13:
             return
-        setBits(
-            self.remote_state[length - 6],
-            kHighNibble,
-            kNibbleSize,
-            self.calcChecksum(self.remote_state, length)
-        )
-        setBits(
-            self.remote_state[length - 13],
-            kHighNibble,
-            kNibbleSize,
-            self.calcChecksum(remote_state, length - 7)
-        )
+
+        kSamsungAcChecksum.apply(self.remote_state, length)
 
 
 addBoolToString = irutils.addBoolToString
@@ -609,8 +628,8 @@ def sendSAMSUNG(data, nbits, repeat):
 #
 # Status: BETA / Should be working.
 def encodeSAMSUNG(customer, command):
-    revcustomer = reverseBits(customer, len(customer) * 8)
-    revcommand = reverseBits(command, len(command) * 8)
+    revcustomer = reverseBits(customer, 8)
+    revcommand = reverseBits(command, 8)
     return (
         (revcommand ^ 0xFF) | 
         (revcommand << 8) | 
@@ -685,8 +704,8 @@ def decodeSAMSUNG(results, nbits, strict):
     results.value = data
     results.decode_type = SAMSUNG
     # command & address need to be reversed as they are transmitted LSB first,
-    results.command = reverseBits(command, sizeof(command) * 8)
-    results.address = reverseBits(address, sizeof(address) * 8)
+    results.command = reverseBits(command, 8)
+    results.address = reverseBits(address, 8)
     return True
 
 
@@ -937,7 +956,7 @@ def decodeSamsungAC(results, nbits, strict):
     if results.state[0] != 0x02 or results.state[2] != 0x0F:
         return False
 
-    if strict and not IRSamsungAc.validChecksum(results.state, nbits / 8):
+    if strict and not IRSamsungAc.validChecksum(results.state, nbits // 8):
         return False
 
     # Success
@@ -185,7 +185,7 @@ void IRTrotecESP.send(repeat) {
 
 IRTrotecESP.calcChecksum(state[],
                                   length) {
-  return sumBytes(state + 2, length - 3)
+  return sumBytes(state[2:], length - 3)
 }
 
 bool IRTrotecESP.validChecksum(state[], length) {
@@ -193,7 +193,7 @@ bool IRTrotecESP.validChecksum(state[], length) {
 }
 
 void IRTrotecESP.checksum(void) {
-  remote_state[kTrotecStateLength - 1] = sumBytes(remote_state + 2,
+  remote_state[kTrotecStateLength - 1] = sumBytes(remote_state[2:],
                                                   kTrotecStateLength - 3)
 }
 
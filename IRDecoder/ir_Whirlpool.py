@@ -274,13 +274,13 @@ void IRWhirlpoolAc.begin(void) { _irsend.begin() }
 bool IRWhirlpoolAc.validChecksum(state[], length) {
   if (length > kWhirlpoolAcChecksumByte1 and
       state[kWhirlpoolAcChecksumByte1] !=
-          xorBytes(state + 2, kWhirlpoolAcChecksumByte1 - 1 - 2)) {
+          xorBytes(state[2:], kWhirlpoolAcChecksumByte1 - 1 - 2)) {
     DPRINTLN("DEBUG: First Whirlpool AC checksum failed.")
     return False
   }
   if (length > kWhirlpoolAcChecksumByte2 and
       state[kWhirlpoolAcChecksumByte2] !=
-          xorBytes(state + kWhirlpoolAcChecksumByte1 + 1,
+          xorBytes(state[kWhirlpoolAcChecksumByte1 + 1:],
                    kWhirlpoolAcChecksumByte2 - kWhirlpoolAcChecksumByte1 - 1)) {
     DPRINTLN("DEBUG: Second Whirlpool AC checksum failed.")
     return False
@@ -293,10 +293,10 @@ bool IRWhirlpoolAc.validChecksum(state[], length) {
 void IRWhirlpoolAc.checksum(length) {
   if (length >= kWhirlpoolAcChecksumByte1)
     remote_state[kWhirlpoolAcChecksumByte1] =
-        xorBytes(remote_state + 2, kWhirlpoolAcChecksumByte1 - 1 - 2)
+        xorBytes(remote_state[2:], kWhirlpoolAcChecksumByte1 - 1 - 2)
   if (length >= kWhirlpoolAcChecksumByte2)
     remote_state[kWhirlpoolAcChecksumByte2] =
-        xorBytes(remote_state + kWhirlpoolAcChecksumByte1 + 1,
+        xorBytes(remote_state[kWhirlpoolAcChecksumByte1 + 1:],
                  kWhirlpoolAcChecksumByte2 - kWhirlpoolAcChecksumByte1 - 1)
 }
 
@@ -31,6 +31,8 @@ class ACProtocolBase(object):
     _clean = None
     _beep = None
     _model = None
+    # IRchecksum.Checksum of the state. (Def: an 8-bit sum in the last byte)
+    _checksum = None
 
     def __init__(self, pin, inverted=False, use_modulation=True):
         self._irsend = IRsend(pin, inverted, use_modulation)
@@ -56,6 +58,9 @@ class ACProtocolBase(object):
         if length == 0:
             return state[0]
 
+        if cls._checksum is not None:
+            return cls._checksum.calc(state, length)
+
         return sumBytes(state, length - 1)
 
     @classmethod
@@ -65,6 +70,10 @@ class ACProtocolBase(object):
 
         if length < 2:
             return True  # No checksum to compare with. Assume okay.
+
+        if cls._checksum is not None:
+            return cls._checksum.valid(state, length)
+
         return state[length - 1] == cls.calc_checksum(state, length)
 
     # Update the checksum for the internal state.
@@ -75,6 +84,10 @@ class ACProtocolBase(object):
         if length < 2:
             return
 
+        if self._checksum is not None:
+            self._checksum.apply(self.remote_state, length)
+            return
+
         self.remote_state[length - 1] = self.calc_checksum(self.remote_state, length)
 
     def send(self, repeat=None):
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+# Benchmarks.
+#
+#   python -m benchmarks.decode --help
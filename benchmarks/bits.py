@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+# Bit manipulation kernel microbenchmark.
+#
+# Times the IRutils helpers every encoder, decoder & checksum goes through
+# and the compiled SetParam field accessors, and reports nano-Seconds per
+# call.
+#
+#   python -m benchmarks.bits --json bits.json
+
+import argparse
+import json
+import platform
+import random
+import sys
+import timeit
+
+import IRDecoder.IRrecv  # NOQA  IRutils can't be the first module imported.
+from IRDecoder import IRutils
+
+
+class Field(IRutils.SetParam):
+    # A field that goes past the end of its byte.
+    byte_num = 4
+    bit_num = 5
+    num_bits = 6
+
+
+class Flag(IRutils.SetParam):
+    byte_num = 4
+    bit_num = 3
+
+
+def cases(seed=0):
+    # Get the calls to time.
+    #
+    # Returns:
+    #   A list of (name, function, args) tuples.
+    rng = random.Random(seed)
+    state = [rng.randrange(256) for _ in range(35)]  # Daikin sized state.
+    view = memoryview(bytes(state))
+
+    return [
+        ('reverseBits/8', IRutils.reverseBits, (0xA5, 8)),
+        ('reverseBits/16', IRutils.reverseBits, (0xA5C3, 16)),
+        ('reverseBits/32', IRutils.reverseBits, (0x20DF10EF, 32)),
+        ('reverseBits/64', IRutils.reverseBits, (rng.getrandbits(64), 64)),
+        ('invertBits/32', IRutils.invertBits, (0x20DF10EF, 32)),
+        ('countBits/int', IRutils.countBits, (rng.getrandbits(44), 44, True, 2)),
+        ('countBits/bytes', IRutils.countBits, (state, len(state))),
+        ('sumBytes/list', IRutils.sumBytes, (state, len(state) - 1)),
+        ('sumBytes/memoryview', IRutils.sumBytes, (view[8:], 26)),
+        ('xorBytes', IRutils.xorBytes, (state, len(state) - 1)),
+        ('sumNibbles', IRutils.sumNibbles, (state, 15)),
+        ('bcdToUint8', IRutils.bcdToUint8, (0x59,)),
+        ('uint8ToBcd', IRutils.uint8ToBcd, (59,)),
+        ('SetParam.get/bit', Flag.get, (state,)),
+        ('SetParam.set/bit', Flag.set, (state, 1)),
+        ('SetParam.get/bits', Field.get, (state,)),
+        ('SetParam.set/bits', Field.set, (state, 0x2A)),
+    ]
+
+
+def measure(function, args, min_time=0.2):
+    # Call function(*args) over and over until at least min_time seconds
+    # passed.
+    #
+    # Returns:
+    #   nano-Seconds per call. (the best of 3 runs)
+    timer = timeit.Timer(lambda: function(*args))
+    number, elapsed = timer.autorange()
+    number = max(int(number * min_time / max(elapsed, 1e-9)), 1)
+    best = min(timer.repeat(3, number))
+    return best * 1e9 / number
+
+
+def run(min_time=0.2, seed=0):
+    # Time the kernel.
+    #
+    # Returns:
+    #   A dict that can be dumped as JSON.
+    return dict(
+        python=platform.python_version(),
+        platform=sys.platform,
+        functions=dict(
+            (name, measure(function, args, min_time))
+            for name, function, args in cases(seed)
+        )
+    )
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='IRutils bit kernel timings.')
+    parser.add_argument('--min-time', type=float, default=0.2, help='seconds per function')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='write the results to this file')
+    args = parser.parse_args(args)
+
+    report = run(args.min_time, args.seed)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    for name, ns in sorted(report['functions'].items()):
+        print('{0:<24}{1:>10.1f} ns'.format(name, ns))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
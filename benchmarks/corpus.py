@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+# Synthetic capture corpus.
+#
+# Every protocol in the registry that has a sender is "sent" through an IRsend
+# with a RecordingBackend, so the marks & spaces are recorded instead of
+# driving a LED. The first message is turned into a capture buffer (kRawTick
+# ticks) the same way the receiver would have captured it. Protocols whose
+# sender doesn't work (yet) are reported with the reason instead.
+#
+# fixedCorpus() is a small set of hand built captures that doesn't need any
+# sender, so the decode pipeline (candidate index, timing windows, repeat
+# fast path & decode cache) can be timed even when no sender works.
+
+import random
+from array import array
+
+from IRDecoder.IRbackend import RecordingBackend
+from IRDecoder.IRrecv import kRawTick, kTimeoutMs
+from IRDecoder.IRregistry import kRegistry
+from IRDecoder.IRremoteESP8266 import *
+from IRDecoder.IRsend import IRsend
+
+# Nr. of uSeconds of the gap before a message. (rawbuf[0])
+kCorpusGap = kTimeoutMs * 1000
+
+
+def sampleData(entry, rng):
+    # Get the data & nr. of bits (bytes for a state) to send for a protocol.
+    nbits = entry.default_bits
+    if entry.ac_state:
+        nbytes = max(nbits // 8, 1)
+        return bytes(rng.getrandbits(8) for _ in range(nbytes)), nbytes
+
+    return rng.getrandbits(max(nbits, 1)), nbits
+
+
+def toRawbuf(timings, timeout=kTimeoutMs):
+    # Turn mark/space uSeconds into a capture of the first message.
+    #
+    # Args:
+    #   timings: uSeconds, starting with a mark.
+    #   timeout: Nr. of milli-Seconds of space that ends a capture.
+    # Returns:
+    #   An array('H') capture buffer.
+    rawbuf = array('H', [kCorpusGap // kRawTick])
+    timeout *= 1000
+
+    for index, usec in enumerate(timings):
+        if index % 2 and usec >= timeout:
+            break
+
+        rawbuf.append(min(int(round(usec / float(kRawTick))), 0xFFFF))
+
+    # A capture ends with a mark, the trailing space is the next gap.
+    if len(rawbuf) % 2 == 1:
+        rawbuf.pop()
+
+    return rawbuf
+
+
+def render(decode_type, seed=0):
+    # Render a message of a protocol.
+    #
+    # Returns:
+    #   A (timings, data) tuple. timings are the uSeconds of the first message.
+    # Raises:
+    #   Anything the sender raises.
+    entry = kRegistry.get(decode_type)
+    rng = random.Random(seed)
+    data, nbits = sampleData(entry, rng)
+
+    backend = RecordingBackend()
+    irsend = IRsend(None, backend=backend)
+    if not irsend.send(decode_type, data, nbits):
+        raise ValueError('protocol can not be sent')
+
+    timings = backend.timings()
+    if not timings:
+        raise ValueError('sender produced no output')
+
+    return timings, data
+
+
+def addNoise(timings, rng, jitter=0, lag=0):
+    # Distort a message like a real receiver would.
+    #
+    # Args:
+    #   timings: uSeconds, starting with a mark.
+    #   rng: random.Random instance.
+    #   jitter: Standard deviation in uSeconds of every entry.
+    #   lag: Nr. of uSeconds the sensor is late turning off. Marks become
+    #        longer & spaces shorter. (Like kMarkExcess)
+    noisy = []
+    for index, usec in enumerate(timings):
+        if index % 2:
+            usec -= lag
+        else:
+            usec += lag
+
+        if jitter:
+            usec += rng.gauss(0, jitter)
+
+        noisy.append(max(int(usec), 1))
+
+    return noisy
+
+
+def pulseDistance(hdrmark, hdrspace, bitmark, onespace, zerospace, data, nbits):
+    # Get the uSeconds of a MSB first pulse distance message.
+    #
+    # Args:
+    #   hdrmark: Header mark, None for a message without a header.
+    #   data: The value to encode in nbits bits.
+    timings = [] if hdrmark is None else [hdrmark, hdrspace]
+    for bit in range(nbits - 1, -1, -1):
+        timings.append(bitmark)
+        timings.append(onespace if (data >> bit) & 1 else zerospace)
+
+    timings.append(bitmark)
+    return timings
+
+
+def pulseWidth(hdrmark, hdrspace, onemark, zeromark, space, data, nbits):
+    # Get the uSeconds of a MSB first pulse width message. (e.g. Sony)
+    timings = [hdrmark, hdrspace]
+    for bit in range(nbits - 1, -1, -1):
+        timings.append(onemark if (data >> bit) & 1 else zeromark)
+        timings.append(space)
+
+    # The last space is the gap.
+    return timings[:-1]
+
+
+# Name -> uSeconds of the hand built captures. The timings are the nominal
+# ones of each protocol module. (ir_NEC, ir_Samsung, ir_LG, ir_JVC,
+# ir_Panasonic & ir_Sony)
+kFixedMessages = (
+    ('NEC', pulseDistance(8960, 4480, 560, 1680, 560, 0x20DF10EF, kNECBits)),
+    ('NEC repeat', [8960, 2240, 560]),
+    ('Samsung', pulseDistance(
+        4480, 4480, 560, 1680, 560, 0xE0E040BF, kSamsungBits
+    )),
+    ('LG', pulseDistance(8500, 4250, 550, 1600, 550, 0x8800347, kLgBits)),
+    ('LG repeat', [8500, 2250, 550]),
+    ('JVC', pulseDistance(8400, 4200, 525, 1725, 525, 0xC5E8, kJvcBits)),
+    ('JVC repeat', pulseDistance(None, None, 525, 1725, 525, 0xC5E8, kJvcBits)),
+    ('Panasonic', pulseDistance(
+        3456, 1728, 432, 1296, 432, 0x40040100BCBD, kPanasonicBits
+    )),
+    ('Sony', pulseWidth(2400, 600, 1200, 600, 600, 0xA90, kSony12Bits)),
+)
+
+
+def fixedCorpus(messages=kFixedMessages):
+    # Get the hand built captures.
+    #
+    # Returns:
+    #   A list of (name, capture buffer) tuples.
+    return [(name, toRawbuf(timings)) for name, timings in messages]
+
+
+class Corpus(object):
+
+    def __init__(self, variants=16, jitter=0, lag=0, seed=0, protocols=None):
+        # Args:
+        #   variants: Nr. of noisy captures per protocol.
+        #   jitter: See addNoise().
+        #   lag: See addNoise().
+        #   seed: Seed of the data & noise.
+        #   protocols: decode_type_t values to render. (Def: all of them)
+        self.variants = variants
+        self.jitter = jitter
+        self.lag = lag
+        self.seed = seed
+        # decode_type -> list of capture buffers.
+        self.captures = {}
+        # decode_type -> reason it couldn't be rendered.
+        self.skipped = {}
+
+        if protocols is None:
+            protocols = kRegistry.protocols()
+
+        for decode_type in protocols:
+            entry = kRegistry.get(decode_type)
+            if entry is None or entry.sender is None:
+                continue
+
+            try:
+                timings, _ = render(decode_type, seed)
+            except Exception as err:  # NOQA
+                self.skipped[decode_type] = type(err).__name__ + ': ' + str(err)
+                continue
+
+            rng = random.Random(seed * 1000003 + decode_type)
+            self.captures[decode_type] = [
+                toRawbuf(addNoise(timings, rng, jitter, lag))
+                for _ in range(variants)
+            ]
+
+    def unknown(self, rawlens=(12, 34, 68, 100, 200), seed=None):
+        # Captures that no protocol should match. They go through the whole
+        # decode chain & end up in decodeHash().
+        #
+        # Returns:
+        #   A list of capture buffers.
+        rng = random.Random(self.seed if seed is None else seed)
+        captures = []
+
+        for rawlen in rawlens:
+            for _ in range(self.variants):
+                rawbuf = array('H', [kCorpusGap // kRawTick])
+                rawbuf.extend(rng.randrange(50, 5000) for _ in range(rawlen - 1))
+                captures.append(rawbuf)
+
+        return captures
@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+# Decode throughput benchmark.
+#
+# Decodes the synthetic corpus (see corpus.py) of every protocol with
+# IRrecv.decodeRaw() and reports frames/second & uSeconds/frame, the position
+# of the decoder that matched in the candidate list of the capture & how many
+# candidates there were. The "unknown" entry is captures no decoder matches,
+# the worst case: every candidate is tried & decodeHash() has the last word.
+#
+#   python -m benchmarks.decode --jitter 30 --lag 40 --json results.json
+#   python -m benchmarks.decode --compare results.json --threshold 10
+#
+# The repeat fast path & the decode cache are off so every frame is decoded.
+#
+# The "fixed" entries time the hand built captures of corpus.fixedCorpus()
+# with the fast path & cache off, with the repeat fast path on & with the
+# decode cache on. They don't need a working sender, so the candidate index,
+# timing & cache work always has a number:
+#
+#   python -m benchmarks.decode --fixed-only
+#
+# A run where no protocol decoded its own captures measured nothing but the
+# fixed corpus. That is said in the summary & the exit code is 2.
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+from IRDecoder.IRcache import DecodeCache
+from IRDecoder.IRrecv import IRrecv
+from IRDecoder.IRremoteESP8266 import UNKNOWN
+from IRDecoder.IRutils import typeToString
+
+from .corpus import Corpus, fixedCorpus
+
+kBenchmarkVersion = 2
+
+# Exit code of a run that measured no protocol.
+kNothingMeasured = 2
+
+# Name -> (repeat fast path, decode cache) of the fixed corpus runs.
+kFixedSettings = (
+    ('plain', False, False),
+    ('repeats', True, False),
+    ('cache', False, True),
+)
+
+
+def _receiver(repeats=False, cache=False):
+    irrecv = IRrecv(0)
+    irrecv.setRepeatFastPath(repeats)
+    irrecv.setDecodeCache(DecodeCache() if cache else None)
+    return irrecv
+
+
+def measure(irrecv, captures, min_time=0.2):
+    # Decode captures over and over until at least min_time seconds passed.
+    #
+    # Returns:
+    #   A (frames, seconds) tuple.
+    frames = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+
+    while elapsed < min_time:
+        for rawbuf in captures:
+            irrecv.decodeRaw(rawbuf)
+
+        frames += len(captures)
+        elapsed = time.perf_counter() - start
+
+    return frames, elapsed
+
+
+def chainPosition(irrecv, rawbuf):
+    # Get where in the decode chain a capture gets decoded.
+    #
+    # Returns:
+    #   A (decode_type, position, nr. of candidates) tuple. position is None
+    #   if no decoder matched.
+    results = irrecv.decodeRaw(rawbuf)
+    candidates = list(irrecv._decode_index.candidates(results))
+    matched = irrecv.decodeCandidates(results, candidates)
+
+    if matched is None:
+        return UNKNOWN, None, len(candidates)
+
+    return results.decode_type, candidates.index(matched), len(candidates)
+
+
+def _entry(irrecv, captures, expected, min_time):
+    decode_type, position, candidates = chainPosition(irrecv, captures[0])
+    correct = sum(
+        1 for rawbuf in captures
+        if irrecv.decodeRaw(rawbuf).decode_type == expected
+    )
+
+    frames, seconds = measure(irrecv, captures, min_time)
+    return dict(
+        decoded_as=typeToString(decode_type),
+        correct=correct / float(len(captures)),
+        position=position,
+        candidates=candidates,
+        frames=frames,
+        seconds=seconds,
+        fps=frames / seconds,
+        us_per_frame=seconds * 1000000.0 / frames
+    )
+
+
+def runFixed(min_time=0.2):
+    # Time the fixed corpus with each of kFixedSettings.
+    #
+    # Returns:
+    #   A dict of setting name -> entry.
+    captures = fixedCorpus()
+    report = {}
+
+    for name, repeats, cache in kFixedSettings:
+        irrecv = _receiver(repeats, cache)
+        decoded = {
+            capture: typeToString(irrecv.decodeRaw(rawbuf).decode_type)
+            for capture, rawbuf in captures
+        }
+
+        frames, seconds = measure(irrecv, [rawbuf for _, rawbuf in captures], min_time)
+        report[name] = dict(
+            decoded_as=decoded,
+            frames=frames,
+            seconds=seconds,
+            fps=frames / seconds,
+            us_per_frame=seconds * 1000000.0 / frames
+        )
+
+    return report
+
+
+def measured(report):
+    # Get the names of the protocols that decoded their own captures.
+    return sorted(
+        name for name, entry in report['protocols'].items()
+        if entry['correct'] > 0
+    )
+
+
+def run(
+    variants=16,
+    jitter=0,
+    lag=0,
+    seed=0,
+    min_time=0.2,
+    protocols=None,
+    fixed_only=False
+):
+    # Run the benchmark.
+    #
+    # Args:
+    #   fixed_only: Only time the fixed corpus.
+    # Returns:
+    #   A dict that can be dumped as JSON.
+    if fixed_only:
+        protocols = ()
+
+    corpus = Corpus(variants, jitter, lag, seed, protocols)
+    irrecv = _receiver()
+
+    report = dict(
+        version=kBenchmarkVersion,
+        python=platform.python_implementation() + ' ' + platform.python_version(),
+        machine=platform.machine(),
+        settings=dict(
+            variants=variants,
+            jitter=jitter,
+            lag=lag,
+            seed=seed,
+            min_time=min_time
+        ),
+        protocols={},
+        errors={},
+        skipped={},
+        fixed=runFixed(min_time)
+    )
+
+    if fixed_only:
+        return report
+
+    for decode_type, reason in corpus.skipped.items():
+        report['skipped'][typeToString(decode_type)] = reason
+
+    for decode_type, captures in sorted(corpus.captures.items()):
+        name = typeToString(decode_type)
+        try:
+            report['protocols'][name] = _entry(irrecv, captures, decode_type, min_time)
+        except Exception as err:  # NOQA
+            report['errors'][name] = type(err).__name__ + ': ' + str(err)
+
+    try:
+        report['unknown'] = _entry(irrecv, corpus.unknown(), UNKNOWN, min_time)
+    except Exception as err:  # NOQA
+        report['errors']['UNKNOWN'] = type(err).__name__ + ': ' + str(err)
+
+    positions = [
+        (entry['position'], name)
+        for name, entry in report['protocols'].items()
+        if entry['position'] is not None
+    ]
+    if positions:
+        report['worst_position'] = max(positions)[1]
+
+    return report
+
+
+def compare(report, baseline, threshold=10.0):
+    # Find the protocols that got slower.
+    #
+    # Args:
+    #   threshold: Percentage uSeconds/frame may grow before it counts.
+    # Returns:
+    #   A list of (name, baseline us/frame, us/frame) tuples.
+    def entries(data):
+        found = dict(data.get('protocols', {}))
+        if 'unknown' in data:
+            found['unknown'] = data['unknown']
+        for name, entry in data.get('fixed', {}).items():
+            found['fixed/' + name] = entry
+        return found
+
+    old = entries(baseline)
+    slower = []
+
+    for name, entry in sorted(entries(report).items()):
+        if name not in old:
+            continue
+
+        before = old[name]['us_per_frame']
+        after = entry['us_per_frame']
+        if after > before * (1.0 + threshold / 100.0):
+            slower.append((name, before, after))
+
+    return slower
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='IRrecv decode throughput.')
+    parser.add_argument('--variants', type=int, default=16, help='noisy captures per protocol')
+    parser.add_argument('--jitter', type=float, default=0, help='std. deviation in uSeconds')
+    parser.add_argument('--lag', type=float, default=0, help='sensor lag in uSeconds')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--min-time', type=float, default=0.2, help='seconds per protocol')
+    parser.add_argument('--json', help='write the results to this file')
+    parser.add_argument('--compare', help='results file of an earlier run')
+    parser.add_argument('--threshold', type=float, default=10.0, help='allowed slow down in percent')
+    parser.add_argument('--fixed-only', action='store_true', help='only time the fixed corpus')
+    args = parser.parse_args(args)
+
+    report = run(
+        args.variants,
+        args.jitter,
+        args.lag,
+        args.seed,
+        args.min_time,
+        fixed_only=args.fixed_only
+    )
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    rows = sorted(report['protocols'].items())
+    if 'unknown' in report:
+        rows.append(('(unknown)', report['unknown']))
+
+    for name, entry in rows:
+        print(
+            '{0:<24}{1:>12.0f} fps{2:>10.1f} us  pos {3}/{4}  correct {5:.0%}'.format(
+                name,
+                entry['fps'],
+                entry['us_per_frame'],
+                '-' if entry['position'] is None else entry['position'],
+                entry['candidates'],
+                entry['correct']
+            )
+        )
+
+    for name, entry in sorted(report['fixed'].items()):
+        print(
+            '{0:<24}{1:>12.0f} fps{2:>10.1f} us  {3} of {4} decoded'.format(
+                'fixed/' + name,
+                entry['fps'],
+                entry['us_per_frame'],
+                sum(1 for v in entry['decoded_as'].values() if v != 'UNKNOWN'),
+                len(entry['decoded_as'])
+            )
+        )
+
+    result = 0
+    if not args.fixed_only:
+        good = measured(report)
+        print(
+            '{0} protocols measured, {1} rendered but never decoded correctly, '
+            '{2} could not be rendered, {3} failed to decode.'.format(
+                len(good),
+                len(report['protocols']) - len(good),
+                len(report['skipped']),
+                len(report['errors'])
+            )
+        )
+
+        if not good:
+            print(
+                'NOTHING MEASURED: no protocol decoded its own captures, only '
+                'the fixed corpus timings mean anything.'
+            )
+            result = kNothingMeasured
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+        slower = compare(report, baseline, args.threshold)
+        for name, before, after in slower:
+            print('SLOWER: {0} {1:.1f} -> {2:.1f} us/frame'.format(name, before, after))
+
+        if slower:
+            return 1
+
+    return result
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import IRDecoder.IRrecv  # NOQA  IRutils can't be the first module imported.
+
+import pytest
+
+from IRDecoder.IRregistry import kRegistry
+from IRDecoder.IRremoteESP8266 import *
+
+# JVC timings. (ir_JVC)
+kJvcHdrMark = 8400
+kJvcHdrSpace = 4200
+kJvcBitMark = 525
+kJvcOneSpace = 1725
+kJvcZeroSpace = 525
+
+
+def jvcTimings(data, header=True):
+    # uSeconds of a JVC message, or of its repeat without the header.
+    usecs = [kJvcHdrMark, kJvcHdrSpace] if header else []
+    for bit in range(kJvcBits - 1, -1, -1):
+        usecs.append(kJvcBitMark)
+        usecs.append(kJvcOneSpace if (data >> bit) & 1 else kJvcZeroSpace)
+
+    return usecs + [kJvcBitMark]
+
+
+def decodeJVC(self, results, nbits=kJvcBits, strict=True):
+    # Stand-in for ir_JVC.decodeJVC(), which isn't ported yet.
+    offset = 1
+    repeat = not self.matchMark(results.rawbuf[offset], kJvcHdrMark)
+    if not repeat:
+        if not self.matchSpace(results.rawbuf[offset + 1], kJvcHdrSpace):
+            return False
+        offset += 2
+
+    if results.rawlen != offset + 2 * nbits + 1:
+        return False
+
+    data = 0
+    for _ in range(nbits):
+        if not self.matchMark(results.rawbuf[offset], kJvcBitMark):
+            return False
+
+        if self.matchSpace(results.rawbuf[offset + 1], kJvcOneSpace):
+            data = (data << 1) | 1
+        elif self.matchSpace(results.rawbuf[offset + 1], kJvcZeroSpace):
+            data <<= 1
+        else:
+            return False
+
+        offset += 2
+
+    results.decode_type = JVC
+    results.bits = nbits
+    results.value = data
+    results.address = data >> 8
+    results.command = data & 0xFF
+    results.repeat = repeat
+    return True
+
+
+@pytest.fixture
+def jvcDecoder(monkeypatch):
+    # The registry finds the decoder in ir_JVC the first time it is used.
+    monkeypatch.setattr(kRegistry.module('.ir_JVC'), 'decodeJVC', decodeJVC)
+    monkeypatch.delitem(kRegistry._resolved, ('.ir_JVC', 'decodeJVC'), raising=False)
+    for candidate in kRegistry.chain():
+        if candidate.method == 'decodeJVC':
+            monkeypatch.setattr(candidate, 'error', None)
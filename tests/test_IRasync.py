@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+import asyncio
+import threading
+from array import array
+
+import pytest
+
+from IRDecoder.IRasync import TransmitQueue
+from IRDecoder.IRbackend import RecordingBackend, kLevelMark, kLevelSpace
+from IRDecoder.IRremoteESP8266 import *
+from IRDecoder.IRsend import IRsend
+from IRDecoder.IRwaveform import Waveform
+
+
+def waveform(data, gap=30000):
+    # A known message per data value. 0 gap means it ends with a mark.
+    pairs = [kLevelMark, 1000 + data, kLevelSpace, 500, kLevelMark, 500]
+    if gap:
+        pairs += [kLevelSpace, gap]
+
+    return Waveform(38000, 33, array('L', pairs))
+
+
+class StubQueue(TransmitQueue):
+    # Renders waveform(data, gap=nbits) without a sender.
+
+    def __init__(self, *args, **kwargs):
+        TransmitQueue.__init__(self, *args, **kwargs)
+        self.renders = []
+
+    def _waveform(self, decode_type, data, nbits, repeat):
+        self.renders.append(data)
+        return waveform(data, nbits)
+
+
+class RealtimeBackend(RecordingBackend):
+    # Records like a LED backend would send, the gaps aren't written. play()
+    # can be held up to keep a frame on the wire.
+
+    realtime = True
+
+    def __init__(self):
+        RecordingBackend.__init__(self)
+        self.playing = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def play(self, pairs):
+        self.playing.set()
+        self.release.wait(5)
+        RecordingBackend.play(self, pairs)
+
+
+async def until(condition):
+    for _ in range(500):
+        if condition():
+            return
+        await asyncio.sleep(0.001)
+
+    raise AssertionError('timed out')
+
+
+def test_render_runs_off_the_event_loop():
+    threads = []
+
+    class Queue(TransmitQueue):
+
+        def _waveform(self, *args):
+            threads.append(threading.get_ident())
+            return TransmitQueue._waveform(self, *args)
+
+    backend = RecordingBackend()
+    irsend = IRsend(4, backend=backend)
+
+    async def main():
+        async with Queue(IRsend(4, backend=RecordingBackend())) as queue:
+            frame = await queue.send(JVC, 0xC5E8, kJvcBits)
+            await frame.future
+            return frame
+
+    frame = asyncio.run(main())
+
+    assert threads and threading.get_ident() not in threads
+    # The same as sending it directly.
+    irsend.send(JVC, 0xC5E8, kJvcBits)
+    assert frame.waveform.pairs.tolist() == backend.pairs().tolist()
+    assert frame.airtime == backend.now()
+
+
+def test_render_error_resolves_the_frame():
+    async def main():
+        async with TransmitQueue(IRsend(4, backend=RecordingBackend())) as queue:
+            frame = await queue.send(UNKNOWN, 0, 0)
+            try:
+                await frame.future
+            except ValueError:
+                return True
+
+        return False
+
+    assert asyncio.run(main())
+
+
+def test_virtual_clock_backend_gets_the_gaps():
+    backend = RecordingBackend()
+
+    async def main():
+        async with StubQueue(IRsend(4, backend=backend)) as queue:
+            frames = [await queue.send(JVC, data, gap) for data, gap in ((1, 30000), (2, 0))]
+            await asyncio.gather(*frames)
+
+    asyncio.run(main())
+
+    # Nothing waits, the gap is part of the recording.
+    assert backend.pairs().tolist() == waveform(1).pairs.tolist() + waveform(2, 0).pairs.tolist()
+    assert (backend.frequency, backend.duty) == (38000, 33)
+
+
+def test_minimum_gap_between_frames():
+    backend = RealtimeBackend()
+
+    async def main():
+        queue = StubQueue(IRsend(4, backend=backend), min_gap=20000)
+        async with queue:
+            frames = [
+                await queue.send(JVC, data, gap)
+                for data, gap in ((1, 50000), (2, 0), (3, 0))
+            ]
+            await asyncio.gather(*frames)
+
+        return frames
+
+    frames = asyncio.run(main())
+
+    # The gaps aren't sent, they are waited out before the next frame.
+    pairs = backend.pairs()
+    spaces = [
+        pairs[index + 1] for index in range(0, len(pairs), 2)
+        if pairs[index] == kLevelSpace
+    ]
+    assert spaces == [500] * 3
+    assert frames[1].started - frames[0].finished >= 0.05 - 0.002
+    # No space at the end, min_gap.
+    assert frames[2].started - frames[1].finished >= 0.02 - 0.002
+
+
+def test_next_frame_is_rendered_while_one_is_sent():
+    backend = RealtimeBackend()
+    backend.release.clear()
+
+    async def main():
+        queue = StubQueue(IRsend(4, backend=backend))
+        async with queue:
+            frames = [await queue.send(JVC, data, 0) for data in range(4)]
+            await until(backend.playing.is_set)
+            await until(lambda: queue._ready.full())
+
+            # One frame on the wire & the next one ready. The one after that
+            # got rendered & waits for room, the last one isn't rendered.
+            assert not frames[0].future.done()
+            assert frames[1].waveform is not None
+            assert queue.renders == [0, 1, 2]
+            assert frames[3].waveform is None
+            assert len(queue) == 2
+
+            backend.release.set()
+            await asyncio.gather(*frames)
+
+        return queue
+
+    queue = asyncio.run(main())
+    assert queue.renders == [0, 1, 2, 3]
+
+
+def test_airtime():
+    queue = StubQueue(IRsend(4, backend=RecordingBackend()))
+    assert queue.airtime(JVC, 1, 30000) == 1001 + 500 + 500 + 30000
+    assert queue.airtime(JVC, 1, 0) == 2001
+
+    queue = TransmitQueue(IRsend(4, backend=RecordingBackend()))
+    backend = RecordingBackend()
+    IRsend(4, backend=backend).send(JVC, 0xC5E8, kJvcBits, 1)
+    assert queue.airtime(JVC, 0xC5E8, kJvcBits, 1) == backend.now()
+    assert queue.airtime(UNKNOWN, 0, 0) is None
+
+
+def test_stop_without_draining_cancels_the_frames():
+    backend = RealtimeBackend()
+    backend.release.clear()
+
+    async def main():
+        queue = StubQueue(IRsend(4, backend=backend))
+        queue.start()
+        frames = [await queue.send(JVC, data, 0) for data in range(5)]
+        await until(backend.playing.is_set)
+
+        stop = asyncio.ensure_future(queue.stop(drain=False))
+        await asyncio.sleep(0.01)
+        # The worker thread finishes the frame on the wire.
+        backend.release.set()
+        await stop
+
+        return queue, frames
+
+    queue, frames = asyncio.run(main())
+
+    assert all(frame.future.cancelled() for frame in frames)
+    assert len(queue) == 0
+    # Only the first one made it out.
+    assert len(backend) == 3
+
+
+@pytest.mark.parametrize('drain', [True, False])
+def test_stop_of_an_idle_queue(drain):
+    async def main():
+        queue = StubQueue(IRsend(4, backend=RecordingBackend()))
+        await queue.stop(drain)
+        async with queue:
+            await (await queue.send(JVC, 1, 0))
+        await queue.stop(drain)
+        return queue
+
+    assert asyncio.run(main()).renders == [1]
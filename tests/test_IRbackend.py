@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+from array import array
+
+import pytest
+
+from IRDecoder.IRbackend import RecordingBackend, kLevelMark, kLevelSpace
+from IRDecoder.IRsend import IRsend
+
+
+def send_generic(irsend, mesg_time=None, repeat=0, frequency=38, duty=50):
+    # A 4 bit message of 0b1010 with a 9000/4500 header.
+    args = [0b1010, 4, frequency, True, repeat, duty]
+    if mesg_time is not None:
+        args.insert(0, mesg_time)
+
+    irsend.send_generic(9000, 4500, 560, 1690, 560, 560, 560, 10000, *args)
+
+
+kMessage = [
+    kLevelMark, 9000, kLevelSpace, 4500,
+    kLevelMark, 560, kLevelSpace, 1690,
+    kLevelMark, 560, kLevelSpace, 560,
+    kLevelMark, 560, kLevelSpace, 1690,
+    kLevelMark, 560, kLevelSpace, 560,
+    kLevelMark, 560,
+]
+kMessageTime = sum(kMessage[1::2])
+
+
+def test_buffer_grows():
+    backend = RecordingBackend(size=1)
+    expected = []
+
+    for usec in range(1, 200):
+        backend.mark(usec)
+        backend.space(usec * 2)
+        expected += [kLevelMark, usec, kLevelSpace, usec * 2]
+
+    assert len(backend) == 398
+    assert backend.pairs() == array('L', expected)
+    assert backend.now() == sum(expected[1::2])
+
+
+def test_same_levels_are_merged():
+    backend = RecordingBackend()
+    backend.space(100)
+    backend.mark(300)
+    backend.mark(260)
+    backend.mark(0)
+    backend.space(500)
+    backend.space(-1)
+    backend.play(array('L', [kLevelSpace, 100, kLevelMark, 560, kLevelSpace, 40]))
+
+    assert list(backend.pairs()) == [
+        kLevelSpace, 100, kLevelMark, 560, kLevelSpace, 600, kLevelMark, 560,
+        kLevelSpace, 40
+    ]
+    # The first mark on.
+    assert list(backend.timings()) == [560, 600, 560, 40]
+    assert backend.now() == 1860
+
+    assert list(backend.finish()) == [
+        kLevelSpace, 100, kLevelMark, 560, kLevelSpace, 600, kLevelMark, 560,
+        kLevelSpace, 40
+    ]
+    assert len(backend) == 0 and backend.now() == 0
+
+
+def test_play_is_the_same_as_marks_and_spaces():
+    pairs = array('L', kMessage + [kLevelSpace, 10000])
+    played = RecordingBackend(size=1)
+    played.mark(100)
+    played.play(pairs)
+
+    backend = RecordingBackend()
+    backend.mark(100)
+    for index in range(0, len(pairs), 2):
+        if pairs[index] == kLevelMark:
+            backend.mark(pairs[index + 1])
+        else:
+            backend.space(pairs[index + 1])
+
+    assert played.pairs() == backend.pairs()
+    assert played.now() == backend.now()
+
+
+def test_send_generic_gap():
+    backend = RecordingBackend()
+    send_generic(IRsend(4, backend=backend), repeat=1)
+
+    assert list(backend.pairs()) == (kMessage + [kLevelSpace, 10000]) * 2
+
+
+@pytest.mark.parametrize('mesg_time', [0, kMessageTime + 5000, kMessageTime + 20000])
+def test_send_generic_mesg_time(mesg_time):
+    backend = RecordingBackend()
+    irsend = IRsend(4, backend=backend)
+    send_generic(irsend, mesg_time, repeat=2)
+
+    # The message plus its gap takes at least mesg_time.
+    gap = max(10000, mesg_time - kMessageTime)
+    assert list(backend.pairs()) == (kMessage + [kLevelSpace, gap]) * 3
+    assert backend.now() == 3 * max(kMessageTime + 10000, mesg_time)
+
+
+@pytest.mark.parametrize(
+    'frequency, duty, pulses',
+    [
+        (38, 50, 342),
+        (36000, 33, 324),
+        (56, 100, 1),
+    ]
+)
+def test_carrier_is_recorded(frequency, duty, pulses):
+    backend = RecordingBackend()
+    irsend = IRsend(4, backend=backend)
+    send_generic(irsend, frequency=frequency, duty=duty)
+
+    assert (backend.frequency, backend.duty) == (
+        frequency * 1000 if frequency < 1000 else frequency, duty
+    )
+    # The nr. of carrier pulses of the header mark.
+    assert backend.mark(9000) == pulses
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+from array import array
+
+from IRDecoder.IRcache import DecodeCache
+from IRDecoder.IRindex import DecodeCandidate, DecodeIndex
+from IRDecoder.IRrecv import IRrecv, kRawTick
+from IRDecoder.IRremoteESP8266 import *
+
+
+class Receiver(IRrecv):
+
+    def __init__(self):
+        IRrecv.__init__(self, 0)
+        self.calls = 0
+        self.setRepeatFastPath(False)
+        self._decode_index = DecodeIndex(
+            self,
+            chain=[DecodeCandidate('Fake', 'decodeFake')],
+            raw_tick=kRawTick
+        )
+
+    def decodeFake(self, results):
+        self.calls += 1
+        results.decode_type = NEC
+        results.value = 0x20DF10EF
+        results.bits = 32
+        return True
+
+
+kCapture = [50000, 9000, 4480] + [560, 1680] * 32 + [560]
+
+
+def capture():
+    return array('H', [usec // kRawTick for usec in kCapture])
+
+
+def test_cache_hits_count_for_the_decoder():
+    irrecv = Receiver()
+    irrecv.setDecodeCache(DecodeCache())
+
+    for _ in range(3):
+        results = irrecv.decodeRaw(capture())
+        assert results.decode_type == NEC
+        assert results.value == 0x20DF10EF
+
+    assert irrecv.calls == 1
+    assert irrecv.getDecodeCache().hits == 2
+    assert irrecv.getDecodeStats() == {'Fake': 3}
+
+
+def test_cache_hits_trigger_adaptive_ordering():
+    irrecv = Receiver()
+    irrecv.setDecodeCache(DecodeCache())
+    irrecv.setAdaptiveOrder(interval=2, decay=0.5)
+
+    for _ in range(2):
+        irrecv.decodeRaw(capture())
+
+    # Reordering after the 2nd (cached) message decayed the counter.
+    assert irrecv.calls == 1
+    assert irrecv.getDecodeStats() == {'Fake': 1.0}
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from IRDecoder import IRcapture
+from IRDecoder.IRcapture import CaptureReader, CaptureWriter
+
+kRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+kCaptures = [
+    [25000, 4500, 2250, 280, 280, 280, 840, 280],
+    [25000, 4500, 1120, 280],
+    [300] * 67,
+]
+
+
+def read(path):
+    with CaptureReader(path) as reader:
+        records = [
+            (record.timestamp, record.receiver, list(record.rawbuf))
+            for record in reader
+        ]
+        record = None
+
+    return records
+
+
+@pytest.mark.parametrize('index', [True, False])
+def test_write_reopen_append_read(tmp_path, index):
+    path = str(tmp_path / 'log.ircap')
+
+    with CaptureWriter(path, receiver=3, index=index) as writer:
+        writer.write(kCaptures[0], timestamp=10)
+        writer.write(kCaptures[1] + [0, 0], rawlen=4, timestamp=20)
+
+    with CaptureWriter(path, index=index) as writer:
+        assert writer.raw_tick == 2
+        writer.write(kCaptures[2], timestamp=30, receiver=7)
+
+    assert read(path) == [
+        (10, 3, kCaptures[0]),
+        (20, 3, kCaptures[1]),
+        (30, 7, kCaptures[2]),
+    ]
+
+    with CaptureReader(path) as reader:
+        assert [r.timestamp for r in reader.records(start=15, end=30)] == [20]
+        assert [r.timestamp for r in reader.records(receiver=7)] == [30]
+
+
+def test_partial_record_is_skipped_and_truncated(tmp_path):
+    path = str(tmp_path / 'log.ircap')
+
+    with CaptureWriter(path, index=False) as writer:
+        writer.write(kCaptures[0], timestamp=10)
+        writer.write(kCaptures[2], timestamp=20)
+
+    # Cut the last record short, like a crash in the middle of a write.
+    size = os.path.getsize(path)
+    with open(path, 'r+b') as f:
+        f.truncate(size - 10)
+
+    assert read(path) == [(10, 0, kCaptures[0])]
+
+    with CaptureWriter(path) as writer:
+        writer.write(kCaptures[1], timestamp=30)
+
+    assert read(path) == [(10, 0, kCaptures[0]), (30, 0, kCaptures[1])]
+
+
+def test_reopen_walks_only_the_records_after_the_index(tmp_path, monkeypatch):
+    path = str(tmp_path / 'log.ircap')
+
+    with CaptureWriter(path) as writer:
+        for timestamp, rawbuf in enumerate(kCaptures * 50):
+            writer.write(rawbuf, timestamp=timestamp)
+        last = writer._offsets[-1]
+
+    walked = []
+    scan = IRcapture._scan
+
+    def _scan(f, end=None, offset=IRcapture._header.size):
+        offsets, end = scan(f, end, offset)
+        walked.extend(offsets)
+        return offsets, end
+
+    monkeypatch.setattr(IRcapture, '_scan', _scan)
+
+    for count in range(1, 3):
+        with CaptureWriter(path) as writer:
+            writer.write(kCaptures[0], timestamp=1000 + count)
+
+        # The last indexed record is checked, the rest come from the index.
+        assert walked == [last]
+        walked[:] = []
+        last = writer._offsets[-1]
+
+    records = read(path)
+    assert len(records) == 152
+    assert records[-2:] == [(1001, 0, kCaptures[0]), (1002, 0, kCaptures[0])]
+
+
+def test_reopen_without_a_valid_index(tmp_path):
+    path = str(tmp_path / 'log.ircap')
+
+    with CaptureWriter(path) as writer:
+        writer.write(kCaptures[0], timestamp=10)
+        writer.write(kCaptures[1], timestamp=20)
+
+    # An index that doesn't fit the file, its records get walked instead.
+    with open(path, 'r+b') as f:
+        f.seek(-8, os.SEEK_END)
+        f.write(b'\x09' + b'\x00' * 7)
+
+    with CaptureWriter(path) as writer:
+        writer.write(kCaptures[2], timestamp=30)
+
+    assert read(path) == [
+        (10, 0, kCaptures[0]),
+        (20, 0, kCaptures[1]),
+        (30, 0, kCaptures[2]),
+    ]
+
+
+def test_summary_of_an_empty_log(tmp_path):
+    path = str(tmp_path / 'log.ircap')
+    CaptureWriter(path).close()
+
+    output = subprocess.run(
+        [sys.executable, '-m', 'IRDecoder.IRcapture', path],
+        cwd=kRoot,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True
+    )
+    assert output.returncode == 0, output.stderr
+    assert output.stdout == ''
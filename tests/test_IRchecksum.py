@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+import random
+
+import pytest
+
+from IRDecoder import IRchecksum
+from IRDecoder.IRchecksum import (
+    ByteSum,
+    Checksum,
+    ChecksumRegistry,
+    Crc8,
+    InvertedPairs,
+    NibbleSum,
+    ReversedSum,
+    UpperNibbleSum,
+    XorSum,
+)
+from IRDecoder.IRrecv import decode_results
+from IRDecoder.IRremoteESP8266 import *
+from IRDecoder.IRutils import reverseBits
+from IRDecoder.ir_Hitachi import IRHitachiAc
+
+kChecksumCases = [
+    Checksum(ByteSum()),
+    Checksum(ByteSum(end=7, at=7), ByteSum(8)),
+    Checksum(NibbleSum(end=-1, at=-1, init=3)),
+    Checksum(UpperNibbleSum(end=7, at=7), NibbleSum(8)),
+    Checksum(ReversedSum(init=62)),
+    Checksum(XorSum(2, -1, at=1)),
+    Checksum(InvertedPairs(3)),
+    Checksum(Crc8(init=0xFF, poly=0x31, xorout=0x55)),
+]
+
+
+def states(count, length, seed=0):
+    rng = random.Random(seed)
+    return [
+        bytearray(rng.getrandbits(8) for _ in range(length))
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize('checksum', kChecksumCases)
+@pytest.mark.parametrize('length', [16, 28])
+def test_scalar_and_batch_agree(checksum, length):
+    group = states(64, length)
+    for state in group[::2]:
+        checksum.apply(state)
+
+    expected = [checksum.valid(state) for state in group]
+    assert all(expected[::2])
+    assert checksum.validMany(group) == expected
+
+
+@pytest.mark.parametrize('checksum', kChecksumCases)
+def test_batch_without_numpy(checksum, monkeypatch):
+    group = states(8, 16, seed=1)
+    checksum.apply(group[0])
+    expected = [checksum.valid(state) for state in group]
+
+    monkeypatch.setattr(IRchecksum, 'np', None)
+    assert checksum.validMany(group) == expected
+
+
+def test_upper_nibble_keeps_the_lower_nibble():
+    section = UpperNibbleSum(end=7, at=7)
+    state = bytearray(range(1, 9))
+    section.apply(state)
+
+    assert state[7] & 0x0F == 8
+    assert state[7] >> 4 == (sum((b >> 4) + (b & 0xF) for b in range(1, 8)) + 8) & 0xF
+
+
+def test_hitachi_checksum_matches_the_reference():
+    for state in states(32, kHitachiAcStateLength, seed=2):
+        total = 62
+        for value in state[:-1]:
+            total -= reverseBits(value, 8)
+
+        assert IRHitachiAc.calcChecksum(state) == reverseBits(total & 0xFF, 8)
+
+        state[-1] = IRHitachiAc.calcChecksum(state)
+        assert IRHitachiAc.validChecksum(state)
+
+
+def test_validate_many_groups_by_protocol_and_length():
+    registry = ChecksumRegistry()
+    registry.register(HAIER_AC, ByteSum())
+    registry.register(HITACHI_AC, ReversedSum(init=62))
+
+    results = []
+    for decode_type, length in [
+        (HAIER_AC, 9), (HITACHI_AC, 28), (HAIER_AC, 9), (HAIER_AC, 14), (NEC, 4)
+    ]:
+        entry = decode_results()
+        entry.decode_type = decode_type
+        entry.bits = length * 8
+        entry.state[:length] = states(1, length, seed=len(results))[0]
+        if len(results) % 2 == 0 and registry.get(decode_type) is not None:
+            registry.get(decode_type).apply(entry.state, length)
+        results.append(entry)
+
+    expected = [
+        registry.valid(entry.decode_type, entry.state[:entry.bits // 8])
+        for entry in results
+    ]
+    assert expected[0] and expected[2] and expected[4] is None
+    assert registry.validate_many(results) == expected
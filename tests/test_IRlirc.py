@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+import io
+
+import pytest
+
+from IRDecoder.IRlirc import LircReader
+
+kMode2 = b'''Using driver default on device /dev/lirc0
+Trying device: /dev/lirc0
+space 16777215
+pulse 9000
+space 4500
+pulse 560
+space 560
+pulse 560
+timeout 126000
+pulse 9000
+space 2250
+pulse 560
+space 40000
+pulse 9000
+space 2250
+pulse 560
+space 560
+'''
+
+kIrCtl = b'''+9000 -4500 +560 -560 +560
+# timeout 126000
++9000 -2250 +560 -40000 +9000 -2250 +560 -560
+'''
+
+# Capture ticks of both. (kRawTick, entry 0 is the gap)
+kCaptures = [
+    [0xFFFF, 4500, 2250, 280, 280, 280],
+    [63000, 4500, 1125, 280],
+    [20000, 4500, 1125, 280],
+]
+
+
+def captures(reader):
+    return [list(rawbuf) for rawbuf in reader]
+
+
+@pytest.mark.parametrize('read_size', [1, 2, 7, 64, 65536])
+def test_mode2(read_size):
+    reader = LircReader(io.BytesIO(kMode2), read_size=read_size)
+
+    assert captures(reader) == kCaptures
+    assert reader.records == 15 and reader.frames == 3
+
+
+@pytest.mark.parametrize('read_size', [1, 5, 16, 65536])
+def test_ir_ctl(read_size):
+    reader = LircReader(io.BytesIO(kIrCtl), read_size=read_size)
+
+    assert captures(reader) == [[0] + kCaptures[0][1:]] + kCaptures[1:]
+    assert reader.records == 14 and reader.frames == 3
+
+
+def test_text_mode_file(tmp_path):
+    path = tmp_path / 'mode2.txt'
+    path.write_bytes(kMode2)
+
+    with open(str(path)) as f:
+        assert captures(LircReader(f, read_size=16)) == kCaptures
+
+    with LircReader(str(path)) as reader:
+        assert captures(reader) == kCaptures
+
+
+def test_read_only_source():
+
+    class Source(object):
+
+        def __init__(self):
+            self._data = io.BytesIO(kIrCtl)
+
+        def read(self, size):
+            return self._data.read(size)
+
+    assert len(captures(LircReader(Source(), read_size=3))) == 3
+
+
+def test_back_to_back_pulses_are_merged():
+    text = b'pulse 300\npulse 260\nspace 500\nspace 620\npulse 560\n'
+
+    assert captures(LircReader(io.BytesIO(text))) == [[0, 280, 560, 280]]
+
+
+def test_timeout():
+    text = b'+9000 -4500 +560 -9000 +560 -9000 +560\n'
+
+    assert captures(LircReader(io.BytesIO(text))) == [
+        [0, 4500, 2250, 280, 4500, 280, 4500, 280]
+    ]
+    assert captures(LircReader(io.BytesIO(text), timeout=9)) == [
+        [0, 4500, 2250, 280],
+        [4500, 280],
+        [4500, 280],
+    ]
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from IRDecoder import IRmodulate
+from IRDecoder.IRbackend import RecordingBackend
+from IRDecoder.IRmodulate import CarrierRenderer, pairTimings
+
+kTimings = [9000, 4500, 560, 1690, 560, 560, 560, 40000]
+
+
+def naiveRender(timings, sample_rate, frequency, duty):
+    # One sample at a time, a mark starts with the carrier on.
+    samples = []
+    start = 0.0
+    for entry, usecs in enumerate(timings):
+        end = start + usecs
+        first = int(round(start * sample_rate / 1e6))
+        last = int(round(end * sample_rate / 1e6))
+        for index in range(first, last):
+            phase = ((index - first) * frequency / float(sample_rate)) % 1.0
+            samples.append(int(entry % 2 == 0 and phase < duty / 100.0))
+        start = end
+
+    return samples
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1000, 65536])
+def test_chunks_are_the_whole_render(chunk_size):
+    renderer = CarrierRenderer(sample_rate=192000)
+    chunks = list(renderer.chunks(kTimings, chunk_size))
+
+    assert all(len(chunk) == chunk_size for chunk in chunks[:-1])
+    assert 0 < len(chunks[-1]) <= chunk_size
+    assert np.array_equal(np.concatenate(chunks), renderer.render(kTimings))
+    assert len(renderer.render(kTimings)) == renderer.nsamples(kTimings)
+
+
+@pytest.mark.parametrize(
+    'sample_rate, frequency, duty',
+    [
+        (1000000, 38, 50),
+        (192000, 38000, 33),
+        (96000, 36000, 25),
+        (1000000, 56000, 100),
+        (1000000, 40000, 0),
+    ]
+)
+def test_render_matches_naive(sample_rate, frequency, duty):
+    renderer = CarrierRenderer(sample_rate, frequency, duty)
+    samples = renderer.render(kTimings)
+
+    assert samples.dtype == np.uint8
+    assert list(samples) == naiveRender(
+        kTimings,
+        sample_rate,
+        frequency * 1000 if frequency < 1000 else frequency,
+        duty
+    )
+
+
+def test_duty_cycle():
+    renderer = CarrierRenderer(sample_rate=3800000, frequency=38000, duty=25)
+    mark = renderer.render([100000])
+
+    # 100 samples per carrier cycle, 25 of them high.
+    assert mark.mean() == pytest.approx(0.25)
+    assert list(mark[:100]) == [1] * 25 + [0] * 75
+
+    assert not renderer.render([0, 1000]).any()
+    assert renderer.render([]).dtype == np.uint8
+
+
+def test_sample_values():
+    renderer = CarrierRenderer(high=32767, low=-32768, dtype='int16', duty=100)
+    samples = renderer.render([10, 10])
+
+    assert samples.dtype == np.int16
+    assert list(samples) == [32767] * 10 + [-32768] * 10
+
+
+def test_from_output():
+    backend = RecordingBackend()
+    backend.enable(36000, 33)
+    backend.space(500)
+    backend.mark(560)
+    backend.space(1690)
+
+    renderer = CarrierRenderer.fromOutput(backend, sample_rate=192000)
+    assert (renderer.frequency, renderer.duty) == (36000, 33)
+    assert list(pairTimings(backend.pairs())) == list(backend.timings()) == [560, 1690]
+
+
+def test_without_numpy(monkeypatch):
+    monkeypatch.setattr(IRmodulate, 'np', None)
+
+    with pytest.raises(ImportError):
+        CarrierRenderer()
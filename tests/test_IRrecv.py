@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+import multiprocessing
+import warnings
+from array import array
+
+import pytest
+
+from IRDecoder.IRcache import DecodeCache
+from IRDecoder.IRrecv import (
+    IRrecv,
+    decode_results,
+    irparams_t,
+    kRawTick,
+    kRepeat,
+    kStopState,
+    match_result_t,
+    rawBuffer,
+)
+from IRDecoder.IRremoteESP8266 import *
+
+from conftest import jvcTimings
+
+
+def capture(*usecs):
+    return array('H', [50000] + [usec // kRawTick for usec in usecs])
+
+
+def jvc(data, header=True):
+    return capture(*jvcTimings(data, header))
+
+
+kNecRepeat = capture(8960, 2240, 560)
+
+# Repeats of both messages, before & after them, & junk in between.
+kCorpus = [
+    jvc(0xC5E8, header=False),
+    kNecRepeat,
+    jvc(0xC5E8),
+    jvc(0xC5E8, header=False),
+    capture(3000, 1000, 600, 600, 600),
+    jvc(0xC5E8, header=False),
+    jvc(0x1234, header=False),
+    kNecRepeat,
+    jvc(0x1234),
+    jvc(0xC5E8, header=False),
+    jvc(0x1234, header=False),
+] * 3
+
+
+def fields(results):
+    return (
+        results.decode_type,
+        results.value,
+        results.address,
+        results.command,
+        results.bits,
+        results.repeat,
+        list(results.rawbuf[:results.rawlen])
+    )
+
+
+@pytest.mark.parametrize(
+    'protocols, cache, repeats',
+    [
+        (None, False, True),
+        (None, True, True),
+        ((JVC,), False, True),
+        (None, False, False),
+    ]
+)
+def test_decode_many_workers_match_in_process(jvcDecoder, protocols, cache, repeats):
+    if multiprocessing.get_start_method() != 'fork':
+        pytest.skip('the stand-in decoder only reaches forked workers')
+
+    def receiver():
+        irrecv = IRrecv(0)
+        irrecv.setProtocols(protocols)
+        irrecv.setRepeatFastPath(repeats)
+        if cache:
+            irrecv.setDecodeCache(DecodeCache())
+        return irrecv
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        serial = receiver()
+        expected = [fields(results) for results in serial.decode_many(kCorpus, workers=1)]
+        irrecv = receiver()
+        output = [
+            fields(results)
+            for results in irrecv.decode_many(kCorpus, workers=2, chunksize=2)
+        ]
+
+    assert output == expected
+    assert irrecv.getDecodeStats() == serial.getDecodeStats()
+
+    # The repeats got the message before them, across chunks.
+    if repeats:
+        assert expected[3][:6] == (JVC, kRepeat, 0xC5, 0xE8, 0, True)
+
+
+def test_decode_many_keeps_the_chain_order():
+    irrecv = IRrecv(0)
+    irrecv.setAdaptiveOrder()
+    irrecv.loadDecodeStats({'JVC': 100})
+    order = [candidate.name for candidate in irrecv._decode_index.chain]
+
+    worker = IRrecv(0)
+    worker._useChain(order)
+
+    assert [candidate.name for candidate in worker._decode_index.chain] == order
+    assert order.index('JVC') < order.index('NEC')
+
+
+def receive(irrecv, rawbuf):
+    # What the interrupt handler leaves behind after a capture.
+    irrecv.irparams.rawbuf[:len(rawbuf)] = rawbuf
+    irrecv.irparams.rawlen = len(rawbuf)
+    irrecv.irparams.overflow = False
+    irrecv.irparams.rcvstate = kStopState
+
+
+@pytest.mark.parametrize('swap', [False, True])
+def test_decode_with_a_save_buffer(jvcDecoder, swap):
+    irrecv = IRrecv(0, bufsize=100, save_buffer=True, swap_buffers=swap)
+    capture_buffer = irrecv.irparams.rawbuf
+    save_buffer = irrecv.irparams_save.rawbuf
+
+    for data in (0xC5E8, 0x1234, 0xC5E8):
+        rawbuf = jvc(data)
+        receive(irrecv, rawbuf)
+        buffers = (irrecv.irparams.rawbuf, irrecv.irparams_save.rawbuf)
+        results = decode_results()
+
+        assert irrecv.decode(results)
+        assert (results.decode_type, results.value) == (JVC, data)
+        assert results.rawlen == len(rawbuf)
+        assert results.rawbuf[:results.rawlen] == rawbuf
+        assert results.rawbuf is irrecv.irparams_save.rawbuf
+
+        if swap:
+            # The buffers traded places, nothing was copied.
+            assert irrecv.irparams_save.rawbuf is buffers[0]
+            assert irrecv.irparams.rawbuf is buffers[1]
+        else:
+            assert irrecv.irparams.rawbuf is capture_buffer
+            assert irrecv.irparams_save.rawbuf is save_buffer
+
+    # Still the same two buffers.
+    assert {id(irrecv.irparams.rawbuf), id(irrecv.irparams_save.rawbuf)} == {
+        id(capture_buffer), id(save_buffer)
+    }
+
+
+def test_decode_without_a_save_buffer(jvcDecoder):
+    irrecv = IRrecv(0, bufsize=100)
+    receive(irrecv, jvc(0xC5E8))
+    results = decode_results()
+
+    assert irrecv.decode(results)
+    assert results.rawbuf is irrecv.irparams.rawbuf
+    assert results.value == 0xC5E8
+
+
+def test_decode_waits_for_the_capture():
+    irrecv = IRrecv(0, bufsize=100)
+    irrecv.irparams.rcvstate = None
+
+    assert not irrecv.decode(decode_results())
+
+
+@pytest.mark.parametrize('cls', [irparams_t, decode_results, match_result_t])
+def test_slots(cls):
+    instance = cls()
+
+    assert not hasattr(instance, '__dict__')
+    with pytest.raises(AttributeError):
+        instance.unknown = 1
+
+
+def test_raw_buffer():
+    rawbuf = rawBuffer(10)
+
+    assert rawbuf.typecode == 'H' and list(rawbuf) == [0] * 10
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+import inspect
+import random
+import warnings
+from array import array
+
+import pytest
+
+from IRDecoder.IRbackend import RecordingBackend
+from IRDecoder.IRindex import DecodeCandidate
+from IRDecoder.IRrecv import IRrecv
+from IRDecoder.IRregistry import (
+    DecoderEntry,
+    ProtocolRegistry,
+    adaptiveOrder,
+    kRegistry,
+)
+from IRDecoder.IRremoteESP8266 import *
+from IRDecoder.IRsend import IRsend
+
+
+def test_unavailable_module_warns_once():
+    registry = ProtocolRegistry()
+
+    with pytest.warns(RuntimeWarning, match='ir_Missing'):
+        assert registry.module('.ir_Missing') is None
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        assert not registry.available('.ir_Missing')
+
+    assert list(registry.unavailable()) == ['.ir_Missing']
+    assert registry.resolve('.ir_Missing', 'decodeMissing') == (None, False)
+
+
+def test_unavailable_decoder_does_not_match():
+    registry = ProtocolRegistry()
+    registry.registerDecoder(DecoderEntry('decodeMissing', '.ir_Missing'))
+
+    class Receiver(object):
+        pass
+
+    registry.install(Receiver)
+
+    with pytest.warns(RuntimeWarning):
+        assert Receiver().decodeMissing(None) is False
+
+
+def test_unfinished_decoder_leaves_the_chain():
+    calls = []
+
+    class Receiver(object):
+
+        def decodeUnfinished(self, results):
+            calls.append(results)
+            return notDefinedAnywhere  # NOQA
+
+    candidate = DecodeCandidate('Unfinished', 'decodeUnfinished')
+
+    with pytest.warns(RuntimeWarning, match='Unfinished'):
+        assert not candidate.decode(Receiver(), 1)
+
+    assert isinstance(candidate.error, NameError)
+    assert not candidate.decode(Receiver(), 2)
+    assert calls == [1]
+
+
+@pytest.mark.parametrize(
+    'rawbuf',
+    [
+        [100, 4480, 2240, 280],  # NEC repeat sized.
+        [100] + [300] * 67,
+        [100, 4480, 4480] + [280, 280] * 30,
+    ]
+)
+def test_decode_raw_survives_broken_modules(rawbuf):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        results = IRrecv(0).decodeRaw(array('H', rawbuf))
+
+    assert results is not None
+
+
+# Senders that still use names of the C++ library. (sendGeneric, etc.)
+kUnportedSenders = frozenset([
+    HAIER_AC,
+    HAIER_AC_YRW02,
+    HITACHI_AC,
+    HITACHI_AC1,
+    HITACHI_AC2,
+    HITACHI_AC424,
+    SHARP_AC,
+])
+
+kStateProtocols = [
+    pytest.param(
+        decode_type,
+        marks=pytest.mark.xfail(raises=NameError, strict=True, reason='sender not ported yet')
+    )
+    if decode_type in kUnportedSenders else decode_type
+    for decode_type in kRegistry.protocols()
+    if kRegistry.hasACState(decode_type)
+]
+
+
+@pytest.mark.parametrize('decode_type', kStateProtocols)
+def test_send_state(decode_type):
+    nbytes = kRegistry.defaultBits(decode_type) // 8 or 8
+    state = [0] * nbytes
+    irsend = IRsend(4, backend=RecordingBackend())
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        sender = kRegistry.sender(irsend, decode_type)
+
+    # The arguments send() passes have to fit the sender.
+    repeat = irsend.min_repeats(decode_type)
+    inspect.signature(sender).bind(state, nbytes, repeat)
+
+    assert irsend.send(decode_type, state, nbytes)
+
+
+def chain(count, seed):
+    # A decode chain with random before/after constraints that its own order
+    # keeps.
+    rng = random.Random(seed)
+    names = ['decode%d' % pos for pos in range(count)]
+    candidates = []
+
+    for pos, name in enumerate(names):
+        before = [other for other in names[pos + 1:] if rng.random() < 0.05]
+        after = [other for other in names[:pos] if rng.random() < 0.05]
+        if rng.random() < 0.2:
+            before.append('decodeNotInTheChain')
+
+        candidates.append(
+            DecodeCandidate(name, name, before=tuple(before), after=tuple(after))
+        )
+
+    return candidates
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_adaptive_order_keeps_the_constraints(seed):
+    candidates = chain(40, seed)
+    rng = random.Random(seed)
+    hits = dict(
+        (candidate.name, rng.randrange(5))
+        for candidate in candidates if rng.random() < 0.7
+    )
+
+    ordered = adaptiveOrder(candidates, hits)
+    assert isinstance(ordered, tuple)
+    assert sorted(ordered, key=candidates.index) == candidates
+
+    positions = dict((candidate.name, pos) for pos, candidate in enumerate(ordered))
+    for pos, candidate in enumerate(ordered):
+        for name in candidate.before:
+            assert positions.get(name, len(ordered)) > pos
+        for name in candidate.after:
+            assert positions[name] < pos
+
+
+def test_adaptive_order_without_constraints():
+    candidates = [DecodeCandidate(name, name) for name in 'ABCDEF']
+    hits = {'C': 3, 'E': 3, 'F': 1, 'A': 0}
+
+    ordered = adaptiveOrder(candidates, hits)
+    assert [candidate.name for candidate in ordered] == list('CEFABD')
+    assert adaptiveOrder(candidates, {}) == tuple(candidates)
+
+
+def test_adaptive_order_moves_what_a_busy_entry_waits_for():
+    candidates = [
+        DecodeCandidate('A', 'A'),
+        DecodeCandidate('B', 'B', before=('C',)),
+        DecodeCandidate('C', 'C'),
+    ]
+
+    ordered = adaptiveOrder(candidates, {'C': 10})
+    assert [candidate.name for candidate in ordered] == ['B', 'C', 'A']
+
+
+def test_adaptive_order_loop():
+    candidates = [
+        DecodeCandidate('A', 'A', before=('B',)),
+        DecodeCandidate('B', 'B', before=('C',)),
+        DecodeCandidate('C', 'C', before=('A',)),
+    ]
+
+    with pytest.raises(ValueError, match='loop'):
+        adaptiveOrder(candidates, {'B': 1})
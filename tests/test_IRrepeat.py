@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+import multiprocessing
+import warnings
+from array import array
+
+from IRDecoder import IRrepeat
+from IRDecoder.IRrecv import IRrecv, decode_results, kRawTick, kRepeat
+from IRDecoder.IRregistry import kRegistry
+from IRDecoder.IRremoteESP8266 import *
+from IRDecoder.IRrepeat import (
+    RepeatClassifier,
+    kJvcRptBitMark,
+    kJvcRptOneSpace,
+    kJvcRptZeroSpace,
+    kNecRptBitMark,
+    kNecRptHdrMark,
+    kNecRptSpace,
+)
+
+
+def ticks(*usecs):
+    return [usec // kRawTick for usec in usecs]
+
+
+def capture(rawbuf):
+    results = decode_results()
+    results.rawbuf = array('H', rawbuf)
+    results.rawlen = len(rawbuf)
+    results.overflow = False
+    return results
+
+
+def message(decode_type, value, address=0, command=0):
+    results = decode_results()
+    results.decode_type = decode_type
+    results.value = value
+    results.address = address
+    results.command = command
+    results.repeat = False
+    return results
+
+
+def jvcRepeat(data):
+    rawbuf = ticks(50000)
+    for bit in range(kJvcBits - 1, -1, -1):
+        space = kJvcRptOneSpace if (data >> bit) & 1 else kJvcRptZeroSpace
+        rawbuf += ticks(kJvcRptBitMark, space)
+
+    return rawbuf + ticks(kJvcRptBitMark)
+
+
+kNecRepeat = ticks(50000, kNecRptHdrMark, kNecRptSpace, kNecRptBitMark)
+
+
+def test_jvc_repeat_of_the_last_message():
+    classifier = RepeatClassifier(repeat_value=kRepeat)
+    classifier.update(message(JVC, 0xC5E8, 0xA3, 0x17))
+
+    results = capture(jvcRepeat(0xC5E8))
+    assert classifier.classify(IRrecv(0), results)
+    assert results.decode_type == JVC
+    assert results.repeat
+    assert (results.address, results.command) == (0xA3, 0x17)
+
+
+def test_jvc_frame_with_other_data_is_not_a_repeat():
+    classifier = RepeatClassifier(repeat_value=kRepeat)
+    classifier.update(message(JVC, 0xC5E8))
+
+    assert not classifier.classify(IRrecv(0), capture(jvcRepeat(0xC5E9)))
+
+
+def test_jvc_sized_junk_is_not_a_repeat():
+    classifier = RepeatClassifier(repeat_value=kRepeat)
+    classifier.update(message(JVC, 0xC5E8))
+
+    rawbuf = jvcRepeat(0xC5E8)
+    rawbuf[2:-1] = [9999] * (len(rawbuf) - 3)
+    assert not classifier.classify(IRrecv(0), capture(rawbuf))
+
+
+def test_jvc_frame_without_a_jvc_message_is_not_a_repeat():
+    classifier = RepeatClassifier(repeat_value=kRepeat)
+    classifier.update(message(NEC, 0xC5E8))
+
+    assert not classifier.classify(IRrecv(0), capture(jvcRepeat(0xC5E8)))
+
+
+def test_nec_repeat_defaults_to_nec():
+    results = capture(kNecRepeat)
+    assert RepeatClassifier().classify(IRrecv(0), results)
+    assert results.decode_type == NEC
+
+
+def test_repeat_frames_follow_the_enabled_protocols():
+    irrecv = IRrecv(0)
+    irrecv.setProtocols([SONY])
+
+    results = capture(kNecRepeat)
+    assert not irrecv._repeats.classify(irrecv, results)
+
+    irrecv.setProtocols([SONY, NEC])
+    assert irrecv._repeats.classify(irrecv, results)
+    assert results.decode_type == NEC
+
+
+def test_enabled_protocols_survive_toggling_the_fast_path():
+    irrecv = IRrecv(0)
+    irrecv.setProtocols([LG])
+    irrecv.setRepeatFastPath(False)
+    irrecv.setRepeatFastPath(True)
+
+    assert not irrecv._repeats.classify(irrecv, capture(kNecRepeat))
+
+
+def test_jvc_timings_mirror_the_protocol_module():
+    # Through the registry, importing it directly replaces IRrecv.decodeJVC.
+    ir_JVC = kRegistry.module('.ir_JVC')
+    assert IRrepeat.kJvcRptBitMark == ir_JVC.kJvcBitMark
+    assert IRrepeat.kJvcRptOneSpace == ir_JVC.kJvcOneSpace
+    assert IRrepeat.kJvcRptZeroSpace == ir_JVC.kJvcZeroSpace
+
+
+def test_unknown_message_is_forgotten_by_the_classifier():
+    classifier = RepeatClassifier(repeat_value=kRepeat)
+    classifier.update(message(JVC, 0xC5E8))
+    classifier.update(message(UNKNOWN, 0x1234))
+
+    assert not classifier.classify(IRrecv(0), capture(jvcRepeat(0xC5E8)))
+
+
+def test_repeats_of_a_message_before_junk_are_not_repeats(jvcDecoder):
+    jvc = ticks(50000, 8400, 4200) + jvcRepeat(0xC5E8)[1:]
+    junk = ticks(50000, 3000, 1000, 600, 600, 600)
+    rawbufs = [array('H', rawbuf) for rawbuf in (jvc, jvcRepeat(0xC5E8), junk, jvcRepeat(0xC5E8))]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        irrecv = IRrecv(0)
+        serial = [irrecv.decodeRaw(rawbuf) for rawbuf in rawbufs]
+
+        # The classifier runs in this process, after the workers.
+        if multiprocessing.get_start_method() == 'fork':
+            output = list(IRrecv(0).decode_many(rawbufs, workers=2, chunksize=1))
+        else:
+            output = serial
+
+    for results in (serial, output):
+        assert [result.value for result in results[:2]] == [0xC5E8, kRepeat]
+        assert results[2].decode_type == UNKNOWN
+        # Only the stand-in decoder knows it now, as a headerless message.
+        assert (results[3].decode_type, results[3].value) == (JVC, 0xC5E8)
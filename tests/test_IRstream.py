@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+import random
+import warnings
+from array import array
+
+import pytest
+
+from IRDecoder.IRcache import DecodeCache
+from IRDecoder.IRrecv import IRrecv, kRawTick, kRepeat
+from IRDecoder.IRremoteESP8266 import *
+from IRDecoder.IRstream import IRrecvStream
+
+from conftest import jvcTimings
+
+kGap = 50000
+kNecRepeat = [8960, 2240, 560]
+kJunk = [3000, 1000, 600, 600, 600]
+
+# uSeconds of every message. Repeats of both messages, before & after them,
+# & junk in between.
+kMessages = [
+    jvcTimings(0xC5E8, header=False),
+    kNecRepeat,
+    jvcTimings(0xC5E8),
+    jvcTimings(0xC5E8, header=False),
+    kJunk,
+    jvcTimings(0xC5E8, header=False),
+    jvcTimings(0x1234, header=False),
+    kNecRepeat,
+    jvcTimings(0x1234),
+    jvcTimings(0xC5E8, header=False),
+    jvcTimings(0x1234, header=False),
+] * 2
+
+
+def receiver(cache=False, repeats=True):
+    irrecv = IRrecv(0)
+    irrecv.setRepeatFastPath(repeats)
+    if cache:
+        irrecv.setDecodeCache(DecodeCache())
+    return irrecv
+
+
+def fields(results):
+    # Entry 0 (the gap) isn't compared, a stream only knows it afterwards.
+    return (
+        results.decode_type,
+        results.value,
+        results.address,
+        results.command,
+        results.bits,
+        results.repeat,
+        list(results.rawbuf[1:results.rawlen])
+    )
+
+
+def decodeRaw(irrecv, messages):
+    # A stream drops what decodeRaw() gives as UNKNOWN without a hash.
+    output = []
+    for usecs in messages:
+        rawbuf = array('H', [kGap // kRawTick] + [usec // kRawTick for usec in usecs])
+        results = irrecv.decodeRaw(rawbuf)
+        if results.decode_type != UNKNOWN or results.bits:
+            output.append(fields(results))
+    return output
+
+
+def chunks(durations, seed):
+    rand = random.Random(seed)
+    while durations:
+        size = rand.randint(1, 40)
+        yield durations[:size]
+        durations = durations[size:]
+
+
+@pytest.mark.parametrize('cache', [False, True])
+@pytest.mark.parametrize('repeats', [False, True])
+@pytest.mark.parametrize('seed', range(3))
+def test_feed_matches_decode_raw(jvcDecoder, cache, repeats, seed):
+    durations = []
+    for usecs in kMessages:
+        durations.extend(usecs)
+        durations.append(kGap)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        serial = receiver(cache, repeats)
+        expected = decodeRaw(serial, kMessages)
+
+        irrecv = receiver(cache, repeats)
+        stream = IRrecvStream(irrecv)
+        output = []
+        for chunk in chunks(durations[:-1], seed):
+            output.extend(fields(results) for results in stream.feed(chunk))
+        output.extend(fields(results) for results in stream.flush())
+
+    assert output == expected
+    assert irrecv.getDecodeStats() == serial.getDecodeStats()
+    if repeats:
+        assert expected[3][:6] == (JVC, kRepeat, 0xC5, 0xE8, 0, True)
+
+
+@pytest.mark.parametrize('cache', [False, True])
+def test_idle_matches_decode_raw(jvcDecoder, cache):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        serial = receiver(cache)
+        expected = decodeRaw(serial, kMessages)
+
+        irrecv = receiver(cache)
+        stream = IRrecvStream(irrecv)
+        output = []
+        for usecs in kMessages:
+            output.extend(fields(results) for results in stream.feed(usecs))
+            # Nothing ends before the timeout.
+            assert not list(stream.idle(kGap // 10))
+            output.extend(fields(results) for results in stream.idle(kGap))
+            assert not list(stream.feed([kGap]))
+
+        assert not list(stream.flush())
+
+    assert output == expected
+    assert irrecv.getDecodeStats() == serial.getDecodeStats()
+
+
+@pytest.mark.parametrize('cache', [False, True])
+def test_repeat_frames_are_committed_early(jvcDecoder, cache):
+    irrecv = receiver(cache)
+    stream = IRrecvStream(irrecv)
+
+    # A NEC repeat on its own is a NEC repeat.
+    output = list(stream.feed(kNecRepeat))
+    assert [fields(results)[:6] for results in output] == [
+        (NEC, kRepeat, 0, 0, 0, True)
+    ]
+
+    # A full JVC message waits for the gap, Mitsubishi2 has the same header
+    # & has precedence.
+    assert not list(stream.feed([kGap] + jvcTimings(0xC5E8)))
+    assert len(list(stream.feed([kGap]))) == 1
+
+    # Its repeat is done at the last mark.
+    for _ in range(2):
+        output = list(stream.feed(jvcTimings(0xC5E8, header=False)))
+        assert [fields(results)[:6] for results in output] == [
+            (JVC, kRepeat, 0xC5, 0xE8, 0, True)
+        ]
+        assert not list(stream.feed([kGap]))
+
+    assert not list(stream.flush())
+    assert irrecv.getDecodeStats() == {'JVC': 1}
+
+
+def test_a_flushed_message_is_decoded(jvcDecoder):
+    stream = IRrecvStream(receiver())
+
+    assert not list(stream.feed(jvcTimings(0x1234)))
+    output = list(stream.flush())
+
+    assert [fields(results)[:6] for results in output] == [
+        (JVC, 0x1234, 0x12, 0x34, kJvcBits, False)
+    ]
+    assert not list(stream.flush())
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+import pytest
+
+from IRDecoder import IRbackend, IRtimer
+from IRDecoder.IRbackend import LEDBackend
+from IRDecoder.IRsend import IRsend
+from IRDecoder.IRtimer import DelayEngine
+
+
+class FakeClock(object):
+    # nanos() that moves `step` nano-Seconds every call, & a time.sleep()
+    # that wakes up `latency` nano-Seconds late.
+
+    def __init__(self, step=100, latency=50000):
+        self.now = 0
+        self.step = step
+        self.latency = latency
+        self.sleeps = []
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += int(seconds * 1e9) + self.latency
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(IRtimer, 'nanos', clock)
+    monkeypatch.setattr(IRtimer.time, 'sleep', clock.sleep)
+    return clock
+
+
+def test_sleeps_then_spins(clock):
+    engine = DelayEngine(spin_margin=300)
+    now = engine.until(1000000)
+
+    # Woken up spin_margin early, the rest is spun.
+    assert clock.sleeps == [pytest.approx((1000000 - 100 - 300000) / 1e9)]
+    assert 1000000 <= now < 1000000 + clock.step
+    assert engine.count == 1
+
+
+def test_short_delay_only_spins(clock):
+    engine = DelayEngine(spin_margin=300)
+    engine.wait(250)
+
+    assert clock.sleeps == []
+    assert engine.count == 1
+
+    engine.setSpinMargin(0)
+    engine.wait(250)
+    assert len(clock.sleeps) == 1
+
+    engine.wait(0)
+    engine.wait(-5)
+    assert engine.count == 2
+
+
+def test_jitter(monkeypatch):
+    # Deadline 0, every until() reads the clock twice.
+    lates = [1000, 3000, 2000]
+    reads = iter([late for late in lates for _ in range(2)])
+    monkeypatch.setattr(IRtimer, 'nanos', lambda: next(reads))
+
+    engine = DelayEngine()
+    assert engine.jitter() == dict(count=0, mean=0.0, max=0.0, stddev=0.0)
+
+    for late in lates:
+        assert engine.until(0) == late
+
+    jitter = engine.jitter()
+    assert jitter['count'] == 3
+    assert jitter['mean'] == pytest.approx(2.0)
+    assert jitter['max'] == pytest.approx(3.0)
+    assert jitter['stddev'] == pytest.approx(1.0)
+
+    engine.resetStats()
+    assert engine.jitter() == dict(count=0, mean=0.0, max=0.0, stddev=0.0)
+
+
+def test_delay_waits():
+    engine = DelayEngine()
+    start = IRtimer.nanos()
+    engine.wait(2000)
+
+    assert IRtimer.nanos() - start >= 2000000
+    assert engine.jitter()['count'] == 1
+
+
+def test_led_backend_waits_with_the_engine(clock, monkeypatch):
+    class Delay(object):
+        spin_margin = 300
+
+        def __init__(self):
+            self.deadlines = []
+
+        def until(self, deadline_ns):
+            self.deadlines.append(deadline_ns)
+            clock.now = deadline_ns + 1000
+            return clock.now
+
+    monkeypatch.setattr(IRbackend, 'nanos', clock)
+    delay = Delay()
+    irsend = IRsend(4, use_modulation=False)
+    irsend.set_backend(LEDBackend(irsend, delay=delay))
+
+    irsend.mark(560)
+    irsend.space(1690)
+    irsend.mark(560)
+    start = delay.deadlines[0] - 560000
+
+    # Back to back entries are timed from the last deadline, not from when
+    # the engine returned.
+    assert delay.deadlines == [
+        start + 560000,
+        start + 2250000,
+        start + 2810000,
+    ]
+
+    # After being idle longer than the spin margin it starts from now.
+    clock.now += 1000000
+    start = clock.now + clock.step
+    irsend.space(500)
+    assert delay.deadlines[-1] == start + 500000
+
+
+def test_timestamps_are_integers():
+    nanos = IRtimer.nanos()
+    micros = IRtimer.micros()
+    millis = IRtimer.millis()
+
+    assert all(isinstance(value, int) for value in (nanos, micros, millis))
+    assert nanos // 1000 <= micros < nanos // 1000 + 1000000
+    assert micros // 1000 <= millis < micros // 1000 + 1000
+
+
+@pytest.mark.parametrize('name', [name for name, _ in IRtimer._clocks()])
+def test_clock_override(monkeypatch, name):
+    monkeypatch.setenv('IRTIMER_CLOCK', name)
+
+    assert IRtimer._selectClock()[0] == name
+
+
+def test_clock_selection(monkeypatch):
+    monkeypatch.setenv('IRTIMER_CLOCK', 'no_such_clock')
+    name, clock = IRtimer._selectClock()
+
+    assert name in dict(IRtimer._clocks())
+    assert isinstance(clock(), int)
+
+    # An unknown name is ignored. The pick ticks often enough, unless none
+    # of them do & the last one is the fallback.
+    _, resolution = IRtimer.measureClock(clock)
+    assert resolution <= IRtimer.kClockMaxResolution or name == IRtimer._clocks()[-1][0]
+
+
+def test_measure_clock():
+    overhead, resolution = IRtimer.measureClock(lambda: 0, calls=10)
+    assert overhead >= 0 and resolution == float('inf')
+
+    ticks = iter(range(0, 10000, 3))
+    overhead, resolution = IRtimer.measureClock(lambda: next(ticks), calls=10)
+    assert resolution == 3
+
+    assert set(IRtimer.benchmarkClocks(calls=10)) == set(dict(IRtimer._clocks()))
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+import random
+
+import pytest
+
+from IRDecoder import IRtiming
+from IRDecoder.IRtiming import TimingTable, tickWindow
+
+# name, one mark, one space, zero mark, zero space, tolerance, excess
+kTimings = [
+    ('NEC', 560, 1690, 560, 560, 25, 50),
+    ('Sony', 1200, 600, 600, 600, 25, 50),
+    ('Daikin', 428, 1280, 428, 428, 35, 50),
+]
+
+
+def naiveMatch(ticks, usecs, tolerance, raw_tick=2):
+    # IRrecv.match() of the C++ library, one pulse at a time.
+    low = int(max(usecs * (1.0 - tolerance / 100.0), 0))
+    high = int(usecs * (1.0 + tolerance / 100.0) + 1)
+    return low <= ticks * raw_tick <= high
+
+
+def naiveMatchData(buf, start, nbits, timings, MSBfirst=True):
+    _, onemark, onespace, zeromark, zerospace, tolerance, excess = timings
+    if len(buf) - start < nbits * 2:
+        return False, 0, 0
+
+    data = 0
+    for pos in range(nbits):
+        mark = buf[start + pos * 2]
+        space = buf[start + pos * 2 + 1]
+
+        if (
+            naiveMatch(mark, onemark + excess, tolerance) and
+            naiveMatch(space, onespace - excess, tolerance)
+        ):
+            bit = 1
+        elif (
+            naiveMatch(mark, zeromark + excess, tolerance) and
+            naiveMatch(space, zerospace - excess, tolerance)
+        ):
+            bit = 0
+        else:
+            return False, 0, pos * 2
+
+        if MSBfirst:
+            data = (data << 1) | bit
+        else:
+            data |= bit << pos
+
+    return True, data, nbits * 2
+
+
+def frame(rng, nbits, timings, jitter, junk=0.0):
+    _, onemark, onespace, zeromark, zerospace, _, excess = timings
+    buf = [rng.randrange(1000, 20000)]
+    for _ in range(nbits):
+        if rng.getrandbits(1):
+            mark, space = onemark, onespace
+        else:
+            mark, space = zeromark, zerospace
+
+        for usecs in (mark + excess, space - excess):
+            if rng.random() < junk:
+                usecs = rng.randrange(1, 5000)
+            buf.append(max(int(rng.gauss(usecs, jitter)) // 2, 0))
+
+    return buf
+
+
+def table(timings):
+    _, onemark, onespace, zeromark, zerospace, tolerance, excess = timings
+    return TimingTable(onemark, onespace, zeromark, zerospace, tolerance, excess)
+
+
+@pytest.mark.parametrize('usecs', [0, 1, 2, 3, 263, 560, 1690, 9000, 32767])
+@pytest.mark.parametrize('tolerance', [0, 10, 25, 100])
+@pytest.mark.parametrize('delta', [0, 50])
+def test_tick_window(usecs, tolerance, delta):
+    low, high = tickWindow(usecs, tolerance, delta)
+    lowest = int(max(usecs * (1.0 - tolerance / 100.0) - delta, 0))
+    highest = int(usecs * (1.0 + tolerance / 100.0) + 1 + delta)
+
+    for ticks in range(0, usecs + 100):
+        assert (low <= ticks <= high) == (lowest <= ticks * 2 <= highest)
+
+
+@pytest.mark.parametrize('timings', kTimings, ids=[t[0] for t in kTimings])
+@pytest.mark.parametrize('nbits', [7, 8, 32, 63, 64, 100])
+@pytest.mark.parametrize('MSBfirst', [True, False])
+@pytest.mark.parametrize('numpy', [True, False])
+def test_match_data_matches_naive(timings, nbits, MSBfirst, numpy, monkeypatch):
+    if not numpy:
+        monkeypatch.setattr(IRtiming, 'np', None)
+    elif IRtiming.np is None:
+        pytest.skip('NumPy is not installed')
+
+    rng = random.Random(nbits)
+    compiled = table(timings)
+
+    for jitter, junk in ((0, 0.0), (60, 0.0), (150, 0.0), (40, 0.01)):
+        for _ in range(20):
+            buf = frame(rng, nbits, timings, jitter, junk)
+            expected = naiveMatchData(buf, 1, nbits, timings, MSBfirst)
+            assert compiled.matchData(buf, 1, nbits, MSBfirst) == expected
+
+    # Too short.
+    buf = frame(rng, nbits, timings, 0)[:-1]
+    assert compiled.matchData(buf, 1, nbits, MSBfirst) == (False, 0, 0)
+
+
+@pytest.mark.parametrize('timings', kTimings, ids=[t[0] for t in kTimings])
+@pytest.mark.parametrize('nbytes', [1, 4, 8, 35])
+@pytest.mark.parametrize('numpy', [True, False])
+def test_match_bytes_matches_naive(timings, nbytes, numpy, monkeypatch):
+    if not numpy:
+        monkeypatch.setattr(IRtiming, 'np', None)
+    elif IRtiming.np is None:
+        pytest.skip('NumPy is not installed')
+
+    rng = random.Random(nbytes)
+    compiled = table(timings)
+
+    for junk in (0.0, 0.01):
+        for _ in range(20):
+            buf = frame(rng, nbytes * 8, timings, 60, junk)
+
+            for MSBfirst in (True, False):
+                # The bytes are the bits of the whole section, least
+                # significant byte first for LSB first data.
+                ok, data, _ = naiveMatchData(buf, 1, nbytes * 8, timings, MSBfirst)
+                expected = None
+                if ok:
+                    order = 'big' if MSBfirst else 'little'
+                    expected = list(data.to_bytes(nbytes, order))
+
+                assert compiled.matchBytes(buf, 1, nbytes, MSBfirst) == expected
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+import io
+from array import array
+
+from IRDecoder.IRrecv import IRrecv, kRawTick
+from IRDecoder.IRremoteESP8266 import *
+from IRDecoder.IRtrace import (
+    FileSink,
+    RingSink,
+    TraceSink,
+    kTraceAttempt,
+    kTraceDecoded,
+    kTraceMatch,
+)
+
+from conftest import jvcTimings
+
+
+def traceDecode(sink):
+    irrecv = IRrecv(0)
+    irrecv.setProtocols([JVC])
+    irrecv.setTrace(sink)
+    rawbuf = array('H', [0] + [usec // kRawTick for usec in jvcTimings(0xC5E8)])
+    return irrecv.decodeRaw(rawbuf)
+
+
+def test_file_sink_writes_the_decode(jvcDecoder, tmp_path):
+    path = str(tmp_path / 'trace.tsv')
+    ring = RingSink()
+    traceDecode(ring)
+
+    with FileSink(path) as sink:
+        results = traceDecode(sink)
+
+    assert sink.file.closed
+    assert results.decode_type == JVC and results.value == 0xC5E8
+
+    with open(path) as f:
+        lines = [line.rstrip('\n').split('\t') for line in f]
+
+    # A timestamp, then the event fields.
+    assert len(lines) == len(ring) and len(lines) > 2
+    assert [line[1:] for line in lines] == [
+        ['' if value is None else str(value) for value in event] for event in ring
+    ]
+    assert lines[0][1:3] == [kTraceAttempt, 'JVC']
+    assert lines[-1][1:3] == [kTraceDecoded, 'JVC']
+    assert all(line[1] == kTraceMatch for line in lines[1:-1])
+
+    # The file is appended to.
+    with FileSink(path, events=[kTraceDecoded]) as sink:
+        traceDecode(sink)
+
+    with open(path) as f:
+        assert len(f.readlines()) == len(lines) + 1
+
+
+def test_file_sink_leaves_a_file_object_open(jvcDecoder):
+    f = io.StringIO()
+    with FileSink(f, events=[kTraceDecoded]) as sink:
+        traceDecode(sink)
+
+    assert not f.closed
+    assert f.getvalue().split('\t')[1:3] == [kTraceDecoded, 'JVC']
+
+
+def test_base_sink_drops_events():
+    with TraceSink() as sink:
+        sink.emit(kTraceAttempt, 'NEC')
+        sink.write(None)
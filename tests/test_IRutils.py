@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+import random
+from array import array
+
+import pytest
+
+from IRDecoder.IRutils import (
+    SetParam,
+    bcdToUint8,
+    compileField,
+    countBits,
+    invertBits,
+    reverseBits,
+    sumBytes,
+    sumNibbles,
+    uint8ToBcd,
+    xorBytes,
+)
+
+
+def naiveReverseBits(inpt, nbits):
+    output = 0
+    for pos in range(nbits):
+        output = (output << 1) | ((inpt >> pos) & 1)
+
+    return ((inpt >> nbits) << nbits) | output
+
+
+def naiveGet(state, byte_num, bit_num, num_bits):
+    value = 0
+    for pos in range(num_bits):
+        index, bit = divmod(bit_num + pos, 8)
+        value |= ((state[byte_num + index] >> bit) & 1) << pos
+
+    return value
+
+
+def naiveSet(state, byte_num, bit_num, num_bits, value):
+    for pos in range(num_bits):
+        index, bit = divmod(bit_num + pos, 8)
+        if (value >> pos) & 1:
+            state[byte_num + index] |= 1 << bit
+        else:
+            state[byte_num + index] &= ~(1 << bit) & 0xFF
+
+
+@pytest.mark.parametrize('nbits', [0, 1, 2, 7, 8, 9, 16, 31, 32, 64, 65])
+def test_reverse_bits(nbits):
+    rng = random.Random(nbits)
+    for _ in range(200):
+        value = rng.getrandbits(80)
+        assert reverseBits(value, nbits) == (
+            value if nbits <= 1 else naiveReverseBits(value, nbits)
+        )
+
+
+@pytest.mark.parametrize('kind', [bytes, bytearray, list, 'array'])
+def test_byte_helpers(kind):
+    rng = random.Random(0)
+    for length in (0, 1, 7, 35):
+        values = [rng.getrandbits(8) for _ in range(length + 3)]
+        if kind == 'array':
+            state = array('B', values)
+        else:
+            state = kind(values)
+
+        section = values[:length]
+        ones = sum(bin(value).count('1') for value in section)
+        nibbles = sum((value >> 4) + (value & 0xF) for value in section)
+        xor = 0x5A
+        for value in section:
+            xor ^= value
+
+        assert sumBytes(state, length, 3) == (sum(section) + 3) & 0xFF
+        assert xorBytes(state, length, 0x5A) == xor
+        assert sumNibbles(state, length, 9) == (nibbles + 9) & 0xFF
+        assert countBits(state, length) == ones
+        if length:
+            assert countBits(state, length, ones=False) == length * 8 - ones
+
+
+def test_count_bits_of_an_integer():
+    rng = random.Random(1)
+    for length in (1, 8, 13, 64):
+        for _ in range(50):
+            value = rng.getrandbits(80)
+            ones = bin(value & ((1 << length) - 1)).count('1')
+
+            assert countBits(value, length) == ones
+            assert countBits(value, length, ones=False) == length - ones
+
+
+def test_invert_bits():
+    assert invertBits(0x1234, 0) == 0x1234
+    assert invertBits(0x0F, 8) == 0xF0
+    assert invertBits(0, 70) == (1 << 64) - 1
+
+
+def test_bcd():
+    for integer in range(100):
+        assert bcdToUint8(uint8ToBcd(integer)) == integer
+
+    assert uint8ToBcd(100) == 255
+    assert bcdToUint8(0x9A) == 255
+
+
+kFields = [
+    (0, 0, 1),
+    (2, 5, 3),
+    (1, 0, 8),
+    (1, 3, 7),
+    (1, 6, 10),
+    (0, 4, 16),
+    (2, 7, 17),
+    (0, 3, 24),
+    (1, 0, 32),
+    (0, 1, 40),
+]
+
+
+@pytest.mark.parametrize('byte_num, bit_num, num_bits', kFields)
+def test_compiled_field_matches_naive(byte_num, bit_num, num_bits):
+    get, set = compileField(byte_num, bit_num, num_bits)
+    rng = random.Random(byte_num * 100 + bit_num * 10 + num_bits)
+
+    for _ in range(100):
+        state = bytearray(rng.getrandbits(8) for _ in range(8))
+        assert get(state) == naiveGet(state, byte_num, bit_num, num_bits)
+
+        value = rng.getrandbits(num_bits + 2)
+        expected = bytearray(state)
+        naiveSet(expected, byte_num, bit_num, num_bits, value)
+        set(state, value)
+        assert state == expected
+
+
+def test_compiled_single_bit():
+    get, set = compileField(3, 6, None)
+    state = bytearray(4)
+
+    set(state, True)
+    assert state == bytearray([0, 0, 0, 0x40]) and get(state) == 1
+    set(state, False)
+    assert state == bytearray(4) and get(state) == 0
+
+
+def test_set_param_recompiles():
+
+    class Field(SetParam):
+        byte_num = 1
+        bit_num = 2
+        num_bits = 3
+
+    class Sub(Field):
+        pass
+
+    state = bytearray(4)
+    Field.set(state, 5)
+    assert state == bytearray([0, 5 << 2, 0, 0]) and Sub.get(state) == 5
+
+    Field.byte_num = 2
+    Field.num_bits = 10
+    state = bytearray(4)
+    Sub.set(state, 0x3FF)
+    assert state == bytearray([0, 0, 0xFC, 0x0F])
+    assert Field.get(state) == Sub._field_get(state) == 0x3FF
+
+
+def test_set_param_keeps_its_own_accessors():
+
+    class Field(SetParam):
+        byte_num = 0
+        bit_num = 4
+        num_bits = 4
+
+        @classmethod
+        def get(cls, remote_state):
+            return cls._field_get(remote_state) + 16
+
+    state = bytearray([0x30])
+    assert Field.get(state) == 19
+    Field.set(state, 7)
+    assert state == bytearray([0x70])
+
+    Field.bit_num = 0
+    assert Field.get(state) == 16
+
+
+def test_set_param_without_a_field():
+
+    class Field(SetParam):
+        pass
+
+    with pytest.raises(TypeError):
+        Field.get(bytearray(1))
+
+
+def test_set_param_with_a_plain_method():
+
+    class Field(SetParam):
+        byte_num = 0
+        bit_num = 0
+        num_bits = 8
+
+        def get(self, remote_state):
+            return self._field_get(remote_state) * 2
+
+    class Sub(Field):
+        bit_num = 4
+        num_bits = 4
+
+    state = bytearray([0x21])
+    assert Field().get(state) == 0x42
+    assert Sub().get(state) == 0x04
+    Sub.set(state, 0xF)
+    assert state == bytearray([0xF1])
+
+    Field.num_bits = 4
+    assert Field().get(state) == 2
+    assert Field.__dict__['get'].__name__ == 'get'
+
+
+def test_set_param_with_a_property():
+
+    class Field(SetParam):
+        byte_num = 1
+        bit_num = 0
+        num_bits = 4
+
+        def __init__(self, remote_state):
+            self.remote_state = remote_state
+
+        @property
+        def get(self):
+            return self._field_get(self.remote_state)
+
+    field = Field(bytearray([0, 0x35]))
+    assert field.get == 5
+
+    Field.bit_num = 4
+    assert field.get == 3
+    assert isinstance(Field.__dict__['get'], property)
+
+
+def test_set_param_multi_byte_field():
+
+    class Field(SetParam):
+        byte_num = 1
+        bit_num = 5
+        num_bits = 20
+
+    state = bytearray(5)
+    Field.set(state, 0xABCDE)
+    assert Field.get(state) == 0xABCDE
+    assert state == bytearray([0, 0xC0, 0x9B, 0x57, 0x01])
+    assert naiveGet(state, 1, 5, 20) == 0xABCDE
+
+    # Bits beyond the field are left alone.
+    state = bytearray([0xFF] * 5)
+    Field.set(state, 0)
+    assert state == bytearray([0xFF, 0x1F, 0, 0, 0xFE])
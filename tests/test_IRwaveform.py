@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+from array import array
+
+import pytest
+
+from IRDecoder.IRbackend import RecordingBackend, kLevelMark, kLevelSpace
+from IRDecoder.IRremoteESP8266 import *
+from IRDecoder.IRsend import IRsend
+from IRDecoder.IRwaveform import Waveform, WaveformCache, waveformKey
+
+
+def waveform(*pairs):
+    return Waveform(38000, 50, array('L', pairs))
+
+
+def test_waveform():
+    wave = waveform(kLevelMark, 9000, kLevelSpace, 4500, kLevelMark, 560, kLevelSpace, 40000)
+
+    assert len(wave) == 4
+    assert wave.duration == 54060 and wave.gap == 40000
+    assert waveform(kLevelMark, 560).gap == 0
+    with pytest.raises(TypeError):
+        wave.pairs[1] = 1
+
+
+def test_waveform_key():
+    assert waveformKey(NEC, 0x20DF10EF, 32, 0) == (NEC, 0x20DF10EF, 32, 0, True)
+    assert waveformKey(NEC, 0x20DF10EF, 32, 0, False) != waveformKey(NEC, 0x20DF10EF, 32, 0)
+    assert waveformKey(NEC, 0x20DF10EF, 32, 1) != waveformKey(NEC, 0x20DF10EF, 32, 0)
+
+    # A state is keyed by its bytes, whatever sequence it is in.
+    key = waveformKey(DAIKIN, [1, 2, 3], 3, 0)
+    assert key == waveformKey(DAIKIN, bytearray([1, 2, 3]), 3, 0)
+    assert key == waveformKey(DAIKIN, array('B', [1, 2, 3]), 3, 0)
+    assert key[1] == b'\x01\x02\x03'
+
+    assert waveformKey(DAIKIN, [1, 256], 2, 0) is None
+    assert waveformKey(DAIKIN, [object()], 1, 0) is None
+
+
+def test_least_recently_used_is_evicted():
+    cache = WaveformCache(size=2)
+    first = waveform(kLevelMark, 1)
+    second = waveform(kLevelMark, 2)
+    third = waveform(kLevelMark, 3)
+
+    cache.put('first', first)
+    cache.put('second', second)
+    assert cache.get('first') is first
+    cache.put('third', third)
+
+    assert len(cache) == 2
+    assert cache.get('second') is None
+    assert cache.get('first') is first and cache.get('third') is third
+    assert (cache.hits, cache.misses) == (3, 1)
+
+    cache.invalidate()
+    assert len(cache) == 0 and cache.get('first') is None
+    assert (cache.hits, cache.misses) == (3, 2)
+
+    cache.resetStats()
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_size_zero_keeps_nothing():
+    cache = WaveformCache(size=0)
+    cache.put('first', waveform(kLevelMark, 1))
+
+    assert len(cache) == 0
+
+
+def test_cache_is_shared_between_senders():
+    cache = WaveformCache()
+    backends = [RecordingBackend() for _ in range(3)]
+    senders = [IRsend(4, backend=backend) for backend in backends]
+    for irsend in senders[:2]:
+        irsend.set_waveform_cache(cache)
+
+    for irsend in senders:
+        assert irsend.send(JVC, 0xC5E8, kJvcBits, 1)
+
+    # Rendered once, replayed by the other sender.
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert backends[0].pairs() == backends[2].pairs()
+    assert backends[1].pairs() == backends[2].pairs()
+    assert backends[0].frequency == backends[2].frequency
+
+    # A different repeat is a different message.
+    assert senders[1].send(JVC, 0xC5E8, kJvcBits, 2)
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert len(cache) == 2
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+from array import array
+
+import pytest
+
+from IRDecoder.ir_GlobalCache import (
+    formatGlobalCache,
+    gc_to_pronto,
+    gc_to_raw,
+    gc_to_rawbuf,
+    parseGlobalCache,
+    pronto_to_gc,
+    raw_to_gc,
+    rawbuf_to_gc,
+)
+from IRDecoder.ir_Pronto import pronto_to_raw, raw_to_pronto
+
+# uSeconds of a message, in whole periods of a 38kHz code. (26 uSeconds)
+kMessage = [26 * units for units in (343, 171, 21, 64, 21, 21, 21, 64, 21, 1517)]
+kNEC = (
+    'sendir,1:1,1,38000,1,1,343,171,21,21,21,21,21,64,21,21,21,21,21,21,21,'
+    '21,21,21,21,64,21,64,21,21,21,64,21,64,21,64,21,64,21,64,21,21,21,21,'
+    '21,21,21,64,21,21,21,21,21,21,21,21,21,64,21,64,21,64,21,21,21,64,21,'
+    '64,21,64,21,64,21,1517'
+)
+
+
+@pytest.mark.parametrize('emits', [1, 2, 4])
+def test_raw_round_trip(emits):
+    code = raw_to_gc(kMessage, 38000, emits)
+
+    assert code.startswith('sendir,1:1,1,38000,%d,1,343,171,' % emits)
+    assert gc_to_raw(code) == (38000, array('L', kMessage * emits))
+
+
+def test_repeat_from_a_mark():
+    code = raw_to_gc(kMessage, 38, 3, 3)
+
+    assert list(gc_to_raw(code)[1]) == kMessage + kMessage[2:] * 2
+    assert list(gc_to_raw(code, 1)[1]) == kMessage
+
+
+def test_repeat_from_a_space_merges_with_the_gap():
+    code = raw_to_gc(kMessage, 38000, 2, 2)
+
+    assert list(gc_to_raw(code)[1]) == (
+        kMessage[:-1] + [kMessage[-1] + kMessage[1]] + kMessage[2:]
+    )
+
+
+def test_odd_message_gets_a_gap():
+    code = raw_to_gc(kMessage[:-1], 38000, gap=26 * 100)
+
+    assert list(gc_to_raw(code)[1]) == kMessage[:-1] + [26 * 100]
+
+
+@pytest.mark.parametrize('code', [kNEC, raw_to_gc(kMessage, 38000, 2, 3)])
+def test_compressed_round_trip(code):
+    words = parseGlobalCache(code)
+    compressed = formatGlobalCache(words, compress=True)
+
+    assert len(compressed) < len(code)
+    assert parseGlobalCache(compressed) == words
+    assert formatGlobalCache(words) == code
+    assert gc_to_raw(compressed) == gc_to_raw(code)
+
+
+def test_compressed_letter_off_a_pair_boundary():
+    with pytest.raises(ValueError):
+        parseGlobalCache('38000,1,1,343,171,21A')
+
+
+def test_rawbuf_round_trip():
+    rawbuf = array('H', [30000] + [13 * units for units in (343, 171, 21, 64, 21, 1517)])
+
+    ticks = gc_to_rawbuf(rawbuf_to_gc(rawbuf))
+    assert ticks[0] == 0 and ticks[1:] == rawbuf[1:]
+
+    ticks = gc_to_rawbuf(rawbuf_to_gc(rawbuf, rawlen=6, gap=26 * 1000))
+    assert ticks[1:] == rawbuf[1:6] + array('H', [13 * 1000])
+
+
+@pytest.mark.parametrize('emits', [1, 3])
+def test_pronto_round_trip(emits):
+    code = raw_to_gc(kMessage, 38000, emits, 3)
+    pronto = gc_to_pronto(code)
+    timings = gc_to_raw(code)[1]
+
+    assert pronto_to_raw(pronto, emits - 1)[1] == timings
+    assert gc_to_raw(pronto_to_gc(pronto, emits - 1))[1] == timings
+
+
+def test_pronto_repeat_only():
+    pronto = raw_to_pronto([], 38000, kMessage)
+
+    assert gc_to_raw(pronto_to_gc(pronto, 2))[1] == array('L', kMessage * 3)
+
+
+def test_pronto_from_a_space():
+    with pytest.raises(ValueError):
+        gc_to_pronto(raw_to_gc(kMessage, 38000, 2, 2))
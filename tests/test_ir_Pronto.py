@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Kevin Schlosser
+
+from array import array
+
+import pytest
+
+from IRDecoder.ir_Pronto import convert_library, pronto_to_raw, raw_to_pronto
+
+kSony = (
+    '0000 0067 0000 0015 0060 0018 0018 0018 0030 0018 0030 0018 0030 0018 '
+    '0018 0018 0030 0018 0018 0018 0018 0018 0030 0018 0018 0018 0030 0018 '
+    '0030 0018 0030 0018 0018 0018 0018 0018 0030 0018 0018 0018 0018 0018 '
+    '0030 0018 0018 03f6'
+)
+
+# uSeconds of a message & of its repeat, in whole periods of a 38kHz code.
+# (26 uSeconds)
+kMessage = [26 * units for units in (346, 173, 22, 65, 22, 22, 22, 1536)]
+kRepeat = [26 * units for units in (346, 87, 22, 3700)]
+
+
+@pytest.mark.parametrize(
+    'name',
+    ['KEY_POWER', 'FACE', 'BEEF', '0001', '0000', 'DEAD BEEF', 'Vol Up:']
+)
+def test_library_names_that_look_like_words(name):
+    frequency, timings = pronto_to_raw(kSony)
+    lines = ['# comment', '', name + ' ' + kSony]
+
+    assert list(convert_library(lines)) == [
+        (name.rstrip(':'), frequency, timings)
+    ]
+
+
+def test_library_line_without_a_name():
+    assert [entry[0] for entry in convert_library([kSony])] == ['']
+
+
+def test_library_invalid_line():
+    lines = ['FACE 0000 0067 0000 0015 0060']
+
+    assert list(convert_library(lines)) == []
+    with pytest.raises(ValueError, match='line 1'):
+        list(convert_library(lines, strict=True))
+
+
+
+@pytest.mark.parametrize('frequency', [38000, 38, 40000, 56000])
+def test_raw_round_trip(frequency):
+    hz, timings = pronto_to_raw(raw_to_pronto([100, 100], frequency))
+    period = max(1, (1000000 + hz // 2) // hz)
+    message = [period * (index + 4) for index in range(20)]
+
+    assert abs(hz - frequency * (1000 if frequency < 1000 else 1)) < 1000
+    assert pronto_to_raw(raw_to_pronto(message, frequency)) == (hz, array('L', message))
+
+
+@pytest.mark.parametrize('repeat', [0, 1, 3])
+def test_repeat_round_trip(repeat):
+    code = raw_to_pronto(kMessage, 38000, kRepeat)
+
+    assert code.startswith('0000 006D 0004 0002 ')
+    assert list(pronto_to_raw(code, repeat)[1]) == kMessage + kRepeat * repeat
+
+
+def test_repeat_only_is_sent_once_more():
+    code = raw_to_pronto([], 38000, kRepeat)
+
+    assert list(pronto_to_raw(code, 1)[1]) == kRepeat * 2
+
+
+def test_odd_sequence_gets_a_gap():
+    _, timings = pronto_to_raw(raw_to_pronto(kMessage[:-1], 38000, gap=26 * 100))
+
+    assert list(timings) == kMessage[:-1] + [26 * 100]